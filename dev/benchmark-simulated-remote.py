@@ -0,0 +1,142 @@
+"""
+Benchmark reading scenarios against simulated remote storage.
+
+Writes a test file (a TTree and an RNTuple with the same columns) to a
+temporary directory and reads it through uproot.source.simulated.SimulatedSource
+with several network profiles, so that changes to coalescing, executors, or
+prefetching can be compared on a laptop:
+
+    python dev/benchmark-simulated-remote.py
+    python dev/benchmark-simulated-remote.py --profile wan --scenario iterate --repeat 5
+
+Each line of output is one scenario with one profile: the best wall time of
+the repetitions, the number of read calls (requests before coalescing), and
+the number of simulated transfers (requests after coalescing).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+import awkward as ak
+import numpy as np
+
+import uproot
+
+PROFILES = {
+    "local": {},
+    "lan": {"latency": 0.001, "jitter": 0.0005, "bandwidth": "500 MB"},
+    "wan": {"latency": 0.03, "jitter": 0.01, "bandwidth": "50 MB"},
+    "transatlantic": {"latency": 0.1, "jitter": 0.02, "bandwidth": "20 MB"},
+}
+
+
+def make_file(path, num_entries, num_baskets):
+    rng = np.random.default_rng(12345)
+    step = num_entries // num_baskets
+    with uproot.recreate(path) as file:
+        file.mktree(
+            "tree",
+            {"px": np.float32, "py": np.float32, "n": np.int32, "hits": "var * float64"},
+        )
+        for start in range(0, num_entries, step):
+            size = min(step, num_entries - start)
+            counts = rng.poisson(3, size)
+            file["tree"].extend(
+                {
+                    "px": rng.normal(size=size).astype(np.float32),
+                    "py": rng.normal(size=size).astype(np.float32),
+                    "n": counts.astype(np.int32),
+                    "hits": ak.unflatten(rng.normal(size=counts.sum()), counts),
+                }
+            )
+        file["ntuple"] = {
+            "px": rng.normal(size=num_entries).astype(np.float32),
+            "py": rng.normal(size=num_entries).astype(np.float32),
+            "n": rng.poisson(3, num_entries).astype(np.int32),
+        }
+
+
+def scenario_arrays(file):
+    file["tree"].arrays()
+
+
+def scenario_arrays_subset(file):
+    tree = file["tree"]
+    tree.arrays(["px", "hits"], entry_stop=tree.num_entries // 2)
+
+
+def scenario_iterate(file):
+    for _ in file["tree"].iterate(step_size="1 MB"):
+        pass
+
+
+def scenario_rntuple(file):
+    file["ntuple"].arrays()
+
+
+SCENARIOS = {
+    "arrays": scenario_arrays,
+    "arrays-subset": scenario_arrays_subset,
+    "iterate": scenario_iterate,
+    "rntuple": scenario_rntuple,
+}
+
+
+def run(path, scenario, profile, repeat, seed):
+    best = None
+    for _ in range(repeat):
+        with uproot.open(
+            path,
+            handler=uproot.source.simulated.SimulatedSource,
+            seed=seed,
+            **PROFILES[profile],
+        ) as file:
+            source = file.file.source
+            reads, transfers = source.num_requests, source.num_transfers
+            start = time.perf_counter()
+            SCENARIOS[scenario](file)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (
+                    elapsed,
+                    source.num_requests - reads,
+                    source.num_transfers - transfers,
+                )
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profile", choices=list(PROFILES), action="append")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--baskets", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.root")
+        make_file(path, args.entries, args.baskets)
+        print(f"{os.path.getsize(path) / 1e6:.1f} MB, {args.entries} entries")
+        print(
+            f"{'scenario':15s} {'profile':15s} {'seconds':>9s} {'reads':>7s} "
+            f"{'transfers':>10s}"
+        )
+        for scenario in args.scenario or list(SCENARIOS):
+            for profile in args.profile or list(PROFILES):
+                elapsed, reads, transfers = run(
+                    path, scenario, profile, args.repeat, args.seed
+                )
+                print(
+                    f"{scenario:15s} {profile:15s} {elapsed:9.3f} {reads:7d} "
+                    f"{transfers:10d}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,12 @@ order = [
     "uproot.writing",
     "uproot.behaviors",
     "uproot._dask",
+    "uproot.batching",
     "uproot.behavior",
     "uproot.model",
     "uproot.streamers",
     "uproot.cache",
+    "uproot.profiling",
     "uproot.compression",
     "uproot.deserialization",
     "uproot.serialization",
@@ -37,7 +39,12 @@ common = [
     "uproot.behaviors.TBranch.iterate",
     "uproot.behaviors.TBranch.concatenate",
     "uproot._dask.dask",
+    "uproot.batching.batch_loader",
     "uproot.writing._dask_write.dask_write",
+    "uproot.writing.basketcopy.copy_tree",
+    "uproot.writing.basketcopy.merge",
+    "uproot.writing.conversion.convert_to_rntuple",
+    "uproot.writing.conversion.to_parquet",
     "uproot.writing.writable.create",
     "uproot.writing.writable.recreate",
     "uproot.writing.writable.update",
@@ -45,6 +52,7 @@ common = [
     "uproot.reading.ReadOnlyDirectory",
     "uproot.behaviors.TTree.TTree",
     "uproot.behaviors.TBranch.TBranch",
+    "uproot.behaviors.TBranch.MemoryBudget",
     "uproot.writing.writable.WritableFile",
     "uproot.writing.writable.WritableDirectory",
     "uproot.writing.writable.WritableTree",
@@ -55,6 +63,8 @@ common = [
     "uproot.compression.ZSTD",
     "uproot.cache.LRUCache",
     "uproot.cache.LRUArrayCache",
+    "uproot.cache.BufferPool",
+    "uproot.profiling.Profile",
     "uproot.model.Model",
     "uproot.pyroot.from_pyroot",
     "uproot.source.object.ObjectSource",
@@ -64,6 +74,7 @@ common = [
     "uproot.source.http.MultithreadedHTTPSource",
     "uproot.source.xrootd.XRootDSource",
     "uproot.source.xrootd.MultithreadedXRootDSource",
+    "uproot.source.simulated.SimulatedSource",
     "uproot.models.TTree.num_entries",
 ]
 
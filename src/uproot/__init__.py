@@ -57,6 +57,10 @@ The submodules of Uproot are:
   containers, such as ``std::vector`` and arrays.
 * :doc:`uproot.language`: computational backends for expressions in
   :ref:`uproot.behaviors.TBranch.HasBranches.arrays`.
+* :doc:`uproot.batching`: shuffled mini-batches of features for machine
+  learning, from :doc:`uproot.batching.batch_loader`.
+* :doc:`uproot.profiling`: per-``TBranch`` timings of fetching, decompressing,
+  and interpreting ``TBaskets``.
 * :doc:`uproot.models`: predefined models for classes that are too basic
   to rely on ``TStreamerInfo`` or too common to justify reading it.
 * ``uproot.const``: integer constants used in ROOT serialization and
@@ -82,6 +86,8 @@ unknown_classes = {}
 
 from uproot.cache import LRUCache
 from uproot.cache import LRUArrayCache
+from uproot.cache import BufferPool
+from uproot.profiling import Profile
 
 from uproot.source.file import MemmapSource
 from uproot.source.file import MultithreadedFileSource
@@ -91,9 +97,11 @@ from uproot.source.xrootd import XRootDSource
 from uproot.source.xrootd import MultithreadedXRootDSource
 from uproot.source.object import ObjectSource
 from uproot.source.fsspec import FSSpecSource
+from uproot.source.simulated import SimulatedSource
 from uproot.source.cursor import Cursor
 from uproot.source.futures import TrivialExecutor
 from uproot.source.futures import ThreadPoolExecutor
+from uproot.source.scheduler import IOScheduler
 from uproot.deserialization import DeserializationError
 
 from uproot.compression import ZLIB
@@ -123,6 +131,10 @@ from uproot.writing import WritableTree
 from uproot.writing import WritableBranch
 from uproot.writing import to_writable
 from uproot.writing import dask_write
+from uproot.writing import copy_tree
+from uproot.writing import merge
+from uproot.writing import convert_to_rntuple
+from uproot.writing import to_parquet
 
 from uproot.writing.interpret import as_TGraph
 
@@ -186,11 +198,13 @@ from uproot.behaviors.TTree import TTree
 from uproot.behaviors.TBranch import TBranch
 from uproot.behaviors.TBranch import iterate
 from uproot.behaviors.TBranch import concatenate
+from uproot.behaviors.TBranch import MemoryBudget
 
 from uproot.behavior import behavior_of
 
 from uproot._util import no_filter
 from uproot._dask import dask, ImplementsFormMapping, ImplementsFormMappingInfo
+from uproot.batching import batch_loader
 
 from uproot.pyroot import from_pyroot
 from uproot.pyroot import to_pyroot
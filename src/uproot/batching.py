@@ -0,0 +1,331 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines :doc:`uproot.batching.batch_loader`, which yields shuffled
+mini-batches of features from TTrees and RNTuples for training machine
+learning models.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+
+import numpy
+
+import uproot
+import uproot.behaviors.TBranch
+import uproot.language.python
+import uproot.source.futures
+from uproot._util import no_filter, unset
+
+
+def batch_loader(
+    files,
+    expressions=None,
+    batch_size=1024,
+    *,
+    shuffle=True,
+    seed=None,
+    shuffle_buffer=65536,
+    num_shards=1,
+    shard=0,
+    drop_last=False,
+    dtype=numpy.float32,
+    cut=None,
+    filter_name=no_filter,
+    filter_typename=no_filter,
+    filter_branch=no_filter,
+    filter_field=no_filter,
+    aliases=None,
+    language=uproot.language.python.python_language,
+    prefetch=2,
+    decompression_executor=None,
+    interpretation_executor=None,
+    custom_classes=None,
+    allow_missing=False,
+    **options,
+):
+    """
+    Args:
+        files: See :doc:`uproot.behaviors.TBranch.iterate` for a description
+            of the TTrees and RNTuples that can be given, including the
+            ``"filename.root:treename"`` syntax and wildcards.
+        expressions (None, str, or list of str): Names of ``TBranches``,
+            ``RFields``, or aliases to use as features, or mathematical
+            expressions of them (TTrees only). Each must have a single value or
+            a fixed-size array of values per entry. If None, all ``TBranches``
+            or ``RFields`` selected by the filters are used.
+        batch_size (int): Number of entries (rows) in each mini-batch.
+        shuffle (bool): If True, the order of the entries is randomized; if
+            False, they are yielded in order.
+        seed (None, int, or ``numpy.random.Generator``): Seed of the random
+            order. The same seed (with the same ``files`` and selection) gives
+            the same order; use a different seed for each epoch. Required if
+            ``num_shards`` is greater than 1.
+        shuffle_buffer (int): Number of entries to mix in memory. Larger
+            buffers mix better, at the expense of memory.
+        num_shards (int): Number of workers to split the data among.
+        shard (int): The index of this worker, from ``0`` to ``num_shards - 1``.
+        drop_last (bool): If True, the last mini-batch is dropped if it has
+            fewer than ``batch_size`` entries.
+        dtype (``numpy.dtype``): Data type of the feature matrices.
+        cut (None or str): If not None, this expression filters the entries
+            (TTrees only).
+        filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str \u2192 bool, or iterable of the above): A
+            filter to select ``TBranches`` or ``RFields`` by name.
+        filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str \u2192 bool, or iterable of the above): A
+            filter to select ``TBranches`` or ``RFields`` by type.
+        filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` \u2192 bool, :doc:`uproot.interpretation.Interpretation`, or None): A
+            filter to select ``TBranches`` using the full
+            :doc:`uproot.behaviors.TBranch.TBranch` object. Only used for
+            TTrees.
+        filter_field (None or function of :doc:`uproot.models.RNTuple.RField` \u2192 bool): A
+            filter to select ``RFields`` using the full
+            :doc:`uproot.models.RNTuple.RField` object. Only used for RNTuples.
+        aliases (None or dict of str \u2192 str): Mathematical expressions that
+            can be used in ``expressions`` or other aliases (without cycles).
+        language (:doc:`uproot.language.Language`): Language used to interpret
+            the ``expressions`` and ``aliases``.
+        prefetch (int): Number of clusters to read ahead in a background
+            thread. If 0, clusters are read in the calling thread.
+        decompression_executor (None or Executor with a ``submit`` method): The
+            executor that is used to decompress ``TBaskets``; see
+            :doc:`uproot.behaviors.TBranch.iterate`.
+        interpretation_executor (None or Executor with a ``submit`` method): The
+            executor that is used to interpret uncompressed ``TBasket`` data;
+            see :doc:`uproot.behaviors.TBranch.iterate`.
+        custom_classes (None or dict): If a dict, override the classes from
+            the :doc:`uproot.reading.ReadOnlyFile` or ``uproot.classes``.
+        allow_missing (bool): If True, skip over any files that do not contain
+            the specified ``TTree`` or ``RNTuple``.
+        options: See :doc:`uproot.reading.open`.
+
+    Yields mini-batches of entries as C-contiguous 2-dimensional NumPy arrays
+    of ``dtype``, one row per entry and one column per feature (fixed-size
+    arrays contribute one column per item), in the order of the
+    ``expressions``.
+
+    For example:
+
+    .. code-block:: python
+
+        for epoch in range(10):
+            for batch in uproot.batch_loader(
+                "training-*.root:Events", ["pt", "eta", "phi", "label"], 512, seed=epoch
+            ):
+                features, labels = batch[:, :-1], batch[:, -1]
+
+    The entries are read in contiguous clusters, which are the ranges of
+    entries in which the ``TBaskets`` of all selected ``TBranches`` (or the
+    clusters of an RNTuple) align, so that no ``TBasket`` is read twice. If a
+    TTree or RNTuple has only one such cluster, it is read in pieces of
+    ``max(batch_size, shuffle_buffer // 4)`` entries instead. Shuffling
+    randomizes the order of the clusters of all files, then mixes the entries
+    of consecutive clusters in a buffer of at least ``shuffle_buffer``
+    entries. Thus, data are read almost sequentially, while each mini-batch
+    draws entries from many parts of the dataset.
+
+    With ``num_shards`` workers, each one gets every ``num_shards``-th cluster
+    of the shuffled order, so that workers with the same ``seed`` read
+    disjoint data.
+
+    All ``files`` are opened at the start, to find their clusters, and are
+    closed when the iteration is finished.
+    """
+    for name, value, minimum in [
+        ("batch_size", batch_size, 1),
+        ("shuffle_buffer", shuffle_buffer, 1),
+        ("num_shards", num_shards, 1),
+        ("prefetch", prefetch, 0),
+    ]:
+        if not uproot._util.isint(value) or value < minimum:
+            raise ValueError(
+                f"{name} must be an integer of at least {minimum}, not {value!r}"
+            )
+    if not uproot._util.isint(shard) or not 0 <= shard < num_shards:
+        raise ValueError(
+            f"shard must be an integer from 0 to {num_shards - 1}, not {shard!r}"
+        )
+    if num_shards > 1 and shuffle and seed is None:
+        raise ValueError("a seed is required to shuffle the data of several shards")
+
+    if isinstance(expressions, str):
+        expressions = [expressions]
+    rng = numpy.random.default_rng(seed)
+    max_cluster_size = max(batch_size, shuffle_buffer // 4)
+
+    with contextlib.ExitStack() as stack:
+        sources = []
+        clusters = []
+        for file_path, object_path in uproot._util.regularize_files(
+            files, steps_allowed=False, **options
+        ):
+            obj = uproot._util.regularize_object_path(
+                file_path, object_path, custom_classes, allow_missing, options
+            )
+            if obj is None:
+                continue
+            stack.enter_context(obj)
+
+            offsets = _clusters(
+                obj, expressions, filter_name, filter_typename, filter_branch
+            )
+            if len(offsets) == 2:
+                # no common boundaries: read the only cluster in pieces
+                offsets = [*range(0, offsets[1], max_cluster_size), offsets[1]]
+            for start, stop in itertools.pairwise(offsets):
+                clusters.append((len(sources), start, stop))
+            sources.append(obj)
+
+        order = numpy.arange(len(clusters))
+        if shuffle:
+            rng.shuffle(order)
+        order = order[shard::num_shards]
+
+        decompression_executor, interpretation_executor = (
+            uproot.behaviors.TBranch._regularize_executors(
+                decompression_executor, interpretation_executor, None
+            )
+        )
+        matrices = (
+            _feature_matrix(
+                sources[clusters[index][0]],
+                clusters[index][1],
+                clusters[index][2],
+                expressions,
+                cut,
+                filter_name,
+                filter_typename,
+                filter_branch,
+                filter_field,
+                aliases,
+                language,
+                decompression_executor,
+                interpretation_executor,
+                dtype,
+            )
+            for index in order
+        )
+
+        with uproot.source.futures._ReadAhead(matrices, prefetch) as ahead:
+            yield from _batches(
+                ahead, batch_size, shuffle_buffer if shuffle else 0, rng, drop_last
+            )
+
+
+def _clusters(obj, expressions, filter_name, filter_typename, filter_branch):
+    if isinstance(obj, uproot.behaviors.TBranch.HasBranches):
+        if expressions is not None and all(x in obj for x in expressions):
+            filters = {"filter_name": expressions}
+        else:
+            # expressions of TBranches are computed from all of the selected
+            # TBranches
+            filters = {
+                "filter_name": filter_name,
+                "filter_typename": filter_typename,
+                "filter_branch": filter_branch,
+            }
+        if len(obj.keys(**filters)) == 0:
+            offsets = []
+        else:
+            offsets = obj.common_entry_offsets(**filters)
+    else:
+        offsets = [c.num_first_entry for c in obj.ntuple.cluster_summaries]
+        offsets.append(obj.num_entries)
+
+    if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != obj.num_entries:
+        offsets = [0, obj.num_entries]
+    return offsets
+
+
+def _feature_matrix(
+    obj,
+    entry_start,
+    entry_stop,
+    expressions,
+    cut,
+    filter_name,
+    filter_typename,
+    filter_branch,
+    filter_field,
+    aliases,
+    language,
+    decompression_executor,
+    interpretation_executor,
+    dtype,
+):
+    is_ttree = isinstance(obj, uproot.behaviors.TBranch.HasBranches)
+    arrays = obj.arrays(
+        expressions,
+        cut,
+        filter_name=filter_name,
+        filter_typename=filter_typename,
+        filter_branch=(
+            filter_branch if is_ttree or filter_branch is not no_filter else unset
+        ),
+        **({} if is_ttree else {"filter_field": filter_field}),
+        aliases=aliases,
+        language=language,
+        entry_start=entry_start,
+        entry_stop=entry_stop,
+        decompression_executor=decompression_executor,
+        interpretation_executor=interpretation_executor,
+        library="np",
+        how=dict,
+    )
+    names = list(arrays) if expressions is None else expressions
+    if len(names) == 0:
+        raise ValueError(f"no features were selected\nin file {obj.file.file_path}")
+
+    columns = []
+    for name in names:
+        array = arrays[name]
+        if array.dtype == numpy.dtype(object):
+            raise TypeError(
+                f"feature {name!r} does not have a fixed number of values per "
+                f"entry, so it cannot be a column of a matrix\nin file {obj.file.file_path}"
+            )
+        # not -1, which can't be inferred if a cut removed every entry
+        width = int(numpy.prod(array.shape[1:], dtype=numpy.int64))
+        columns.append(array.reshape(len(array), width))
+
+    matrix = numpy.empty(
+        (len(columns[0]), sum(x.shape[1] for x in columns)), dtype=dtype
+    )
+    start = 0
+    for column in columns:
+        matrix[:, start : start + column.shape[1]] = column
+        start += column.shape[1]
+    return matrix
+
+
+def _batches(matrices, batch_size, shuffle_buffer, rng, drop_last):
+    # entries that have not been yielded yet; when shuffling, half of the
+    # buffer is kept to be mixed with the next clusters
+    pending = []
+    num_pending = 0
+    for matrix in matrices:
+        pending.append(matrix)
+        num_pending += len(matrix)
+        if num_pending >= max(shuffle_buffer, batch_size):
+            data = _mixed(pending, rng, shuffle_buffer)
+            num_ready = num_pending - shuffle_buffer // 2
+            num_ready -= num_ready % batch_size
+            for start in range(0, num_ready, batch_size):
+                yield data[start : start + batch_size]
+            pending = [data[num_ready:]]
+            num_pending -= num_ready
+
+    if num_pending != 0:
+        data = _mixed(pending, rng, shuffle_buffer)
+        for start in range(0, num_pending, batch_size):
+            if not drop_last or start + batch_size <= num_pending:
+                yield data[start : start + batch_size]
+
+
+def _mixed(pending, rng, shuffle_buffer):
+    data = pending[0] if len(pending) == 1 else numpy.concatenate(pending)
+    if shuffle_buffer != 0:
+        data = numpy.take(data, rng.permutation(len(data)), axis=0)
+    return numpy.ascontiguousarray(data)
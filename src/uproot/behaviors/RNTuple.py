@@ -84,7 +84,8 @@ def iterate(
             :doc:`uproot.source.futures.TrivialExecutor` is created. (Not implemented yet.)
         library (str or :doc:`uproot.interpretation.library.Library`): The library
             that is used to represent arrays. Options are ``"np"`` for NumPy,
-            ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+            ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+            Arrow, and ``"pl"`` for Polars.
         ak_add_doc (bool | dict ): If True and ``library="ak"``, add the RField ``description``
             to the Awkward ``__doc__`` parameter of the array.
             if dict = {key:value} and ``library="ak"``, add the RField ``value`` to the
@@ -275,7 +276,8 @@ def concatenate(
             :doc:`uproot.source.futures.TrivialExecutor` is created. (Not implemented yet.)
         library (str or :doc:`uproot.interpretation.library.Library`): The library
             that is used to represent arrays. Options are ``"np"`` for NumPy,
-            ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+            ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+            Arrow, and ``"pl"`` for Polars.
         ak_add_doc (bool | dict ): If True and ``library="ak"``, add the RField ``description``
             to the Awkward ``__doc__`` parameter of the array.
             if dict = {key:value} and ``library="ak"``, add the RField ``value`` to the
@@ -689,7 +691,8 @@ class HasFields(Mapping):
                 if a memory size, create a new cache of this size.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             backend (str): The backend Awkward Array will use.
             interpreter (str): If "cpu" will use cpu to interpret raw data. If "gpu" and
                 ``backend="cuda"`` will use KvikIO bindings to CuFile and nvCOMP to
@@ -906,6 +909,14 @@ class HasFields(Mapping):
             else:
                 arrays = numpy_data
 
+        elif library.name in ("pa", "pl"):
+            arrays = {
+                f: library.finalize(arrays[f], None, None, entry_start, entry_stop, {})
+                for f in arrays.fields
+            }
+            if how is None:
+                arrays = library.group(arrays, expression_context, how)
+
         if how is not None:
             arrays = library.group(arrays, expression_context, how)
 
@@ -983,7 +994,8 @@ class HasFields(Mapping):
                 is used. (Not implemented yet.)
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the RField ``description``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the RField ``value`` to the
@@ -1842,6 +1854,8 @@ def _num_entries_for(ntuple, akform, target_num_bytes, entry_start, entry_stop):
 def _regularize_step_size(ntuple, akform, step_size, entry_start, entry_stop):
     if uproot._util.isint(step_size):
         return step_size
+    if isinstance(step_size, uproot.behaviors.TBranch.MemoryBudget):
+        step_size = step_size.budget
     target_num_bytes = uproot._util.memory_size(
         step_size,
         "number of entries or memory size string with units "
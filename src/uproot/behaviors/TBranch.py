@@ -17,6 +17,7 @@ import queue
 import re
 import sys
 import threading
+import time
 from collections.abc import Iterable, Mapping, MutableMapping
 from keyword import iskeyword
 
@@ -103,10 +104,13 @@ def iterate(
             :ref:`uproot.behaviors.TBranch.TBranch.aliases` are available.
         language (:doc:`uproot.language.Language`): Language used to interpret
             the ``expressions`` and ``aliases``.
-        step_size (int or str): If an integer, the maximum number of entries to
-            include in each iteration step; if a string, the maximum memory size
-            to include. The string must be a number followed by a memory unit,
-            such as "100 MB".
+        step_size (int, str, or :doc:`uproot.behaviors.TBranch.MemoryBudget`): If
+            an integer, the maximum number of entries to include in each
+            iteration step; if a string, the maximum memory size to include.
+            The string must be a number followed by a memory unit, such as
+            "100 MB". A :doc:`uproot.behaviors.TBranch.MemoryBudget` chooses
+            each step's entries separately, to fit a budget of memory (for
+            RNTuples, its ``budget`` is used as a memory size string would be).
         decompression_executor (None or Executor with a ``submit`` method): The
             executor that is used to decompress ``TBaskets``; if None, a
             :doc:`uproot.source.futures.TrivialExecutor` is created.
@@ -116,7 +120,8 @@ def iterate(
             is created.
         library (str or :doc:`uproot.interpretation.library.Library`): The library
             that is used to represent arrays. Options are ``"np"`` for NumPy,
-            ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+            ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+            Arrow, and ``"pl"`` for Polars.
         ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
             to the Awkward ``__doc__`` parameter of the array.
             if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -322,7 +327,8 @@ def concatenate(
             is created.
         library (str or :doc:`uproot.interpretation.library.Library`): The library
             that is used to represent arrays. Options are ``"np"`` for NumPy,
-            ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+            ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+            Arrow, and ``"pl"`` for Polars.
         ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
             to the Awkward ``__doc__`` parameter of the array.
             if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -627,6 +633,215 @@ class Report:
         )
 
 
+class Reader:
+    """
+    Args:
+        hasbranches (:doc:`uproot.behaviors.TBranch.HasBranches`): The
+            object (:doc:`uproot.behaviors.TBranch.TBranch` or
+            :doc:`uproot.behaviors.TTree.TTree`) to read entries from.
+        keys (set of str): All ``TBranch`` names in ``hasbranches``.
+        aliases (dict of str \u2192 str): Regularized aliases.
+        language (:doc:`uproot.language.Language`): Language used to interpret
+            the expressions and ``aliases``.
+        arrays (dict): Arrays that are not read from ``TBaskets``, keyed by
+            ``TBranch`` cache key.
+        expression_context (list of (str, dict) tuples): Regularized
+            expressions.
+        branchid_interpretation (dict of str \u2192 :doc:`uproot.interpretation.Interpretation`): The
+            interpretation of each ``TBranch`` to read, keyed by cache key.
+        basket_cache (MutableMapping): Cache of interpreted ``TBaskets``.
+        decompression_executor (Executor with a ``submit`` method): The
+            executor that is used to decompress ``TBaskets``.
+        interpretation_executor (Executor with a ``submit`` method): The
+            executor that is used to interpret uncompressed ``TBasket`` data as
+            arrays.
+        library (:doc:`uproot.interpretation.library.Library`): The library
+            that is used to represent arrays.
+        ak_add_doc (bool | dict): Passed to the ``library``, as in
+            :ref:`uproot.behaviors.TBranch.HasBranches.arrays`.
+        how (None, str, or container type): Library-dependent instructions
+            for grouping.
+
+    Random access to the entries of a ``TTree``, returned by
+    :ref:`uproot.behaviors.TBranch.HasBranches.reader`.
+
+    ``reader[i:j]`` returns the same group of arrays as
+    :ref:`uproot.behaviors.TBranch.HasBranches.arrays` with ``entry_start=i``
+    and ``entry_stop=j``, and ``reader[i]`` returns entry ``i`` of it: an
+    ``ak.Record`` for ``library="ak"``, a row for ``"pd"``, a dict for
+    ``"pa"`` and ``"pl"``, and the item of each array for ``"np"``. Negative
+    indexes count from the end, but slices must have a step of 1.
+
+    Interpreted ``TBaskets`` are kept in the
+    :ref:`uproot.behaviors.TBranch.Reader.basket_cache`, so entries in
+    ``TBaskets`` that have been read before do not need any I/O. All of the
+    ``TBaskets`` that are not in the cache are requested from the
+    :doc:`uproot.source.chunk.Source` at once.
+    """
+
+    def __init__(
+        self,
+        hasbranches,
+        keys,
+        aliases,
+        language,
+        arrays,
+        expression_context,
+        branchid_interpretation,
+        basket_cache,
+        decompression_executor,
+        interpretation_executor,
+        library,
+        ak_add_doc,
+        how,
+    ):
+        self._hasbranches = hasbranches
+        self._keys = keys
+        self._aliases = aliases
+        self._language = language
+        self._arrays = arrays
+        self._expression_context = expression_context
+        self._branchid_interpretation = branchid_interpretation
+        self._basket_cache = basket_cache
+        self._decompression_executor = decompression_executor
+        self._interpretation_executor = interpretation_executor
+        self._library = library
+        self._ak_add_doc = ak_add_doc
+        self._how = how
+
+        self._branches = []
+        checked = set()
+        for _, context in expression_context:
+            for branch in context["branches"]:
+                if branch.cache_key not in checked and not isinstance(
+                    branchid_interpretation[branch.cache_key],
+                    uproot.interpretation.grouped.AsGrouped,
+                ):
+                    checked.add(branch.cache_key)
+                    self._branches.append(branch)
+
+    def __repr__(self):
+        return "<Reader of {} entries from {}>".format(
+            self.num_entries,
+            repr(
+                self._hasbranches.file.file_path + ":" + self._hasbranches.object_path
+            ),
+        )
+
+    @property
+    def source(self):
+        """
+        The object (:doc:`uproot.behaviors.TBranch.TBranch` or
+        :doc:`uproot.behaviors.TTree.TTree`) that this reader reads from.
+        """
+        return self._hasbranches
+
+    @property
+    def basket_cache(self):
+        """
+        The cache of interpreted ``TBaskets`` (MutableMapping).
+        """
+        return self._basket_cache
+
+    @property
+    def num_entries(self):
+        """
+        The number of entries in the ``TTree``.
+        """
+        return self._hasbranches.tree.num_entries
+
+    def __len__(self):
+        return self.num_entries
+
+    def __getitem__(self, where):
+        num_entries = self.num_entries
+        if isinstance(where, slice):
+            entry_start, entry_stop, step = where.indices(num_entries)
+            if step != 1:
+                raise ValueError(
+                    f"Reader slices must have a step of 1, not {where.step!r}"
+                )
+            return self._read(entry_start, max(entry_start, entry_stop))
+
+        if not uproot._util.isint(where):
+            raise TypeError(
+                f"Reader can only be indexed by an integer or a slice, not {where!r}"
+            )
+        entry = int(where)
+        if entry < 0:
+            entry += num_entries
+        if not 0 <= entry < num_entries:
+            raise IndexError(f"entry {where} is out of range for {num_entries} entries")
+        return _first_entry(self._read(entry, entry + 1))
+
+    def _read(self, entry_start, entry_stop):
+        ranges_or_baskets = _BasketPlan()
+        for branch in self._branches:
+            ranges_or_baskets.add(branch, entry_start, entry_stop)
+
+        arrays = dict(self._arrays)
+        _ranges_or_baskets_to_arrays(
+            self._hasbranches,
+            ranges_or_baskets,
+            self._branchid_interpretation,
+            entry_start,
+            entry_stop,
+            self._decompression_executor,
+            self._interpretation_executor,
+            self._library,
+            arrays,
+            False,
+            {"ak_add_doc": self._ak_add_doc},
+            self._basket_cache,
+        )
+
+        _fix_asgrouped(
+            arrays,
+            self._expression_context,
+            self._branchid_interpretation,
+            self._library,
+            self._how,
+            self._ak_add_doc,
+        )
+
+        output = self._language.compute_expressions(
+            self._hasbranches,
+            arrays,
+            self._expression_context,
+            self._keys,
+            self._aliases,
+            self._hasbranches.file.file_path,
+            self._hasbranches.object_path,
+        )
+
+        expression_context = [
+            (e, c) for e, c in self._expression_context if c["is_primary"]
+        ]
+        return _ak_add_doc(
+            self._library.group(output, expression_context, self._how),
+            self._hasbranches,
+            self._ak_add_doc,
+        )
+
+
+def _first_entry(group):
+    module = type(group).__module__.split(".")[0]
+    if isinstance(group, dict):
+        return {name: _first_entry(array) for name, array in group.items()}
+    elif isinstance(group, (tuple, list)):
+        return type(group)(_first_entry(array) for array in group)
+    elif module == "pandas":
+        return group.iloc[0]
+    elif module == "pyarrow" and hasattr(group, "schema"):
+        # RecordBatch or Table
+        return group.slice(0, 1).to_pylist()[0]
+    elif module == "polars" and hasattr(group, "columns"):
+        # DataFrame
+        return group.row(0, named=True)
+    else:
+        return group[0]
+
+
 def _ak_add_doc(array, hasbranches, ak_add_doc):
     if type(array).__module__ == "awkward.highlevel":
         if isinstance(ak_add_doc, bool):
@@ -642,6 +857,84 @@ def _ak_add_doc(array, hasbranches, ak_add_doc):
     return array
 
 
+class MemoryBudget:
+    """
+    Args:
+        budget (int or str): The maximum amount of memory for each step. An
+            integer is interpreted as a number of bytes and a string must be a
+            number followed by a unit, such as "1 GB".
+        ratio (float): The initial estimate of the size of the output arrays
+            relative to the uncompressed ``TBasket`` data they come from. It is
+            replaced by measurements of the output arrays as the iteration
+            proceeds.
+
+    An adaptive ``step_size`` for :ref:`uproot.behaviors.TBranch.HasBranches.iterate`
+    and :doc:`uproot.behaviors.TBranch.iterate`, which chooses each step's
+    range of entries such that the uncompressed ``TBaskets`` that it needs and
+    the arrays it produces fit in the ``budget``.
+
+    For example:
+
+    .. code-block:: python
+
+        >>> for arrays in tree.iterate(step_size=uproot.MemoryBudget("1 GB")):
+        ...     do_something(arrays)
+
+    A step size given as a memory size string, such as ``step_size="100 MB"``,
+    is converted into one number of entries from the average size of the
+    entries of the whole ``TTree``. If the sizes of entries vary (for instance,
+    jagged arrays with varying multiplicity), the memory used by the steps
+    varies as well. A MemoryBudget uses the uncompressed size of each
+    ``TBasket`` (from its ``TKey``) and the range of entries it covers to
+    estimate the memory of each range of entries separately. The size of each
+    step's output arrays, where the library reports it (not for arrays of
+    Python objects), corrects the ``ratio`` for the steps that follow.
+
+    Every ``TBasket`` that a step touches is counted in full, since it must
+    be decompressed in full. If the ``TBaskets`` that contain a single entry
+    do not fit in the ``budget``, the step is extended to the end of the
+    first of them, as no smaller step would use less memory.
+
+    The same MemoryBudget can be used for many iterations: its ``ratio``
+    carries over from one ``TTree`` (or file) to the next.
+    """
+
+    def __init__(self, budget, ratio=1.0):
+        self._budget = uproot._util.memory_size(
+            budget,
+            f"memory size string with units (such as '1 GB') required, not {budget!r}",
+        )
+        if not ratio > 0:
+            raise ValueError(f"ratio must be positive, not {ratio!r}")
+        self._ratio = float(ratio)
+
+    def __repr__(self):
+        return f"MemoryBudget({self._budget}, ratio={self._ratio:.3g})"
+
+    @property
+    def budget(self):
+        """
+        The maximum number of bytes for each step.
+        """
+        return self._budget
+
+    @property
+    def ratio(self):
+        """
+        The current estimate of the size of the output arrays relative to the
+        uncompressed ``TBasket`` data they come from.
+        """
+        return self._ratio
+
+    def _measured(self, ratio):
+        # increases are taken immediately, decreases slowly, since the budget
+        # is a hard limit
+        if ratio > self._ratio:
+            self._ratio = ratio
+        else:
+            self._ratio = (self._ratio + ratio) / 2
+
+
 class HasBranches(Mapping):
     """
     Abstract class of behaviors for anything that "has branches," namely
@@ -789,6 +1082,8 @@ class HasBranches(Mapping):
         how=None,
         virtual=False,
         access_log=None,
+        out=None,
+        profile=False,
     ):
         """
         Args:
@@ -835,7 +1130,8 @@ class HasBranches(Mapping):
                 if a memory size, create a new cache of this size.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -852,6 +1148,13 @@ class HasBranches(Mapping):
             access_log (None or object with a ``__iadd__`` method): If an access_log is
                 provided, e.g. a list, all materializations of the arrays are
                 tracked inside this reference. Only applies if ``virtual=True``.
+            out (None or 2-dimensional NumPy array): If not None, each of the
+                ``TBranches`` fills a column of this array, in order, which is
+                returned instead of a group of arrays. See below.
+            profile (bool or :doc:`uproot.profiling.Profile`): If True, return
+                an (arrays, :doc:`uproot.profiling.Profile`) pair with the time
+                and memory spent on each ``TBranch``; if a Profile, record into
+                that Profile and return it in the pair.
 
         Returns a group of arrays from the ``TTree``.
 
@@ -894,6 +1197,37 @@ class HasBranches(Mapping):
             >>> print(access_log)
             [Accessed(branch='run', buffer_key="('<root>', 'run')-data")]
 
+        Or fill the columns of a matrix, without a separate array per ``TBranch``:
+
+        .. code-block:: python
+
+            >>> matrix = numpy.empty((my_tree.num_entries, 2), dtype=numpy.float32)
+            >>> my_tree.arrays(["x", "y"], out=matrix)
+            array([[-41.195287,  17.433243],
+                   [ 35.11844 , -16.570362],
+                   ...,
+                   [ 32.4986  ,   1.199406]], dtype=float32)
+
+        With ``out``, the ``expressions`` (or the ``TBranches`` selected by the
+        filters) must be ``TBranches`` of one number per entry, and ``out``
+        must have one row per entry from ``entry_start`` to ``entry_stop`` and
+        one column per ``TBranch``. Its ``dtype`` and memory layout
+        (row-major or column-major) can be anything: the data in each
+        ``TBasket`` are converted directly into their place in the column (see
+        :doc:`uproot.interpretation.numerical.AsDtypeInPlace`). A ``cut``
+        cannot be applied, and the ``array_cache``, ``library``, and ``how``
+        are not used.
+
+        To find out which ``TBranches`` are the costliest to read and whether
+        the time goes to I/O, decompression, or interpretation, ask for a
+        :doc:`uproot.profiling.Profile`:
+
+        .. code-block:: python
+
+            >>> arrays, profile = my_tree.arrays(["x", "y"], profile=True)
+            >>> print(profile.table())
+            >>> profile.write_chrome_trace("read.json")  # for https://ui.perfetto.dev
+
         See also :ref:`uproot.behaviors.TBranch.TBranch.array` to read a single
         ``TBranch`` as an array.
 
@@ -913,6 +1247,10 @@ class HasBranches(Mapping):
                 raise ValueError(err("cut"))
             if aliases is not None:
                 raise ValueError(err("aliases"))
+            if out is not None:
+                raise ValueError(err("out"))
+            if profile:
+                raise ValueError(err("profile"))
 
             return self._virtual_arrays(
                 filter_name=filter_name,
@@ -949,6 +1287,8 @@ class HasBranches(Mapping):
                 library=library,
                 ak_add_doc=ak_add_doc,
                 how=how,
+                out=out,
+                profile=profile,
             )
 
     def _virtual_arrays(
@@ -1147,6 +1487,8 @@ class HasBranches(Mapping):
         library="ak",
         ak_add_doc=False,
         how=None,
+        out=None,
+        profile=False,
     ):
         """
         Args:
@@ -1193,7 +1535,8 @@ class HasBranches(Mapping):
                 if a memory size, create a new cache of this size.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -1205,6 +1548,12 @@ class HasBranches(Mapping):
                 ``how=tuple``, not ``how=()``).
                 For ``library="ak"``, passing ``how="zip"`` applies ``ak.zip``
                 to interleave data from compatible branches.
+            out (None or 2-dimensional NumPy array): If not None, each of the
+                ``TBranches`` fills a column of this array, in order, which is
+                returned instead of a group of arrays.
+            profile (bool or :doc:`uproot.profiling.Profile`): If True, return
+                an (arrays, :doc:`uproot.profiling.Profile`) pair; if a Profile,
+                record into that Profile and return it in the pair.
 
         Returns a group of arrays from the ``TTree``.
 
@@ -1242,14 +1591,23 @@ class HasBranches(Mapping):
                 library=library,
                 ak_add_doc=ak_add_doc,
                 how=how,
+                out=out,
+                profile=profile,
             )
 
         entry_start, entry_stop = _regularize_entries_start_stop(
             self.tree.num_entries, entry_start, entry_stop
         )
+        profile = uproot.profiling._regularize_profile(profile)
         decompression_executor, interpretation_executor = _regularize_executors(
             decompression_executor, interpretation_executor, self._file
         )
+        if out is not None:
+            if cut is not None:
+                raise ValueError("a cut cannot be applied to the rows of 'out'")
+            # the arrays are the columns of out, which can't come from a cache
+            array_cache = None
+            library = "np"
         array_cache = _regularize_array_cache(array_cache, self._file)
         library = uproot.interpretation.library._regularize_library(library)
 
@@ -1273,8 +1631,15 @@ class HasBranches(Mapping):
             language,
             get_from_cache,
         )
+        if out is not None:
+            _fill_columns(
+                out,
+                expression_context,
+                branchid_interpretation,
+                entry_stop - entry_start,
+            )
 
-        ranges_or_baskets = []
+        ranges_or_baskets = _BasketPlan()
         checked = set()
         for _, context in expression_context:
             for branch in context["branches"]:
@@ -1289,11 +1654,7 @@ class HasBranches(Mapping):
                     )
                 ):
                     checked.add(branch.cache_key)
-                    for (
-                        basket_num,
-                        range_or_basket,
-                    ) in branch.entries_to_ranges_or_baskets(entry_start, entry_stop):
-                        ranges_or_baskets.append((branch, basket_num, range_or_basket))
+                    ranges_or_baskets.add(branch, entry_start, entry_stop)
 
         interp_options = {"ak_add_doc": ak_add_doc}
         _ranges_or_baskets_to_arrays(
@@ -1308,11 +1669,15 @@ class HasBranches(Mapping):
             arrays,
             False,
             interp_options,
+            profile=profile,
         )
 
         # no longer needed; save memory
         del ranges_or_baskets
 
+        if out is not None:
+            return out if profile is None else (out, profile)
+
         _fix_asgrouped(
             arrays,
             expression_context,
@@ -1332,6 +1697,9 @@ class HasBranches(Mapping):
                         cache_key = f"{self.cache_key}:{expression}:{interpretation.cache_key}:{entry_start}-{entry_stop}:{library.name}"
                         array_cache[cache_key] = arrays[branch.cache_key]
 
+        if profile is not None:
+            start, cpu_start = time.perf_counter(), time.thread_time()
+
         output = language.compute_expressions(
             self,
             arrays,
@@ -1349,9 +1717,21 @@ class HasBranches(Mapping):
             (e, c) for e, c in expression_context if c["is_primary"] and not c["is_cut"]
         ]
 
-        return _ak_add_doc(
+        output = _ak_add_doc(
             library.group(output, expression_context, how), self, ak_add_doc
         )
+        if profile is None:
+            return output
+
+        profile._record(
+            "compute",
+            None,
+            None,
+            start,
+            time.perf_counter(),
+            time.thread_time() - cpu_start,
+        )
+        return output, profile
 
     def iterate(
         self,
@@ -1372,6 +1752,8 @@ class HasBranches(Mapping):
         ak_add_doc=False,
         how=None,
         report=False,
+        buffers=None,
+        profile=False,
     ):
         """
         Args:
@@ -1405,10 +1787,12 @@ class HasBranches(Mapping):
                 than the last entry to include). If None, stop at
                 :ref:`uproot.behaviors.TTree.TTree.num_entries`. If negative,
                 count from the end, like a Python slice.
-            step_size (int or str): If an integer, the maximum number of entries to
-                include in each iteration step; if a string, the maximum memory size
-                to include. The string must be a number followed by a memory unit,
-                such as "100 MB".
+            step_size (int, str, or :doc:`uproot.behaviors.TBranch.MemoryBudget`): If
+                an integer, the maximum number of entries to include in each
+                iteration step; if a string, the maximum memory size to include.
+                The string must be a number followed by a memory unit, such as
+                "100 MB". A :doc:`uproot.behaviors.TBranch.MemoryBudget` chooses
+                each step's entries separately, to fit a budget of memory.
             decompression_executor (None or Executor with a ``submit`` method): The
                 executor that is used to decompress ``TBaskets``; if None, the
                 file's :ref:`uproot.reading.ReadOnlyFile.decompression_executor`
@@ -1419,7 +1803,8 @@ class HasBranches(Mapping):
                 is used.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -1435,6 +1820,14 @@ class HasBranches(Mapping):
                 (arrays, :doc:`uproot.behaviors.TBranch.Report`) pairs; if False,
                 it only yields arrays. The report has data about the ``TFile``,
                 ``TTree``, and global and local entry ranges.
+            buffers (None or :doc:`uproot.cache.BufferPool`): If not None, the
+                arrays of each step are filled into buffers from this pool,
+                which are reused for later steps after they are released.
+            profile (bool or :doc:`uproot.profiling.Profile`): If True, this
+                generator yields (arrays, :doc:`uproot.profiling.Profile`) pairs,
+                with a new Profile for each step, or (arrays, report, profile)
+                triples if ``report`` is also True. If a Profile, all steps are
+                recorded into that Profile, which is yielded in each step.
 
         Iterates through contiguous chunks of entries from the ``TTree``.
 
@@ -1446,6 +1839,21 @@ class HasBranches(Mapping):
             ...     # each of the following have 100 entries
             ...     array["x"], array["y"]
 
+        To keep the memory footprint of a long iteration flat, pass a
+        :doc:`uproot.cache.BufferPool` as ``buffers`` and release the arrays
+        of each step when they are no longer needed:
+
+        .. code-block:: python
+
+            >>> pool = uproot.BufferPool()
+            >>> for array in tree.iterate(["x", "y"], step_size="10 MB", buffers=pool):
+            ...     with pool:   # releases the buffers of this step at the end
+            ...         histogram.fill(array["x"], array["y"])
+
+        Arrays of a released step that share its buffers (such as the
+        Awkward Arrays or NumPy arrays of numbers that are yielded) are
+        overwritten by the next step, so copy anything that must be kept.
+
         See also :ref:`uproot.behaviors.TBranch.HasBranches.arrays` to read
         everything in a single step, without iteration.
 
@@ -1472,6 +1880,8 @@ class HasBranches(Mapping):
                 ak_add_doc=ak_add_doc,
                 how=how,
                 report=report,
+                buffers=buffers,
+                profile=profile,
             )
 
         else:
@@ -1482,6 +1892,8 @@ class HasBranches(Mapping):
                 decompression_executor, interpretation_executor, self._file
             )
             library = uproot.interpretation.library._regularize_library(library)
+            new_profiles = profile is True
+            profile = uproot.profiling._regularize_profile(profile)
 
             aliases = _regularize_aliases(self, aliases)
             (
@@ -1504,17 +1916,26 @@ class HasBranches(Mapping):
             if len(branchid_interpretation) == 0:
                 return
 
-            entry_step = _regularize_step_size(
-                self, step_size, entry_start, entry_stop, branchid_interpretation
-            )
+            if isinstance(step_size, MemoryBudget):
+                plan = _MemoryBudgetPlan(
+                    step_size, self, entry_start, entry_stop, branchid_interpretation
+                )
+            else:
+                plan = None
+                entry_step = _regularize_step_size(
+                    self, step_size, entry_start, entry_stop, branchid_interpretation
+                )
 
             previous_baskets = {}
-            for sub_entry_start in range(entry_start, entry_stop, entry_step):
-                sub_entry_stop = min(sub_entry_start + entry_step, entry_stop)
-                if sub_entry_stop - sub_entry_start == 0:
-                    continue
+            sub_entry_stop = entry_start
+            while sub_entry_stop < entry_stop:
+                sub_entry_start = sub_entry_stop
+                if plan is None:
+                    sub_entry_stop = min(sub_entry_start + entry_step, entry_stop)
+                else:
+                    sub_entry_stop = plan.next_stop(sub_entry_start)
 
-                ranges_or_baskets = []
+                ranges_or_baskets = _BasketPlan()
                 checked = set()
                 for _, context in expression_context:
                     for branch in context["branches"]:
@@ -1523,26 +1944,15 @@ class HasBranches(Mapping):
                             uproot.interpretation.grouped.AsGrouped,
                         ):
                             checked.add(branch.cache_key)
-                            for (
-                                basket_num,
-                                range_or_basket,
-                            ) in branch.entries_to_ranges_or_baskets(
-                                sub_entry_start, sub_entry_stop
-                            ):
-                                previous_basket = previous_baskets.get(
-                                    (branch.cache_key, basket_num)
-                                )
-                                if previous_basket is None:
-                                    ranges_or_baskets.append(
-                                        (branch, basket_num, range_or_basket)
-                                    )
-                                else:
-                                    ranges_or_baskets.append(
-                                        (branch, basket_num, previous_basket)
-                                    )
+                            ranges_or_baskets.add(
+                                branch,
+                                sub_entry_start,
+                                sub_entry_stop,
+                                previous_baskets,
+                            )
 
                 arrays = {}
-                interp_options = {"ak_add_doc": ak_add_doc}
+                interp_options = {"ak_add_doc": ak_add_doc, "buffers": buffers}
                 _ranges_or_baskets_to_arrays(
                     self,
                     ranges_or_baskets,
@@ -1555,7 +1965,10 @@ class HasBranches(Mapping):
                     arrays,
                     True,
                     interp_options,
+                    profile=profile,
                 )
+                if plan is not None:
+                    plan.measured(sub_entry_start, sub_entry_stop, arrays)
 
                 _fix_asgrouped(
                     arrays,
@@ -1566,6 +1979,9 @@ class HasBranches(Mapping):
                     ak_add_doc,
                 )
 
+                if profile is not None:
+                    start, cpu_start = time.perf_counter(), time.thread_time()
+
                 output = language.compute_expressions(
                     self,
                     arrays,
@@ -1594,8 +2010,21 @@ class HasBranches(Mapping):
                 # no longer needed; save memory
                 del output
 
+                if profile is not None:
+                    profile._record(
+                        "compute",
+                        None,
+                        None,
+                        start,
+                        time.perf_counter(),
+                        time.thread_time() - cpu_start,
+                    )
+                    step_profile = profile
+                    if new_profiles:
+                        profile = uproot.profiling.Profile()
+
                 next_baskets = {}
-                for branch, basket_num, basket in ranges_or_baskets:
+                for branch, basket_num, basket in ranges_or_baskets.last_baskets():
                     _basket_entry_start, basket_entry_stop = basket.entry_start_stop
                     if basket_entry_stop > sub_entry_stop:
                         next_baskets[branch.cache_key, basket_num] = basket
@@ -1606,10 +2035,165 @@ class HasBranches(Mapping):
                 popper = [out]
                 del out
 
-                if report:
-                    yield popper.pop(), Report(self, sub_entry_start, sub_entry_stop)
+                if profile is None:
+                    if report:
+                        yield (
+                            popper.pop(),
+                            Report(self, sub_entry_start, sub_entry_stop),
+                        )
+                    else:
+                        yield popper.pop()
+                elif report:
+                    yield (
+                        popper.pop(),
+                        Report(self, sub_entry_start, sub_entry_stop),
+                        step_profile,
+                    )
                 else:
-                    yield popper.pop()
+                    yield popper.pop(), step_profile
+
+    def reader(
+        self,
+        expressions=None,
+        *,
+        filter_name=no_filter,
+        filter_typename=no_filter,
+        filter_branch=no_filter,
+        aliases=None,
+        language=uproot.language.python.python_language,
+        basket_cache="100 MB",
+        decompression_executor=None,
+        interpretation_executor=None,
+        library="ak",
+        ak_add_doc=False,
+        how=None,
+    ):
+        """
+        Args:
+            expressions (None, str, or list of str): Names of ``TBranches`` or
+                aliases to convert to arrays or mathematical expressions of them.
+                Uses the ``language`` to evaluate. If None, all ``TBranches``
+                selected by the filters are included.
+            filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str \u2192 bool, or iterable of the above): A
+                filter to select ``TBranches`` by name.
+            filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str \u2192 bool, or iterable of the above): A
+                filter to select ``TBranches`` by type.
+            filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` \u2192 bool, :doc:`uproot.interpretation.Interpretation`, or None): A
+                filter to select ``TBranches`` using the full
+                :doc:`uproot.behaviors.TBranch.TBranch` object. If the function
+                returns False or None, the ``TBranch`` is excluded; if the function
+                returns True, it is included with its standard
+                :ref:`uproot.behaviors.TBranch.TBranch.interpretation`; if an
+                :doc:`uproot.interpretation.Interpretation`, this interpretation
+                overrules the standard one.
+            aliases (None or dict of str \u2192 str): Mathematical expressions that
+                can be used in ``expressions`` or other aliases (without cycles).
+                Uses the ``language`` engine to evaluate. If None, only the
+                :ref:`uproot.behaviors.TBranch.TBranch.aliases` are available.
+            language (:doc:`uproot.language.Language`): Language used to interpret
+                the ``expressions`` and ``aliases``.
+            basket_cache (MutableMapping or memory size): Cache of decompressed
+                and interpreted ``TBaskets``; if a memory size, create a new
+                :doc:`uproot.cache.LRUArrayCache` of this size.
+            decompression_executor (None or Executor with a ``submit`` method): The
+                executor that is used to decompress ``TBaskets``; if None, the
+                file's :ref:`uproot.reading.ReadOnlyFile.decompression_executor`
+                is used.
+            interpretation_executor (None or Executor with a ``submit`` method): The
+                executor that is used to interpret uncompressed ``TBasket`` data as
+                arrays; if None, the file's :ref:`uproot.reading.ReadOnlyFile.interpretation_executor`
+                is used.
+            library (str or :doc:`uproot.interpretation.library.Library`): The library
+                that is used to represent arrays. Options are ``"np"`` for NumPy,
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
+            ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
+                to the Awkward ``__doc__`` parameter of the array.
+                if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
+                Awkward ``key`` parameter of the array.
+            how (None, str, or container type): Library-dependent instructions
+                for grouping. The only recognized container types are ``tuple``,
+                ``list``, and ``dict``. Note that the container *type itself*
+                must be passed as ``how``, not an instance of that type (i.e.
+                ``how=tuple``, not ``how=()``).
+                For ``library="ak"``, passing ``how="zip"`` applies ``ak.zip``
+                to interleave data from compatible branches.
+
+        Returns a :doc:`uproot.behaviors.TBranch.Reader` for random access to
+        single entries and small ranges of entries.
+
+        The reader keeps the ``TBaskets`` it has decompressed and interpreted in
+        the ``basket_cache``, so that reading the same or neighboring entries
+        again does not read, decompress, or interpret anything. ``TBaskets``
+        that are not in the cache are requested all at once.
+
+        For example:
+
+        .. code-block:: python
+
+            >>> reader = my_tree.reader(["x", "y"])
+            >>> reader[100]
+            <Record {x: -41.2, y: 17.4} type='{x: float64, y: float64}'>
+            >>> reader[100:103]
+            <Array [{x: -41.2, y: 17.4}, {...}, {...}] type='3 * {x: float64, y: ...'>
+
+        See also :ref:`uproot.behaviors.TBranch.HasBranches.arrays` to read
+        large ranges of entries.
+        """
+        keys = _keys_deep(self)
+        if isinstance(self, TBranch) and expressions is None and len(keys) == 0:
+            filter_branch = uproot._util.regularize_filter(filter_branch)
+            return self.parent.reader(
+                expressions=expressions,
+                filter_name=filter_name,
+                filter_typename=filter_typename,
+                filter_branch=lambda branch: branch is self and filter_branch(branch),
+                aliases=aliases,
+                language=language,
+                basket_cache=basket_cache,
+                decompression_executor=decompression_executor,
+                interpretation_executor=interpretation_executor,
+                library=library,
+                ak_add_doc=ak_add_doc,
+                how=how,
+            )
+
+        if not isinstance(basket_cache, MutableMapping):
+            basket_cache = uproot.cache.LRUArrayCache(basket_cache)
+        decompression_executor, interpretation_executor = _regularize_executors(
+            decompression_executor, interpretation_executor, self._file
+        )
+        library = uproot.interpretation.library._regularize_library(library)
+
+        aliases = _regularize_aliases(self, aliases)
+        arrays, expression_context, branchid_interpretation = _regularize_expressions(
+            self,
+            expressions,
+            None,
+            filter_name,
+            filter_typename,
+            filter_branch,
+            keys,
+            aliases,
+            language,
+            lambda branchname, interpretation: None,
+        )
+
+        return Reader(
+            self,
+            keys,
+            aliases,
+            language,
+            arrays,
+            expression_context,
+            branchid_interpretation,
+            basket_cache,
+            decompression_executor,
+            interpretation_executor,
+            library,
+            ak_add_doc,
+            how,
+        )
 
     def keys(
         self,
@@ -2235,7 +2819,8 @@ class TBranch(HasBranches):
                 if a memory size, create a new cache of this size.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the TBranch ``title``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the TBranch ``value`` to the
@@ -2296,7 +2881,7 @@ class TBranch(HasBranches):
             False,
         )
 
-        ranges_or_baskets = []
+        ranges_or_baskets = _BasketPlan()
         checked = set()
         for _, context in expression_context:
             for branch in context["branches"]:
@@ -2305,11 +2890,7 @@ class TBranch(HasBranches):
                     uproot.interpretation.grouped.AsGrouped,
                 ):
                     checked.add(branch.cache_key)
-                    for (
-                        basket_num,
-                        range_or_basket,
-                    ) in branch.entries_to_ranges_or_baskets(entry_start, entry_stop):
-                        ranges_or_baskets.append((branch, basket_num, range_or_basket))
+                    ranges_or_baskets.add(branch, entry_start, entry_stop)
 
         interp_options = {"ak_add_doc": ak_add_doc}
         _ranges_or_baskets_to_arrays(
@@ -2884,24 +3465,53 @@ in file {self._file.file_path}"""
         :doc:`uproot.models.TBasket.Model_TBasket` objects as they get
         read and interpreted.
         """
-        entry_offsets = self.entry_offsets
-        out = []
-        start = entry_offsets[0]
-        for basket_num, stop in enumerate(entry_offsets[1:]):
-            if entry_start < stop and (
-                start < entry_stop or entry_start == entry_stop == start
-            ):
-                if 0 <= basket_num < self._num_normal_baskets:
-                    byte_start = self.member("fBasketSeek")[basket_num]
-                    byte_stop = byte_start + self.basket_compressed_bytes(basket_num)
-                    out.append((basket_num, (byte_start, byte_stop)))
-                elif 0 <= basket_num < self.num_baskets:
-                    out.append((basket_num, self.basket(basket_num)))
-                else:
-                    raise AssertionError((self.name, basket_num))
-            start = stop
+        start, stop = self._entries_to_basket_range(entry_start, entry_stop)
+        _, byte_starts, byte_stops = self._basket_layout()
+        normal_stop = max(start, min(stop, self._num_normal_baskets))
+        out = list(
+            zip(
+                range(start, normal_stop),
+                zip(
+                    byte_starts[start:normal_stop].tolist(),
+                    byte_stops[start:normal_stop].tolist(),
+                    strict=True,
+                ),
+                strict=True,
+            )
+        )
+        for basket_num in range(normal_stop, stop):
+            out.append((basket_num, self.basket(basket_num)))
         return out
 
+    def _basket_layout(self):
+        """
+        Returns the :ref:`uproot.behaviors.TBranch.TBranch.entry_offsets` and
+        the starting and stopping byte positions of the normal (free)
+        ``TBaskets`` as NumPy arrays, which are computed once.
+        """
+        if self._basket_layout_arrays is None:
+            entry_offsets = numpy.array(self.entry_offsets, dtype=numpy.int64)
+            n = self._num_normal_baskets
+            byte_starts = self.member("fBasketSeek")[:n].astype(numpy.int64)
+            byte_stops = byte_starts + self.member("fBasketBytes")[:n]
+            self._basket_layout_arrays = (entry_offsets, byte_starts, byte_stops)
+        return self._basket_layout_arrays
+
+    def _entries_to_basket_range(self, entry_start, entry_stop):
+        """
+        Returns the first ``TBasket`` number and one more than the last
+        ``TBasket`` number that contain entries from ``entry_start``
+        (inclusive) to ``entry_stop`` (exclusive), by binary search.
+
+        If ``entry_start == entry_stop``, ``TBaskets`` that start at that
+        entry are included.
+        """
+        entry_offsets = self._basket_layout()[0]
+        start = int(numpy.searchsorted(entry_offsets[1:], entry_start, side="right"))
+        side = "right" if entry_start == entry_stop else "left"
+        stop = int(numpy.searchsorted(entry_offsets[:-1], entry_stop, side=side))
+        return start, max(start, stop)
+
     def postprocess(self, chunk, cursor, context, file):
         fWriteBasket = self.member("fWriteBasket")
 
@@ -2920,6 +3530,8 @@ in file {self._file.file_path}"""
         self._context["breadcrumbs"] = ()
         self._context["in_TBranch"] = True
 
+        self._basket_layout_arrays = None
+
         self._num_normal_baskets = 0
         for i, x in enumerate(self.member("fBasketSeek")):
             if x == 0 or i == fWriteBasket:
@@ -3582,9 +4194,149 @@ def _regularize_expressions(
     return arrays, expression_context, branchid_interpretation
 
 
+class _BasketPlan:
+    """
+    The ``TBaskets`` to read for a set of ``TBranches`` in a range of entries:
+    all of their :ref:`uproot.behaviors.TBranch.TBranch.entries_to_ranges_or_baskets`
+    at once, as parallel arrays of branch index, basket number, and byte
+    range (start and stop).
+
+    ``TBaskets`` that are already in memory (embedded, kept from the previous
+    step of an iteration, or read by ``_ranges_or_baskets_to_arrays``) are in
+    the ``baskets`` dict, keyed by their index in the plan.
+
+    Iterating over a plan yields ``(branch, basket_num, range_or_basket)``
+    tuples, like the lists returned by ``entries_to_ranges_or_baskets``.
+    """
+
+    def __init__(self):
+        self.branches = []
+        self.baskets = {}
+        self._parts = []
+        self._arrays = None
+        self._length = 0
+
+    def add(self, branch, entry_start, entry_stop, previous_baskets=None):
+        """
+        Adds the ``TBaskets`` of ``branch`` that overlap the entries from
+        ``entry_start`` to ``entry_stop``. If ``previous_baskets`` is a dict
+        from ``(cache_key, basket_num)`` to ``TBasket``, those ``TBaskets``
+        are not read again.
+        """
+        start, stop = branch._entries_to_basket_range(entry_start, entry_stop)
+        _, byte_starts, byte_stops = branch._basket_layout()
+        normal_stop = max(start, min(stop, branch._num_normal_baskets))
+
+        for basket_num in range(normal_stop, stop):
+            self.baskets[self._length + basket_num - start] = branch.basket(basket_num)
+        if previous_baskets:
+            # only the first TBaskets can be left over from the previous step
+            for basket_num in range(start, stop):
+                basket = previous_baskets.get((branch.cache_key, basket_num))
+                if basket is None:
+                    break
+                self.baskets[self._length + basket_num - start] = basket
+
+        starts = numpy.full(stop - start, -1, dtype=numpy.int64)
+        stops = numpy.full(stop - start, -1, dtype=numpy.int64)
+        starts[: normal_stop - start] = byte_starts[start:normal_stop]
+        stops[: normal_stop - start] = byte_stops[start:normal_stop]
+
+        self._parts.append((start, starts, stops))
+        self.branches.append(branch)
+        self._length += stop - start
+        self._arrays = None
+
+    def _concatenated(self):
+        if self._arrays is None:
+            lengths = self.num_baskets_per_branch()
+            self._arrays = (
+                numpy.repeat(numpy.arange(len(lengths), dtype=numpy.int64), lengths),
+                numpy.concatenate(
+                    [numpy.zeros(0, dtype=numpy.int64)]
+                    + [
+                        numpy.arange(first, first + len(starts), dtype=numpy.int64)
+                        for first, starts, _ in self._parts
+                    ]
+                ),
+                numpy.concatenate(
+                    [numpy.zeros(0, dtype=numpy.int64)]
+                    + [starts for _, starts, _ in self._parts]
+                ),
+                numpy.concatenate(
+                    [numpy.zeros(0, dtype=numpy.int64)]
+                    + [stops for _, _, stops in self._parts]
+                ),
+            )
+        return self._arrays
+
+    def num_baskets_per_branch(self):
+        """
+        The number of ``TBaskets`` for each of the ``branches``, as a list.
+        """
+        return [len(starts) for _, starts, _ in self._parts]
+
+    def ranges_to_read(self, skip=()):
+        """
+        Returns the (start, stop) byte ranges of the ``TBaskets`` that are not
+        in memory (or at a plan index in ``skip``) as a list, sorted by start,
+        along with an array of their starts and an array of the plan index of
+        each.
+        """
+        _, _, byte_starts, byte_stops = self._concatenated()
+        to_read = byte_starts >= 0
+        if len(self.baskets) != 0:
+            to_read[list(self.baskets)] = False
+        if len(skip) != 0:
+            to_read[list(skip)] = False
+        index = numpy.nonzero(to_read)[0]
+        index = index[numpy.argsort(byte_starts[index], kind="stable")]
+        starts = byte_starts[index]
+        ranges = list(zip(starts.tolist(), byte_stops[index].tolist(), strict=True))
+        return ranges, starts, index
+
+    def branch_and_basket_num(self, index):
+        """
+        Returns the ``TBranch`` and basket number at ``index`` in the plan.
+        """
+        branch_index, basket_nums, _, _ = self._concatenated()
+        return self.branches[branch_index[index]], int(basket_nums[index])
+
+    def last_baskets(self):
+        """
+        Yields ``(branch, basket_num, basket)`` for the last ``TBasket`` of
+        each ``TBranch``, after they have all been read.
+        """
+        index = 0
+        for (first, starts, _), branch in zip(self._parts, self.branches, strict=True):
+            index += len(starts)
+            if len(starts) != 0:
+                yield branch, first + len(starts) - 1, self.baskets[index - 1]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        branch, basket_num = self.branch_and_basket_num(index)
+        basket = self.baskets.get(index)
+        if basket is not None:
+            return branch, basket_num, basket
+        _, _, byte_starts, byte_stops = self._concatenated()
+        return branch, basket_num, (int(byte_starts[index]), int(byte_stops[index]))
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+
 _basket_arrays_lock = threading.Lock()
 
 
+def _basket_array_cache_key(branch, branchid_interpretation, library, basket_num):
+    interpretation = branchid_interpretation[branch.cache_key]
+    return f"{branch.cache_key}:{interpretation.cache_key}:{library.name}:{basket_num}"
+
+
 def _ranges_or_baskets_to_arrays(
     hasbranches,
     ranges_or_baskets,
@@ -3597,40 +4349,48 @@ def _ranges_or_baskets_to_arrays(
     arrays,
     update_ranges_or_baskets,
     interp_options,
+    basket_array_cache=None,
+    profile=None,
 ):
-    notifications = queue.Queue()
+    # last in, first out: a TBasket is interpreted as soon as it is
+    # decompressed, rather than after all of the chunks have been decompressed
+    notifications = queue.LifoQueue() if profile is None else _TimedQueue()
+
+    source = hasbranches._file.source
+    if isinstance(source, uproot.source.file.MemmapSource) and source.zero_copy:
+        interp_options = dict(interp_options, zero_copy=True)
 
     branchid_arrays = {}
-    branchid_num_baskets = {}
-    ranges = []
-    range_args = {}
-    range_original_index = {}
-    original_index = 0
+    branchid_num_baskets = dict.fromkeys(branchid_interpretation, 0)
     branchid_to_branch = {}
 
-    for cache_key in branchid_interpretation:
-        branchid_num_baskets[cache_key] = 0
-
-    for branch, basket_num, range_or_basket in ranges_or_baskets:
-        branchid_num_baskets[branch.cache_key] += 1
-
-        if branch.cache_key not in branchid_arrays:
+    num_baskets = ranges_or_baskets.num_baskets_per_branch()
+    for branch, num in zip(ranges_or_baskets.branches, num_baskets, strict=True):
+        if num != 0:
+            branchid_num_baskets[branch.cache_key] += num
             branchid_arrays[branch.cache_key] = {}
-
-        if isinstance(range_or_basket, tuple) and len(range_or_basket) == 2:
-            range_or_basket = (  # noqa: PLW2901 (overwriting range_or_basket)
-                int(range_or_basket[0]),
-                int(range_or_basket[1]),
+            branchid_to_branch[branch.cache_key] = branch
+
+    # interpreted TBaskets from the basket_array_cache are neither read nor
+    # decompressed; their arrays go straight into branchid_arrays
+    cached = set()
+    if basket_array_cache is not None:
+        for index in range(len(ranges_or_baskets)):
+            branch, basket_num = ranges_or_baskets.branch_and_basket_num(index)
+            basket_array = basket_array_cache.get(
+                _basket_array_cache_key(
+                    branch, branchid_interpretation, library, basket_num
+                )
             )
-            ranges.append(range_or_basket)
-            range_args[range_or_basket] = (branch, basket_num)
-            range_original_index[range_or_basket] = original_index
-        else:
-            notifications.put(range_or_basket)
+            if basket_array is not None:
+                branchid_arrays[branch.cache_key][basket_num] = basket_array
+                cached.add(index)
 
-        original_index += 1  # noqa: SIM113 (don't use `enumerate` for `original_index`)
+    for index, basket in ranges_or_baskets.baskets.items():
+        if index not in cached:
+            notifications.put(basket)
 
-        branchid_to_branch[branch.cache_key] = branch
+    ranges, range_starts, plan_index = ranges_or_baskets.ranges_to_read(cached)
 
     for cache_key, interpretation in branchid_interpretation.items():
         if branchid_num_baskets[cache_key] == 0 and cache_key not in arrays:
@@ -3646,24 +4406,58 @@ def _ranges_or_baskets_to_arrays(
         ):
             branchid_to_branch[cache_key]._awkward_check(interpretation)
 
-    def replace(ranges_or_baskets, original_index, basket):
-        branch, basket_num, _range_or_basket = ranges_or_baskets[original_index]
-        ranges_or_baskets[original_index] = branch, basket_num, basket
+        if (
+            cache_key in branchid_to_branch
+            and len(branchid_arrays[cache_key]) == branchid_num_baskets[cache_key]
+        ):
+            branch = branchid_to_branch[cache_key]
+            arrays[cache_key] = interpretation.final_array(
+                branchid_arrays.pop(cache_key),
+                entry_start,
+                entry_stop,
+                branch.entry_offsets,
+                library,
+                branch,
+                interp_options,
+            )
 
-    def chunk_to_basket(chunk, branch, basket_num):
+    def chunk_to_basket(chunk, index):
         try:
+            branch, basket_num = ranges_or_baskets.branch_and_basket_num(index)
             cursor = uproot.source.cursor.Cursor(chunk.start)
+            # numerical final_arrays either copy basket data into a new output
+            # array or (zero_copy) keep the memmap alive, so uncompressed
+            # baskets can be views of a memmap
+            interpretation = branchid_interpretation[branch.cache_key]
+            detach_memmap = not isinstance(
+                interpretation,
+                (
+                    uproot.interpretation.numerical.Numerical,
+                    uproot.interpretation.jagged.AsJagged,
+                ),
+            )
+            if profile is not None:
+                start, cpu_start = time.perf_counter(), time.thread_time()
             basket = uproot.models.TBasket.Model_TBasket.read(
                 chunk,
                 cursor,
-                {"basket_num": basket_num},
+                {"basket_num": basket_num, "detach_memmap": detach_memmap},
                 hasbranches._file,
                 hasbranches._file,
                 branch,
             )
-            original_index = range_original_index[(chunk.start, chunk.stop)]
+            if profile is not None:
+                profile._record(
+                    "decompress",
+                    branch.name,
+                    basket_num,
+                    start,
+                    time.perf_counter(),
+                    time.thread_time() - cpu_start,
+                    basket.uncompressed_bytes,
+                )
             if update_ranges_or_baskets:
-                replace(ranges_or_baskets, original_index, basket)
+                ranges_or_baskets.baskets[index] = basket
         except Exception as err:
             notifications.put(err)
         else:
@@ -3681,6 +4475,8 @@ def _ranges_or_baskets_to_arrays(
             context = dict(branch.context)
             context["forth"] = forth_context[branch.cache_key]
 
+            if profile is not None:
+                start, cpu_start = time.perf_counter(), time.thread_time()
             basket_array = interpretation.basket_array(
                 basket.data,
                 basket.byte_offsets,
@@ -3691,6 +4487,16 @@ def _ranges_or_baskets_to_arrays(
                 library,
                 interp_options,
             )
+            if profile is not None:
+                profile._record(
+                    "interpret",
+                    branch.name,
+                    basket.basket_num,
+                    start,
+                    time.perf_counter(),
+                    time.thread_time() - cpu_start,
+                    getattr(basket_array, "nbytes", None),
+                )
             if basket.num_entries != len(basket_array):
                 raise ValueError(
                     f"""basket {basket.basket_num} in tree/branch {branch.object_path} has the wrong number of entries """
@@ -3701,11 +4507,33 @@ def _ranges_or_baskets_to_arrays(
             basket_num = basket.basket_num
             basket = None
 
+            if basket_array_cache is not None:
+                basket_array_cache[
+                    _basket_array_cache_key(
+                        branch, branchid_interpretation, library, basket_num
+                    )
+                ] = basket_array
+
+            if isinstance(
+                interpretation, uproot.interpretation.numerical.AsDtypeInPlace
+            ):
+                # copy into the array to fill now, so that the TBasket is released
+                interpretation.fill_basket(
+                    basket_array,
+                    basket_num,
+                    entry_start,
+                    entry_stop,
+                    branch.entry_offsets,
+                )
+                basket_array = None
+
             with _basket_arrays_lock:
                 basket_arrays[basket_num] = basket_array
                 len_basket_arrays = len(basket_arrays)
 
             if len_basket_arrays == branchid_num_baskets[branch.cache_key]:
+                if profile is not None:
+                    start, cpu_start = time.perf_counter(), time.thread_time()
                 arrays[branch.cache_key] = interpretation.final_array(
                     basket_arrays,
                     entry_start,
@@ -3715,6 +4543,16 @@ def _ranges_or_baskets_to_arrays(
                     branch,
                     interp_options,
                 )
+                if profile is not None:
+                    profile._record(
+                        "finalize",
+                        branch.name,
+                        None,
+                        start,
+                        time.perf_counter(),
+                        time.thread_time() - cpu_start,
+                        _output_nbytes(arrays[branch.cache_key]),
+                    )
                 with _basket_arrays_lock:
                     # no longer needed, save memory
                     basket_arrays.clear()
@@ -3729,14 +4567,27 @@ def _ranges_or_baskets_to_arrays(
         return
 
     # Request all chunks and then poll notifications queue until we have all the arrays we expect
-    hasbranches._file.source.chunks(ranges, notifications=notifications)
+    source.advise_will_need(ranges)
+    requested = time.perf_counter()
+    source.chunks(ranges, notifications=notifications)
 
     while len(arrays) < len(branchid_interpretation):
         obj = notifications.get()
 
         if isinstance(obj, uproot.source.chunk.Chunk):
-            args = range_args[(obj.start, obj.stop)]
-            decompression_executor.submit(chunk_to_basket, obj, *args)
+            # ranges are sorted by start, and no two TBaskets start at the same byte
+            index = plan_index[numpy.searchsorted(range_starts, obj.start)]
+            if profile is not None:
+                branch, basket_num = ranges_or_baskets.branch_and_basket_num(index)
+                profile._record(
+                    "fetch",
+                    branch.name,
+                    basket_num,
+                    requested,
+                    notifications.arrivals.pop(obj.start),
+                    nbytes=obj.stop - obj.start,
+                )
+            decompression_executor.submit(chunk_to_basket, obj, int(index))
 
         elif isinstance(obj, uproot.models.TBasket.Model_TBasket):
             interpretation_executor.submit(basket_to_array, obj)
@@ -3750,6 +4601,58 @@ def _ranges_or_baskets_to_arrays(
         obj = None  # release before blocking
 
 
+class _TimedQueue(queue.LifoQueue):
+    """
+    Notifications queue that records when each Chunk arrived, for a
+    :doc:`uproot.profiling.Profile`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.arrivals = {}
+
+    def put(self, item, block=True, timeout=None):
+        if isinstance(item, uproot.source.chunk.Chunk):
+            self.arrivals[item.start] = time.perf_counter()
+        super().put(item, block, timeout)
+
+
+def _fill_columns(out, expression_context, branchid_interpretation, num_entries):
+    if not isinstance(out, numpy.ndarray) or out.ndim != 2:
+        raise TypeError(f"out must be a 2-dimensional NumPy array, not {out!r}")
+    primary = [(e, c) for e, c in expression_context if c["is_primary"]]
+    if out.shape != (num_entries, len(primary)):
+        raise ValueError(
+            f"out must have shape {(num_entries, len(primary))} for {num_entries} "
+            f"entries of {len(primary)} TBranches, not {out.shape}"
+        )
+
+    for column, (expression, context) in enumerate(primary):
+        interpretation = None
+        if context["is_branch"]:
+            branch = context["branches"][-1]
+            interpretation = branchid_interpretation[branch.cache_key]
+            if isinstance(
+                interpretation, uproot.interpretation.numerical.AsDtypeInPlace
+            ):
+                raise ValueError(
+                    f"{expression!r} cannot fill more than one column of 'out'"
+                )
+        if (
+            type(interpretation) is not uproot.interpretation.numerical.AsDtype
+            or interpretation.from_dtype.subdtype is not None
+        ):
+            raise ValueError(
+                f"{expression!r} cannot fill a column of 'out' because it is not "
+                f"a TBranch of one number per entry (interpretation: {interpretation!r})"
+            )
+        branchid_interpretation[branch.cache_key] = (
+            uproot.interpretation.numerical.AsDtypeInPlace(
+                out[:, column], interpretation.from_dtype
+            )
+        )
+
+
 def _fix_asgrouped(
     arrays, expression_context, branchid_interpretation, library, how, ak_add_doc
 ):
@@ -3787,14 +4690,9 @@ def _hasbranches_num_entries_for(
     total_bytes = 0.0
     for branch in hasbranches.itervalues(recursive=True):
         if branch.cache_key in branchid_interpretation:
-            entry_offsets = branch.entry_offsets
-            start = entry_offsets[0]
-            for basket_num, stop in enumerate(entry_offsets[1:]):
-                if entry_start < stop and (
-                    start < entry_stop or entry_start == entry_stop == start
-                ):
-                    total_bytes += branch.basket_uncompressed_bytes(basket_num)
-                start = stop
+            start, stop = branch._entries_to_basket_range(entry_start, entry_stop)
+            for basket_num in range(start, stop):
+                total_bytes += branch.basket_uncompressed_bytes(basket_num)
 
     total_entries = entry_stop - entry_start
     if total_bytes == 0:
@@ -3812,11 +4710,153 @@ def _regularize_step_size(
 ):
     if uproot._util.isint(step_size):
         return step_size
+    if isinstance(step_size, MemoryBudget):
+        # a fixed number of entries (such as Dask partitions) for the budget
+        step_size = step_size.budget
     target_num_bytes = uproot._util.memory_size(
         step_size,
-        "number of entries or memory size string with units "
-        f"(such as '100 MB') required, not {step_size!r}",
+        "number of entries, memory size string with units "
+        f"(such as '100 MB'), or uproot.MemoryBudget required, not {step_size!r}",
     )
     return _hasbranches_num_entries_for(
         hasbranches, target_num_bytes, entry_start, entry_stop, branchid_interpretation
     )
+
+
+class _MemoryBudgetPlan:
+    """
+    Chooses the steps of a :doc:`uproot.behaviors.TBranch.MemoryBudget`
+    iteration from the uncompressed sizes and entry ranges of the ``TBaskets``.
+
+    For a step from ``a`` to ``c``, the ``TBaskets`` that start before ``c``
+    and stop after ``a`` are decompressed (``started(c) - finished(a)``
+    bytes), and the output arrays are estimated as ``ratio`` times the bytes
+    of those ``TBaskets`` that are in the range, assuming that each
+    ``TBasket``'s bytes are spread evenly over its entries
+    (``prorated(c) - prorated(a)``). Both are nondecreasing in ``c``, so the
+    largest step that fits the budget is found by binary search.
+    """
+
+    def __init__(
+        self,
+        memory_budget,
+        hasbranches,
+        entry_start,
+        entry_stop,
+        branchid_interpretation,
+    ):
+        self._memory_budget = memory_budget
+        self._entry_stop = entry_stop
+        self._branches = {}
+        starts, stops, nbytes = [], [], []
+        for branch in hasbranches.itervalues(recursive=True):
+            if branch.cache_key in branchid_interpretation and not isinstance(
+                branchid_interpretation[branch.cache_key],
+                uproot.interpretation.grouped.AsGrouped,
+            ):
+                start, stop = branch._entries_to_basket_range(entry_start, entry_stop)
+                offsets = branch._basket_layout()[0][start : stop + 1]
+                sizes = numpy.array(
+                    [branch.basket_uncompressed_bytes(i) for i in range(start, stop)],
+                    dtype=numpy.float64,
+                )
+                if len(sizes) != 0:
+                    cumulative = numpy.concatenate([[0.0], numpy.cumsum(sizes)])
+                    self._branches[branch.cache_key] = (offsets, cumulative)
+                    starts.append(offsets[:-1])
+                    stops.append(offsets[1:])
+                    nbytes.append(sizes)
+
+        if len(nbytes) == 0:
+            starts = stops = numpy.zeros(0, numpy.int64)
+            nbytes = numpy.zeros(0, numpy.float64)
+        else:
+            starts = numpy.concatenate(starts)
+            stops = numpy.concatenate(stops)
+            nbytes = numpy.concatenate(nbytes)
+
+        order = numpy.argsort(starts, kind="stable")
+        self._sorted_starts = starts[order]
+        self._started = numpy.concatenate([[0.0], numpy.cumsum(nbytes[order])])
+        order = numpy.argsort(stops, kind="stable")
+        self._sorted_stops = stops[order]
+        self._finished = numpy.concatenate([[0.0], numpy.cumsum(nbytes[order])])
+
+        # the sum of the TBaskets' bytes, prorated over their entries, is
+        # piecewise linear between the boundaries of all TBaskets
+        self._knots = numpy.unique(
+            numpy.concatenate([starts, stops, [entry_start, entry_stop]])
+        )
+        slopes = numpy.zeros(len(self._knots), numpy.float64)
+        nonempty = stops > starts
+        density = nbytes[nonempty] / (stops[nonempty] - starts[nonempty])
+        numpy.add.at(slopes, numpy.searchsorted(self._knots, starts[nonempty]), density)
+        numpy.add.at(slopes, numpy.searchsorted(self._knots, stops[nonempty]), -density)
+        slopes = numpy.cumsum(slopes)[:-1]
+        self._prorated = numpy.concatenate(
+            [[0.0], numpy.cumsum(slopes * numpy.diff(self._knots))]
+        )
+
+    def _estimate(self, entry_start, entry_stop):
+        started = self._started[
+            numpy.searchsorted(self._sorted_starts, entry_stop, side="left")
+        ]
+        finished = self._finished[
+            numpy.searchsorted(self._sorted_stops, entry_start, side="right")
+        ]
+        prorated = numpy.interp([entry_start, entry_stop], self._knots, self._prorated)
+        return (started - finished) + self._memory_budget.ratio * (
+            prorated[1] - prorated[0]
+        )
+
+    def next_stop(self, entry_start):
+        """
+        Returns the stop of the largest step from ``entry_start`` that fits in
+        the budget, which is at least one entry.
+        """
+        budget = self._memory_budget.budget
+        low, high = entry_start + 1, self._entry_stop
+        if self._estimate(entry_start, low) > budget:
+            # even one entry does not fit: finish the first of its TBaskets
+            index = numpy.searchsorted(self._knots, entry_start, side="right")
+            return min(int(self._knots[index]), self._entry_stop)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._estimate(entry_start, middle) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def measured(self, entry_start, entry_stop, arrays):
+        """
+        Corrects the ratio of output size to uncompressed ``TBasket`` size
+        with the sizes of the output ``arrays`` of a step, for the
+        ``TBranches`` whose arrays report one.
+        """
+        expected = actual = 0.0
+        for cache_key, array in arrays.items():
+            nbytes = _output_nbytes(array)
+            if nbytes is not None and cache_key in self._branches:
+                offsets, cumulative = self._branches[cache_key]
+                prorated = numpy.interp([entry_start, entry_stop], offsets, cumulative)
+                expected += prorated[1] - prorated[0]
+                actual += nbytes
+        if expected > 0:
+            self._memory_budget._measured(actual / expected)
+
+
+def _output_nbytes(array):
+    # None for arrays of Python objects, whose nbytes only counts pointers
+    module = type(array).__module__.split(".")[0]
+    if module == "polars":
+        return array.estimated_size()
+    elif module == "awkward" or (module == "pyarrow" and hasattr(array, "nbytes")):
+        return array.nbytes
+    elif hasattr(array, "dtype") and hasattr(array, "nbytes"):
+        # NumPy and Pandas
+        if array.dtype == numpy.dtype(object):
+            return None
+        return array.nbytes
+    else:
+        return None
@@ -10,13 +10,20 @@ policy that limits the number of items in the cache (used as an
 
 The :doc:`uproot.cache.LRUArrayCache` implements the same policy, limiting the
 total number of bytes, as reported by ``nbytes``.
+
+The :doc:`uproot.cache.BufferPool` is not a ``MutableMapping``: it recycles
+the output buffers of :ref:`uproot.behaviors.TBranch.HasBranches.iterate`
+from one step to the next.
 """
 
 from __future__ import annotations
 
 import threading
+import weakref
 from collections.abc import MutableMapping
 
+import numpy
+
 import uproot
 
 
@@ -233,3 +240,121 @@ class LRUArrayCache(LRUCache):
         Current number of bytes in the cache.
         """
         return self._current
+
+
+class BufferPool:
+    """
+    Args:
+        growth (float): When a buffer is too small for a new step, it is
+            replaced by one that is this factor larger than needed, so that
+            slowly growing steps do not reallocate every time.
+
+    BufferPool keeps the NumPy buffers that
+    :ref:`uproot.behaviors.TBranch.HasBranches.iterate` fills (numerical data,
+    the offsets and contents of jagged arrays, and the offsets of strings) for
+    reuse in later steps,
+    rather than allocating new ones in every step. Pass it as the ``buffers``
+    argument and :ref:`uproot.cache.BufferPool.release` the buffers of a step
+    when the arrays of that step are no longer needed, or use the pool as a
+    context manager around the body of the loop:
+
+    .. code-block:: python
+
+        >>> pool = uproot.BufferPool()
+        >>> for arrays in tree.iterate(["x", "y"], step_size="10 MB", buffers=pool):
+        ...     with pool:
+        ...         total += ak.sum(arrays.x * arrays.y)
+
+    Each buffer is identified by the ``TBranch`` it belongs to, so the memory
+    footprint of an iteration is bounded by the largest step of each
+    ``TBranch`` (times ``growth``).
+
+    Arrays that are derived from a released step without being copied (such
+    as NumPy views or Awkward Arrays that share the buffers) are overwritten
+    by the next step. Buffers that are never released are not reused, and
+    the pool does not keep them alive.
+
+    BufferPool is thread-safe.
+    """
+
+    def __init__(self, growth=1.25):
+        if not growth >= 1:
+            raise ValueError(f"growth must be at least 1, not {growth!r}")
+        self._growth = growth
+        self._free = {}
+        self._in_use = []
+        self._prune_at = 64
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<BufferPool ({self.nbytes} bytes free) at 0x{id(self):012x}>"
+
+    @property
+    def growth(self):
+        """
+        Factor by which a buffer that is too small is enlarged.
+        """
+        return self._growth
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes in the buffers that have been released and are
+        available for reuse.
+        """
+        with self._lock:
+            return sum(x.nbytes for x in self._free.values())
+
+    def empty(self, key, shape, dtype):
+        """
+        Args:
+            key (hashable): Identifies the buffer to reuse, such as the path
+                of a ``TBranch`` and the role of the array.
+            shape (tuple of int): Shape of the array.
+            dtype (``numpy.dtype``): Data type of the array.
+
+        Returns an uninitialized array like ``numpy.empty``, using the free
+        buffer with this ``key`` if it is large enough. The buffer is in use
+        until :ref:`uproot.cache.BufferPool.release` is called.
+        """
+        dtype = numpy.dtype(dtype)
+        nbytes = int(numpy.prod(shape, dtype=numpy.int64)) * dtype.itemsize
+        with self._lock:
+            buffer = self._free.pop(key, None)
+            if buffer is None or buffer.nbytes < nbytes:
+                # 8-byte words, so that any dtype is aligned
+                buffer = numpy.empty(-(-int(nbytes * self._growth) // 8), numpy.uint64)
+            self._in_use.append((key, weakref.ref(buffer)))
+            if len(self._in_use) > self._prune_at:
+                # buffers that are never released must not be tracked forever
+                self._in_use = [x for x in self._in_use if x[1]() is not None]
+                self._prune_at = max(64, 2 * len(self._in_use))
+        return numpy.ndarray(shape, dtype, buffer=buffer)
+
+    def release(self):
+        """
+        Declares that the arrays of all buffers that are in use are no longer
+        needed, so that the buffers can be reused.
+        """
+        with self._lock:
+            for key, ref in self._in_use:
+                buffer = ref()
+                if buffer is not None and (
+                    key not in self._free or self._free[key].nbytes < buffer.nbytes
+                ):
+                    self._free[key] = buffer
+            self._in_use = []
+
+    def clear(self):
+        """
+        Drops all buffers, both free and in use.
+        """
+        with self._lock:
+            self._free = {}
+            self._in_use = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.release()
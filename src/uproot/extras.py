@@ -37,6 +37,42 @@ or
         return pandas
 
 
+def pyarrow():
+    """
+    Imports and returns ``pyarrow``.
+    """
+    try:
+        import pyarrow
+    except ModuleNotFoundError as err:
+        raise ModuleNotFoundError("""install the 'pyarrow' package with:
+
+    pip install pyarrow
+
+or
+
+    conda install -c conda-forge pyarrow""") from err
+    else:
+        return pyarrow
+
+
+def polars():
+    """
+    Imports and returns ``polars``.
+    """
+    try:
+        import polars
+    except ModuleNotFoundError as err:
+        raise ModuleNotFoundError("""install the 'polars' package with:
+
+    pip install polars
+
+or
+
+    conda install -c conda-forge polars""") from err
+    else:
+        return polars
+
+
 def XRootD_client():
     """
     Imports and returns ``XRootD.client`` (after setting the
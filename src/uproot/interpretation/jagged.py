@@ -220,6 +220,11 @@ class AsJagged(uproot.interpretation.Interpretation):
 
         return output
 
+    def _zero_copy_dtype(self, library, options):
+        if self._header_bytes != 0:
+            return None
+        return self._content._zero_copy_dtype(library, options)
+
     def final_array(
         self,
         basket_arrays,
@@ -246,9 +251,14 @@ class AsJagged(uproot.interpretation.Interpretation):
             basket_offsets[k] = v.offsets
             basket_content[k] = v.content
 
+        zero_copy_dtype = self._zero_copy_dtype(library, options)
+        content_dtype = (
+            self.content.to_dtype if zero_copy_dtype is None else zero_copy_dtype
+        )
+
         if entry_start >= entry_stop:
             offsets = library.zeros((1,), numpy.int64)
-            content = numpy.empty(0, self.content.to_dtype)
+            content = numpy.empty(0, content_dtype)
             output = JaggedArray(offsets, content)
 
         else:
@@ -265,7 +275,13 @@ class AsJagged(uproot.interpretation.Interpretation):
                     length += stop - start
                 start = stop
 
-            offsets = numpy.empty((length + 1,), numpy.int64)
+            buffers = options.get("buffers")
+            if buffers is None:
+                offsets = numpy.empty((length + 1,), numpy.int64)
+            else:
+                offsets = buffers.empty(
+                    (branch.object_path, "offsets"), (length + 1,), numpy.int64
+                )
 
             before = 0
             start = entry_offsets[0]
@@ -311,11 +327,20 @@ class AsJagged(uproot.interpretation.Interpretation):
 
                 start = stop
 
-            content = numpy.empty((before,), self.content.to_dtype)
-            before = 0
-            for cnt in contents:
-                content[before : before + len(cnt)] = cnt
-                before += len(cnt)
+            if zero_copy_dtype is not None and len(contents) == 1:
+                # a view of the basket, which may be a view of a memmap
+                content = contents[0]
+            else:
+                if buffers is None:
+                    content = numpy.empty((before,), content_dtype)
+                else:
+                    content = buffers.empty(
+                        (branch.object_path, "content"), (before,), content_dtype
+                    )
+                before = 0
+                for cnt in contents:
+                    content[before : before + len(cnt)] = cnt
+                    before += len(cnt)
 
             content = self._content._wrap_almost_finalized(content)
 
@@ -386,6 +411,13 @@ class JaggedArray:
         """
         return self._content
 
+    @property
+    def nbytes(self):
+        """
+        Number of bytes in the ``offsets`` and ``content``.
+        """
+        return self._offsets.nbytes + self._content.nbytes
+
     def __getitem__(self, where):
         return self._content[self._offsets[where] : self._offsets[where + 1]]
 
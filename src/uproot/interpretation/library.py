@@ -18,6 +18,12 @@ The :doc:`uproot.interpretation.library.Pandas` library outputs
 are not efficiently represented, but some jagged arrays are encoded as
 ``pandas.MultiIndex``.
 
+The :doc:`uproot.interpretation.library.Arrow` library outputs ``pyarrow.Array``
+for single arrays and ``pyarrow.RecordBatch`` as groups, and the
+:doc:`uproot.interpretation.library.Polars` library outputs ``polars.Series``
+and ``polars.DataFrame``. Numerical, jagged, and string data are wrapped
+without copying.
+
 Lazy arrays (:doc:`uproot.behaviors.TBranch.lazy`) can only use the
 :doc:`uproot.interpretation.library.Awkward` library.
 """
@@ -42,7 +48,7 @@ def _rename(name, context):
 class Library:
     """
     Abstract superclass of array-library handlers, for libraries such as NumPy,
-    Awkward Array, and Pandas.
+    Awkward Array, Pandas, Arrow, and Polars.
 
     A library is used in the finalization and grouping stages of producing an
     array, converting it from internal representations like
@@ -966,10 +972,277 @@ class Pandas(Library):
             return concatenated
 
 
+def _numpy_to_arrow(pyarrow, array):
+    if not isinstance(array, numpy.ndarray) or array.dtype.kind not in "biuf":
+        return None
+    if not array.dtype.isnative:
+        array = array.astype(array.dtype.newbyteorder("="))
+    # pyarrow.array wraps the NumPy buffer without copying if it is contiguous
+    out = pyarrow.array(array.reshape(-1))
+    for size in array.shape[:0:-1]:
+        out = pyarrow.FixedSizeListArray.from_arrays(out, size)
+    return out
+
+
+def _jagged_to_arrow(pyarrow, array):
+    content = _numpy_to_arrow(pyarrow, array.content)
+    if content is None:
+        return None
+    if issubclass(array.offsets.dtype.type, numpy.int32):
+        return pyarrow.ListArray.from_arrays(pyarrow.array(array.offsets), content)
+    else:
+        offsets = array.offsets.astype(numpy.int64, copy=False)
+        return pyarrow.LargeListArray.from_arrays(pyarrow.array(offsets), content)
+
+
+def _strings_to_arrow(pyarrow, array):
+    if issubclass(array.offsets.dtype.type, numpy.int32):
+        cls, offsets = pyarrow.StringArray, array.offsets
+    else:
+        cls, offsets = (
+            pyarrow.LargeStringArray,
+            array.offsets.astype(numpy.int64, copy=False),
+        )
+    return cls.from_buffers(
+        len(offsets) - 1, pyarrow.py_buffer(offsets), pyarrow.py_buffer(array.content)
+    )
+
+
+def _to_arrow(pyarrow, array):
+    if isinstance(array, (pyarrow.Array, pyarrow.ChunkedArray)):
+        return array
+    elif isinstance(array, pyarrow.RecordBatch):
+        return pyarrow.StructArray.from_arrays(array.columns, array.schema.names)
+    elif isinstance(array, awkward.Array):
+        return awkward.to_arrow(array, extensionarray=False)
+    out = _numpy_to_arrow(pyarrow, array)
+    if out is None:
+        return awkward.to_arrow(awkward.Array(array), extensionarray=False)
+    return out
+
+
+class Arrow(Library):
+    """
+    A :doc:`uproot.interpretation.library.Library` that presents ``TBranch``
+    data as Apache Arrow arrays. The standard name for this library is
+    ``"pa"``, and ``"arrow"`` and ``"pyarrow"`` are accepted as aliases.
+
+    The single-``TBranch`` form for this library is ``pyarrow.Array``.
+    Numerical data, jagged arrays of numbers, and strings are wrapped as
+    ``pyarrow.Array``, ``pyarrow.ListArray``, and ``pyarrow.StringArray``
+    around the same buffers that Uproot filled, without copying them. Other
+    types (objects, records) are converted through Awkward Array.
+
+    The "group" behavior for this library is:
+
+    * ``how=None``: a ``pyarrow.RecordBatch``. Since each step of
+      :ref:`uproot.behaviors.TBranch.HasBranches.iterate` makes one, iteration
+      produces a stream of record batches, and
+      :doc:`uproot.behaviors.TBranch.concatenate` collects them into a
+      ``pyarrow.Table`` (without copying).
+    * ``how="table"``: a ``pyarrow.Table``.
+    * ``how=dict``: a dict of str → array, mapping the names to arrays.
+    * ``how=tuple``: a tuple of arrays, in the order requested. (Names are
+      lost.)
+    * ``how=list``: a list of arrays, in the order requested. (Names are lost.)
+
+    Arrow arrays do not have arithmetic operators, so expressions other than
+    plain branch names must use functions that accept them, such as those in
+    ``pyarrow.compute``.
+
+    Since Arrow arrays are not indexed, ``global_index`` has no effect.
+    """
+
+    name = "pa"
+
+    @property
+    def imported(self):
+        return uproot.extras.pyarrow()
+
+    def finalize(self, array, branch, interpretation, entry_start, entry_stop, options):
+        pyarrow = self.imported
+
+        if isinstance(array, uproot.interpretation.jagged.JaggedArray):
+            out = _jagged_to_arrow(pyarrow, array)
+        elif isinstance(array, uproot.interpretation.strings.StringArray):
+            out = _strings_to_arrow(pyarrow, array)
+        elif isinstance(array, awkward.Array):
+            out = awkward.to_arrow(array, extensionarray=False)
+        else:
+            out = _numpy_to_arrow(pyarrow, array)
+
+        if out is None:
+            out = awkward.to_arrow(
+                _libraries[Awkward.name].finalize(
+                    array, branch, interpretation, entry_start, entry_stop, options
+                ),
+                extensionarray=False,
+            )
+        return out
+
+    def group(self, arrays, expression_context, how):
+        pyarrow = self.imported
+
+        if how is tuple:
+            return tuple(arrays[name] for name, _ in expression_context)
+        elif how is list:
+            return [arrays[name] for name, _ in expression_context]
+        elif how is dict:
+            return {_rename(name, c): arrays[name] for name, c in expression_context}
+        elif how is None or how == "table":
+            out = pyarrow.RecordBatch.from_arrays(
+                [_to_arrow(pyarrow, arrays[name]) for name, _ in expression_context],
+                names=[_rename(name, c) for name, c in expression_context],
+            )
+            if how is None:
+                return out
+            else:
+                return pyarrow.Table.from_batches([out])
+        else:
+            raise TypeError(
+                f'for library {self.name}, how must be tuple, list, dict, "table" '
+                "for a pyarrow.Table, or None, for a pyarrow.RecordBatch"
+            )
+
+    def concatenate(self, all_arrays):
+        pyarrow = self.imported
+
+        if len(all_arrays) == 0:
+            return all_arrays
+
+        if isinstance(all_arrays[0], (tuple, list)):
+            keys = range(len(all_arrays[0]))
+        elif isinstance(all_arrays[0], dict):
+            keys = list(all_arrays[0])
+        elif isinstance(all_arrays[0], pyarrow.RecordBatch):
+            return pyarrow.Table.from_batches(all_arrays)
+        elif isinstance(all_arrays[0], pyarrow.Table):
+            return pyarrow.concat_tables(all_arrays)
+        else:
+            return pyarrow.chunked_array(all_arrays)
+
+        to_concatenate = {k: [] for k in keys}
+        for arrays in all_arrays:
+            for k in keys:
+                to_concatenate[k].append(arrays[k])
+
+        concatenated = {k: pyarrow.chunked_array(to_concatenate[k]) for k in keys}
+
+        if isinstance(all_arrays[0], tuple):
+            return tuple(concatenated[k] for k in keys)
+        elif isinstance(all_arrays[0], list):
+            return [concatenated[k] for k in keys]
+        elif isinstance(all_arrays[0], dict):
+            return concatenated
+
+
+def _to_polars(polars, name, array):
+    if isinstance(array, polars.Series):
+        return array.alias(name)
+    elif isinstance(array, polars.DataFrame):
+        return array.to_struct(name)
+    else:
+        pyarrow = uproot.extras.pyarrow()
+        return polars.Series(name, _to_arrow(pyarrow, array))
+
+
+class Polars(Library):
+    """
+    A :doc:`uproot.interpretation.library.Library` that presents ``TBranch``
+    data as Polars Series and DataFrames. The standard name for this library
+    is ``"pl"``, and ``"polars"`` is accepted as an alias.
+
+    The single-``TBranch`` form for this library is ``polars.Series``, and the
+    "group" form is ``polars.DataFrame``. The data are first made into Arrow
+    arrays, as in :doc:`uproot.interpretation.library.Arrow`, which Polars
+    adopts without copying (except to widen 32-bit list offsets). Unlike
+    :doc:`uproot.interpretation.library.Pandas`, jagged arrays remain a
+    single column of lists.
+
+    The "group" behavior for this library is:
+
+    * ``how=None``: a ``polars.DataFrame``.
+    * ``how=dict``: a dict of str → array, mapping the names to
+      ``polars.Series``.
+    * ``how=tuple``: a tuple of ``polars.Series``, in the order requested.
+    * ``how=list``: a list of ``polars.Series``, in the order requested.
+
+    Cuts are applied with ``polars.Series.filter``.
+
+    Since Polars DataFrames are not indexed, ``global_index`` has no effect.
+    """
+
+    name = "pl"
+
+    @property
+    def imported(self):
+        return uproot.extras.polars()
+
+    def finalize(self, array, branch, interpretation, entry_start, entry_stop, options):
+        polars = self.imported
+        out = _libraries[Arrow.name].finalize(
+            array, branch, interpretation, entry_start, entry_stop, options
+        )
+        return polars.Series("" if branch is None else branch.name, out)
+
+    def group(self, arrays, expression_context, how):
+        polars = self.imported
+
+        if how is tuple:
+            return tuple(arrays[name] for name, _ in expression_context)
+        elif how is list:
+            return [arrays[name] for name, _ in expression_context]
+        elif how is dict:
+            return {_rename(name, c): arrays[name] for name, c in expression_context}
+        elif how is None:
+            return polars.DataFrame(
+                [
+                    _to_polars(polars, _rename(name, c), arrays[name])
+                    for name, c in expression_context
+                ]
+            )
+        else:
+            raise TypeError(
+                f"for library {self.name}, how must be tuple, list, dict, or None "
+                "(for a polars.DataFrame)"
+            )
+
+    def concatenate(self, all_arrays):
+        polars = self.imported
+
+        if len(all_arrays) == 0:
+            return all_arrays
+
+        if isinstance(all_arrays[0], (tuple, list)):
+            keys = range(len(all_arrays[0]))
+        elif isinstance(all_arrays[0], dict):
+            keys = list(all_arrays[0])
+        else:
+            return polars.concat(all_arrays, rechunk=False)
+
+        to_concatenate = {k: [] for k in keys}
+        for arrays in all_arrays:
+            for k in keys:
+                to_concatenate[k].append(arrays[k])
+
+        concatenated = {
+            k: polars.concat(to_concatenate[k], rechunk=False) for k in keys
+        }
+
+        if isinstance(all_arrays[0], tuple):
+            return tuple(concatenated[k] for k in keys)
+        elif isinstance(all_arrays[0], list):
+            return [concatenated[k] for k in keys]
+        elif isinstance(all_arrays[0], dict):
+            return concatenated
+
+
 _libraries = {
     NumPy.name: NumPy(),
     Awkward.name: Awkward(),
     Pandas.name: Pandas(),
+    Arrow.name: Arrow(),
+    Polars.name: Polars(),
 }
 
 _libraries["numpy"] = _libraries[NumPy.name]
@@ -988,6 +1261,17 @@ _libraries["pandas"] = _libraries[Pandas.name]
 _libraries["Pandas"] = _libraries[Pandas.name]
 _libraries["PANDAS"] = _libraries[Pandas.name]
 
+_libraries["arrow"] = _libraries[Arrow.name]
+_libraries["Arrow"] = _libraries[Arrow.name]
+_libraries["ARROW"] = _libraries[Arrow.name]
+_libraries["pyarrow"] = _libraries[Arrow.name]
+_libraries["PyArrow"] = _libraries[Arrow.name]
+_libraries["PYARROW"] = _libraries[Arrow.name]
+
+_libraries["polars"] = _libraries[Polars.name]
+_libraries["Polars"] = _libraries[Polars.name]
+_libraries["POLARS"] = _libraries[Polars.name]
+
 
 def _regularize_library(library):
     if isinstance(library, Library):
@@ -1012,6 +1296,6 @@ def _regularize_library(library):
         except KeyError as err:
             raise ValueError(
                 f"""library {library!r} not recognized (for this function); """
-                """try "np" (NumPy), "ak" (Awkward Array), or "pd" (Pandas) """
-                """instead"""
+                """try "np" (NumPy), "ak" (Awkward Array), "pd" (Pandas), """
+                """"pa" (Arrow), or "pl" (Polars) instead"""
             ) from err
@@ -44,6 +44,15 @@ class Numerical(uproot.interpretation.Interpretation):
     def _wrap_almost_finalized(self, array):
         return array
 
+    def _zero_copy_dtype(self, library, options):
+        """
+        The ``numpy.dtype`` of an output that can be a view of the raw
+        ``TBasket`` data (or a single copy of it) or None if the output must
+        be converted.
+
+        In this default implementation, the output is always converted.
+        """
+
     def final_array(
         self,
         basket_arrays,
@@ -63,8 +72,21 @@ class Numerical(uproot.interpretation.Interpretation):
             branch=branch,
         )
 
+        zero_copy_dtype = self._zero_copy_dtype(library, options)
+        single_basket = None
+        if zero_copy_dtype is not None and entry_start < entry_stop:
+            single_basket = _single_basket(entry_start, entry_stop, entry_offsets)
+
         if entry_start >= entry_stop:
-            output = self._prepare_output(library, length=0)
+            if zero_copy_dtype is None:
+                output = self._prepare_output(library, length=0)
+            else:
+                output = library.empty((0,), zero_copy_dtype)
+
+        elif single_basket is not None:
+            # a view of the basket, which may be a view of a memmap
+            basket_num, local_start, local_stop = single_basket
+            output = basket_arrays[basket_num][local_start:local_stop]
 
         else:
             length = 0
@@ -80,7 +102,17 @@ class Numerical(uproot.interpretation.Interpretation):
                     length += stop - start
                 start = stop
 
-            output = self._prepare_output(library, length)
+            buffers = options.get("buffers")
+            if buffers is not None:
+                output = buffers.empty(
+                    (branch.object_path, "data"),
+                    (length,),
+                    self.to_dtype if zero_copy_dtype is None else zero_copy_dtype,
+                )
+            elif zero_copy_dtype is None:
+                output = self._prepare_output(library, length)
+            else:
+                output = library.empty((length,), zero_copy_dtype)
 
             start = entry_offsets[0]
             for basket_num, stop in enumerate(entry_offsets[1:]):
@@ -109,7 +141,7 @@ class Numerical(uproot.interpretation.Interpretation):
                 start = stop
 
         native_dtype = output.dtype.newbyteorder("=")
-        if output.dtype != native_dtype:
+        if output.dtype != native_dtype and zero_copy_dtype is None:
             output = output.astype(native_dtype)
         self.hook_before_library_finalize(
             basket_arrays=basket_arrays,
@@ -149,6 +181,20 @@ class Numerical(uproot.interpretation.Interpretation):
         return output
 
 
+def _single_basket(entry_start, entry_stop, entry_offsets):
+    """
+    Returns ``(basket_num, local_start, local_stop)`` if the entries from
+    ``entry_start`` to ``entry_stop`` are all in one ``TBasket``, otherwise
+    None.
+    """
+    start = entry_offsets[0]
+    for basket_num, stop in enumerate(entry_offsets[1:]):
+        if start <= entry_start and entry_stop <= stop:
+            return basket_num, entry_start - start, entry_stop - start
+        start = stop
+    return None
+
+
 _numpy_byteorder_to_cache_key = {
     "!": "B",
     ">": "B",
@@ -261,6 +307,16 @@ class AsDtype(Numerical):
     def numpy_dtype(self):
         return self._to_dtype
 
+    def _zero_copy_dtype(self, library, options):
+        if not options.get("zero_copy", False):
+            return None
+        if self._to_dtype != self._from_dtype.newbyteorder("="):
+            return None
+        # only NumPy can represent data in the file's (big-endian) byte order
+        if library.name == "np" or self._from_dtype.isnative:
+            return self._from_dtype
+        return None
+
     def awkward_form(
         self,
         file,
@@ -412,6 +468,9 @@ class AsDtypeInPlace(AsDtype):
         self._from_dtype = from_dtype
         self._to_dtype = numpy.dtype(array.dtype)
 
+    def _zero_copy_dtype(self, library, options):
+        return None
+
     def _prepare_output(self, library, length):
         """
         Specialized version of _prepare_output : re-use our target array kept in self._to_fill.
@@ -429,6 +488,83 @@ class AsDtypeInPlace(AsDtype):
             )
         return output[:length]
 
+    def fill_basket(
+        self, basket_array, basket_num, entry_start, entry_stop, entry_offsets
+    ):
+        """
+        Copies the entries of one ``TBasket`` (``basket_array``) that are
+        between ``entry_start`` and ``entry_stop`` into their place in the
+        array to fill, so that the ``TBasket`` does not need to be kept until
+        all of them have been read.
+
+        In :ref:`uproot.interpretation.numerical.AsDtypeInPlace.final_array`,
+        a ``basket_array`` of None is one that has already been filled.
+        """
+        start, stop = entry_offsets[basket_num], entry_offsets[basket_num + 1]
+        local_start = max(start, entry_start)
+        local_stop = min(stop, entry_stop)
+        if local_start < local_stop:
+            output = self._to_fill.view(self.to_dtype)
+            if local_stop - entry_start > len(output):
+                raise ValueError(
+                    f"Requesting to fill an array of size {len(output)} (type {self._to_dtype}) with input of size {entry_stop - entry_start} (type {self._from_dtype})"
+                )
+            output[local_start - entry_start : local_stop - entry_start] = basket_array[
+                local_start - start : local_stop - start
+            ]
+
+    def final_array(
+        self,
+        basket_arrays,
+        entry_start,
+        entry_stop,
+        entry_offsets,
+        library,
+        branch,
+        options,
+    ):
+        self.hook_before_final_array(
+            basket_arrays=basket_arrays,
+            entry_start=entry_start,
+            entry_stop=entry_stop,
+            entry_offsets=entry_offsets,
+            library=library,
+            branch=branch,
+        )
+
+        for basket_num, basket_array in basket_arrays.items():
+            if basket_array is not None:
+                self.fill_basket(
+                    basket_array, basket_num, entry_start, entry_stop, entry_offsets
+                )
+        output = self._prepare_output(library, max(entry_stop - entry_start, 0))
+
+        self.hook_before_library_finalize(
+            basket_arrays=basket_arrays,
+            entry_start=entry_start,
+            entry_stop=entry_stop,
+            entry_offsets=entry_offsets,
+            library=library,
+            branch=branch,
+            output=output,
+        )
+
+        output = library.finalize(
+            output, branch, self, entry_start, entry_stop, options
+        )
+
+        self.hook_after_final_array(
+            basket_arrays=basket_arrays,
+            entry_start=entry_start,
+            entry_stop=entry_stop,
+            entry_offsets=entry_offsets,
+            library=library,
+            branch=branch,
+            output=output,
+        )
+
+        return output
+
 
 class AsSTLBits(Numerical):
     """
@@ -607,6 +743,57 @@ in file {branch.file.file_path}"""
 
         return output
 
+    def to_raw(self, array):
+        """
+        Args:
+            array (``numpy.ndarray``): Floating-point values to pack.
+
+        Packs ``array`` into an array of
+        :ref:`uproot.interpretation.numerical.TruncatedNumerical.from_dtype`
+        with the same shape, which is the inverse of
+        :ref:`uproot.interpretation.numerical.TruncatedNumerical.basket_array`
+        (up to the loss of precision), as ROOT does when writing it.
+
+        Values outside of the range
+        (:ref:`uproot.interpretation.numerical.TruncatedNumerical.low`,
+        :ref:`uproot.interpretation.numerical.TruncatedNumerical.high`)
+        are clipped to it.
+        """
+        out = numpy.empty(numpy.shape(array), self.from_dtype)
+
+        if self.is_truncated:
+            # as in ROOT's TBufferFile::WriteWithNbits
+            if self._num_bits > 14:
+                raise ValueError(
+                    f"at most 14 bits of mantissa can be written, not {self._num_bits}"
+                )
+            floats = numpy.asarray(array, numpy.float32)
+            bits = floats.view(numpy.uint32)
+
+            mantissa = (bits >> (22 - self._num_bits)) & (
+                (1 << (self._num_bits + 1)) - 1
+            )
+            mantissa += 1
+            mantissa >>= 1
+            mantissa[(mantissa & (1 << self._num_bits)) != 0] = (
+                1 << self._num_bits
+            ) - 1
+            mantissa |= (floats < 0).astype(numpy.uint32) << (self._num_bits + 1)
+
+            out["exponent"] = (bits >> 23) & 0xFF
+            out["mantissa"] = mantissa
+
+        else:
+            # as in ROOT's TBufferFile::WriteDouble32 for a range
+            if self._num_bits < 32:
+                factor = (1 << self._num_bits) / (self._high - self._low)
+            else:
+                factor = 0xFFFFFFFF / (self._high - self._low)
+            clipped = numpy.clip(array, self._low, self._high)
+            out[...] = numpy.floor(0.5 + factor * (clipped - self._low))
+
+        return out
+
 
 class AsDouble32(TruncatedNumerical):
     """
@@ -1124,6 +1124,13 @@ class ObjectArray:
         """
         return self._cursor_offset
 
+    @property
+    def nbytes(self):
+        """
+        Number of bytes in the ``byte_offsets`` and ``byte_content``.
+        """
+        return self._byte_offsets.nbytes + self._byte_content.nbytes
+
     def to_numpy(self):
         """
         Convert this ObjectArray into a NumPy ``dtype="O"`` (object) array.
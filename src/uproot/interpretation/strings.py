@@ -396,7 +396,13 @@ class AsStrings(uproot.interpretation.Interpretation):
                         length += stop - start
                     start = stop
 
-                offsets = numpy.empty((length + 1,), numpy.int64)
+                buffers = options.get("buffers")
+                if buffers is None:
+                    offsets = numpy.empty((length + 1,), numpy.int64)
+                else:
+                    offsets = buffers.empty(
+                        (branch.object_path, "offsets"), (length + 1,), numpy.int64
+                    )
 
                 before = 0
                 start = entry_offsets[0]
@@ -532,6 +538,13 @@ class StringArray:
         """
         return self._content
 
+    @property
+    def nbytes(self):
+        """
+        Number of bytes in the ``offsets`` and ``content``.
+        """
+        return self._offsets.nbytes + len(self._content)
+
     def __getitem__(self, where):
         data = self._content[self._offsets[where] : self._offsets[where + 1]]
         return uproot._util.ensure_str(data)
@@ -11,6 +11,7 @@ the default language.
 from __future__ import annotations
 
 import ast
+import functools
 import warnings
 
 import numpy
@@ -113,7 +114,7 @@ def _walk_ast_yield_symbols(node, keys, aliases, functions, getter):
         pass
 
 
-def _ast_as_branch_expression(node, keys, aliases, functions, getter):
+def _ast_as_branch_expression(node, keys, aliases, functions, getter, warn=True):
     if (
         isinstance(node, ast.Call)
         and isinstance(node.func, ast.Name)
@@ -132,7 +133,7 @@ def _ast_as_branch_expression(node, keys, aliases, functions, getter):
         # A name in function-call position resolves to the function, even when a
         # branch happens to share the name (e.g. a branch literally named
         # "sqrt"). Warn about the shadowing so the conflict is visible.
-        if node.func.id in keys or node.func.id in aliases:
+        if warn and (node.func.id in keys or node.func.id in aliases):
             warnings.warn(
                 f"{node.func.id!r} is both a branch name and a function; "
                 "using the function in call position",
@@ -141,11 +142,11 @@ def _ast_as_branch_expression(node, keys, aliases, functions, getter):
             )
         new_func = ast.parse(f"function[{node.func.id!r}]").body[0].value
         new_args = [
-            _ast_as_branch_expression(x, keys, aliases, functions, getter)
+            _ast_as_branch_expression(x, keys, aliases, functions, getter, warn)
             for x in node.args
         ]
         new_keywords = [
-            _ast_as_branch_expression(x, keys, aliases, functions, getter)
+            _ast_as_branch_expression(x, keys, aliases, functions, getter, warn)
             for x in node.keywords
         ]
         new_node = ast.Call(new_func, new_args, new_keywords)
@@ -165,7 +166,7 @@ def _ast_as_branch_expression(node, keys, aliases, functions, getter):
         name = _attribute_to_dotted_name(node)
         if name is None:
             value = _ast_as_branch_expression(
-                node.value, keys, aliases, functions, getter
+                node.value, keys, aliases, functions, getter, warn
             )
             new_node = ast.Attribute(value, node.attr, node.ctx)
             new_node.lineno = getattr(node, "lineno", 1)
@@ -182,7 +183,9 @@ def _ast_as_branch_expression(node, keys, aliases, functions, getter):
         for field_name in node._fields:
             field_value = getattr(node, field_name)
             args.append(
-                _ast_as_branch_expression(field_value, keys, aliases, functions, getter)
+                _ast_as_branch_expression(
+                    field_value, keys, aliases, functions, getter, warn
+                )
             )
         new_node = type(node)(*args)
         new_node.lineno = getattr(node, "lineno", 1)
@@ -191,13 +194,168 @@ def _ast_as_branch_expression(node, keys, aliases, functions, getter):
 
     elif isinstance(node, list):
         return [
-            _ast_as_branch_expression(x, keys, aliases, functions, getter) for x in node
+            _ast_as_branch_expression(x, keys, aliases, functions, getter, warn)
+            for x in node
         ]
 
     else:
         return node
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(expression):
+    """
+    Parses ``expression`` and returns its AST node, all names (including dotted
+    names) that could be branches, aliases, or functions, and the names in
+    function-call position. Returns None if ``expression`` is not a single
+    Python expression, so that the error can be raised with file information.
+    """
+    try:
+        node = ast.parse(expression)
+    except SyntaxError:
+        return None
+    if len(node.body) != 1 or not isinstance(node.body[0], ast.Expr):
+        return None
+
+    names = set()
+    called = set()
+    for x in ast.walk(node):
+        if isinstance(x, ast.Name):
+            names.add(x.id)
+        elif isinstance(x, ast.Attribute):
+            name = _attribute_to_dotted_name(x)
+            if name is not None:
+                names.add(name)
+        if isinstance(x, ast.Call) and isinstance(x.func, ast.Name):
+            called.add(x.func.id)
+
+    return node, frozenset(names), frozenset(called)
+
+
+_elementwise_nodes = (
+    ast.Expression,
+    ast.Expr,
+    ast.Module,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Load,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+)
+
+
+def _is_elementwise(node, symbols, functions, getter):
+    """
+    Returns True if ``node`` only applies arithmetic, single comparisons, and
+    calls of ``functions`` to branches or aliases, so that evaluating it on
+    slices of its inputs gives slices of its output.
+    """
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or len(node.keywords) != 0:
+            return False
+        if node.func.id == getter:
+            return len(node.args) == 1 and isinstance(node.args[0], ast.Constant)
+        return node.func.id in functions and all(
+            _is_elementwise(x, symbols, functions, getter) for x in node.args
+        )
+    elif isinstance(node, ast.Name):
+        return node.id in symbols
+    elif isinstance(node, ast.Attribute):
+        return _attribute_to_dotted_name(node) in symbols
+    elif isinstance(node, ast.Compare):
+        return len(node.ops) == 1 and all(
+            _is_elementwise(x, symbols, functions, getter)
+            for x in (node.left, *node.comparators)
+        )
+    elif isinstance(node, ast.Constant):
+        return isinstance(node.value, (bool, int, float, complex))
+    elif isinstance(node, _elementwise_nodes):
+        return all(
+            _is_elementwise(x, symbols, functions, getter)
+            for x in ast.iter_child_nodes(node)
+        )
+    else:
+        return False
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(expression, symbols, function_names, getter):
+    """
+    Compiles ``expression`` into a code object that makes a function of no
+    arguments when evaluated in a scope with a ``getter`` and ``function``.
+
+    The translation only depends on which names in the expression are branches
+    or aliases (``symbols``) and which are functions (``function_names``), so
+    the result is cached for these signatures and reused across calls, such as
+    every step of an iteration.
+
+    Also returns the names given to the ``getter`` if the expression is
+    elementwise (see ``_is_elementwise``), or None otherwise.
+    """
+    node = _parse_expression(expression)[0]
+    expr = _ast_as_branch_expression(
+        node.body[0].value, symbols, (), function_names, getter, warn=False
+    )
+
+    function = ast.parse("lambda: None").body[0].value
+    function.body = expr
+    tree = ast.Expression(function)
+    tree.lineno = getattr(function, "lineno", 1)
+    tree.col_offset = getattr(function, "col_offset", 0)
+    code = compile(tree, "<dynamic>", "eval")
+
+    inputs = None
+    if _is_elementwise(node, symbols, function_names, getter):
+        inputs = []
+        for x in ast.walk(expr):
+            if (
+                isinstance(x, ast.Call)
+                and isinstance(x.func, ast.Name)
+                and x.func.id == getter
+                and x.args[0].value not in inputs
+            ):
+                inputs.append(x.args[0].value)
+        inputs = tuple(inputs)
+
+    return code, inputs
+
+
+def _expression_to_plan(
+    expression, keys, aliases, functions, getter, file_path, object_path
+):
+    """
+    Returns the cached code object for ``expression`` (see
+    ``_compile_expression``) and the names of its inputs if it is elementwise.
+    """
+    parsed = _parse_expression(expression)
+    if parsed is None:
+        _expression_to_node(expression, file_path, object_path)
+        raise AssertionError(expression)
+    _, names, called = parsed
+
+    symbols = frozenset(x for x in names if x in keys or x in aliases)
+    function_names = frozenset(x for x in names if x in functions)
+    for name in sorted(called & symbols & function_names):
+        warnings.warn(
+            f"{name!r} is both a branch name and a function; "
+            "using the function in call position",
+            uproot.exceptions.NameConflictWarning,
+            stacklevel=1,
+        )
+
+    try:
+        return _compile_expression(expression, symbols, function_names, getter)
+    except KeyError as err:
+        raise uproot.KeyInFileError(
+            err.args[0],
+            keys=sorted(keys) + list(aliases),
+            file_path=file_path,
+            object_path=object_path,
+        ) from err
+
+
 def _expression_to_function(
     expression, keys, aliases, functions, getter, scope, file_path, object_path
 ):
@@ -205,25 +363,80 @@ def _expression_to_function(
         return lambda: scope[getter](expression)
 
     else:
-        node = _expression_to_node(expression, file_path, object_path)
-        try:
-            expr = _ast_as_branch_expression(
-                node.body[0].value, keys, aliases, functions, getter
-            )
-        except KeyError as err:
-            raise uproot.KeyInFileError(
-                err.args[0],
-                keys=sorted(keys) + list(aliases),
-                file_path=file_path,
-                object_path=object_path,
-            ) from err
-
-        function = ast.parse("lambda: None").body[0].value
-        function.body = expr
-        expression = ast.Expression(function)
-        expression.lineno = getattr(function, "lineno", 1)
-        expression.col_offset = getattr(function, "col_offset", 0)
-        return eval(compile(expression, "<dynamic>", "eval"), scope)
+        code, _ = _expression_to_plan(
+            expression, keys, aliases, functions, getter, file_path, object_path
+        )
+        return eval(code, scope)
+
+
+def _as_flat_numpy(array):
+    if isinstance(array, numpy.ndarray):
+        out = array
+    elif uproot._util.from_module(array, "awkward"):
+        import awkward
+
+        if not isinstance(array, awkward.Array) or array.ndim != 1:
+            return None
+        layout = array.layout
+        if not isinstance(layout, awkward.contents.NumpyArray) or layout.parameters:
+            return None
+        out = awkward.to_numpy(array, allow_missing=False)
+    else:
+        return None
+    if out.ndim != 1 or out.dtype.kind not in "biufc":
+        return None
+    return out
+
+
+def _evaluate_in_blocks(code, inputs, get, getter, functions, block_size):
+    """
+    Evaluates the elementwise expression ``code`` on blocks of ``block_size``
+    entries of its ``inputs`` at a time, so that intermediate arrays are only
+    as large as a block, and fills one output array. The full inputs are taken
+    from ``get``, and each block is given to the expression as ``getter``.
+    Returns None if the inputs are not all flat NumPy (or Awkward) arrays of
+    numbers with the same length.
+    """
+    arrays = {}
+    is_awkward = False
+    for name in inputs:
+        original = get(name)
+        array = _as_flat_numpy(original)
+        if array is None:
+            return None
+        if len(arrays) != 0 and len(array) != len(next(iter(arrays.values()))):
+            return None
+        is_awkward = is_awkward or not isinstance(original, numpy.ndarray)
+        arrays[name] = array
+
+    if len(arrays) == 0:
+        return None
+    length = len(next(iter(arrays.values())))
+
+    block = {}
+    function = eval(code, {getter: block.__getitem__, "function": functions})
+
+    output = None
+    for start in range(0, length, block_size):
+        stop = min(start + block_size, length)
+        for name, array in arrays.items():
+            block[name] = array[start:stop]
+        result = function()
+        if not isinstance(result, numpy.ndarray) or result.shape != (stop - start,):
+            return None
+        if output is None:
+            output = numpy.empty(length, result.dtype)
+        elif result.dtype != output.dtype:
+            output = output.astype(numpy.result_type(output, result))
+        output[start:stop] = result
+
+    if output is None:
+        return None
+    if is_awkward:
+        import awkward
+
+        return awkward.Array(output)
+    return output
 
 
 def _vectorized_erf(complement):
@@ -288,6 +501,11 @@ class PythonLanguage(uproot.language.Language):
         getter (str): Name of the function that extracts branches by name;
             needed for branches whose names are not valid Python symbols.
             Default is "get".
+        block_size (None or int): If an integer, expressions that only do
+            arithmetic, comparisons, and calls of ``functions`` on flat arrays
+            of numbers are evaluated this many entries at a time, filling one
+            output array, rather than making full-size intermediate arrays for
+            each operation. If None, every expression is evaluated at once.
 
     PythonLanguage is the default :doc:`uproot.language.Language` for
     interpreting expressions passed to
@@ -298,6 +516,21 @@ class PythonLanguage(uproot.language.Language):
     Unlike standard Python, an expression with attributes, such as
     ``some.thing``, can be a single identifier, so that a ``TBranch`` whose
     name contains dots does not need to be loaded with ``get("some.thing")``.
+
+    Expressions are parsed and compiled once for each combination of the
+    names in them that are branches, aliases, or functions, and reused in
+    later calls, such as each step of :doc:`uproot.behaviors.TBranch.iterate`.
+
+    With a ``block_size``, such as
+
+    .. code-block:: python
+
+        language = uproot.language.python.PythonLanguage(block_size=16384)
+        tree.arrays(["sqrt(px**2 + py**2)"], cut="pt > 20", language=language)
+
+    the intermediate arrays of each block can stay in the CPU cache, which
+    is faster for expressions with several operations on large arrays. The
+    ``functions`` are assumed to be elementwise.
     """
 
     default_functions = {
@@ -363,12 +596,19 @@ class PythonLanguage(uproot.language.Language):
         "where": numpy.where,
     }
 
-    def __init__(self, functions=None, getter="get"):
+    def __init__(self, functions=None, getter="get", block_size=None):
         if functions is None:
             self._functions = self.default_functions
         else:
             self._functions = dict(functions)
         self._getter = getter
+        if block_size is not None and (
+            not uproot._util.isint(block_size) or block_size <= 0
+        ):
+            raise ValueError(
+                f"block_size must be None or a positive integer, not {block_size!r}"
+            )
+        self._block_size = block_size
 
     def __repr__(self):
         return "uproot.language.python.PythonLanguage()"
@@ -391,6 +631,14 @@ class PythonLanguage(uproot.language.Language):
         """
         return self._getter
 
+    @property
+    def block_size(self):
+        """
+        Number of entries at a time with which elementwise expressions are
+        evaluated, or None if they are evaluated all at once.
+        """
+        return self._block_size
+
     def getter_of(self, name):
         """
         Returns a string, an expression in which the ``getter`` is getting
@@ -419,7 +667,11 @@ class PythonLanguage(uproot.language.Language):
             return [expression]
 
         else:
-            node = _expression_to_node(expression, file_path, object_path)
+            parsed = _parse_expression(expression)
+            if parsed is None:
+                node = _expression_to_node(expression, file_path, object_path)
+            else:
+                node = parsed[0]
             try:
                 return list(
                     _walk_ast_yield_symbols(
@@ -499,42 +751,75 @@ class PythonLanguage(uproot.language.Language):
                 if name in keys:
                     values[name] = array
 
-        output = {}
-        is_pandas = False
-        for expression, context in expression_context:
-            if context["is_primary"] and not context["is_cut"]:
-                output[expression] = _expression_to_function(
+        def compute(expression):
+            if self._block_size is not None and expression not in keys:
+                code, inputs = _expression_to_plan(
                     expression,
                     keys,
                     aliases,
                     self._functions,
                     self._getter,
-                    scope,
                     file_path,
                     object_path,
-                )()
+                )
+                if inputs is not None:
+                    result = _evaluate_in_blocks(
+                        code,
+                        inputs,
+                        getter,
+                        self._getter,
+                        self._functions,
+                        self._block_size,
+                    )
+                    if result is not None:
+                        return result
+
+            return _expression_to_function(
+                expression,
+                keys,
+                aliases,
+                self._functions,
+                self._getter,
+                scope,
+                file_path,
+                object_path,
+            )()
+
+        output = {}
+        is_pandas = False
+        for expression, context in expression_context:
+            if context["is_primary"] and not context["is_cut"]:
+                output[expression] = compute(expression)
                 if uproot._util.from_module(output[expression], "pandas"):
                     is_pandas = True
 
         cut = None
         for expression, context in expression_context:
             if context["is_primary"] and context["is_cut"]:
-                cut = _expression_to_function(
-                    expression,
-                    keys,
-                    aliases,
-                    self._functions,
-                    self._getter,
-                    scope,
-                    file_path,
-                    object_path,
-                )()
+                try:
+                    cut = compute(expression)
+                except TypeError:
+                    # pyarrow arrays have no operators (only pyarrow.compute
+                    # functions), so a cut like "x > 1" is computed in Awkward
+                    if not any(
+                        uproot._util.from_module(x, "pyarrow") for x in values.values()
+                    ):
+                        raise
+                    import awkward
+
+                    for name, value in values.items():
+                        if uproot._util.from_module(value, "pyarrow"):
+                            values[name] = awkward.from_arrow(value)
+                    cut = awkward.to_arrow(compute(expression), extensionarray=False)
                 if uproot._util.from_module(cut, "pandas"):
                     is_pandas = True
                 break
 
         if cut is not None:
-            cut = cut != 0
+            if uproot._util.from_module(cut, "polars"):
+                cut = cut.cast(bool)
+            elif not uproot._util.from_module(cut, "pyarrow"):
+                cut = cut != 0
 
             if is_pandas:
                 pandas = uproot.extras.pandas()
@@ -555,6 +840,12 @@ class PythonLanguage(uproot.language.Language):
                     selected = modified[cut]
                     output[name] = selected[original.name]
 
+                elif uproot._util.from_module(
+                    data, "pyarrow"
+                ) or uproot._util.from_module(data, "polars"):
+                    # neither supports boolean masks in __getitem__
+                    output[name] = data.filter(cut)
+
                 else:
                     output[name] = data[cut]
 
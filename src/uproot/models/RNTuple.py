@@ -1984,7 +1984,8 @@ class RField(uproot.behaviors.RNTuple.HasFields):
                 if a memory size, create a new cache of this size.
             library (str or :doc:`uproot.interpretation.library.Library`): The library
                 that is used to represent arrays. Options are ``"np"`` for NumPy,
-                ``"ak"`` for Awkward Array, and ``"pd"`` for Pandas.
+                ``"ak"`` for Awkward Array, ``"pd"`` for Pandas, ``"pa"`` for
+                Arrow, and ``"pl"`` for Polars.
             ak_add_doc (bool | dict ): If True and ``library="ak"``, add the RField ``description``
                 to the Awkward ``__doc__`` parameter of the array.
                 if dict = {key:value} and ``library="ak"``, add the RField ``value`` to the
@@ -2058,6 +2059,9 @@ class RField(uproot.behaviors.RNTuple.HasFields):
                 return pandas_data
             return numpy_data
 
+        elif library.name in ("pa", "pl"):
+            return library.finalize(arrays, None, None, entry_start, entry_stop, {})
+
         return arrays
 
 
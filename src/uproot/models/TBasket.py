@@ -304,8 +304,10 @@ class Model_TBasket(uproot.model.Model):
                     context,
                 )
             else:
-                # Uncompressed; be sure to copy any memmap arrays
-                chunk = chunk.detach_memmap()
+                # Uncompressed; be sure to copy any memmap arrays, unless the
+                # caller copies the data out before the file can be closed
+                if context.get("detach_memmap", True):
+                    chunk = chunk.detach_memmap()
 
                 self._raw_data = cursor.bytes(chunk, uncompressed_bytes, context)
 
@@ -0,0 +1,332 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines :doc:`uproot.profiling.Profile`, a record of where the time
+and memory of :ref:`uproot.behaviors.TBranch.HasBranches.arrays` and
+:ref:`uproot.behaviors.TBranch.HasBranches.iterate` went: fetching,
+decompressing, and interpreting the ``TBaskets`` of each ``TBranch``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+import uproot
+
+_columns = [
+    "num_baskets",
+    "compressed_bytes",
+    "uncompressed_bytes",
+    "fetch_wait",
+    "decompression_time",
+    "interpretation_time",
+    "peak_memory",
+]
+
+
+class Profile:
+    """
+    A record of the work done to read ``TBranches`` into arrays, returned by
+    :ref:`uproot.behaviors.TBranch.HasBranches.arrays` and yielded by
+    :ref:`uproot.behaviors.TBranch.HasBranches.iterate` with ``profile=True``.
+
+    For each ``TBranch``, :ref:`uproot.profiling.Profile.branches` has
+
+    * ``num_baskets``: number of ``TBaskets`` that were read and decompressed,
+    * ``compressed_bytes``: number of bytes read from the file,
+    * ``uncompressed_bytes``: number of bytes after decompression,
+    * ``fetch_wait``: the longest time (in seconds) from the request of the
+      ``TBaskets`` until one of them arrived,
+    * ``decompression_time``: CPU time (in seconds) spent decompressing,
+    * ``interpretation_time``: CPU time (in seconds) spent interpreting the
+      ``TBaskets`` and combining them into an array,
+    * ``peak_memory``: the number of bytes in the interpreted ``TBaskets``
+      and the output array when both are held, before the ``TBaskets`` are
+      released (as reported by ``nbytes``, if available).
+
+    A Profile can be exported as a text :ref:`uproot.profiling.Profile.table`,
+    a Pandas DataFrame (:ref:`uproot.profiling.Profile.to_pandas`), or a
+    timeline in the Chrome Trace Event Format
+    (:ref:`uproot.profiling.Profile.chrome_trace`), which can be viewed in
+    `Perfetto <https://ui.perfetto.dev>`__ or ``chrome://tracing``. The
+    timeline shows each fetch, decompression, and interpretation on the thread
+    that performed it, so executors that are idle or saturated can be seen.
+
+    A Profile can be passed as ``profile`` to record several calls in one
+    Profile: for instance, all steps of an iteration.
+
+    Profile is thread-safe.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._events = []
+        self._branches = {}
+        self._held = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<Profile of {len(self._branches)} TBranches at 0x{id(self):012x}>"
+
+    @property
+    def branches(self):
+        """
+        Dict of ``TBranch`` name to a dict of measurements (see above), in the
+        order in which the ``TBranches`` were first read.
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._branches.items()}
+
+    @property
+    def events(self):
+        """
+        List of events, each a dict with a ``"name"`` (``"fetch"``,
+        ``"decompress"``, ``"interpret"``, ``"finalize"``, or ``"compute"``),
+        ``"branch"`` (None for ``"compute"``), ``"basket"`` (None if not
+        specific to a ``TBasket``), ``"start"`` and ``"stop"`` times in seconds
+        since the Profile was created, ``"cpu_time"``, ``"nbytes"``,
+        ``"thread"`` (identifier), and ``"thread_name"``.
+        """
+        with self._lock:
+            return [dict(x) for x in self._events]
+
+    @property
+    def wall_time(self):
+        """
+        Time in seconds from the start of the first event to the end of the
+        last.
+        """
+        with self._lock:
+            if len(self._events) == 0:
+                return 0.0
+            return max(x["stop"] for x in self._events) - min(
+                x["start"] for x in self._events
+            )
+
+    def _stats(self, branch):
+        stats = self._branches.get(branch)
+        if stats is None:
+            stats = self._branches[branch] = dict.fromkeys(_columns, 0)
+        return stats
+
+    def _record(
+        self, name, branch, basket, start, stop, cpu_time=None, nbytes=None, **more
+    ):
+        # start and stop are in time.perf_counter() seconds
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "branch": branch,
+            "basket": basket,
+            "start": start - self._origin,
+            "stop": stop - self._origin,
+            "cpu_time": cpu_time,
+            "nbytes": nbytes,
+            "thread": thread.ident,
+            "thread_name": thread.name,
+        }
+        event.update(more)
+
+        with self._lock:
+            self._events.append(event)
+            if branch is None:
+                return
+            stats = self._stats(branch)
+            if name == "fetch":
+                stats["num_baskets"] += 1
+                stats["compressed_bytes"] += nbytes
+                stats["fetch_wait"] = max(stats["fetch_wait"], stop - start)
+            elif name == "decompress":
+                stats["uncompressed_bytes"] += nbytes
+                stats["decompression_time"] += cpu_time
+            elif name == "interpret":
+                stats["interpretation_time"] += cpu_time
+                self._held[branch] = self._held.get(branch, 0) + (nbytes or 0)
+            elif name == "finalize":
+                stats["interpretation_time"] += cpu_time
+                stats["peak_memory"] = max(
+                    stats["peak_memory"], self._held.pop(branch, 0) + (nbytes or 0)
+                )
+
+    def table(self, sort_by="total_time"):
+        """
+        Args:
+            sort_by (str): Name of the measurement by which the ``TBranches``
+                are sorted, largest first, or ``"total_time"`` for the sum
+                of ``fetch_wait``, ``decompression_time``, and
+                ``interpretation_time``. If None, the ``TBranches`` are not
+                sorted.
+
+        Returns the :ref:`uproot.profiling.Profile.branches` as a text table,
+        one row per ``TBranch``, with the costliest ``TBranches`` at the top.
+        """
+        rows = list(self.branches.items())
+        if sort_by == "total_time":
+            rows.sort(
+                key=lambda row: (
+                    -(
+                        row[1]["fetch_wait"]
+                        + row[1]["decompression_time"]
+                        + row[1]["interpretation_time"]
+                    )
+                )
+            )
+        elif sort_by is not None:
+            if sort_by not in _columns:
+                raise ValueError(
+                    f"sort_by must be one of {['total_time', *_columns]}, not {sort_by!r}"
+                )
+            rows.sort(key=lambda row: -row[1][sort_by])
+
+        header = [
+            "branch",
+            "baskets",
+            "compressed",
+            "uncompressed",
+            "fetch wait",
+            "decompress",
+            "interpret",
+            "peak memory",
+        ]
+        lines = [
+            [
+                name,
+                str(stats["num_baskets"]),
+                _format_bytes(stats["compressed_bytes"]),
+                _format_bytes(stats["uncompressed_bytes"]),
+                _format_seconds(stats["fetch_wait"]),
+                _format_seconds(stats["decompression_time"]),
+                _format_seconds(stats["interpretation_time"]),
+                _format_bytes(stats["peak_memory"]),
+            ]
+            for name, stats in rows
+        ]
+        widths = [max(len(x[i]) for x in [header, *lines]) for i in range(len(header))]
+        out = []
+        for line in [header, *lines]:
+            out.append(
+                "  ".join(
+                    [line[0].ljust(widths[0])]
+                    + [x.rjust(w) for x, w in zip(line[1:], widths[1:], strict=True)]
+                ).rstrip()
+            )
+        out.insert(1, "-" * len(out[0]))
+        return "\n".join(out)
+
+    def to_pandas(self):
+        """
+        Returns the :ref:`uproot.profiling.Profile.branches` as a Pandas
+        DataFrame, one row per ``TBranch``.
+        """
+        pandas = uproot.extras.pandas()
+        branches = self.branches
+        return pandas.DataFrame(
+            [[stats[x] for x in _columns] for stats in branches.values()],
+            index=pandas.Index(list(branches), name="branch"),
+            columns=_columns,
+        )
+
+    def chrome_trace(self):
+        """
+        Returns the :ref:`uproot.profiling.Profile.events` as a dict in the
+        Chrome Trace Event Format (which can be saved as JSON with
+        :ref:`uproot.profiling.Profile.write_chrome_trace`).
+
+        Decompression, interpretation, and expression evaluation are complete
+        events on the threads that performed them; fetches, which overlap,
+        are asynchronous events from the request to the arrival of each
+        ``TBasket``.
+        """
+        pid = os.getpid()
+        trace = []
+        threads = {}
+        for i, event in enumerate(self.events):
+            threads[event["thread"]] = event["thread_name"]
+            args = {
+                k: v
+                for k, v in event.items()
+                if k not in ("name", "start", "stop", "thread", "thread_name")
+                and v is not None
+            }
+            title = event["name"] if event["branch"] is None else event["branch"]
+            common = {
+                "name": title,
+                "cat": event["name"],
+                "pid": pid,
+                "tid": event["thread"],
+            }
+            if event["name"] == "fetch":
+                trace.append(
+                    {
+                        **common,
+                        "ph": "b",
+                        "id": i,
+                        "ts": event["start"] * 1e6,
+                        "args": args,
+                    }
+                )
+                trace.append({**common, "ph": "e", "id": i, "ts": event["stop"] * 1e6})
+            else:
+                trace.append(
+                    {
+                        **common,
+                        "ph": "X",
+                        "ts": event["start"] * 1e6,
+                        "dur": (event["stop"] - event["start"]) * 1e6,
+                        "args": args,
+                    }
+                )
+        for tid, name in threads.items():
+            trace.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+            )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """
+        Args:
+            path (str or ``pathlib.Path``): File to write.
+
+        Writes the :ref:`uproot.profiling.Profile.chrome_trace` to a JSON
+        file, which can be opened in `Perfetto <https://ui.perfetto.dev>`__ or
+        ``chrome://tracing``.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+def _regularize_profile(profile):
+    if profile is None or profile is False:
+        return None
+    elif profile is True:
+        return Profile()
+    elif isinstance(profile, Profile):
+        return profile
+    else:
+        raise TypeError(
+            f"profile must be a bool, None, or uproot.Profile, not {profile!r}"
+        )
+
+
+def _format_bytes(nbytes):
+    if nbytes < 1000:
+        return f"{nbytes:.0f} B"
+    value, unit = nbytes / 1000, 0
+    while value >= 1000 and unit < 2:
+        value, unit = value / 1000, unit + 1
+    return f"{value:.1f} {['kB', 'MB', 'GB'][unit]}"
+
+
+def _format_seconds(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds:.3f} s"
@@ -85,11 +85,19 @@ def open(
     * timeout (float for HTTP, int for XRootD; 30)
     * max_num_elements (None or int; None)
         The maximum number of elements to be requested in a single vector read, when using XRootD.
+    * max_concurrent_requests (None or int; None)
+        The maximum number of coalesced requests in flight at the same time for a file
+        opened with fsspec (:doc:`uproot.source.fsspec.FSSpecSource`).
     * num_workers (int; 1)
     * use_threads (bool; False on the emscripten platform (i.e. in a web browser), else True)
     * num_fallback_workers (int; 10)
     * begin_chunk_size (memory_size; 403, the smallest a ROOT file can be)
     * minimal_ttree_metadata (bool; True)
+    * zero_copy (bool; False)
+        If True and the file is memory-mapped (``handler=uproot.MemmapSource``),
+        arrays of uncompressed numerical data that come from a single ``TBasket``
+        are views of the file, rather than copies, and keep the file's byte order.
+        Only ``library="np"`` can represent big-endian data without a copy.
 
     Any object derived from a ROOT file is a context manager (works in Python's
     ``with`` statement) that closes the file when exiting the ``with`` block.
@@ -176,6 +184,7 @@ open.defaults = {
     "begin_chunk_size": 403,  # the smallest a ROOT file can be
     "minimal_ttree_metadata": True,
     "http_max_header_bytes": 21784,
+    "zero_copy": False,
 }
 
 
@@ -529,11 +538,19 @@ class ReadOnlyFile(CommonFileMethods):
     * timeout (float for HTTP, int for XRootD; 30)
     * max_num_elements (None or int; None)
        The maximum number of elements to be requested in a single vector read, when using XRootD.
+    * max_concurrent_requests (None or int; None)
+       The maximum number of coalesced requests in flight at the same time for a file
+       opened with fsspec (:doc:`uproot.source.fsspec.FSSpecSource`).
     * num_workers (int; 1)
     * use_threads (bool; False on the emscripten platform (i.e. in a web browser), else True)
     * num_fallback_workers (int; 10)
     * begin_chunk_size (memory_size; 403, the smallest a ROOT file can be)
     * minimal_ttree_metadata (bool; True)
+    * zero_copy (bool; False)
+        If True and the file is memory-mapped (``handler=uproot.MemmapSource``),
+        arrays of uncompressed numerical data that come from a single ``TBasket``
+        are views of the file, rather than copies, and keep the file's byte order.
+        Only ``library="np"`` can represent big-endian data without a copy.
 
     See the `ROOT TFile documentation <https://root.cern.ch/doc/master/classTFile.html>`__
     for a specification of ``TFile`` header fields.
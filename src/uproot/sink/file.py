@@ -7,12 +7,32 @@ Defines a :doc:`uproot.sink.file.FileSink`, which can wrap a Python file-like ob
 that has ``read``, ``write``, ``seek``, ``tell``, and ``flush`` methods and has a
 context manager (Python's ``with`` statement) to ensure that files are properly closed
 (although files are flushed after every object-write).
+
+With a ``write_buffer_size``, the :doc:`uproot.sink.file.FileSink` is a write-behind
+buffer instead: writes are collected in memory, where repeated writes to the same
+region (such as metadata that is rewritten after every TBasket) are merged, and are
+handed to a background thread in large, sequential writes when more than
+``write_buffer_size`` bytes are pending at a ``flush``. The file on disk is only
+guaranteed to be complete after :ref:`uproot.sink.file.FileSink.checkpoint` or
+``close``.
+
+With ``positioned_writes=True``, the :doc:`uproot.sink.file.FileSink` writes and
+reads with ``os.pwrite`` and ``os.pread`` at explicit positions, rather than ``seek``
+followed by ``write``, so that it can be written from several threads at once: since
+the writer allocates the location of each TBasket before writing it, threads that
+compressed TBaskets can also write them, each to its own part of the file. If the
+file has no file descriptor or the platform has no ``os.pwrite``, the writes are
+serialized with a lock instead.
 """
 
 from __future__ import annotations
 
+import bisect
+import contextlib
 import numbers
 import os
+import queue
+import threading
 from typing import IO
 
 import fsspec
@@ -27,17 +47,54 @@ class FileSink:
             filesystem URL that specifies the file to open by fsspec. If a file-like object, it
             must have ``read``, ``write``, ``seek``, ``tell``, and ``flush`` methods.
 
+        write_buffer_size (None or int): If None, every ``write`` goes directly to
+            the file and every ``flush`` flushes it. Otherwise, writes are buffered
+            in memory and written by a background thread when at least this many
+            bytes are pending at a ``flush`` (see :doc:`uproot.sink.file`).
+        positioned_writes (bool): If True, ``write`` and ``read`` are safe to call
+            from several threads at once (see :doc:`uproot.sink.file`). This
+            can't be combined with a ``write_buffer_size``.
+
     An object that can write (and read) files on a local or remote filesystem.
     It can be initialized from a file-like object (already opened) or a filesystem URL.
     If initialized from a filesystem URL, fsspec is used to open the file.
     In this case the file is opened in the first read or write operation.
     """
 
-    def __init__(self, urlpath_or_file_like: str | IO, **storage_options):
+    def __init__(
+        self,
+        urlpath_or_file_like: str | IO,
+        *,
+        write_buffer_size: int | None = None,
+        positioned_writes: bool = False,
+        **storage_options,
+    ):
         self._open_file = None
         self._file = None
+        self._descriptor = None
         self._closed = False
 
+        if write_buffer_size is not None and (
+            not uproot._util.isint(write_buffer_size) or write_buffer_size < 0
+        ):
+            raise ValueError(
+                "write_buffer_size must be None or a non-negative integer, "
+                f"not {write_buffer_size!r}"
+            )
+        self._write_buffer_size = write_buffer_size
+        if positioned_writes and write_buffer_size is not None:
+            raise ValueError(
+                "positioned_writes and write_buffer_size can't be used together"
+            )
+        self._positioned_writes = bool(positioned_writes)
+        self._lock = threading.Lock()
+        self._pending_starts = []
+        self._pending_buffers = []
+        self._pending_length = None
+        self._writer = None
+        self._writer_queue = None
+        self._writer_error = None
+
         if uproot._util.is_file_like(
             urlpath_or_file_like, readable=False, writable=False, seekable=False
         ):
@@ -100,34 +157,193 @@ class FileSink:
         Opens the file if it is not already open.
         Sets the file's position to the beginning.
         """
+        self._open()
+        self._file.seek(0)
+
+    def _open(self):
         if self._closed:
             raise OSError(f"file sink is closed{self.in_path}")
 
         if not self._file:
             self._file = self._open_file.open()
+            self._descriptor = None
 
-        self._file.seek(0)
+    def _fileno(self):
+        """
+        Returns the file descriptor to use with ``os.pwrite`` and ``os.pread``,
+        or None if the file doesn't have one or the platform has no ``os.pwrite``.
+        """
+        self._open()
+        if self._descriptor is None:
+            self._descriptor = -1
+            if hasattr(os, "pwrite"):
+                with contextlib.suppress(AttributeError, OSError, ValueError):
+                    self._descriptor = self._file.fileno()
+        return None if self._descriptor < 0 else self._descriptor
 
     def __getstate__(self):
+        if self._write_buffer_size is not None and not self._closed:
+            self._drain()
         state = dict(self.__dict__)
         state.pop("_file")
+        state.pop("_descriptor")
+        state.pop("_lock")
+        state.pop("_writer")
+        state.pop("_writer_queue")
         return state
 
     def __setstate__(self, state):
         self.__dict__ = state
         self._file = None
+        self._descriptor = None
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_queue = None
+
+    @property
+    def write_buffer_size(self) -> int | None:
+        """
+        If None, writes go directly to the file; otherwise, the number of pending
+        bytes at which a ``flush`` hands them to the background writer.
+        """
+        return self._write_buffer_size
+
+    @property
+    def positioned_writes(self) -> bool:
+        """
+        If True, ``write`` and ``read`` may be called from several threads at once.
+        """
+        return self._positioned_writes
+
+    @property
+    def num_pending_bytes(self) -> int:
+        """
+        The number of bytes that have been written to the sink but not yet handed
+        to the background writer.
+        """
+        return sum(len(buffer) for buffer in self._pending_buffers)
+
+    def _buffer(self, location, serialization):
+        data = memoryview(serialization).cast("B")
+        stop = location + len(data)
+        starts, buffers = self._pending_starts, self._pending_buffers
+
+        # pending buffers [i, j) overlap or touch [location, stop)
+        i = bisect.bisect_left(starts, location)
+        if i > 0 and starts[i - 1] + len(buffers[i - 1]) >= location:
+            i -= 1
+        j = bisect.bisect_right(starts, stop)
+
+        if i == j:
+            starts.insert(i, location)
+            buffers.insert(i, bytearray(data))
+        elif j == i + 1 and starts[i] <= location:
+            # the common cases: overwriting or appending to one buffer
+            offset = location - starts[i]
+            buffers[i][offset : offset + len(data)] = data
+        else:
+            begin = min(location, starts[i])
+            end = max(stop, starts[j - 1] + len(buffers[j - 1]))
+            merged = bytearray(end - begin)
+            for start, buffer in zip(starts[i:j], buffers[i:j], strict=True):
+                merged[start - begin : start - begin + len(buffer)] = buffer
+            merged[location - begin : stop - begin] = data
+            starts[i:j] = [begin]
+            buffers[i:j] = [merged]
+        return len(data)
+
+    def _hand_off(self):
+        if self._writer_error is not None:
+            err, self._writer_error = self._writer_error, None
+            raise err
+        if len(self._pending_starts) == 0 and self._pending_length is None:
+            return
+        if self._writer is None:
+            self._writer_queue = queue.Queue(maxsize=2)
+            self._writer = threading.Thread(
+                target=self._write_behind, args=(self._writer_queue,), daemon=True
+            )
+            self._writer.start()
+        # don't seek: the background writer may be using the file
+        self._open()
+        self._writer_queue.put(
+            (self._pending_starts, self._pending_buffers, self._pending_length)
+        )
+        self._pending_starts = []
+        self._pending_buffers = []
+        self._pending_length = None
+
+    def _write_behind(self, work_queue):
+        while True:
+            batch = work_queue.get()
+            try:
+                if batch is None:
+                    return
+                starts, buffers, length = batch
+                if self._writer_error is None:
+                    for start, buffer in zip(starts, buffers, strict=True):
+                        self._file.seek(start)
+                        self._file.write(buffer)
+                    if length is not None:
+                        self._extend_file(length)
+            except BaseException as err:
+                # raised by the next flush; KeyboardInterrupt and the like also
+                # stop this thread
+                self._writer_error = err
+                if not isinstance(err, Exception):
+                    raise
+            finally:
+                work_queue.task_done()
+
+    def _drain(self):
+        self._hand_off()
+        if self._writer_queue is not None:
+            self._writer_queue.join()
+        if self._writer_error is not None:
+            err, self._writer_error = self._writer_error, None
+            raise err
+
+    def checkpoint(self) -> None:
+        """
+        Writes everything that is pending to the file and flushes it.
+
+        Without a ``write_buffer_size``, this is the same as ``flush``.
+        """
+        if self._write_buffer_size is not None:
+            self._drain()
+        if self._positioned_writes and self._fileno() is not None:
+            return
+        self._ensure()
+        self._file.flush()
 
     def tell(self) -> int:
         """
         Calls the file or file-like object's ``tell`` method.
         """
+        if self._write_buffer_size is not None:
+            self._drain()
         self._ensure()
         return self._file.tell()
 
     def flush(self) -> None:
         """
         Calls the file or file-like object's ``flush`` method.
+
+        With a ``write_buffer_size``, this only hands pending writes to the
+        background writer if at least ``write_buffer_size`` bytes are pending;
+        use :ref:`uproot.sink.file.FileSink.checkpoint` to force them to disk.
         """
+        if self._write_buffer_size is not None:
+            if self.num_pending_bytes >= self._write_buffer_size:
+                self._hand_off()
+            return None
+        if self._positioned_writes:
+            # os.pwrite doesn't go through the file object's buffer
+            if self._fileno() is None:
+                with self._lock:
+                    self._ensure()
+                    self._file.flush()
+            return None
         self._ensure()
         return self._file.flush()
 
@@ -143,11 +359,25 @@ class FileSink:
         Closes the file (calls ``close`` if it has such a method) and marks the
         sink as closed so that closure is permanent: subsequent reads or writes
         raise instead of silently reopening the file.
+
+        With a ``write_buffer_size``, everything that is pending is written first.
         """
-        if self._file is not None and hasattr(self._file, "close"):
-            self._file.close()
-        self._file = None
-        self._closed = True
+        if self._closed:
+            return
+        try:
+            if self._write_buffer_size is not None:
+                self._drain()
+        finally:
+            if self._writer is not None:
+                self._writer_queue.put(None)
+                self._writer.join()
+                self._writer = None
+                self._writer_queue = None
+            if self._file is not None and hasattr(self._file, "close"):
+                self._file.close()
+            self._file = None
+            self._descriptor = None
+            self._closed = True
 
     def __enter__(self):
         return self
@@ -167,18 +397,61 @@ class FileSink:
 
         Writes data to the file at a specific location, calling the file-like
         object's ``seek`` and ``write`` methods.
+
+        With a ``write_buffer_size``, the data are only copied into the buffer.
+        With ``positioned_writes``, the data are written with ``os.pwrite``.
         """
+        if self._write_buffer_size is not None:
+            if self._closed:
+                raise OSError(f"file sink is closed{self.in_path}")
+            return self._buffer(location, serialization)
+        if self._positioned_writes:
+            return self._pwrite(location, serialization)
         self._ensure()
         self._file.seek(location)
         return self._file.write(serialization)
 
+    def _pwrite(self, location, serialization):
+        descriptor = self._fileno()
+        if descriptor is None:
+            with self._lock:
+                self._ensure()
+                self._file.seek(location)
+                return self._file.write(serialization)
+
+        data = memoryview(serialization).cast("B")
+        num_written = 0
+        while num_written < len(data):
+            num_written += os.pwrite(
+                descriptor, data[num_written:], location + num_written
+            )
+        return num_written
+
     def set_file_length(self, length: int):
         """
         Sets the file's length to ``length``, truncating with zeros if necessary.
 
         Calls ``seek``, ``tell``, and possibly ``write``.
         """
+        if self._write_buffer_size is not None:
+            if self._closed:
+                raise OSError(f"file sink is closed{self.in_path}")
+            self._pending_length = max(self._pending_length or 0, length)
+            return
+        if self._positioned_writes:
+            descriptor = self._fileno()
+            if descriptor is not None:
+                if os.fstat(descriptor).st_size < length:
+                    os.ftruncate(descriptor, length)
+                return
+            with self._lock:
+                self._ensure()
+                self._extend_file(length)
+            return
         self._ensure()
+        self._extend_file(length)
+
+    def _extend_file(self, length: int):
         self._file.seek(0, os.SEEK_END)
         missing = length - self._file.tell()
         if missing > 0:
@@ -197,9 +470,14 @@ class FileSink:
         object's ``seek`` and ``read`` methods. The ``insist`` parameter can be
         used to ensure that the output has the requested length.
         """
-        self._ensure()
-        self._file.seek(location)
-        out = self._file.read(num_bytes)
+        if self._write_buffer_size is not None:
+            self._drain()
+        if self._positioned_writes:
+            out = self._pread(location, num_bytes)
+        else:
+            self._ensure()
+            self._file.seek(location)
+            out = self._file.read(num_bytes)
         if insist is True:
             if len(out) != num_bytes:
                 raise OSError(
@@ -210,3 +488,21 @@ class FileSink:
                 f"could not read {insist} bytes from the file at position {location}{self.in_path}"
             )
         return out
+
+    def _pread(self, location, num_bytes):
+        descriptor = self._fileno()
+        if descriptor is None:
+            with self._lock:
+                self._ensure()
+                self._file.seek(location)
+                return self._file.read(num_bytes)
+
+        chunks = []
+        while num_bytes > 0:
+            chunk = os.pread(descriptor, num_bytes, location)
+            if len(chunk) == 0:
+                break
+            chunks.append(chunk)
+            location += len(chunk)
+            num_bytes -= len(chunk)
+        return b"".join(chunks)
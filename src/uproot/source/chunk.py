@@ -115,6 +115,20 @@ class Source:
         chunks to be filled.
         """
 
+    def advise_will_need(self, ranges: list[tuple[int, int]]):
+        """
+        Args:
+            ranges (list of (int, int) 2-tuples): Intervals that are about to
+                be requested with :ref:`uproot.source.chunk.Source.chunks`.
+
+        Hints that a set of byte ranges will be read soon, so that the source
+        can start bringing them into memory before they are needed.
+
+        This is only a hint: it does not return anything, and the default
+        implementation does nothing. Sources that read from the local
+        filesystem can use it to ask the operating system to read ahead.
+        """
+
     @property
     def file_path(self) -> str:
         """
@@ -194,7 +208,9 @@ class MultithreadedSource(Source):
         self._num_requested_chunks += 1
         self._num_requested_bytes += stop - start
 
-        future = self.ResourceClass.future(self, start, stop)
+        future = self._scheduled(
+            self.ResourceClass.future(self, start, stop), start, stop
+        )
         chunk = Chunk(self, start, stop, future)
         self._executor.submit(future)
         return chunk
@@ -208,13 +224,24 @@ class MultithreadedSource(Source):
 
         chunks = []
         for start, stop in ranges:
-            future = self.ResourceClass.future(self, start, stop)
+            future = self._scheduled(
+                self.ResourceClass.future(self, start, stop), start, stop
+            )
             chunk = Chunk(self, start, stop, future)
             future._set_notify(notifier(chunk, notifications))
             self._executor.submit(future)
             chunks.append(chunk)
         return chunks
 
+    def _scheduled(self, future, start: int, stop: int):
+        # see uproot.source.scheduler; the task waits in the worker thread
+        future._task = uproot.source.scheduler.scheduled_task(
+            future._task,
+            uproot.source.scheduler.endpoint(self._file_path),
+            stop - start,
+        )
+        return future
+
     @property
     def executor(self):
         """
@@ -12,6 +12,8 @@ from collections.abc import Callable
 from concurrent.futures import Future
 from dataclasses import dataclass
 
+import numpy
+
 import uproot.source.chunk
 
 
@@ -91,15 +93,21 @@ class CoalescedRequest:
 
 
 def _merge_adjacent(ranges: list[RangeRequest], config: CoalesceConfig):
-    sorted_ranges = sorted(ranges, key=lambda r: r.start)
-    cluster = Cluster([])
-    for current_range in sorted_ranges:
-        if cluster.ranges and current_range.start - cluster.stop > config.max_range_gap:
-            yield cluster
-            cluster = Cluster([])
-        cluster.append(current_range)
-    if cluster.ranges:
-        yield cluster
+    if len(ranges) == 0:
+        return
+    starts = numpy.fromiter((r.start for r in ranges), numpy.int64, len(ranges))
+    stops = numpy.fromiter((r.stop for r in ranges), numpy.int64, len(ranges))
+    order = numpy.argsort(starts, kind="stable")
+    starts, stops = starts[order], stops[order]
+    # a cluster's stop is the maximum stop of its ranges so far, and a range
+    # that starts more than max_range_gap beyond it starts a new cluster
+    running_stop = numpy.maximum.accumulate(stops)
+    breaks = numpy.nonzero(starts[1:] - running_stop[:-1] > config.max_range_gap)[0]
+    sorted_ranges = [ranges[i] for i in order.tolist()]
+    first = 0
+    for last in [*(breaks + 1).tolist(), len(ranges)]:
+        yield Cluster(sorted_ranges[first:last], int(running_stop[last - 1]))
+        first = last
 
 
 def _coalesce(ranges: list[RangeRequest], config: CoalesceConfig):
@@ -14,6 +14,8 @@ If the filesystem or operating system does not support memory-mapped files, the
 
 from __future__ import annotations
 
+import contextlib
+import mmap
 import os.path
 import queue
 
@@ -88,19 +90,38 @@ class FileResource(uproot.source.chunk.Resource):
         return uproot.source.futures.ResourceFuture(task)
 
 
+_MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)
+
+
+def _madvise(mapping, start: int, stop: int, size: int):
+    stop = min(stop, size)
+    if start < stop:
+        # only a hint; the data will still be read when it's accessed
+        with contextlib.suppress(OSError):
+            mapping.madvise(_MADV_WILLNEED, start, stop - start)
+
+
 class MemmapSource(uproot.source.chunk.Source):
     """
     Args:
         file_path (str): The filesystem path of the file to open.
-        options: Must include ``"num_fallback_workers"``.
+        options: Must include ``"num_fallback_workers"``; may include
+            ``"zero_copy"``.
 
     A :doc:`uproot.source.chunk.Source` that manages one memory-mapped file.
+
+    If ``zero_copy`` is True, arrays read from uncompressed ``TBaskets`` may
+    be views of the memory-mapped file (see
+    :ref:`uproot.source.file.MemmapSource.zero_copy`). Closing the source then
+    only releases its reference to the mapping; the operating system unmaps
+    the file when the last array that views it is garbage collected.
     """
 
     _dtype = uproot.source.chunk.Chunk._dtype
 
     def __init__(self, file_path: str, **options):
         self._num_fallback_workers = options["num_fallback_workers"]
+        self._zero_copy = options.get("zero_copy", False)
         self._fallback_opts = options
         self._num_requests = 0
         self._num_requested_chunks = 0
@@ -183,6 +204,43 @@ class MemmapSource(uproot.source.chunk.Source):
         else:
             return self._fallback.chunks(ranges, notifications)
 
+    def advise_will_need(self, ranges: list[tuple[int, int]]):
+        """
+        Args:
+            ranges (list of (int, int) 2-tuples): Intervals that are about to
+                be requested with :ref:`uproot.source.file.MemmapSource.chunks`.
+
+        Calls ``madvise(MADV_WILLNEED)`` on the pages that cover ``ranges``, so
+        that the operating system can read them ahead of time instead of
+        faulting them in one page at a time. Overlapping and neighboring
+        ranges are merged into as few calls as possible.
+
+        Does nothing if the platform does not support ``madvise`` or if the
+        file could not be memory-mapped.
+        """
+        if self._fallback is not None:
+            self._fallback.advise_will_need(ranges)
+            return
+
+        if _MADV_WILLNEED is None or len(ranges) == 0 or self.closed:
+            return
+
+        mapping = self._file._mmap
+        size = mapping.size()
+
+        previous_start, previous_stop = None, None
+        for start, stop in sorted(ranges):
+            start = start - start % mmap.PAGESIZE  # noqa: PLW2901 (page-aligned)
+            if previous_stop is not None and start <= previous_stop:
+                previous_stop = max(previous_stop, stop)
+                continue
+            if previous_stop is not None:
+                _madvise(mapping, previous_start, previous_stop, size)
+            previous_start, previous_stop = start, stop
+
+        if previous_stop is not None:
+            _madvise(mapping, previous_start, previous_stop, size)
+
     @property
     def file(self):
         """
@@ -190,6 +248,18 @@ class MemmapSource(uproot.source.chunk.Source):
         """
         return self._file
 
+    @property
+    def zero_copy(self) -> bool:
+        """
+        If True, arrays of uncompressed numerical data may be returned as
+        views of the memory-mapped file, rather than copies.
+
+        This is only True if the ``zero_copy`` option was requested and the
+        file was successfully memory-mapped (there is no
+        :ref:`uproot.source.file.MemmapSource.fallback`).
+        """
+        return self._zero_copy and self._fallback is None
+
     @property
     def fallback(self):
         """
@@ -204,7 +274,7 @@ class MemmapSource(uproot.source.chunk.Source):
     @property
     def closed(self) -> bool:
         if self._fallback is None:
-            return self._file._mmap.closed
+            return self._file is None or self._file._mmap.closed
         else:
             return self._fallback.closed
 
@@ -218,7 +288,13 @@ class MemmapSource(uproot.source.chunk.Source):
 
     def __exit__(self, exception_type, exception_value, traceback):
         if self._fallback is None:
-            if hasattr(self._file._mmap, "__exit__"):
+            if self._file is None:
+                pass
+            elif self._zero_copy:
+                # arrays returned to the user may be views of the mapping, so
+                # leave it to be unmapped when the last of them is deleted
+                self._file = None
+            elif hasattr(self._file._mmap, "__exit__"):
                 self._file._mmap.__exit__(exception_type, exception_value, traceback)
             else:
                 self._file._mmap.close()
@@ -228,6 +304,8 @@ class MemmapSource(uproot.source.chunk.Source):
     @property
     def num_bytes(self) -> int:
         if self._fallback is None:
+            if self._file is None:
+                raise OSError(f"memmap is closed for file {self._file_path}")
             return self._file._mmap.size()
         else:
             return self._fallback.num_bytes
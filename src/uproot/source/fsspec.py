@@ -5,16 +5,20 @@ from __future__ import annotations
 import asyncio
 import concurrent.futures
 import contextlib
+import dataclasses
 import queue
 import re
+import threading
 
 import fsspec
 import fsspec.asyn
 import fsspec.implementations.cached
+import fsspec.spec
 
 import uproot
 import uproot.source.chunk
 import uproot.source.futures
+import uproot.source.scheduler
 from uproot.source.coalesce import CoalesceConfig, coalesce_requests
 
 # Patterns for known problematic servers
@@ -36,24 +40,63 @@ def _maybe_wrap_remote_url(url: str) -> str:
     return url
 
 
+@dataclasses.dataclass
+class FSSpecPerformanceCounters(uproot.source.chunk.SourcePerformanceCounters):
+    """
+    Container for performance counters of a
+    :doc:`uproot.source.fsspec.FSSpecSource`, which adds the name of the
+    fsspec backend (its protocol) and the number of calls to each of the
+    backend's reading methods (``"cat_file"``, ``"cat_ranges"``, or
+    ``"_cat_ranges"``).
+    """
+
+    backend: str
+    num_backend_requests: dict[str, int]
+
+
 class FSSpecSource(uproot.source.chunk.Source):
     """
     Args:
         file_path (str): A URL for the file to open.
         coalesce_config (struct, optional): Configuration options for read coalescing
+        max_concurrent_requests (None or int): The maximum number of coalesced
+            requests that may be in flight at the same time for this source,
+            which is also passed to the backend as the ``batch_size`` of its
+            batched range reads. If None, there is no limit beyond the
+            backend's own default.
         **kwargs (dict): any extra arguments to be forwarded to the particular
             FileSystem instance constructor. This might include S3 access keys,
             or HTTP headers, etc.
 
     A :doc:`uproot.source.chunk.Source` that uses FSSpec's cat_ranges feature
     to get many chunks in one request.
+
+    Backends with a native batched range read (async filesystems'
+    ``_cat_ranges`` or an overridden ``cat_ranges``) receive each coalesced
+    request as a single call (see
+    :ref:`uproot.source.fsspec.FSSpecSource.native_batching`); other backends
+    are called in a thread, one coalesced request at a time.
     """
 
     def __init__(
-        self, file_path: str, coalesce_config: CoalesceConfig | None = None, **options
+        self,
+        file_path: str,
+        coalesce_config: CoalesceConfig | None = None,
+        max_concurrent_requests: int | None = None,
+        **options,
     ):
         super().__init__()
         self._coalesce_config = coalesce_config
+        if max_concurrent_requests is not None and (
+            not uproot._util.isint(max_concurrent_requests)
+            or max_concurrent_requests < 1
+        ):
+            raise ValueError(
+                "max_concurrent_requests must be None or a positive integer, "
+                f"not {max_concurrent_requests!r}"
+            )
+        self._max_concurrent_requests = max_concurrent_requests
+        self._num_backend_requests = {}
 
         file_path = _maybe_wrap_remote_url(file_path)
 
@@ -61,15 +104,32 @@ class FSSpecSource(uproot.source.chunk.Source):
             k: v for k, v in options.items() if k not in uproot.reading.open.defaults
         }
         self._file_path_orig = file_path
+        # the fsspec path has no protocol, so it's not used for the endpoint
+        self._endpoint = uproot.source.scheduler.endpoint(file_path)
         self._open()
 
     def _open(self):
         self._executor = FSSpecLoopExecutor()
+        # the counters are updated by the threads that call chunk and chunks
+        # and by the executor's threads
+        self._counters_lock = threading.Lock()
         self._open_file = fsspec.open(self._file_path_orig, **self._fsspec_options)
         self._fs = self._open_file.fs
         self._file_path = self._open_file.path
         self._fo = self._open_file.__enter__()
         self._async_impl = self._fs.async_impl
+        # _cat_ranges is async while cat_ranges is not. Avoid the native
+        # async path for caching filesystems, whose _cat_ranges is not async.
+        self._use_async = self._async_impl and not isinstance(
+            self._fs, fsspec.implementations.cached.CachingFileSystem
+        )
+        self._native_batching = self._use_async or (
+            type(self._fs).cat_ranges is not fsspec.spec.AbstractFileSystem.cat_ranges
+        )
+        if self._max_concurrent_requests is None:
+            self._semaphore = None
+        else:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent_requests)
         self._closed = False
 
     def __repr__(self):
@@ -84,6 +144,8 @@ class FSSpecSource(uproot.source.chunk.Source):
         state.pop("_open_file")
         state.pop("_fo")
         state.pop("_fs")
+        state.pop("_semaphore")
+        state.pop("_counters_lock")
         return state
 
     def __setstate__(self, state):
@@ -122,10 +184,17 @@ class FSSpecSource(uproot.source.chunk.Source):
         if self.closed:
             raise OSError(f"file {self._file_path!r} is closed")
 
-        self._num_requests += 1
-        self._num_requested_chunks += 1
-        self._num_requested_bytes += stop - start
-        data = self._fs.cat_file(self._file_path, start=start, end=stop)
+        with self._counters_lock:
+            self._num_requests += 1
+            self._num_requested_chunks += 1
+            self._num_requested_bytes += stop - start
+        self._count_backend_request("cat_file")
+        scheduler = uproot.source.scheduler.get_scheduler()
+        if scheduler is None:
+            data = self._fs.cat_file(self._file_path, start=start, end=stop)
+        else:
+            with scheduler.scheduled(self._endpoint, stop - start):
+                data = self._fs.cat_file(self._file_path, start=start, end=stop)
         future = uproot.source.futures.TrivialFuture(data)
         return uproot.source.chunk.Chunk(self, start, stop, future)
 
@@ -162,15 +231,20 @@ class FSSpecSource(uproot.source.chunk.Source):
         if self.closed:
             raise OSError(f"file {self._file_path!r} is closed")
 
-        self._num_requests += 1
-        self._num_requested_chunks += len(ranges)
-        self._num_requested_bytes += sum(stop - start for start, stop in ranges)
+        with self._counters_lock:
+            self._num_requests += 1
+            self._num_requested_chunks += len(ranges)
+            self._num_requested_bytes += sum(stop - start for start, stop in ranges)
 
         async def async_wrapper_thread(blocking_func, *args, **kwargs):
             if not callable(blocking_func):
                 raise TypeError("blocking_func must be callable")
             return await asyncio.to_thread(blocking_func, *args, **kwargs)
 
+        async def limit_concurrency(coroutine):
+            async with self._semaphore:
+                return await coroutine
+
         def submit(request_ranges: list[tuple[int, int]]):
             paths = [self._file_path] * len(request_ranges)
             starts = [start for start, _ in request_ranges]
@@ -178,27 +252,83 @@ class FSSpecSource(uproot.source.chunk.Source):
             if uproot._util.wasm:
                 # Threads can't be spawned in pyodide yet, so we run the function directly
                 # and return a future that is already resolved.
+                self._count_backend_request("cat_ranges")
                 return uproot.source.futures.TrivialFuture(
                     self._fs.cat_ranges(paths=paths, starts=starts, ends=ends)
                 )
-            # _cat_ranges is async while cat_ranges is not. Avoid the native
-            # async path for caching filesystems, whose _cat_ranges is not async.
-            is_caching = isinstance(
-                self._fs, fsspec.implementations.cached.CachingFileSystem
-            )
-            coroutine = (
-                self._fs._cat_ranges(paths=paths, starts=starts, ends=ends)
-                if self._async_impl and not is_caching
-                else async_wrapper_thread(
+            if self._use_async:
+                self._count_backend_request("_cat_ranges")
+                batch_options = {}
+                if self._max_concurrent_requests is not None:
+                    batch_options["batch_size"] = self._max_concurrent_requests
+                coroutine = self._fs._cat_ranges(
+                    paths=paths, starts=starts, ends=ends, **batch_options
+                )
+            else:
+                self._count_backend_request("cat_ranges")
+                coroutine = async_wrapper_thread(
                     self._fs.cat_ranges, paths=paths, starts=starts, ends=ends
                 )
+            coroutine = uproot.source.scheduler.scheduled_coroutine(
+                coroutine,
+                self._endpoint,
+                sum(stop - start for start, stop in request_ranges),
             )
+            if self._semaphore is not None:
+                coroutine = limit_concurrency(coroutine)
             return self._executor.submit(coroutine)
 
         return coalesce_requests(
             ranges, submit, self, notifications, config=self._coalesce_config
         )
 
+    def _count_backend_request(self, method: str):
+        with self._counters_lock:
+            self._num_backend_requests[method] = (
+                self._num_backend_requests.get(method, 0) + 1
+            )
+
+    @property
+    def native_batching(self) -> bool:
+        """
+        True if the fsspec backend reads many byte ranges in one call, either
+        concurrently in its event loop (async filesystems) or with its own
+        implementation of ``cat_ranges``; False if it falls back to reading
+        the ranges one at a time.
+        """
+        return self._native_batching
+
+    @property
+    def max_concurrent_requests(self) -> int | None:
+        """
+        The maximum number of coalesced requests that may be in flight at the
+        same time, or None for no limit.
+        """
+        return self._max_concurrent_requests
+
+    @property
+    def num_backend_requests(self) -> dict[str, int]:
+        """
+        The number of calls to each of the fsspec backend's reading methods
+        (performance counter).
+        """
+        with self._counters_lock:
+            return dict(self._num_backend_requests)
+
+    @property
+    def performance_counters(self) -> FSSpecPerformanceCounters:
+        protocol = self._fs.protocol
+        if not isinstance(protocol, str):
+            protocol = protocol[0]
+        with self._counters_lock:
+            return FSSpecPerformanceCounters(
+                self._num_requested_bytes,
+                self._num_requests,
+                self._num_requested_chunks,
+                protocol,
+                dict(self._num_backend_requests),
+            )
+
     @property
     def async_impl(self) -> bool:
         """
@@ -27,6 +27,8 @@ import queue
 import threading
 from abc import ABC, abstractmethod
 
+import uproot
+
 
 class Executor(ABC):
     def __repr__(self):
@@ -457,3 +459,129 @@ class ResourceTrivialExecutor(TrivialExecutor):
         self.shutdown()
         self._resource.__exit__(exception_type, exception_value, traceback)
         self._closed = True
+
+
+class _WriteBehind:
+    """
+    Calls ``write`` on each item that is ``put`` in a background thread,
+    keeping up to ``depth`` items waiting. Exceptions are raised in the
+    producer, by the next ``put`` or on exit.
+    """
+
+    _done = object()
+
+    def __init__(self, write, depth):
+        self._write = write
+        self._queue = queue.Queue(maxsize=max(depth, 1))
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._done:
+                return
+            if self._error is None:
+                try:
+                    self._write(item)
+                except BaseException as err:
+                    # raised in the producer; KeyboardInterrupt and the like
+                    # also stop this thread
+                    self._error = err
+                    if not isinstance(err, Exception):
+                        raise
+
+    def put(self, item):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._queue.put(self._done)
+        self._thread.join()
+        if exception_type is None and self._error is not None:
+            raise self._error
+
+
+class _ReadAhead:
+    """
+    Iterates over ``iterator`` in a background thread, keeping up to ``depth``
+    items ready for the consumer. Exceptions are raised in the consumer.
+
+    Requests for the item that the consumer needs next (if none are ready)
+    have the consumer's priority; requests for items beyond it have
+    :ref:`uproot.source.scheduler.PRIORITY_PREFETCH`, so that they wait for
+    the requests of the consumer. If the consumer has to wait, the requests
+    that are already waiting in the scheduler are promoted.
+    """
+
+    _done = object()
+
+    def __init__(self, iterator, depth):
+        self._iterator = iterator
+        self._priority = uproot.source.scheduler.current_priority()
+        self._queue = queue.Queue(maxsize=max(depth, 1))
+        self._stopped = threading.Event()
+        self._thread = None
+        if depth != 0:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _put(self, item):
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _level(self):
+        if self._queue.empty():
+            return self._priority
+        return uproot.source.scheduler.PRIORITY_PREFETCH
+
+    def _run(self):
+        with uproot.source.scheduler.priority(self._level):
+            try:
+                for item in self._iterator:
+                    if not self._put((item, None)):
+                        return
+            except BaseException as err:
+                # raised in the consumer; KeyboardInterrupt and the like also
+                # stop this thread
+                self._put((None, err))
+                if not isinstance(err, Exception):
+                    raise
+            else:
+                self._put((self._done, None))
+
+    def __iter__(self):
+        if self._thread is None:
+            yield from self._iterator
+            return
+
+        while True:
+            scheduler = uproot.source.scheduler.get_scheduler()
+            if scheduler is not None and self._queue.empty():
+                scheduler.promote(self._thread.ident, self._priority)
+            item, err = self._queue.get()
+            if err is not None:
+                raise err
+            if item is self._done:
+                return
+            yield item
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        if hasattr(self._iterator, "close"):
+            self._iterator.close()
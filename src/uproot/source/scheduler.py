@@ -0,0 +1,490 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines a process-wide I/O scheduler, which limits the number of
+requests and the number of bytes that all :doc:`uproot.source.chunk.Source`
+objects in a process have in flight to each storage endpoint.
+
+By default, there is no scheduler and every source sends its requests as soon
+as they are made. To install one:
+
+.. code-block:: python
+
+    uproot.source.scheduler.set_scheduler(
+        uproot.source.scheduler.IOScheduler(
+            max_requests_per_endpoint=16,
+            max_bytes_per_endpoint="256 MB",
+        )
+    )
+
+When a request has to wait, the scheduler chooses which waiting request goes
+next by
+
+1. priority: requests made within :doc:`uproot.source.scheduler.priority`
+   with a lower number go first, so that data needed by the current step of
+   an iteration go before speculative prefetching
+   (:ref:`uproot.source.scheduler.PRIORITY_CURRENT` before
+   :ref:`uproot.source.scheduler.PRIORITY_PREFETCH`);
+2. fair share: among requests of equal priority, the thread with the fewest
+   requests in flight to that endpoint goes first, so that concurrent
+   ``arrays`` calls from different threads share the endpoint;
+3. arrival order.
+
+The background threads that read ahead in :doc:`uproot.batching.batch_loader`,
+:doc:`uproot.writing.conversion.to_parquet`, and
+:doc:`uproot.writing.conversion.convert_to_rntuple` make their requests with
+:ref:`uproot.source.scheduler.PRIORITY_PREFETCH`, except for the step that
+is needed next.
+
+The :doc:`uproot.source.fsspec.FSSpecSource` and all subclasses of
+:doc:`uproot.source.chunk.MultithreadedSource` submit their requests to the
+scheduler. :doc:`uproot.source.file.MemmapSource` and
+:doc:`uproot.source.object.ObjectSource` do not make requests, and the
+multipart requests of :doc:`uproot.source.http.HTTPSource` and the vector
+reads of :doc:`uproot.source.xrootd.XRootDSource` are sent by their own
+protocol libraries, so these are not scheduled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import threading
+import urllib.parse
+from collections.abc import Callable
+
+import uproot
+
+PRIORITY_CURRENT = 0
+PRIORITY_PREFETCH = 10
+
+_scheduler = None
+_thread_local = threading.local()
+
+
+def get_scheduler() -> IOScheduler | None:
+    """
+    Returns the process-wide :doc:`uproot.source.scheduler.IOScheduler` or
+    None if requests are not scheduled.
+    """
+    return _scheduler
+
+
+def set_scheduler(scheduler: IOScheduler | None) -> IOScheduler | None:
+    """
+    Args:
+        scheduler (None or :doc:`uproot.source.scheduler.IOScheduler`): The
+            new process-wide scheduler; if None, requests are not scheduled.
+
+    Installs a process-wide scheduler and returns the one it replaced.
+
+    Requests that were already waiting in the old scheduler are still
+    released by it.
+    """
+    global _scheduler
+    if scheduler is not None and not isinstance(scheduler, IOScheduler):
+        raise TypeError(f"scheduler must be None or an IOScheduler, not {scheduler!r}")
+    old, _scheduler = _scheduler, scheduler
+    return old
+
+
+def current_priority() -> int:
+    """
+    The priority of requests made in this thread (see
+    :doc:`uproot.source.scheduler.priority`).
+    """
+    level = getattr(_thread_local, "priority", PRIORITY_CURRENT)
+    return level() if callable(level) else level
+
+
+@contextlib.contextmanager
+def priority(level: int | Callable[[], int]):
+    """
+    Args:
+        level (int or function): Priority of requests made in this thread
+            within the ``with`` block; lower numbers go first. If a function
+            of no arguments, it is called for the priority of each request
+            when the request is made.
+
+    Context manager that sets the priority of requests made by this thread.
+
+    .. code-block:: python
+
+        with uproot.source.scheduler.priority(uproot.source.scheduler.PRIORITY_PREFETCH):
+            next_step = tree.arrays(entry_start=start, entry_stop=stop)
+    """
+    if not uproot._util.isint(level) and not callable(level):
+        raise TypeError(
+            f"priority level must be an integer or a function, not {level!r}"
+        )
+    previous = getattr(_thread_local, "priority", PRIORITY_CURRENT)
+    _thread_local.priority = level
+    try:
+        yield
+    finally:
+        _thread_local.priority = previous
+
+
+def endpoint(file_path) -> str:
+    """
+    Args:
+        file_path (str): The path or URL of a file.
+
+    Returns the name of the storage endpoint of a file: the scheme and host
+    (with port) of a URL, or ``"file://"`` for local files. For a chained
+    fsspec URL (such as ``"simplecache::s3://bucket/key"``), it is the
+    endpoint of the last URL, which the data come from.
+    """
+    if not isinstance(file_path, str):
+        return "file://"
+    parsed = urllib.parse.urlparse(file_path.split("::")[-1])
+    if parsed.scheme in ("", "file") or len(parsed.scheme) == 1:
+        # no scheme or a Windows drive letter
+        return "file://"
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class Permit:
+    """
+    A grant from an :doc:`uproot.source.scheduler.IOScheduler` to send one
+    request to an endpoint. It must be returned with
+    :ref:`uproot.source.scheduler.IOScheduler.release`.
+    """
+
+    def __init__(self, endpoint, num_bytes, priority, owner, order):
+        self.endpoint = endpoint
+        self.num_bytes = num_bytes
+        self.priority = priority
+        self.owner = owner
+        self.order = order
+        self.granted = threading.Event()
+        self._callbacks = []
+
+    def __repr__(self):
+        return (
+            f"<Permit {self.endpoint!r} {self.num_bytes} bytes priority "
+            f"{self.priority} at 0x{id(self):012x}>"
+        )
+
+
+class _Endpoint:
+    def __init__(self):
+        self.num_requests = 0
+        self.num_bytes = 0
+        self.owner_requests = {}
+        self.waiting = []
+        self.num_granted = 0
+        self.num_waited = 0
+
+
+class IOScheduler:
+    """
+    Args:
+        max_requests_per_endpoint (None or int): The maximum number of
+            requests in flight to each endpoint; if None, there is no limit.
+        max_bytes_per_endpoint (None, int, or memory size string): The maximum
+            number of bytes requested and not yet received from each
+            endpoint; if None, there is no limit. A single request that is
+            larger than this limit is sent when nothing else is in flight.
+
+    Limits the requests that all sources in a process send to each storage
+    endpoint (see :doc:`uproot.source.scheduler`).
+    """
+
+    def __init__(self, max_requests_per_endpoint=None, max_bytes_per_endpoint=None):
+        if max_requests_per_endpoint is not None and (
+            not uproot._util.isint(max_requests_per_endpoint)
+            or max_requests_per_endpoint < 1
+        ):
+            raise ValueError(
+                "max_requests_per_endpoint must be None or a positive integer, "
+                f"not {max_requests_per_endpoint!r}"
+            )
+        if max_bytes_per_endpoint is not None:
+            max_bytes_per_endpoint = uproot._util.memory_size(
+                max_bytes_per_endpoint,
+                "max_bytes_per_endpoint must be None, a number of bytes, or a "
+                f"memory size string, not {max_bytes_per_endpoint!r}",
+            )
+        self._max_requests = max_requests_per_endpoint
+        self._max_bytes = max_bytes_per_endpoint
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._order = itertools.count()
+
+    def __repr__(self):
+        return (
+            f"<IOScheduler max_requests_per_endpoint={self._max_requests} "
+            f"max_bytes_per_endpoint={self._max_bytes} at 0x{id(self):012x}>"
+        )
+
+    @property
+    def max_requests_per_endpoint(self) -> int | None:
+        """
+        The maximum number of requests in flight to each endpoint, or None.
+        """
+        return self._max_requests
+
+    @property
+    def max_bytes_per_endpoint(self) -> int | None:
+        """
+        The maximum number of bytes in flight from each endpoint, or None.
+        """
+        return self._max_bytes
+
+    def acquire(self, endpoint, num_bytes, priority=None, owner=None, timeout=None):
+        """
+        Args:
+            endpoint (str): Name of the endpoint (see
+                :doc:`uproot.source.scheduler.endpoint`).
+            num_bytes (int): Number of bytes that the request will receive.
+            priority (None or int): Priority of the request; if None, use
+                :doc:`uproot.source.scheduler.current_priority`.
+            owner (None or hashable): Which client the request is for, for
+                fair sharing; if None, use the current thread.
+            timeout (None or float): Maximum time to wait in seconds.
+
+        Blocks until the request may be sent and returns a
+        :doc:`uproot.source.scheduler.Permit`, which must be returned with
+        :ref:`uproot.source.scheduler.IOScheduler.release`.
+        """
+        permit = self.request(endpoint, num_bytes, priority, owner)
+        if not permit.granted.wait(timeout):
+            with self._lock:
+                state = self._endpoints[endpoint]
+                if not permit.granted.is_set():
+                    state.waiting.remove(permit)
+                    raise TimeoutError(
+                        f"waited more than {timeout} seconds to read from {endpoint}"
+                    )
+        return permit
+
+    def request(self, endpoint, num_bytes, priority=None, owner=None):
+        """
+        Like :ref:`uproot.source.scheduler.IOScheduler.acquire`, but does not
+        block: the returned :doc:`uproot.source.scheduler.Permit` has a
+        ``granted`` ``threading.Event`` that is set when the request may be
+        sent.
+        """
+        if priority is None:
+            priority = current_priority()
+        if owner is None:
+            owner = threading.get_ident()
+        with self._lock:
+            permit = Permit(endpoint, num_bytes, priority, owner, next(self._order))
+            state = self._endpoints.get(endpoint)
+            if state is None:
+                state = self._endpoints[endpoint] = _Endpoint()
+            state.waiting.append(permit)
+            self._dispatch(state)
+            if not permit.granted.is_set():
+                state.num_waited += 1
+        return permit
+
+    def release(self, permit):
+        """
+        Args:
+            permit (:doc:`uproot.source.scheduler.Permit`): A permit from
+                :ref:`uproot.source.scheduler.IOScheduler.acquire` or
+                :ref:`uproot.source.scheduler.IOScheduler.request`.
+
+        Returns the permit of a request that has finished (successfully or
+        not), letting waiting requests go. If the permit has not been granted
+        yet, the request is withdrawn.
+        """
+        with self._lock:
+            state = self._endpoints[permit.endpoint]
+            if not permit.granted.is_set():
+                state.waiting.remove(permit)
+                permit._callbacks = []
+                return
+            state.num_requests -= 1
+            state.num_bytes -= permit.num_bytes
+            count = state.owner_requests[permit.owner] - 1
+            if count == 0:
+                del state.owner_requests[permit.owner]
+            else:
+                state.owner_requests[permit.owner] = count
+            self._dispatch(state)
+
+    def when_granted(self, permit, callback):
+        """
+        Args:
+            permit (:doc:`uproot.source.scheduler.Permit`): A permit from
+                :ref:`uproot.source.scheduler.IOScheduler.request`.
+            callback (function): Function of no arguments.
+
+        Calls ``callback`` as soon as ``permit`` is granted, which may be
+        immediately. The callback is called with the scheduler's lock held, so
+        it must only hand the notification off (e.g. with
+        ``loop.call_soon_threadsafe``).
+        """
+        with self._lock:
+            if permit.granted.is_set():
+                callback()
+            else:
+                permit._callbacks.append(callback)
+
+    @contextlib.contextmanager
+    def scheduled(self, endpoint, num_bytes, priority=None, owner=None):
+        """
+        Context manager that acquires a permit before the ``with`` block and
+        releases it afterward.
+        """
+        permit = self.acquire(endpoint, num_bytes, priority, owner)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def promote(self, owner, priority):
+        """
+        Args:
+            owner (hashable): The client whose waiting requests are promoted
+                (a thread identifier, unless the requests were made with
+                another ``owner``).
+            priority (int): The new priority.
+
+        Gives the waiting requests of ``owner`` the ``priority``, if it goes
+        before their own: for instance, if data that were being prefetched
+        are now needed.
+        """
+        with self._lock:
+            for state in self._endpoints.values():
+                for permit in state.waiting:
+                    if permit.owner == owner and permit.priority > priority:
+                        permit.priority = priority
+
+    def in_flight(self, endpoint) -> tuple[int, int]:
+        """
+        The number of requests and bytes in flight to ``endpoint`` as a
+        2-tuple.
+        """
+        with self._lock:
+            state = self._endpoints.get(endpoint)
+            if state is None:
+                return (0, 0)
+            return (state.num_requests, state.num_bytes)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        For each endpoint, the numbers of requests and bytes in flight, of
+        requests waiting, of requests granted, and of requests that had to
+        wait (performance counters).
+        """
+        with self._lock:
+            return {
+                name: {
+                    "in_flight_requests": state.num_requests,
+                    "in_flight_bytes": state.num_bytes,
+                    "waiting_requests": len(state.waiting),
+                    "granted_requests": state.num_granted,
+                    "waited_requests": state.num_waited,
+                }
+                for name, state in self._endpoints.items()
+            }
+
+    def _dispatch(self, state):
+        # must be called with self._lock held
+        while len(state.waiting) != 0:
+            if self._max_requests is not None and (
+                state.num_requests >= self._max_requests
+            ):
+                return
+
+            best = min(
+                state.waiting,
+                key=lambda p: (
+                    p.priority,
+                    state.owner_requests.get(p.owner, 0),
+                    p.order,
+                ),
+            )
+            if (
+                self._max_bytes is not None
+                and state.num_requests != 0
+                and state.num_bytes + best.num_bytes > self._max_bytes
+            ):
+                return
+
+            state.waiting.remove(best)
+            state.num_requests += 1
+            state.num_bytes += best.num_bytes
+            state.owner_requests[best.owner] = (
+                state.owner_requests.get(best.owner, 0) + 1
+            )
+            state.num_granted += 1
+            best.granted.set()
+            for callback in best._callbacks:
+                callback()
+            best._callbacks = []
+
+
+def scheduled_task(task, endpoint, num_bytes):
+    """
+    Args:
+        task (function): Function of a :doc:`uproot.source.chunk.Resource`
+            that sends a request, as used by a
+            :doc:`uproot.source.futures.ResourceFuture`.
+        endpoint (str): Name of the endpoint.
+        num_bytes (int): Number of bytes that the request will receive.
+
+    If a process-wide scheduler is installed, returns a version of ``task``
+    that waits for a permit before sending the request. The priority and
+    owner are taken from the thread that calls this function, not the worker
+    thread that runs the task.
+
+    If no scheduler is installed, returns ``task`` unchanged.
+    """
+    scheduler = _scheduler
+    if scheduler is None:
+        return task
+
+    level = current_priority()
+    owner = threading.get_ident()
+
+    def wrapped(resource):
+        with scheduler.scheduled(endpoint, num_bytes, level, owner):
+            return task(resource)
+
+    return wrapped
+
+
+def scheduled_coroutine(coroutine, endpoint, num_bytes):
+    """
+    Args:
+        coroutine (coroutine): Request to send in an event loop.
+        endpoint (str): Name of the endpoint.
+        num_bytes (int): Number of bytes that the request will receive.
+
+    Like :doc:`uproot.source.scheduler.scheduled_task`, but for requests sent
+    by an asyncio event loop. While it waits for a permit, the returned
+    coroutine does not block the loop or occupy a thread.
+    """
+    scheduler = _scheduler
+    if scheduler is None:
+        return coroutine
+
+    level = current_priority()
+    owner = threading.get_ident()
+
+    async def wrapped():
+        permit = scheduler.request(endpoint, num_bytes, level, owner)
+        try:
+            if not permit.granted.is_set():
+                loop = asyncio.get_running_loop()
+                granted = loop.create_future()
+
+                def notify():
+                    loop.call_soon_threadsafe(
+                        lambda: granted.done() or granted.set_result(None)
+                    )
+
+                scheduler.when_granted(permit, notify)
+                await granted
+            return await coroutine
+        finally:
+            scheduler.release(permit)
+
+    return wrapped()
@@ -0,0 +1,304 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines a physical layer that simulates remote storage with a
+local file, for reproducible I/O benchmarks.
+
+The :doc:`uproot.source.simulated.SimulatedSource` reads its data from a
+:doc:`uproot.source.file.MemmapSource` or
+:doc:`uproot.source.object.ObjectSource`, but delays every request by a
+configurable latency (with random jitter), limits the throughput of all
+requests together to a configurable bandwidth, and can make requests fail at
+a configurable rate. Requests are coalesced and sent in parallel in the same
+way as :doc:`uproot.source.fsspec.FSSpecSource`, so changes to coalescing,
+executors, or prefetching can be compared without a remote server:
+
+.. code-block:: python
+
+    with uproot.open(
+        "file.root",
+        handler=uproot.source.simulated.SimulatedSource,
+        latency=0.05,
+        bandwidth="20 MB",
+    ) as file:
+        file["tree"].arrays()
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import io
+import queue
+import random
+import threading
+import time
+
+import uproot
+import uproot.source.chunk
+import uproot.source.file
+import uproot.source.futures
+import uproot.source.object
+import uproot.source.scheduler
+from uproot.source.coalesce import CoalesceConfig, coalesce_requests
+
+
+class SimulatedSource(uproot.source.chunk.Source):
+    """
+    Args:
+        file_path (str): The filesystem path of the file to open.
+        latency (float): Time in seconds between sending a request and
+            receiving its first byte.
+        jitter (float): Maximum additional latency in seconds; each request
+            adds a uniformly distributed random delay between 0 and ``jitter``.
+        bandwidth (None, int, or memory size string): Bytes per second that
+            all requests share (the link); if None, there is no limit.
+        error_rate (float): Probability that a request fails with an
+            ``OSError`` after its latency.
+        seed (None or int): Seed for the random jitter and errors, for
+            reproducible benchmarks.
+        source (:doc:`uproot.source.file.MemmapSource` or :doc:`uproot.source.object.ObjectSource` class):
+            The local source to read the data from.
+        num_connections (None or int): Number of requests that can be in
+            flight at the same time; if None, use the ``num_workers`` option.
+        coalesce_config (None or :doc:`uproot.source.coalesce.CoalesceConfig`):
+            How ranges passed to :ref:`uproot.source.simulated.SimulatedSource.chunks`
+            are merged into requests; if None, use the default.
+        options: Options for the local source; must include ``"num_workers"``
+            and ``"use_threads"``.
+
+    A :doc:`uproot.source.chunk.Source` that simulates a remote file with a
+    local one (see :doc:`uproot.source.simulated`).
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: int | str | None = None,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        source: type[uproot.source.chunk.Source] = uproot.source.file.MemmapSource,
+        num_connections: int | None = None,
+        coalesce_config: CoalesceConfig | None = None,
+        **options,
+    ):
+        if latency < 0 or jitter < 0:
+            raise ValueError(
+                f"latency ({latency!r}) and jitter ({jitter!r}) must not be negative"
+            )
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"error_rate must be between 0 and 1, not {error_rate!r}")
+        if bandwidth is not None:
+            bandwidth = uproot._util.memory_size(
+                bandwidth,
+                "bandwidth must be None, a number of bytes per second, or a "
+                f"memory size string, not {bandwidth!r}",
+            )
+            if bandwidth <= 0:
+                raise ValueError(f"bandwidth must be positive, not {bandwidth!r}")
+        if num_connections is None:
+            num_connections = options.get("num_workers", 1)
+
+        self._num_requests = 0
+        self._num_requested_chunks = 0
+        self._num_requested_bytes = 0
+        self._num_transfers = 0
+        self._num_errors = 0
+
+        self._file_path = file_path
+        self._latency = latency
+        self._jitter = jitter
+        self._bandwidth = bandwidth
+        self._error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._link_free = 0.0
+        self._coalesce_config = coalesce_config
+
+        # the ObjectSource's own chunk would ask the scheduler for a second
+        # permit while the simulated transfer holds one, so its file is read
+        # directly (unbuffered: every request is one seek and one read)
+        self._file = None
+        self._file_lock = threading.Lock()
+        if source is uproot.source.object.ObjectSource:
+            self._file = io.FileIO(file_path, "rb")
+            self._source = source(self._file, **options)
+        elif source is uproot.source.file.MemmapSource:
+            self._source = source(file_path, **options)
+        else:
+            raise TypeError(
+                "source must be uproot.source.file.MemmapSource or "
+                f"uproot.source.object.ObjectSource, not {source!r}"
+            )
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_connections
+        )
+        self._num_connections = num_connections
+        self._closed = False
+
+    def __repr__(self):
+        path = repr(self._file_path)
+        if len(self._file_path) > 10:
+            path = repr("..." + self._file_path[-10:])
+        return (
+            f"<{type(self).__name__} {path} latency={self._latency} "
+            f"bandwidth={self._bandwidth} at 0x{id(self):012x}>"
+        )
+
+    def _transfer(self, ranges: list[tuple[int, int]]) -> list[bytes]:
+        num_bytes = sum(stop - start for start, stop in ranges)
+        with self._lock:
+            self._num_transfers += 1
+            delay = self._latency + self._random.uniform(0, self._jitter)
+            failed = self._random.random() < self._error_rate
+
+        time.sleep(delay)
+        if failed:
+            with self._lock:
+                self._num_errors += 1
+            raise OSError(
+                f"simulated error reading {len(ranges)} ranges ({num_bytes} bytes) "
+                f"from {self._file_path}"
+            )
+
+        if self._bandwidth is not None:
+            with self._lock:
+                begin = max(time.monotonic(), self._link_free)
+                self._link_free = begin + num_bytes / self._bandwidth
+                done = self._link_free
+            time.sleep(max(0.0, done - time.monotonic()))
+
+        return [self._read(start, stop) for start, stop in ranges]
+
+    def _read(self, start: int, stop: int) -> bytes:
+        if self._file is None:
+            return bytes(self._source.chunk(start, stop).raw_data)
+        with self._file_lock:
+            self._file.seek(start)
+            return self._file.read(stop - start)
+
+    def chunk(self, start: int, stop: int) -> uproot.source.chunk.Chunk:
+        """
+        Args:
+            start (int): Seek position of the first byte to include.
+            stop (int): Seek position of the first byte to exclude
+                (one greater than the last byte to include).
+
+        Request a byte range of data from the file as a
+        :doc:`uproot.source.chunk.Chunk`, waiting for the simulated transfer.
+        """
+        if self.closed:
+            raise OSError(f"file {self._file_path!r} is closed")
+
+        self._num_requests += 1
+        self._num_requested_chunks += 1
+        self._num_requested_bytes += stop - start
+        scheduler = uproot.source.scheduler.get_scheduler()
+        if scheduler is None:
+            (data,) = self._transfer([(start, stop)])
+        else:
+            with scheduler.scheduled(
+                uproot.source.scheduler.endpoint(self._file_path), stop - start
+            ):
+                (data,) = self._transfer([(start, stop)])
+        future = uproot.source.futures.TrivialFuture(data)
+        return uproot.source.chunk.Chunk(self, start, stop, future)
+
+    def chunks(
+        self, ranges: list[tuple[int, int]], notifications: queue.Queue
+    ) -> list[uproot.source.chunk.Chunk]:
+        """
+        Args:
+            ranges (list of tuple[int, int] 2-tuples): Intervals to fetch
+                as (start, stop) pairs in a single request, if possible.
+            notifications (``queue.Queue``): Indicator of completed
+                chunks. After each gets filled, it is ``put`` on the
+                queue; a listener should ``get`` from this queue
+                ``len(ranges)`` times.
+
+        Request a set of byte ranges from the file.
+
+        The ranges are coalesced into requests with the
+        ``coalesce_config``, which are sent in parallel on at most
+        ``num_connections`` simulated connections.
+        """
+        if self.closed:
+            raise OSError(f"file {self._file_path!r} is closed")
+
+        self._num_requests += 1
+        self._num_requested_chunks += len(ranges)
+        self._num_requested_bytes += sum(stop - start for start, stop in ranges)
+
+        def submit(request_ranges: list[tuple[int, int]]):
+            task = uproot.source.scheduler.scheduled_task(
+                self._transfer,
+                uproot.source.scheduler.endpoint(self._file_path),
+                sum(stop - start for start, stop in request_ranges),
+            )
+            return self._executor.submit(task, request_ranges)
+
+        return coalesce_requests(
+            ranges, submit, self, notifications, config=self._coalesce_config
+        )
+
+    @property
+    def source(self) -> uproot.source.chunk.Source:
+        """
+        The local :doc:`uproot.source.chunk.Source` that the data are read
+        from.
+        """
+        return self._source
+
+    @property
+    def latency(self) -> float:
+        """
+        Time in seconds between sending a request and receiving its first
+        byte (not including jitter).
+        """
+        return self._latency
+
+    @property
+    def bandwidth(self) -> int | None:
+        """
+        Bytes per second shared by all requests, or None for no limit.
+        """
+        return self._bandwidth
+
+    @property
+    def num_connections(self) -> int:
+        """
+        Number of requests that can be in flight at the same time.
+        """
+        return self._num_connections
+
+    @property
+    def num_transfers(self) -> int:
+        """
+        The number of simulated requests after coalescing, including failed
+        ones (performance counter).
+        """
+        return self._num_transfers
+
+    @property
+    def num_errors(self) -> int:
+        """
+        The number of simulated requests that failed (performance counter).
+        """
+        return self._num_errors
+
+    @property
+    def num_bytes(self) -> int:
+        return self._source.num_bytes
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._executor.shutdown()
+        self._source.__exit__(exception_type, exception_value, traceback)
+        self._closed = True
@@ -13,6 +13,8 @@ and :doc:`uproot.writing.writable.update`.
 from __future__ import annotations
 
 from uproot.writing._dask_write import dask_write
+from uproot.writing.basketcopy import copy_tree, merge
+from uproot.writing.conversion import convert_to_rntuple, to_parquet
 from uproot.writing.identify import (
     to_TArray,
     to_TH1x,
@@ -40,8 +42,11 @@ __all__ = [
     "WritableDirectory",
     "WritableFile",
     "WritableTree",
+    "convert_to_rntuple",
+    "copy_tree",
     "create",
     "dask_write",
+    "merge",
     "recreate",
     "to_TArray",
     "to_TH1x",
@@ -52,6 +57,7 @@ __all__ = [
     "to_TProfile",
     "to_TProfile2D",
     "to_TProfile3D",
+    "to_parquet",
     "to_writable",
     "update",
 ]
@@ -1714,6 +1714,8 @@ class Directory(CascadeNode):
         field_name,
         initial_basket_capacity,
         resize_factor,
+        basket_size=None,
+        truncation=None,
     ):
         import uproot.writing._cascadetree
 
@@ -1727,11 +1729,22 @@ class Directory(CascadeNode):
             field_name,
             initial_basket_capacity,
             resize_factor,
+            basket_size,
+            truncation,
         )
         tree.write_anew(sink)
         return tree
 
-    def add_rntuple(self, sink, name, description, akform):
+    def add_rntuple(
+        self,
+        sink,
+        name,
+        description,
+        akform,
+        encodings=None,
+        page_size=None,
+        cluster_size=None,
+    ):
         import uproot.writing._cascadentuple
 
         anchor = uproot.writing._cascadentuple.NTuple_Anchor(
@@ -1746,14 +1759,27 @@ class Directory(CascadeNode):
             0,  # TODO: Fix this
         )
 
+        # like ROOT, only split columns if they're going to be compressed
+        if self._freesegments.fileheader.compression is None:
+            default_encoding = "plain"
+        else:
+            default_encoding = "split"
         header = uproot.writing._cascadentuple.NTuple_Header(
-            None, name, description, akform
+            None, name, description, akform, encodings, default_encoding
         )
 
         footer = uproot.writing._cascadentuple.NTuple_Footer(None, header._checksum)
 
         ntuple = uproot.writing._cascadentuple.NTuple(
-            self, akform, self._freesegments, header, footer, [], anchor
+            self,
+            akform,
+            self._freesegments,
+            header,
+            footer,
+            [],
+            anchor,
+            page_size,
+            cluster_size,
         )
 
         ntuple.write(sink)
@@ -23,6 +23,7 @@ import uproot.compression
 import uproot.const
 import uproot.reading
 import uproot.serialization
+import uproot.source.futures
 from uproot.models.RNTuple import (
     _rntuple_anchor_checksum_format,
     _rntuple_anchor_format,
@@ -79,6 +80,27 @@ _ak_primitive_to_num_dict = {
     "i32": 0x0E,
     "i64": 0x0F,
 }
+# column types that ROOT writes by default for compressed data: split (byte
+# shuffle) for multi-byte numbers, with zigzag for signed integers and delta for
+# offsets; see https://github.com/root-project/root/blob/master/tree/ntuple/v7/doc/specifications.md
+_split_type_num_dict = {
+    uproot.const.rntuple_col_type_to_num_dict[plain]: (
+        uproot.const.rntuple_col_type_to_num_dict["split" + plain]
+    )
+    for plain in [
+        "int16",
+        "uint16",
+        "int32",
+        "uint32",
+        "int64",
+        "uint64",
+        "real32",
+        "real64",
+        "index32",
+        "index64",
+    ]
+}
+_rntuple_encodings = ("split", "plain")
 
 
 def _cpp_typename(akform, subcall=False):
@@ -260,12 +282,82 @@ class NTuple_Column_Description:
         return header_bytes
 
 
+def _regularize_encodings(encodings, field_names, default="plain"):
+    if encodings is None:
+        encodings = default
+    if isinstance(encodings, str):
+        encodings = dict.fromkeys(field_names, encodings)
+    elif isinstance(encodings, dict):
+        unknown = [name for name in encodings if name not in field_names]
+        if len(unknown) != 0:
+            raise ValueError(
+                f"encodings refers to fields that are not in the RNTuple: {unknown!r}"
+            )
+        encodings = {name: encodings.get(name, default) for name in field_names}
+    else:
+        raise TypeError(
+            "encodings must be None, a str, or a dict of field name \u2192 str, "
+            f"not {encodings!r}"
+        )
+    for name, encoding in encodings.items():
+        if encoding not in _rntuple_encodings:
+            raise ValueError(
+                f"encoding of field {name!r} must be one of {_rntuple_encodings!r}, "
+                f"not {encoding!r}"
+            )
+    return encodings
+
+
+def _column_description(type_num, field_id, encoding):
+    if encoding == "split":
+        type_num = _split_type_num_dict.get(type_num, type_num)
+    type_size = uproot.const.rntuple_col_num_to_size_dict[type_num]
+    return NTuple_Column_Description(type_num, type_size, field_id, 0, 0)
+
+
+def _encode_page(col_data, type_num):
+    """
+    Encodes the elements of one page as the column type ``type_num`` requires:
+    the inverse of ``deserialize_page_decompressed_buffer`` and ``post_process``
+    in :doc:`uproot.models.RNTuple`. Returns the page as bytes (uint8 array).
+    """
+    if col_data.dtype == numpy.dtype("bool"):
+        return numpy.packbits(col_data.view("uint8"), bitorder="little")
+
+    if type_num in uproot.const.rntuple_zigzag_types:
+        nbits = col_data.dtype.itemsize * 8
+        unsigned = numpy.dtype(f"uint{nbits}")
+        col_data = ((col_data << 1) ^ (col_data >> (nbits - 1))).view(unsigned)
+    elif type_num in uproot.const.rntuple_delta_types and len(col_data) != 0:
+        # the first element of each page is relative to the start of the cluster
+        col_data = numpy.concatenate((col_data[:1], numpy.diff(col_data)))
+
+    if col_data.dtype.byteorder == ">":
+        col_data = col_data.astype(col_data.dtype.newbyteorder("<"))
+    raw_data = col_data.view("uint8")
+    if type_num in uproot.const.rntuple_split_types:
+        # all first bytes, then all second bytes, etc.
+        raw_data = raw_data.reshape(-1, col_data.dtype.itemsize).T.reshape(-1)
+    return raw_data
+
+
 # https://github.com/root-project/root/blob/8cd9eed6f3a32e55ef1f0f1df8e5462e753c735d/tree/ntuple/v7/doc/BinaryFormatSpecification.md#header-envelope
 class NTuple_Header(CascadeLeaf):
-    def __init__(self, location, name, ntuple_description, akform):
+    def __init__(
+        self,
+        location,
+        name,
+        ntuple_description,
+        akform,
+        encodings=None,
+        default_encoding="plain",
+    ):
         self._name = name
         self._ntuple_description = ntuple_description
         self._akform = _to_packed_form(akform)
+        self._encodings = _regularize_encodings(
+            encodings, self._akform.fields, default_encoding
+        )
 
         self._serialize = None
         self._checksum = None
@@ -284,7 +376,13 @@ class NTuple_Header(CascadeLeaf):
         )
 
     def _build_field_col_records(
-        self, akform, field_name=None, parent_fid=None, add_field=True, description=""
+        self,
+        akform,
+        field_name=None,
+        parent_fid=None,
+        add_field=True,
+        description="",
+        encoding="plain",
     ):
         field_id = len(self._field_records)
         if parent_fid is None:
@@ -309,8 +407,7 @@ class NTuple_Header(CascadeLeaf):
                 field_id = parent_fid
             ak_primitive = akform.parameters.get("__array__", akform.primitive)
             type_num = _ak_primitive_to_num_dict[ak_primitive]
-            type_size = uproot.const.rntuple_col_num_to_size_dict[type_num]
-            col = NTuple_Column_Description(type_num, type_size, field_id, 0, 0)
+            col = _column_description(type_num, field_id, encoding)
             self._column_records.append(col)
             self._column_keys.append(f"node{self._ak_node_count}-data")
         elif isinstance(akform, awkward.forms.ListOffsetForm):
@@ -329,8 +426,7 @@ class NTuple_Header(CascadeLeaf):
             self._field_records.append(field)
             ak_offset = akform.offsets
             type_num = _ak_primitive_to_num_dict[ak_offset]
-            type_size = uproot.const.rntuple_col_num_to_size_dict[type_num]
-            col = NTuple_Column_Description(type_num, type_size, field_id, 0, 0)
+            col = _column_description(type_num, field_id, encoding)
             self._column_records.append(col)
             self._column_keys.append(f"node{self._ak_node_count}-offsets")
             # content data
@@ -340,6 +436,7 @@ class NTuple_Header(CascadeLeaf):
                 add_field=field_role == uproot.const.RNTupleFieldRole.COLLECTION,
                 field_name="_0",
                 description=description,
+                encoding=encoding,
             )
         elif isinstance(akform, awkward.forms.RecordForm):
             type_name = _cpp_typename(akform)
@@ -357,6 +454,7 @@ class NTuple_Header(CascadeLeaf):
                     subakform,
                     field_name=subfield_name,
                     parent_fid=field_id,
+                    encoding=encoding,
                 )
         elif isinstance(akform, awkward.forms.RegularForm):
             type_name = _cpp_typename(akform)
@@ -376,6 +474,7 @@ class NTuple_Header(CascadeLeaf):
                 parent_fid=field_id,
                 field_name="_0",
                 description=description,
+                encoding=encoding,
             )
         elif isinstance(akform, awkward.forms.IndexedOptionForm):
             type_name = _cpp_typename(akform)
@@ -389,8 +488,7 @@ class NTuple_Header(CascadeLeaf):
             self._field_records.append(field)
             ak_index = akform.index
             type_num = _ak_primitive_to_num_dict[ak_index]
-            type_size = uproot.const.rntuple_col_num_to_size_dict[type_num]
-            col = NTuple_Column_Description(type_num, type_size, field_id, 0, 0)
+            col = _column_description(type_num, field_id, encoding)
             self._column_records.append(col)
             self._column_keys.append(f"node{self._ak_node_count}-index")
             # content data
@@ -399,6 +497,7 @@ class NTuple_Header(CascadeLeaf):
                 parent_fid=field_id,
                 field_name="_0",
                 description=description,
+                encoding=encoding,
             )
         elif isinstance(akform, awkward.forms.UnionForm):
             type_name = _cpp_typename(akform)
@@ -411,8 +510,7 @@ class NTuple_Header(CascadeLeaf):
             )
             self._field_records.append(field)
             type_num = uproot.const.rntuple_col_type_to_num_dict["switch"]
-            type_size = uproot.const.rntuple_col_num_to_size_dict[type_num]
-            col = NTuple_Column_Description(type_num, type_size, field_id, 0, 0)
+            col = _column_description(type_num, field_id, encoding)
             self._column_records.append(col)
             self._column_keys.append(f"node{self._ak_node_count}-switch")
             for i, subakform in enumerate(akform.contents):
@@ -421,6 +519,7 @@ class NTuple_Header(CascadeLeaf):
                     subakform,
                     field_name=subfield_name,
                     parent_fid=field_id,
+                    encoding=encoding,
                 )
         elif isinstance(akform, awkward.forms.UnmaskedForm):
             # Do nothing
@@ -429,6 +528,7 @@ class NTuple_Header(CascadeLeaf):
                 parent_fid=parent_fid,
                 field_name=field_name,
                 description=description,
+                encoding=encoding,
             )
         else:
             msg = "This should not have happened. Please report this issue to the Uproot developers."
@@ -440,6 +540,7 @@ class NTuple_Header(CascadeLeaf):
             self._build_field_col_records(
                 topakform,
                 field_name=field_name,
+                encoding=self._encodings[field_name],
             )
 
     def serialize(self):
@@ -766,7 +867,10 @@ class NTuple(CascadeNode):
     The ``write_updates`` method rewrites the parts that change when new TBaskets are
     added.
 
-    The ``extend`` method adds a page cluster to every column.
+    The ``extend`` method adds a page cluster to every column. If a ``cluster_size``
+    is given, data are accumulated until they fill a cluster, and ``flush`` writes
+    the remainder. If a ``page_size`` is given, each column of a cluster is divided
+    into pages of at most that many uncompressed bytes.
 
     See `ROOT RNTuple specification <https://github.com/root-project/root/blob/master/tree/ntuple/v7/doc/specifications.md>`__.
     """
@@ -780,6 +884,8 @@ class NTuple(CascadeNode):
         footer,
         cluster_metadata,
         anchor,
+        page_size=None,
+        cluster_size=None,
     ):
         super().__init__(footer, anchor, freesegments)
         self._directory = directory
@@ -795,6 +901,42 @@ class NTuple(CascadeNode):
 
         self._column_counts = numpy.zeros(len(self._header._column_keys), dtype=int)
 
+        self._page_size = None
+        if page_size is not None:
+            self._page_size = uproot._util.memory_size(
+                page_size,
+                "page_size must be a number of bytes or memory size string with "
+                f"units (such as '1 MB'), not {page_size!r}",
+            )
+            if self._page_size <= 0:
+                raise ValueError(
+                    f"page_size must be a positive memory size, not {page_size!r}"
+                )
+
+        self._cluster_entries = None
+        self._cluster_bytes = None
+        if cluster_size is None:
+            pass
+        elif uproot._util.isint(cluster_size):
+            if cluster_size <= 0:
+                raise ValueError(
+                    f"cluster_size must be a positive number of entries, not {cluster_size!r}"
+                )
+            self._cluster_entries = int(cluster_size)
+        else:
+            self._cluster_bytes = uproot._util.memory_size(
+                cluster_size,
+                "cluster_size must be a number of entries or memory size string with "
+                f"units (such as '100 MB'), not {cluster_size!r}",
+            )
+            if self._cluster_bytes <= 0:
+                raise ValueError(
+                    f"cluster_size must be a positive memory size, not {cluster_size!r}"
+                )
+        self._pending = []
+        self._pending_bytes = 0
+        self._num_pending_entries = 0
+
     def __repr__(self):
         return f"{type(self).__name__}({self._directory}, {self._header}, {self._footer}, {self._cluster_metadata}, {self._anchor}, {self._freesegments})"
 
@@ -826,14 +968,25 @@ class NTuple(CascadeNode):
     def num_entries(self):
         return self._num_entries
 
+    @property
+    def num_pending_entries(self):
+        return self._num_pending_entries
+
+    @property
+    def page_size(self):
+        return self._page_size
+
+    @property
+    def cluster_size(self):
+        if self._cluster_bytes is not None:
+            return self._cluster_bytes
+        return self._cluster_entries
+
     def extend(self, file, sink, data):
         """
-        1. Write pages
-        2. Write page list for new cluster group
-        3. Relocate footer
-        4. Update anchor's foot metadata values in-place
+        Writes ``data`` as a cluster or accumulates it (if a ``cluster_size`` was
+        given) until there is enough for a cluster.
         """
-
         data = _regularize_input_type_to_awkward(data)
         if not isinstance(data, awkward.Array):
             raise TypeError(
@@ -846,8 +999,60 @@ class NTuple(CascadeNode):
             msg = f"Data is not compatible with this RNTuple. Expected {self._header._akform}, got {data.form}"
             raise ValueError(msg)
 
+        if self._cluster_entries is None and self._cluster_bytes is None:
+            self._write_cluster(file, sink, data)
+            return
+
+        if len(data) == 0:
+            return
+        self._pending.append(data)
+        self._pending_bytes += data.nbytes
+        self._num_pending_entries += len(data)
+
+        if self._cluster_entries is not None:
+            if self._num_pending_entries >= self._cluster_entries:
+                pending = self._take_pending()
+                start = 0
+                while len(pending) - start >= self._cluster_entries:
+                    stop = start + self._cluster_entries
+                    self._write_cluster(file, sink, _to_packed(pending[start:stop]))
+                    start = stop
+                if start != len(pending):
+                    remainder = _to_packed(pending[start:])
+                    self._pending.append(remainder)
+                    self._pending_bytes += remainder.nbytes
+                    self._num_pending_entries += len(remainder)
+
+        elif self._pending_bytes >= self._cluster_bytes:
+            self.flush(file, sink)
+
+    def flush(self, file, sink):
+        """
+        Writes the entries that are still being accumulated (if a ``cluster_size``
+        was given) as a cluster, even if it is smaller than the target.
+        """
+        if self._num_pending_entries != 0:
+            self._write_cluster(file, sink, _to_packed(self._take_pending()))
+
+    def _take_pending(self):
+        if len(self._pending) == 1:
+            (pending,) = self._pending
+        else:
+            pending = awkward.concatenate(self._pending, highlevel=False)
+        self._pending = []
+        self._pending_bytes = 0
+        self._num_pending_entries = 0
+        return pending
+
+    def _write_cluster(self, file, sink, data):
+        """
+        1. Write pages
+        2. Write page list for new cluster group
+        3. Relocate footer
+        4. Update anchor's foot metadata values in-place
+        """
+
         # 1. Write pages
-        # We write a single page for each column for now
 
         cluster_page_data = []  # list of list of (locator, len, offset)
         data_buffers = awkward.to_buffers(data)[2]
@@ -874,30 +1079,57 @@ class NTuple(CascadeNode):
                 deltas = numpy.array(index >= 0, dtype=index.dtype)
                 data_buffers[key] = numpy.cumsum(deltas, dtype=deltas.dtype)
 
-        for idx, key in enumerate(self._header._column_keys):
-            col_data = data_buffers[key]
-            col_len = len(col_data.reshape(-1))
-            raw_data = col_data.reshape(-1).view("uint8")
-            if col_data.dtype == numpy.dtype("bool"):
-                raw_data = numpy.packbits(raw_data, bitorder="little")
-            uncompressed_bytes = len(raw_data)
-            # TODO: need better logic to specify per-column/field compression
-            compression = self._directory.freesegments.fileheader.compression
-            raw_data = uproot.compression.compress(raw_data, compression)
-            # TODO: need to add some logic for page splitting
-            pages = []
-            if col_len > 0:
-                page_key = self.add_rblob(sink, raw_data, uncompressed_bytes)
+        # TODO: need better logic to specify per-column/field compression
+        compression = self._directory.freesegments.fileheader.compression
+        compression_code = 0 if compression is None else compression.code
+
+        columns = []  # list of list of (num_elements, raw_data) per page
+        for key, column_record in zip(
+            self._header._column_keys, self._header._column_records, strict=True
+        ):
+            col_data = data_buffers[key].reshape(-1)
+            columns.append(
+                [
+                    (len(page), _encode_page(page, column_record.type_num))
+                    for page in self._split_pages(col_data)
+                ]
+            )
+
+        # compress all pages, concurrently if there's more than one (compressors
+        # release the GIL), then write them in column order
+        compress_executor = uproot.source.futures.TrivialExecutor()
+        if sum(len(pages) for pages in columns) > 1:
+            compress_executor = file.compression_executor
+        futures = [
+            [
+                compress_executor.submit(
+                    uproot.compression.compress, raw_data, compression
+                )
+                for _, raw_data in pages
+            ]
+            for pages in columns
+        ]
+
+        for idx, (pages, page_futures) in enumerate(zip(columns, futures, strict=True)):
+            element_offset = self._column_counts[idx]
+            page_descriptions = []
+            for (num_elements, raw_data), future in zip(
+                pages, page_futures, strict=True
+            ):
+                compressed = future.result()
+                page_key = self.add_rblob(sink, compressed, len(raw_data))
                 page_locator = NTuple_Locator(
-                    len(raw_data), page_key.location + page_key.allocation
+                    len(compressed), page_key.location + page_key.allocation
+                )
+                page_descriptions.append(
+                    NTuple_PageDescription(num_elements, page_locator)
                 )
-                pages.append(NTuple_PageDescription(col_len, page_locator))
+                self._column_counts[idx] += num_elements
             cluster_page_data.append(
                 NTuple_ColumnPageListDescription(
-                    pages, self._column_counts[idx], compression.code
+                    page_descriptions, element_offset, compression_code
                 )
             )
-            self._column_counts[idx] += col_len
         page_data = [
             cluster_page_data
         ]  # list of list of list of (locator, len, offset)
@@ -957,6 +1189,21 @@ class NTuple(CascadeNode):
 
         sink.flush()
 
+    def _split_pages(self, col_data):
+        if len(col_data) == 0:
+            return []
+        if self._page_size is None:
+            return [col_data]
+        if col_data.dtype == numpy.dtype("bool"):
+            # whole bytes of packed bits
+            page_elements = self._page_size * 8
+        else:
+            page_elements = max(self._page_size // col_data.dtype.itemsize, 1)
+        return [
+            col_data[start : start + page_elements]
+            for start in range(0, len(col_data), page_elements)
+        ]
+
     def add_rblob(
         self,
         sink,
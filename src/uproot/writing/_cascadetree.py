@@ -29,6 +29,7 @@ import uproot.compression
 import uproot.const
 import uproot.reading
 import uproot.serialization
+import uproot.source.futures
 
 _dtype_to_char = {
     numpy.dtype("bool"): "O",
@@ -45,6 +46,23 @@ _dtype_to_char = {
     numpy.dtype(">U"): "C",
 }
 
+_default_auto_flush = -30000000
+
+# largest scratch buffer for converting extend data that a TBranch keeps
+_max_scratch_bytes = 16 * 1024**2
+
+# fMinimum and fMaximum of TLeafD32 (Double32_t without a range is a float) and
+# TLeafF16 (Float16_t without a range is an exponent and 12-bit mantissa)
+_tleafd32_format1 = struct.Struct(">ff")
+_tleaff16_format1 = struct.Struct(">BHBH")
+
+# fNbytes, fVersion, fObjlen, fDatime, fKeylen of a TKey, followed (after fCycle)
+# by fSeekKey and fSeekPdir, which are 32-bit or 64-bit
+_raw_key_format = struct.Struct(">ihiIh")
+_raw_key_seeks_position = _raw_key_format.size + 2
+_raw_key_seeks_small = struct.Struct(">ii")
+_raw_key_seeks_big = struct.Struct(">qq")
+
 
 class Tree:
     """
@@ -68,10 +86,16 @@ class Tree:
     The ``write_updates`` method rewrites the parts that change when new TBaskets are
     added.
 
-    The ``extend`` method adds a TBasket to every TBranch.
+    The ``extend`` method adds a TBasket to every TBranch. If a ``basket_size`` is
+    given (a number of entries or a memory size), ``extend`` instead accumulates
+    data until there is enough for a TBasket of that size in every TBranch, and
+    ``flush`` writes what remains.
 
     The ``write_np_basket`` and ``write_jagged_basket`` methods write one TBasket in one
     TBranch, either a rectilinear one from NumPy or a simple jagged array from Awkward Array.
+    Each is split into a ``prepare_*_basket`` step (serialize and compress), which ``extend``
+    runs for all TBranches concurrently, and a ``write_basket`` step (allocate and write),
+    which ``extend`` runs in TBranch order, followed by one ``write_free_segments``.
 
     See `ROOT TTree specification <https://github.com/root-project/root/blob/master/io/doc/TFile/ttree.md>`__.
     """
@@ -87,6 +111,8 @@ class Tree:
         field_name,
         initial_basket_capacity,
         resize_factor,
+        basket_size=None,
+        truncation=None,
     ):
         self._directory = directory
         self._name = name
@@ -97,6 +123,31 @@ class Tree:
         self._basket_capacity = initial_basket_capacity
         self._resize_factor = resize_factor
 
+        self._basket_entries = None
+        self._basket_bytes = None
+        if basket_size is None:
+            pass
+        elif uproot._util.isint(basket_size):
+            if basket_size <= 0:
+                raise ValueError(
+                    f"basket_size must be a positive number of entries, not {basket_size!r}"
+                )
+            self._basket_entries = int(basket_size)
+        else:
+            self._basket_bytes = uproot._util.memory_size(
+                basket_size,
+                "basket_size must be a number of entries or memory size string with "
+                f"units (such as '1 MB'), not {basket_size!r}",
+            )
+            if self._basket_bytes <= 0:
+                raise ValueError(
+                    f"basket_size must be a positive memory size, not {basket_size!r}"
+                )
+        self._pending = []
+        self._pending_bytes = {}
+        self._num_pending_entries = 0
+        self._cut_short = False
+
         if isinstance(branch_types, dict):
             branch_types_items = branch_types.items()
         else:
@@ -197,14 +248,21 @@ class Tree:
 
                     counter_name = self._counter_name(branch_name)
                     counter_dtype = numpy.dtype(numpy.int32)
-                    counter = self._branch_np(
-                        counter_name, counter_dtype, counter_dtype, kind="counter"
-                    )
+                    existing = None
                     if counter_name in self._branch_lookup:
-                        # counters always replace non-counters
-                        del self._branch_data[self._branch_lookup[counter_name]]
-                    self._branch_lookup[counter_name] = len(self._branch_data)
-                    self._branch_data.append(counter)
+                        existing = self._branch_data[self._branch_lookup[counter_name]]
+                    if existing is not None and existing["kind"] == "counter":
+                        # jagged branches with the same counter_name share it
+                        counter = existing
+                    else:
+                        counter = self._branch_np(
+                            counter_name, counter_dtype, counter_dtype, kind="counter"
+                        )
+                        if existing is not None:
+                            # counters always replace non-counters
+                            del self._branch_data[self._branch_lookup[counter_name]]
+                        self._branch_lookup[counter_name] = len(self._branch_data)
+                        self._branch_data.append(counter)
 
                     if type(content).__name__ == "RecordType":
                         if hasattr(content, "contents"):
@@ -287,6 +345,10 @@ class Tree:
                         f"cannot write Awkward Array type to ROOT file:\n\n    {branch_datashape!s}"
                     )
 
+        if truncation is not None:
+            for branch_name, spec in truncation.items():
+                self._truncate_branch(branch_name, spec)
+
         self._num_entries = 0
         self._num_baskets = 0
 
@@ -306,7 +368,11 @@ class Tree:
             "fMaxEntryLoop": 1000000000000,
             "fMaxVirtualSize": 0,
             "fAutoSave": -300000000,
-            "fAutoFlush": -30000000,
+            "fAutoFlush": (
+                _default_auto_flush
+                if self._basket_entries is None
+                else self._basket_entries
+            ),
             "fEstimate": 1000000,
         }
         self._key = None
@@ -386,6 +452,53 @@ class Tree:
             "tleaf_special_struct": None,
         }
 
+    def _truncate_branch(self, branch_name, spec):
+        if branch_name not in self._branch_lookup:
+            raise ValueError(
+                f"cannot truncate {branch_name!r} because there is no such branch"
+            )
+        datum = self._branch_data[self._branch_lookup[branch_name]]
+        if (
+            datum["kind"] != "normal"
+            or datum["dtype"].kind != "f"
+            or len(datum["shape"]) > 1
+        ):
+            raise TypeError(
+                f"only floating-point branches with at most one fixed dimension "
+                f"can be truncated, not {branch_name!r}"
+            )
+
+        if not isinstance(spec, uproot.interpretation.numerical.TruncatedNumerical):
+            if datum["dtype"] == numpy.dtype(">f4"):
+                cls = uproot.interpretation.numerical.AsFloat16
+            else:
+                cls = uproot.interpretation.numerical.AsDouble32
+            if isinstance(spec, tuple) and len(spec) == 2:
+                spec = cls(spec[0], spec[1], 32)
+            elif isinstance(spec, tuple) and len(spec) == 3:
+                spec = cls(*spec)
+            else:
+                raise TypeError(
+                    f"truncation of {branch_name!r} must be an AsDouble32, an "
+                    f"AsFloat16, or a (low, high) or (low, high, num_bits) tuple, "
+                    f"not {spec!r}"
+                )
+        if spec.is_truncated and spec.num_bits > 14:
+            raise ValueError(
+                f"truncation of {branch_name!r} without a range can have at most "
+                f"14 bits, not {spec.num_bits}"
+            )
+
+        if isinstance(spec, uproot.interpretation.numerical.AsFloat16):
+            letter, datum["dtype"] = "f", numpy.dtype(">f4")
+        else:
+            letter, datum["dtype"] = "d", numpy.dtype(">f8")
+        bounds = f"[{spec.low!r},{spec.high!r},{spec.num_bits}]"
+        datum["truncation"] = spec
+        datum["fTitle"] = datum["fTitle"].rsplit("/", 1)[0] + "/" + letter + bounds
+        # ROOT reads the range from leaf titles that begin with the type letter
+        datum["leaf_title"] = letter + bounds
+
     def __repr__(self):
         return "{}({}, {}, {}, {}, {}, {}, {})".format(
             type(self).__name__,
@@ -443,54 +556,20 @@ class Tree:
         return self._num_entries
 
     @property
-    def num_baskets(self):
-        return self._num_baskets
-
-    def extend(self, file, sink, data):
-        # expand capacity if this would REACH (not EXCEED) the existing capacity
-        # that's because completely a full fBasketEntry has nowhere to put the
-        # number of entries in the last basket (it's a fencepost principle thing),
-        # forcing ROOT and Uproot to look it up from the basket header.
-
-        if self._num_baskets >= self._basket_capacity - 1:
-            self._basket_capacity = max(
-                self._basket_capacity + 1,
-                math.ceil(self._basket_capacity * self._resize_factor),
-            )
-
-            for datum in self._branch_data:
-                if datum["kind"] == "record":
-                    continue
-
-                fBasketBytes = datum["fBasketBytes"]
-                fBasketEntry = datum["fBasketEntry"]
-                fBasketSeek = datum["fBasketSeek"]
-                datum["fBasketBytes"] = numpy.zeros(
-                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype1
-                )
-                datum["fBasketEntry"] = numpy.zeros(
-                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype2
-                )
-                datum["fBasketSeek"] = numpy.zeros(
-                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype3
-                )
-                datum["fBasketBytes"][: len(fBasketBytes)] = fBasketBytes
-                datum["fBasketEntry"][: len(fBasketEntry)] = fBasketEntry
-                datum["fBasketSeek"][: len(fBasketSeek)] = fBasketSeek
-                datum["fBasketEntry"][len(fBasketEntry)] = self._num_entries
-
-            oldloc = start = self._key.location
-            stop = start + self._key.num_bytes + self._key.compressed_bytes
+    def basket_size(self):
+        if self._basket_bytes is not None:
+            return self._basket_bytes
+        return self._basket_entries
 
-            self.write_anew(sink)
-
-            newloc = self._key.seek_location
-            file._move_tree(oldloc, newloc)
+    @property
+    def num_pending_entries(self):
+        return self._num_pending_entries
 
-            self._freesegments.release(start, stop)
-            sink.set_file_length(self._freesegments.fileheader.end)
-            sink.flush()
+    @property
+    def num_baskets(self):
+        return self._num_baskets
 
+    def _regularize_data(self, data):
         provided = None
 
         if uproot._util.from_module(data, "pandas"):
@@ -560,7 +639,7 @@ class Tree:
                     kk = self._counter_name(k)
                     vv = numpy.asarray(awkward.num(v, axis=1), dtype=">u4")
                     if kk in provided and not numpy.array_equal(
-                        vv, awkward.to_numpy(provided[kk])
+                        vv, uproot._util.ensure_numpy(provided[kk])
                     ):
                         raise ValueError(
                             f"branch {kk!r} provided both as an explicit array and generated as a counter, and they disagree"
@@ -696,8 +775,8 @@ class Tree:
                         )
                     )
                 else:
-                    big_endian = uproot._util.ensure_numpy(branch_array).astype(
-                        datum["dtype"], copy=False
+                    big_endian = self._to_big_endian(
+                        datum, uproot._util.ensure_numpy(branch_array)
                     )
                     if big_endian.shape != (len(branch_array),) + datum["shape"]:
                         raise ValueError(
@@ -706,6 +785,8 @@ class Tree:
                                 big_endian.shape[1:],
                             )
                         )
+                    if datum.get("truncation") is not None:
+                        big_endian = datum["truncation"].to_raw(big_endian)
                     tofill.append((branch_name, datum["compression"], big_endian, None))
                     if datum["kind"] == "counter" and big_endian.size > 0:
                         datum["tleaf_maximum_value"] = max(
@@ -752,7 +833,7 @@ class Tree:
                             "how did this pass the type check?\n\n" + repr(content)
                         )
 
-                big_endian = numpy.asarray(content.data, dtype=datum["dtype"])
+                big_endian = self._to_big_endian(datum, numpy.asarray(content.data))
                 shape = tuple(shape) + big_endian.shape[1:]
 
                 if shape[1:] != datum["shape"]:
@@ -763,6 +844,8 @@ class Tree:
                         )
                     )
                 big_endian_offsets = offsets.astype(">i4", copy=True)
+                if datum.get("truncation") is not None:
+                    big_endian = datum["truncation"].to_raw(big_endian)
 
                 tofill.append(
                     (
@@ -773,29 +856,235 @@ class Tree:
                     )
                 )
 
-        # actually write baskets into the file
+        return num_entries, tofill
+
+    def _to_big_endian(self, datum, array):
+        """
+        Returns ``array`` as a C-contiguous array of the TBranch's (big-endian)
+        dtype. If ``extend`` calls are accumulated into larger TBaskets, it is
+        always a copy, since the caller may refill its array before the
+        TBasket is written. Otherwise, it is copied only if necessary, and
+        since nothing holds on to the copy after the TBasket is written, it
+        goes into a scratch buffer that the TBranch reuses in the next
+        ``extend``, rather than a new allocation. Copies larger than
+        ``_max_scratch_bytes`` are new allocations, so that one large
+        ``extend`` doesn't leave a large buffer for the rest of the TTree's
+        life.
+        """
+        dtype = numpy.dtype(datum["dtype"])
+        if self._basket_entries is not None or self._basket_bytes is not None:
+            return numpy.array(array, dtype=dtype, order="C", copy=True)
+
+        if array.dtype == dtype and array.flags.c_contiguous:
+            return array
+
+        num_bytes = array.size * dtype.itemsize
+        if num_bytes > _max_scratch_bytes:
+            return numpy.ascontiguousarray(array, dtype=dtype)
+
+        scratch = datum.get("scratch")
+        if scratch is None or len(scratch) < num_bytes:
+            scratch = datum["scratch"] = numpy.empty(num_bytes, numpy.uint8)
+        out = scratch[:num_bytes].view(dtype).reshape(array.shape)
+        numpy.copyto(out, array, casting="unsafe")
+        return out
+
+    def extend(self, file, sink, data):
+        num_entries, tofill = self._regularize_data(data)
+
+        if self._basket_entries is None and self._basket_bytes is None:
+            self._write_baskets(file, sink, num_entries, tofill)
+        else:
+            self._accumulate(file, sink, num_entries, tofill)
+
+    def flush(self, file, sink):
+        """
+        Writes the entries that are still being accumulated (if a ``basket_size``
+        was given) as one TBasket per TBranch, even if it is smaller than the
+        target.
+        """
+        if self._num_pending_entries == 0:
+            return
+
+        num_entries = self._num_pending_entries
+        tofill = _concatenate_tofill([x for _, x in self._pending])
+        self._pending = []
+        self._pending_bytes = {}
+        self._num_pending_entries = 0
+        self._emit_basket(file, sink, num_entries, tofill)
+
+    def _accumulate(self, file, sink, num_entries, tofill):
+        if num_entries == 0:
+            return
+
+        self._pending.append((num_entries, tofill))
+        self._num_pending_entries += num_entries
+        for branch_name, _, big_endian, big_endian_offsets in tofill:
+            num_bytes = big_endian.nbytes
+            if big_endian_offsets is not None:
+                num_bytes += big_endian_offsets.nbytes
+            self._pending_bytes[branch_name] = (
+                self._pending_bytes.get(branch_name, 0) + num_bytes
+            )
+
+        if self._basket_entries is None:
+            # like ROOT's negative fAutoFlush: a memory size is turned into a
+            # number of entries once, when the biggest TBranch first reaches it
+            biggest = max(self._pending_bytes.values())
+            if biggest < self._basket_bytes:
+                return
+            self._basket_entries = max(
+                1, self._basket_bytes * self._num_pending_entries // biggest
+            )
+            if self._num_baskets == 0:
+                self._metadata["fAutoFlush"] = self._basket_entries
+
+        if self._num_pending_entries < self._basket_entries:
+            return
+
+        combined = _concatenate_tofill([x for _, x in self._pending])
+        start = 0
+        while self._num_pending_entries - start >= self._basket_entries:
+            stop = start + self._basket_entries
+            self._emit_basket(
+                file,
+                sink,
+                self._basket_entries,
+                _slice_tofill(combined, start, stop),
+            )
+            start = stop
+
+        remaining = self._num_pending_entries - start
+        self._pending = []
+        self._pending_bytes = {}
+        self._num_pending_entries = 0
+        if remaining != 0:
+            self._accumulate(
+                file,
+                sink,
+                remaining,
+                _slice_tofill(combined, start, start + remaining, copy=True),
+            )
+
+    def _emit_basket(self, file, sink, num_entries, tofill):
+        # every TBasket (and therefore every cluster) has _basket_entries, so
+        # fAutoFlush describes all cluster boundaries, except if a TBasket was
+        # cut short by an explicit flush and more TBaskets follow it
+        if self._cut_short:
+            self._metadata["fAutoFlush"] = _default_auto_flush
+        self._write_baskets(file, sink, num_entries, tofill)
+        self._cut_short = num_entries != self._basket_entries
+
+    def _ensure_capacity(self, file, sink, num_baskets):
+        # expand capacity if this would REACH (not EXCEED) the existing capacity
+        # that's because completely a full fBasketEntry has nowhere to put the
+        # number of entries in the last basket (it's a fencepost principle thing),
+        # forcing ROOT and Uproot to look it up from the basket header.
+
+        if num_baskets >= self._basket_capacity:
+            self._basket_capacity = max(
+                num_baskets + 1,
+                math.ceil(self._basket_capacity * self._resize_factor),
+            )
+
+            for datum in self._branch_data:
+                if datum["kind"] == "record":
+                    continue
+
+                fBasketBytes = datum["fBasketBytes"]
+                fBasketEntry = datum["fBasketEntry"]
+                fBasketSeek = datum["fBasketSeek"]
+                datum["fBasketBytes"] = numpy.zeros(
+                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype1
+                )
+                datum["fBasketEntry"] = numpy.zeros(
+                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype2
+                )
+                datum["fBasketSeek"] = numpy.zeros(
+                    self._basket_capacity, uproot.models.TBranch._tbranch13_dtype3
+                )
+                datum["fBasketBytes"][: len(fBasketBytes)] = fBasketBytes
+                datum["fBasketEntry"][: len(fBasketEntry)] = fBasketEntry
+                datum["fBasketSeek"][: len(fBasketSeek)] = fBasketSeek
+                datum["fBasketEntry"][len(fBasketEntry)] = self._num_entries
+
+            oldloc = start = self._key.location
+            stop = start + self._key.num_bytes + self._key.compressed_bytes
+
+            self.write_anew(sink)
+
+            newloc = self._key.seek_location
+            file._move_tree(oldloc, newloc)
+
+            self._freesegments.release(start, stop)
+            sink.set_file_length(self._freesegments.fileheader.end)
+            sink.flush()
+
+    def _write_baskets(self, file, sink, num_entries, tofill):
+        self._ensure_capacity(file, sink, self._num_baskets + 1)
+
+        # serialize and compress all baskets, concurrently if there's more
+        # than one to compress (compressors release the GIL)
+        prepare_executor = uproot.source.futures.TrivialExecutor()
+        if sum(1 for x in tofill if x[1] is not None) > 1:
+            prepare_executor = file.compression_executor
+
+        futures = []
+        for branch_name, compression, big_endian, big_endian_offsets in tofill:
+            datum = self._branch_data[self._branch_lookup[branch_name]]
+            if datum["dtype"] == ">U0":
+                futures.append(
+                    prepare_executor.submit(
+                        self.prepare_string_basket,
+                        branch_name,
+                        compression,
+                        big_endian,
+                        big_endian_offsets,
+                    )
+                )
+            elif big_endian_offsets is None:
+                futures.append(
+                    prepare_executor.submit(
+                        self.prepare_np_basket, branch_name, compression, big_endian
+                    )
+                )
+            else:
+                futures.append(
+                    prepare_executor.submit(
+                        self.prepare_jagged_basket,
+                        branch_name,
+                        compression,
+                        big_endian,
+                        big_endian_offsets,
+                    )
+                )
+
+        # allocate space for baskets in a deterministic order; if the sink can
+        # write from several threads, the baskets are written concurrently
+        write_executor = None
+        pending_writes = []
+        if sink.positioned_writes and len(tofill) > 1:
+            write_executor = file.compression_executor
+
         uncompressed_bytes = 0
         compressed_bytes = 0
-        for branch_name, compression, big_endian, big_endian_offsets in tofill:
+        for (branch_name, _, _, big_endian_offsets), future in zip(
+            tofill, futures, strict=True
+        ):
             datum = self._branch_data[self._branch_lookup[branch_name]]
 
             if datum["dtype"] == ">U0":
-                totbytes, zipbytes, location, fLen = self.write_string_basket(
-                    sink, branch_name, compression, big_endian, big_endian_offsets
-                )
+                prepared, fLen = future.result()
                 # fLen is the size of the biggest string; accumulate the max
                 # across extends and keep it per-branch (not shared tree-wide).
                 datum["fLen"] = max(datum.get("fLen", 0), fLen)
-                datum["fEntryOffsetLen"] = 4 * (len(big_endian_offsets) - 1)
-
-            elif big_endian_offsets is None:
-                totbytes, zipbytes, location = self.write_np_basket(
-                    sink, branch_name, compression, big_endian
-                )
             else:
-                totbytes, zipbytes, location = self.write_jagged_basket(
-                    sink, branch_name, compression, big_endian, big_endian_offsets
-                )
+                prepared = future.result()
+
+            totbytes, zipbytes, location = self.write_basket(
+                sink, prepared, write_executor, pending_writes
+            )
+            if big_endian_offsets is not None:
                 datum["fEntryOffsetLen"] = 4 * (len(big_endian_offsets) - 1)
             uncompressed_bytes += totbytes
             compressed_bytes += zipbytes
@@ -803,20 +1092,33 @@ class Tree:
             datum["fTotBytes"] += totbytes
             datum["fZipBytes"] += zipbytes
 
-            datum["fBasketBytes"][self._num_baskets] = zipbytes
+            # TBranches copied with add_baskets may have different numbers
+            # of TBaskets, so the index is per-TBranch
+            i = datum["arrays_write_stop"]
+            datum["fBasketBytes"][i] = zipbytes
 
-            if self._num_baskets + 1 < self._basket_capacity:
+            if i + 1 < self._basket_capacity:
                 fBasketEntry = datum["fBasketEntry"]
-                i = self._num_baskets
                 fBasketEntry[i + 1] = num_entries + fBasketEntry[i]
 
-            datum["fBasketSeek"][self._num_baskets] = location
+            datum["fBasketSeek"][i] = location
+
+            datum["arrays_write_stop"] = i + 1
 
-            datum["arrays_write_stop"] = self._num_baskets + 1
+        for future in pending_writes:
+            future.result()
+
+        # the FreeSegments record only needs to be written once for all baskets
+        if len(tofill) != 0:
+            self.write_free_segments(sink)
 
         # update TTree metadata in file
         self._num_entries += num_entries
-        self._num_baskets += 1
+        self._num_baskets = max(
+            datum["arrays_write_stop"]
+            for datum in self._branch_data
+            if datum["kind"] != "record"
+        )
         self._metadata["fTotBytes"] += uncompressed_bytes
         self._metadata["fZipBytes"] += compressed_bytes
 
@@ -931,7 +1233,7 @@ class Tree:
                     fCompress,
                     datum["fBasketSize"],
                     datum["fEntryOffsetLen"],
-                    self._num_baskets,  # fWriteBasket
+                    datum["arrays_write_stop"],  # fWriteBasket
                     self._num_entries,  # fEntryNumber
                 )
             )
@@ -976,7 +1278,7 @@ class Tree:
 
             letter = _dtype_to_char[datum["dtype"]]
             letter_upper = letter.upper()
-            out.append(("TLeaf" + letter_upper).encode() + b"\x00")
+            leaf_classname = "TLeaf" + letter_upper
             if letter_upper == "O":
                 special_struct = uproot.models.TLeaf._tleafO1_format1
             elif letter_upper == "B":
@@ -996,6 +1298,13 @@ class Tree:
             elif letter_upper == "C":
                 special_struct = uproot.models.TLeaf._tleafc1_format1
 
+            truncation = datum.get("truncation")
+            if isinstance(truncation, uproot.interpretation.numerical.AsFloat16):
+                leaf_classname, special_struct = "TLeafF16", _tleaff16_format1
+            elif truncation is not None:
+                leaf_classname, special_struct = "TLeafD32", _tleafd32_format1
+            out.append(leaf_classname.encode() + b"\x00")
+
             fLenType = datum["dtype"].itemsize
             fIsUnsigned = letter != letter_upper
 
@@ -1009,7 +1318,9 @@ class Tree:
 
             # single TLeaf
             leaf_name = datum["fName"].encode(errors="surrogateescape")
-            leaf_title = (datum["fName"] + dims).encode(errors="surrogateescape")
+            leaf_title = datum.get("leaf_title", datum["fName"] + dims).encode(
+                errors="surrogateescape"
+            )
             leaf_name_length = (1 if len(leaf_name) < 255 else 5) + len(leaf_name)
             leaf_title_length = (1 if len(leaf_title) < 255 else 5) + len(leaf_title)
 
@@ -1111,7 +1422,7 @@ class Tree:
                 )
 
             # specialized TLeaf* members (fMinimum, fMaximum)
-            out.append(special_struct.pack(0, 0))
+            out.append(b"\x00" * special_struct.size)
             datum["tleaf_special_struct"] = special_struct
 
             out[subany_tleaf_index] = (
@@ -1256,7 +1567,7 @@ class Tree:
                     fCompress,
                     datum["fBasketSize"],
                     datum["fEntryOffsetLen"],
-                    self._num_baskets,  # fWriteBasket
+                    datum["arrays_write_stop"],  # fWriteBasket
                     self._num_entries,  # fEntryNumber
                 ),
             )
@@ -1339,25 +1650,35 @@ class Tree:
 
         sink.flush()
 
-    def write_np_basket(self, sink, branch_name, compression, array):
-        fClassName = uproot.serialization.string("TBasket")
-        fName = uproot.serialization.string(branch_name)
-        fTitle = uproot.serialization.string(self._name)
+    def _basket_key_names(self, branch_name):
+        return (
+            uproot.serialization.string("TBasket")
+            + uproot.serialization.string(branch_name)
+            + uproot.serialization.string(self._name)
+        )
 
-        fKeylen = (
+    def _basket_key_length(self, branch_name):
+        return (
             uproot.reading._key_format_big.size
-            + len(fClassName)
-            + len(fName)
-            + len(fTitle)
+            + len(self._basket_key_names(branch_name))
             + uproot.models.TBasket._tbasket_format2.size
             + 1
         )
 
+    def prepare_np_basket(self, branch_name, compression, array):
+        """
+        Serializes and compresses one TBasket of a rectilinear NumPy array
+        without writing it. This does not depend on where the TBasket will be
+        written, so it can run in another thread; pass the result to
+        ``write_basket``.
+        """
+        fKeylen = self._basket_key_length(branch_name)
+
         itemsize = array.dtype.itemsize
         for item in array.shape[1:]:
             itemsize *= item
 
-        uncompressed_data = array.tobytes()
+        uncompressed_data = _as_bytes(array)
         compressed_data = uproot.compression.compress(uncompressed_data, compression)
 
         fObjlen = len(uncompressed_data)
@@ -1370,59 +1691,24 @@ class Tree:
                 "Neither of these sizes can exceed 2 GiB."
             )
 
-        parent_location = self._directory.key.location  # FIXME: is this correct?
-
-        location = self._freesegments.allocate(fNbytes, dry_run=False)
-
-        out = []
-        out.append(
-            uproot.reading._key_format_big.pack(
-                fNbytes,
-                1004,  # fVersion
-                fObjlen,
-                uproot._util.datetime_to_code(datetime.datetime.now()),  # fDatime
-                fKeylen,
-                0,  # fCycle
-                location,  # fSeekKey
-                parent_location,  # fSeekPdir
-            )
-        )
-        out.append(fClassName)
-        out.append(fName)
-        out.append(fTitle)
-        out.append(
-            uproot.models.TBasket._tbasket_format2.pack(
-                3,  # fVersion
-                32000,  # fBufferSize
+        return (
+            branch_name,
+            fKeylen,
+            fObjlen,
+            (
                 itemsize,  # fNevBufSize
                 len(array),  # fNevBuf
                 fKeylen + len(uncompressed_data),  # fLast
-            )
+            ),
+            compressed_data,
         )
-        out.append(b"\x00")  # part of the Key (included in fKeylen, at least)
-
-        out.append(compressed_data)
-
-        sink.write(location, b"".join(out))
-        self._freesegments.write(sink)
-        sink.set_file_length(self._freesegments.fileheader.end)
-        sink.flush()
 
-        return fKeylen + fObjlen, fNbytes, location
-
-    def write_jagged_basket(self, sink, branch_name, compression, array, offsets):
-        fClassName = uproot.serialization.string("TBasket")
-        fName = uproot.serialization.string(branch_name)
-        fTitle = uproot.serialization.string(self._name)
-
-        fKeylen = (
-            uproot.reading._key_format_big.size
-            + len(fClassName)
-            + len(fName)
-            + len(fTitle)
-            + uproot.models.TBasket._tbasket_format2.size
-            + 1
-        )
+    def prepare_jagged_basket(self, branch_name, compression, array, offsets):
+        """
+        Like ``prepare_np_basket``, but for a simple jagged array from Awkward
+        Array.
+        """
+        fKeylen = self._basket_key_length(branch_name)
 
         # offsets became a *copy* of the Awkward Array's offsets
         # when it was converted to big-endian (astype with copy=True)
@@ -1432,10 +1718,10 @@ class Tree:
         offsets *= itemsize
         offsets += fKeylen
 
-        raw_array = array.tobytes()
-        raw_offsets = offsets.tobytes()
-        uncompressed_data = (
-            raw_array + _tbasket_offsets_length.pack(len(offsets)) + raw_offsets
+        uncompressed_data = _join_bytes(
+            _as_bytes(array),
+            _tbasket_offsets_length.pack(len(offsets)),
+            _as_bytes(offsets),
         )
         compressed_data = uproot.compression.compress(uncompressed_data, compression)
 
@@ -1452,58 +1738,24 @@ class Tree:
                 "Neither of these sizes can exceed 2 GiB."
             )
 
-        parent_location = self._directory.key.location  # FIXME: is this correct?
-
-        location = self._freesegments.allocate(fNbytes, dry_run=False)
-
-        out = []
-        out.append(
-            uproot.reading._key_format_big.pack(
-                fNbytes,
-                1004,  # fVersion
-                fObjlen,
-                uproot._util.datetime_to_code(datetime.datetime.now()),  # fDatime
-                fKeylen,
-                0,  # fCycle
-                location,  # fSeekKey
-                parent_location,  # fSeekPdir
-            )
-        )
-        out.append(fClassName)
-        out.append(fName)
-        out.append(fTitle)
-        out.append(
-            uproot.models.TBasket._tbasket_format2.pack(
-                3,  # fVersion
-                32000,  # fBufferSize
+        return (
+            branch_name,
+            fKeylen,
+            fObjlen,
+            (
                 len(offsets) + 1,  # fNevBufSize
                 len(offsets) - 1,  # fNevBuf
                 fLast,
-            )
+            ),
+            compressed_data,
         )
-        out.append(b"\x00")  # part of the Key (included in fKeylen, at least)
 
-        out.append(compressed_data)
-
-        sink.write(location, b"".join(out))
-        self._freesegments.write(sink)
-        sink.set_file_length(self._freesegments.fileheader.end)
-        sink.flush()
-
-        return fKeylen + fObjlen, fNbytes, location
-
-    def write_string_basket(self, sink, branch_name, compression, array, offsets):
-        fClassName = uproot.serialization.string("TBasket")
-        fName = uproot.serialization.string(branch_name)
-        fTitle = uproot.serialization.string(self._name)
-        fKeylen = (
-            uproot.reading._key_format_big.size
-            + len(fClassName)
-            + len(fName)
-            + len(fTitle)
-            + uproot.models.TBasket._tbasket_format2.size
-            + 1
-        )
+    def prepare_string_basket(self, branch_name, compression, array, offsets):
+        """
+        Like ``prepare_np_basket``, but for strings. Returns the size of the
+        biggest string (``fLen``) as well.
+        """
+        fKeylen = self._basket_key_length(branch_name)
 
         itemsize = array.dtype.itemsize
         for item in array.shape[1:]:
@@ -1512,13 +1764,11 @@ class Tree:
         offsets *= itemsize
         offsets += fKeylen
 
-        raw_array = array.tobytes()
-        raw_offsets = offsets.tobytes()
-        uncompressed_data = (
-            raw_array
-            + _tbasket_offsets_length.pack(len(offsets))
-            + raw_offsets[:-4]
-            + b"\x00\x00\x00\x00"
+        uncompressed_data = _join_bytes(
+            _as_bytes(array),
+            _tbasket_offsets_length.pack(len(offsets)),
+            _as_bytes(offsets[:-1]),
+            b"\x00\x00\x00\x00",
         )
         compressed_data = uproot.compression.compress(uncompressed_data, compression)
 
@@ -1538,51 +1788,269 @@ class Tree:
                 "Neither of these sizes can exceed 2 GiB."
             )
 
+        prepared = (
+            branch_name,
+            fKeylen,
+            fObjlen,
+            (
+                1000,  # fNevBufSize
+                len(offsets) - 1,  # fNevBuf
+                fLast,
+            ),
+            compressed_data,
+        )
+        return prepared, fLen
+
+    def write_basket(self, sink, prepared, write_executor=None, pending_writes=None):
+        """
+        Allocates space for and writes a TBasket from ``prepare_np_basket``,
+        ``prepare_jagged_basket``, or ``prepare_string_basket``. Returns its
+        uncompressed size, compressed size, and location.
+
+        If a ``write_executor`` is given, the TBasket is written by it (for a
+        ``sink`` with ``positioned_writes``) and the future is appended to
+        ``pending_writes``, which must all be finished before the TBasket is
+        considered written.
+        """
+        branch_name, fKeylen, fObjlen, basket_fields, compressed_data = prepared
+        fNbytes = fKeylen + len(compressed_data)
+
         parent_location = self._directory.key.location  # FIXME: is this correct?
 
         location = self._freesegments.allocate(fNbytes, dry_run=False)
 
-        out = []
-        out.append(
-            uproot.reading._key_format_big.pack(
-                fNbytes,
-                1004,  # fVersion
-                fObjlen,
-                uproot._util.datetime_to_code(datetime.datetime.now()),  # fDatime
-                fKeylen,
-                0,  # fCycle
-                location,  # fSeekKey
-                parent_location,  # fSeekPdir
-            )
+        # the header is packed in place and the (possibly large) data are
+        # written after it as they are, rather than copied into one buffer
+        header = bytearray(fKeylen)  # ends with a zero byte that is part of the Key
+        uproot.reading._key_format_big.pack_into(
+            header,
+            0,
+            fNbytes,
+            1004,  # fVersion
+            fObjlen,
+            uproot._util.datetime_to_code(datetime.datetime.now()),  # fDatime
+            fKeylen,
+            0,  # fCycle
+            location,  # fSeekKey
+            parent_location,  # fSeekPdir
         )
-        out.append(fClassName)
-        out.append(fName)
-        out.append(fTitle)
-        out.append(
-            uproot.models.TBasket._tbasket_format2.pack(
-                3,  # fVersion
-                32000,  # fBufferSize
-                1000,  # fNevBufSize
-                len(offsets) - 1,  # fNevBuf
-                fLast,
+        position = uproot.reading._key_format_big.size
+        names = self._basket_key_names(branch_name)
+        header[position : position + len(names)] = names
+        uproot.models.TBasket._tbasket_format2.pack_into(
+            header,
+            position + len(names),
+            3,  # fVersion
+            32000,  # fBufferSize
+            *basket_fields,  # fNevBufSize, fNevBuf, fLast
+        )
+
+        if write_executor is None:
+            _write_key_and_data(sink, location, header, compressed_data)
+        else:
+            pending_writes.append(
+                write_executor.submit(
+                    _write_key_and_data, sink, location, header, compressed_data
+                )
             )
+
+        return fKeylen + fObjlen, fNbytes, location
+
+    def write_raw_basket(self, sink, raw_data):
+        """
+        Allocates space for and writes a TBasket copied byte-for-byte from
+        another file, including its TKey, changing only the TKey's ``fSeekKey``
+        and ``fSeekPdir``. The TKey keeps its length, so that entry offsets in
+        the compressed data, which count from the start of the TKey, are still
+        valid. Returns its uncompressed size, compressed size, and location, or
+        None if a small (32-bit) TKey can't point to where it would be written.
+        """
+        raw_data = bytearray(raw_data)
+        fNbytes, fVersion, fObjlen, _, fKeylen = _raw_key_format.unpack(
+            raw_data[: _raw_key_format.size]
         )
 
-        out.append(b"\x00")  # part of the Key (included in fKeylen, at least)
+        parent_location = self._directory.key.location
+        location = self._freesegments.allocate(fNbytes, dry_run=True)
+        if fVersion > 1000:
+            _raw_key_seeks_big.pack_into(
+                raw_data, _raw_key_seeks_position, location, parent_location
+            )
+        elif location + fNbytes < uproot.const.kStartBigFile:
+            _raw_key_seeks_small.pack_into(
+                raw_data, _raw_key_seeks_position, location, parent_location
+            )
+        else:
+            return None
+
+        self._freesegments.allocate(fNbytes, dry_run=False)
+        sink.write(location, raw_data)
+
+        return fKeylen + fObjlen, fNbytes, location
+
+    def add_baskets(self, file, sink, num_entries, written):
+        """
+        Adds TBaskets that have already been written with ``write_basket`` or
+        ``write_raw_basket`` to the TTree metadata. The ``written`` is a dict
+        from TBranch name to a list of ``(num_entries, uncompressed_bytes,
+        compressed_bytes, location)`` for each TBasket, in entry order. Every
+        TBranch must get ``num_entries`` in total, but TBranches may have
+        different numbers of TBaskets.
+        """
+        self.flush(file, sink)
+
+        num_baskets = 0
+        for datum in self._branch_data:
+            if datum["kind"] == "record":
+                continue
+            baskets = written.get(datum["fName"])
+            if baskets is None:
+                raise ValueError(
+                    "'add_baskets' must be given TBaskets for every branch; missing {}".format(
+                        repr(datum["fName"])
+                    )
+                )
+            if sum(x[0] for x in baskets) != num_entries:
+                raise ValueError(
+                    f"'add_baskets' must fill every branch with the same number of entries; {datum['fName']!r} has {sum(x[0] for x in baskets)} entries"
+                )
+            num_baskets = max(num_baskets, datum["arrays_write_stop"] + len(baskets))
+
+        self._ensure_capacity(file, sink, num_baskets)
+
+        uncompressed_bytes = 0
+        compressed_bytes = 0
+        for datum in self._branch_data:
+            if datum["kind"] == "record":
+                continue
+            entry = self._num_entries
+            for basket_entries, totbytes, zipbytes, location in written[datum["fName"]]:
+                i = datum["arrays_write_stop"]
+                entry += basket_entries
+                datum["fBasketBytes"][i] = zipbytes
+                datum["fBasketEntry"][i + 1] = entry
+                datum["fBasketSeek"][i] = location
+                datum["arrays_write_stop"] = i + 1
+
+                datum["fTotBytes"] += totbytes
+                datum["fZipBytes"] += zipbytes
+                uncompressed_bytes += totbytes
+                compressed_bytes += zipbytes
+
+        self.write_free_segments(sink)
+
+        self._num_entries += num_entries
+        self._num_baskets = num_baskets
+        self._metadata["fTotBytes"] += uncompressed_bytes
+        self._metadata["fZipBytes"] += compressed_bytes
 
-        out.append(compressed_data)
+        self.write_updates(sink)
 
-        sink.write(location, b"".join(out))
+    def write_free_segments(self, sink):
+        """
+        Writes the FreeSegments record and file length after one or more
+        ``write_basket`` calls.
+        """
         self._freesegments.write(sink)
         sink.set_file_length(self._freesegments.fileheader.end)
         sink.flush()
 
-        return fKeylen + fObjlen, fNbytes, location, fLen
+    def write_np_basket(self, sink, branch_name, compression, array):
+        out = self.write_basket(
+            sink, self.prepare_np_basket(branch_name, compression, array)
+        )
+        self.write_free_segments(sink)
+        return out
+
+    def write_jagged_basket(self, sink, branch_name, compression, array, offsets):
+        out = self.write_basket(
+            sink,
+            self.prepare_jagged_basket(branch_name, compression, array, offsets),
+        )
+        self.write_free_segments(sink)
+        return out
+
+    def write_string_basket(self, sink, branch_name, compression, array, offsets):
+        prepared, fLen = self.prepare_string_basket(
+            branch_name, compression, array, offsets
+        )
+        out = self.write_basket(sink, prepared)
+        self.write_free_segments(sink)
+        return (*out, fLen)
 
 
 _tbasket_offsets_length = struct.Struct(">I")
 
 
+def _write_key_and_data(sink, location, header, data):
+    sink.write(location, header)
+    sink.write(location + len(header), data)
+
+
+def _as_bytes(array):
+    """
+    Returns the data of a NumPy array as a memoryview of bytes, without copying
+    if it is C-contiguous.
+    """
+    return memoryview(numpy.ascontiguousarray(array).reshape(-1).view(numpy.uint8))
+
+
+def _join_bytes(*parts):
+    """
+    Concatenates bytes-like ``parts`` with only one copy, into a memoryview.
+    """
+    out = memoryview(bytearray(sum(len(x) for x in parts)))
+    start = 0
+    for part in parts:
+        out[start : start + len(part)] = part
+        start += len(part)
+    return out
+
+
+def _concatenate_tofill(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+
+    out = []
+    for i, (branch_name, _, big_endian, big_endian_offsets) in enumerate(chunks[0]):
+        compression = chunks[-1][i][1]
+        # numpy.concatenate would return native byte order
+        data = numpy.concatenate([chunk[i][2] for chunk in chunks]).astype(
+            big_endian.dtype, copy=False
+        )
+        if big_endian_offsets is None:
+            out.append((branch_name, compression, data, None))
+        else:
+            offsets = [chunk[i][3] for chunk in chunks]
+            shifts = numpy.cumsum([0] + [x[-1] for x in offsets[:-1]])
+            data_offsets = numpy.concatenate(
+                [offsets[0]]
+                + [
+                    x[1:] + shift
+                    for x, shift in zip(offsets[1:], shifts[1:], strict=True)
+                ]
+            ).astype(">i4", copy=False)
+            out.append((branch_name, compression, data, data_offsets))
+    return out
+
+
+def _slice_tofill(tofill, start, stop, copy=False):
+    out = []
+    for branch_name, compression, big_endian, big_endian_offsets in tofill:
+        if big_endian_offsets is None:
+            data = big_endian[start:stop]
+            data_offsets = None
+        else:
+            data_offsets = big_endian_offsets[start : stop + 1]
+            data = big_endian[data_offsets[0] : data_offsets[-1]]
+            # a new array, since prepare_jagged_basket changes offsets in place
+            data_offsets = (data_offsets - data_offsets[0]).astype(">i4")
+        if copy:
+            data = data.copy()
+        out.append((branch_name, compression, data, data_offsets))
+    return out
+
+
 def dataframe_to_dict(df):
     """
     Converts a Pandas DataFrame into a dict of NumPy arrays for writing.
@@ -0,0 +1,602 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines functions that copy TTrees from one ROOT file to another by
+their TBaskets, without decompressing, interpreting, and recompressing the data.
+
+The :doc:`uproot.writing.basketcopy.copy_tree` function copies (or skims) one
+TTree, optionally restricted to a subset of its TBranches and a range of entries.
+
+The :doc:`uproot.writing.basketcopy.merge` function concatenates the TTrees of
+many files into one, like ROOT's ``hadd``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import queue
+
+import numpy
+
+import uproot
+import uproot.behaviors.TBranch
+import uproot.interpretation.jagged
+import uproot.interpretation.numerical
+import uproot.interpretation.strings
+import uproot.source.futures
+import uproot.writing.writable
+from uproot._util import no_filter
+
+
+def copy_tree(
+    source,
+    destination,
+    name=None,
+    *,
+    filter_name=no_filter,
+    filter_typename=no_filter,
+    filter_branch=no_filter,
+    entry_start=None,
+    entry_stop=None,
+    step_size="100 MB",
+):
+    """
+    Args:
+        source (:doc:`uproot.behaviors.TTree.TTree`): The TTree to copy, from a
+            file opened for reading.
+        destination (:doc:`uproot.writing.writable.WritableDirectory`): The
+            directory in which to make the new TTree.
+        name (None or str): Name of the new TTree. If None, the name of the
+            ``source`` is used.
+        filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by name.
+        filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by type.
+        filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` → bool): A
+            filter to select ``TBranches`` using the full
+            :doc:`uproot.behaviors.TBranch.TBranch` object.
+        entry_start (None or int): The first entry to copy. If None, start at zero.
+            If negative, count from the end, like a Python slice.
+        entry_stop (None or int): The first entry to exclude (i.e. one greater
+            than the last entry to copy). If None, stop at the end of the TTree.
+            If negative, count from the end, like a Python slice.
+        step_size (int or str): The maximum number of compressed bytes to read
+            from the ``source`` at a time, as a number of bytes or a memory size
+            string with units (such as ``"100 MB"``).
+
+    Copies a TTree into a new TTree named ``name`` in ``destination`` and returns
+    it as a :doc:`uproot.writing.writable.WritableTree`, which can be extended
+    afterward.
+
+    The compressed TBaskets are copied byte-for-byte, so copying is limited by
+    I/O, not by decompression and compression. Only TBaskets that straddle
+    ``entry_start`` or ``entry_stop`` (and TBaskets embedded in the TTree
+    metadata) are decompressed, cut, and recompressed with the TBranch's
+    compression setting. For instance,
+
+    .. code-block:: python
+
+        with uproot.open("big.root") as source, uproot.recreate("slim.root") as output:
+            uproot.copy_tree(source["events"], output, filter_name=["Muon_*", "nMuon"])
+
+    keeps only the muon TBranches of the ``events`` TTree. The counter TBranch
+    of each selected jagged TBranch is copied with it, even if not selected.
+
+    Only TBranches that Uproot can write are supported: numbers (and fixed-size
+    arrays of numbers), variable-length arrays of numbers with a counter
+    TBranch, and strings (``TLeafC``). Other TBranches raise ``TypeError``; use
+    ``filter_name`` or ``filter_branch`` to exclude them.
+    """
+    if not isinstance(source, uproot.behaviors.TTree.TTree):
+        raise TypeError("'source' must be a TTree from a file opened for reading")
+    if not isinstance(destination, uproot.writing.writable.WritableDirectory):
+        raise TypeError(
+            "'destination' must be a directory from uproot.create, uproot.recreate, "
+            "or uproot.update"
+        )
+    if destination.closed:
+        raise ValueError("cannot create a TTree in a closed file")
+
+    step_bytes = uproot._util.memory_size(
+        step_size,
+        "number of bytes or memory size string with units "
+        f"(such as '100 MB') required, not {step_size!r}",
+    )
+    entry_start, entry_stop = uproot.behaviors.TBranch._regularize_entries_start_stop(
+        source.num_entries, entry_start, entry_stop
+    )
+
+    branches = _select_branches(source, filter_name, filter_typename, filter_branch)
+    if len(branches) == 0:
+        raise ValueError(
+            f"no TBranches found with names matching {filter_name!r} in TTree "
+            f"{source.object_path} in file {source.file.file_path}"
+        )
+    branch_types, counter_names = _branch_types(branches)
+
+    plans = {
+        branch.name: _plan(branch, entry_start, entry_stop) for branch in branches
+    }
+
+    tree = destination.mktree(
+        source.name if name is None else name,
+        branch_types,
+        title=source.title,
+        counter_name=counter_names.__getitem__,
+        initial_basket_capacity=max(len(plan) for plan in plans.values()) + 2,
+    )
+
+    cascading = tree._cascading
+    file = tree._file
+    for branch in branches:
+        datum = cascading._branch_data[cascading._branch_lookup[branch.name]]
+        datum["compression"] = branch.compression
+        _copy_branch_metadata(branch, datum)
+
+    written = {}
+    for branch in branches:
+        written[branch.name] = _copy_baskets(
+            cascading, file.sink, branch, plans[branch.name], step_bytes
+        )
+
+    cascading.add_baskets(file, file.sink, entry_stop - entry_start, written)
+    return tree
+
+
+def merge(
+    files,
+    output,
+    tree=None,
+    *,
+    filter_name=no_filter,
+    filter_typename=no_filter,
+    filter_branch=no_filter,
+    step_size="100 MB",
+    num_workers=4,
+    **options,
+):
+    """
+    Args:
+        files: See :doc:`uproot.behaviors.TBranch.iterate` for a description
+            of the files and objects that can be given, including the
+            ``"filename.root:treename"`` syntax and wildcards.
+        output (str, ``pathlib.Path``, or :doc:`uproot.writing.writable.WritableDirectory`):
+            The file to make (replacing it if it exists) or the directory in
+            which to make the merged TTree.
+        tree (None or str): Name of the TTree in each of the ``files``, if not
+            given with the ``"filename.root:treename"`` syntax. If None and a
+            file has only one TTree, that TTree is used. The merged TTree gets
+            the same name.
+        filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by name.
+        filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by type.
+        filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` → bool): A
+            filter to select ``TBranches`` using the full
+            :doc:`uproot.behaviors.TBranch.TBranch` object.
+        step_size (int or str): Files whose selected TBaskets are smaller than
+            this many compressed bytes are read in the background, in full;
+            larger files are read this many bytes at a time. Expressed as a
+            number of bytes or a memory size string with units (such as
+            ``"100 MB"``).
+        num_workers (int): Number of ``files`` that are opened and read in the
+            background while the TBaskets of an earlier file are being written.
+            Together with ``step_size``, this bounds the memory used.
+        options: See :doc:`uproot.reading.open`.
+
+    Merges the TTrees of many files into one TTree by appending their compressed
+    TBaskets, as in :doc:`uproot.writing.basketcopy.copy_tree`, and returns the
+    merged TTree as a :doc:`uproot.writing.writable.WritableTree`. For instance,
+
+    .. code-block:: python
+
+        uproot.merge("job-*.root", "merged.root", tree="events")
+
+    Nothing is decompressed, interpreted, or recompressed (except TBaskets
+    embedded in TTree metadata), so this is limited by I/O. The TBranch names and
+    types must be the same in all of the ``files`` (after filtering), or a
+    ``ValueError`` is raised before anything is written from that file.
+
+    If ``output`` is a path, the file is closed when the merge is done.
+    """
+    step_bytes = uproot._util.memory_size(
+        step_size,
+        "number of bytes or memory size string with units "
+        f"(such as '100 MB') required, not {step_size!r}",
+    )
+    files = uproot._util.regularize_files(files, steps_allowed=False, **options)
+    filters = (filter_name, filter_typename, filter_branch)
+
+    if isinstance(output, uproot.writing.writable.WritableDirectory):
+        destination = output
+    else:
+        destination = uproot.writing.writable.recreate(output)
+
+    executor = uproot.source.futures.ThreadPoolExecutor(max(1, num_workers))
+    futures = []
+    try:
+        for file_path, object_path in files[:num_workers]:
+            futures.append(
+                executor.submit(
+                    _open_input,
+                    file_path,
+                    tree if object_path is None else object_path,
+                    filters,
+                    step_bytes,
+                    options,
+                )
+            )
+
+        merged = None
+        reference = None
+        for index in range(len(files)):
+            source, branches, plans, prefetched = futures[index].result()
+            futures[index] = None
+            if index + num_workers < len(files):
+                file_path, object_path = files[index + num_workers]
+                futures.append(
+                    executor.submit(
+                        _open_input,
+                        file_path,
+                        tree if object_path is None else object_path,
+                        filters,
+                        step_bytes,
+                        options,
+                    )
+                )
+
+            with source:
+                types = _branch_types(branches)
+                if merged is None:
+                    reference = types
+                    merged = destination.mktree(
+                        source.name,
+                        types[0],
+                        title=source.title,
+                        counter_name=types[1].__getitem__,
+                        # grows with the TBaskets of the other files
+                        initial_basket_capacity=max(
+                            len(plan) for plan in plans.values()
+                        )
+                        + 2,
+                    )
+                    for branch in branches:
+                        cascading = merged._cascading
+                        datum = cascading._branch_data[
+                            cascading._branch_lookup[branch.name]
+                        ]
+                        datum["compression"] = branch.compression
+
+                elif types != reference:
+                    raise ValueError(
+                        f"TTree {source.object_path!r} in file {source.file.file_path} "
+                        "has different TBranches or types than in the first file:"
+                        f"\n\n    {types[0]}\n\nversus\n\n    {reference[0]}"
+                    )
+
+                cascading = merged._cascading
+                written = {}
+                for branch in branches:
+                    datum = cascading._branch_data[
+                        cascading._branch_lookup[branch.name]
+                    ]
+                    _copy_branch_metadata(branch, datum)
+                    written[branch.name] = _copy_baskets(
+                        cascading,
+                        merged._file.sink,
+                        branch,
+                        plans[branch.name],
+                        step_bytes,
+                        None if prefetched is None else prefetched[branch.name],
+                    )
+                cascading.add_baskets(
+                    merged._file, merged._file.sink, source.num_entries, written
+                )
+
+    finally:
+        # if something went wrong, close the files that are already open; a
+        # file that failed to open was closed by _open_input, and its error
+        # (or the one that is already propagating) must not be replaced by
+        # another one here
+        for future in futures:
+            if future is not None:
+                with contextlib.suppress(Exception):
+                    future.result()[0].__exit__(None, None, None)
+        executor.shutdown()
+        if destination is not output:
+            destination.close()
+
+    return merged
+
+
+def _open_input(file_path, object_path, filters, step_bytes, options):
+    source = uproot._util.regularize_object_path(
+        file_path, object_path, None, False, options
+    )
+    try:
+        if not isinstance(
+            getattr(source, "hasbranches", source), uproot.behaviors.TTree.TTree
+        ):
+            raise TypeError(
+                f"object {source.object_path!r} in file {source.file.file_path} "
+                "is not a TTree"
+            )
+        branches = _select_branches(source, *filters)
+        if len(branches) == 0:
+            raise ValueError(
+                f"no TBranches found with names matching {filters[0]!r} in TTree "
+                f"{source.object_path} in file {source.file.file_path}"
+            )
+        plans = {
+            branch.name: _plan(branch, 0, source.num_entries) for branch in branches
+        }
+
+        fBasketBytes = {branch.name: branch.member("fBasketBytes") for branch in branches}
+        num_bytes = sum(
+            int(fBasketBytes[name][item[0]])
+            for name, plan in plans.items()
+            for item in plan
+            if item[3] is None
+        )
+        prefetched = None
+        if num_bytes <= step_bytes:
+            prefetched = {}
+            for branch in branches:
+                basket_nums = [x[0] for x in plans[branch.name] if x[3] is None]
+                prefetched[branch.name] = dict(
+                    zip(
+                        basket_nums,
+                        _read_raw_baskets(branch, basket_nums),
+                        strict=True,
+                    )
+                )
+
+    except Exception:
+        source.__exit__(None, None, None)
+        raise
+
+    return source, branches, plans, prefetched
+
+
+def _select_branches(source, filter_name, filter_typename, filter_branch):
+    selected = source.values(
+        filter_name=filter_name,
+        filter_typename=filter_typename,
+        filter_branch=filter_branch,
+    )
+
+    out = []
+    seen = set()
+    for branch in selected:
+        _check_branch(branch)
+        count_branch = branch.count_branch
+        if count_branch is not None and count_branch.name not in seen:
+            _check_branch(count_branch)
+            seen.add(count_branch.name)
+            out.append(count_branch)
+        if branch.name not in seen:
+            seen.add(branch.name)
+            out.append(branch)
+    return out
+
+
+def _check_branch(branch):
+    if (
+        branch.classname != "TBranch"
+        or len(branch.branches) != 0
+        or len(branch.member("fLeaves")) != 1
+    ):
+        raise TypeError(
+            f"TBranch {branch.name!r} of class {branch.classname} can't be copied "
+            "TBasket by TBasket; only simple TBranches with one TLeaf are supported"
+        )
+
+    interpretation = branch.interpretation
+    count_branch = branch.count_branch
+    if _is_flat(interpretation) and count_branch is None:
+        return
+    if (
+        isinstance(interpretation, uproot.interpretation.jagged.AsJagged)
+        and interpretation.header_bytes == 0
+        and _is_flat(interpretation.content)
+        and count_branch is not None
+        and _is_flat(count_branch.interpretation)
+        and count_branch.interpretation.from_dtype == numpy.dtype(">i4")
+    ):
+        return
+    if (
+        isinstance(interpretation, uproot.interpretation.strings.AsStrings)
+        and interpretation.header_bytes == 0
+        and interpretation.length_bytes == "1-5"
+    ):
+        return
+    raise TypeError(
+        f"TBranch {branch.name!r} with interpretation {interpretation!r} can't be "
+        "copied TBasket by TBasket; only numbers, variable-length arrays of numbers "
+        "with 32-bit counters, and strings are supported"
+    )
+
+
+def _is_flat(interpretation):
+    return type(interpretation) in (
+        uproot.interpretation.numerical.AsDtype,
+        uproot.interpretation.numerical.AsDtypeInPlace,
+    )
+
+
+def _branch_types(branches):
+    counters = {
+        branch.count_branch.name for branch in branches if branch.count_branch
+    }
+    branch_types = {}
+    counter_names = {}
+    for branch in branches:
+        if branch.name in counters:
+            # created by mktree, along with the first TBranch it counts
+            continue
+
+        interpretation = branch.interpretation
+        if isinstance(interpretation, uproot.interpretation.strings.AsStrings):
+            branch_types[branch.name] = str
+
+        elif isinstance(interpretation, uproot.interpretation.jagged.AsJagged):
+            dtype = interpretation.content.from_dtype
+            if dtype.subdtype is None:
+                shape = ()
+            else:
+                dtype, shape = dtype.subdtype
+            primitive = str(dtype.newbyteorder("="))
+            branch_types[branch.name] = "var * " + "".join(
+                f"{x} * " for x in shape
+            ) + primitive
+            counter_names[branch.name] = branch.count_branch.name
+
+        else:
+            branch_types[branch.name] = interpretation.from_dtype
+
+    return branch_types, counter_names
+
+
+def _copy_branch_metadata(branch, datum):
+    leaf = branch.member("fLeaves")[0]
+    if datum["kind"] == "counter":
+        datum["tleaf_maximum_value"] = max(
+            datum["tleaf_maximum_value"], leaf.member("fMaximum")
+        )
+    if datum["dtype"] == ">U0":
+        datum["fLen"] = max(datum.get("fLen", 0), leaf.member("fLen"))
+    if datum["counter"] is not None or datum["dtype"] == ">U0":
+        datum["fEntryOffsetLen"] = branch.member("fEntryOffsetLen")
+
+
+def _plan(branch, entry_start, entry_stop):
+    """
+    Returns a list of ``(basket_num, basket_start, basket_stop, local_start,
+    local_stop)`` for the TBaskets that overlap ``entry_start:entry_stop``,
+    in which ``local_start`` and ``local_stop`` are None for TBaskets that can
+    be copied without decompression.
+    """
+    out = []
+    for basket_num in range(branch.num_baskets):
+        start, stop = branch.basket_entry_start_stop(basket_num)
+        start, stop = int(start), int(stop)
+        if stop <= entry_start or entry_stop <= start:
+            continue
+        if (
+            entry_start <= start
+            and stop <= entry_stop
+            and basket_num < branch._num_normal_baskets
+        ):
+            out.append((basket_num, start, stop, None, None))
+        else:
+            out.append(
+                (
+                    basket_num,
+                    start,
+                    stop,
+                    max(entry_start, start) - start,
+                    min(entry_stop, stop) - start,
+                )
+            )
+    return out
+
+
+def _read_raw_baskets(branch, basket_nums):
+    fBasketSeek = branch.member("fBasketSeek")
+    fBasketBytes = branch.member("fBasketBytes")
+    ranges = [
+        (int(fBasketSeek[i]), int(fBasketSeek[i] + fBasketBytes[i]))
+        for i in basket_nums
+    ]
+    chunks = branch.file.source.chunks(ranges, notifications=queue.Queue())
+    out = []
+    for chunk in chunks:
+        chunk.wait()
+        out.append(chunk.raw_data)
+    return out
+
+
+def _copy_baskets(cascading, sink, branch, plan, step_bytes, prefetched=None):
+    fBasketBytes = branch.member("fBasketBytes")
+
+    out = []
+    batch = []
+    batch_bytes = 0
+    for i, item in enumerate(plan):
+        if item[3] is None:
+            batch.append(item)
+            batch_bytes += int(fBasketBytes[item[0]])
+        if len(batch) != 0 and (
+            item[3] is not None or batch_bytes >= step_bytes or i == len(plan) - 1
+        ):
+            if prefetched is None:
+                raw_baskets = _read_raw_baskets(branch, [x[0] for x in batch])
+            else:
+                raw_baskets = [prefetched.pop(x[0]) for x in batch]
+            for (basket_num, start, stop, _, _), raw_data in zip(
+                batch, raw_baskets, strict=True
+            ):
+                written = cascading.write_raw_basket(sink, raw_data)
+                if written is None:
+                    written = _rewrite_basket(
+                        cascading, sink, branch, basket_num, 0, stop - start
+                    )
+                out.append((stop - start, *written))
+            batch = []
+            batch_bytes = 0
+
+        if item[3] is not None:
+            basket_num, _, _, local_start, local_stop = item
+            out.append(
+                (
+                    local_stop - local_start,
+                    *_rewrite_basket(
+                        cascading, sink, branch, basket_num, local_start, local_stop
+                    ),
+                )
+            )
+
+    return out
+
+
+def _rewrite_basket(cascading, sink, branch, basket_num, local_start, local_stop):
+    basket = branch.basket(basket_num)
+    data = numpy.frombuffer(basket.data, numpy.uint8)
+    byte_offsets = basket.byte_offsets
+    interpretation = branch.interpretation
+    datum = cascading._branch_data[cascading._branch_lookup[branch.name]]
+
+    if byte_offsets is None:
+        itemsize = interpretation.from_dtype.itemsize
+        array = data[local_start * itemsize : local_stop * itemsize].view(
+            interpretation.from_dtype
+        )
+        prepared = cascading.prepare_np_basket(
+            branch.name, datum["compression"], array
+        )
+
+    else:
+        byte_offsets = numpy.asarray(byte_offsets)
+        start, stop = byte_offsets[local_start], byte_offsets[local_stop]
+        offsets = byte_offsets[local_start : local_stop + 1] - start
+
+        if datum["dtype"] == ">U0":
+            prepared, fLen = cascading.prepare_string_basket(
+                branch.name,
+                datum["compression"],
+                data[start:stop],
+                offsets.astype(">i4"),
+            )
+            datum["fLen"] = max(datum.get("fLen", 0), fLen)
+
+        else:
+            dtype = interpretation.content.from_dtype
+            array = data[start:stop].view(dtype)
+            prepared = cascading.prepare_jagged_basket(
+                branch.name,
+                datum["compression"],
+                array,
+                (offsets // dtype.itemsize).astype(">i4"),
+            )
+
+    return cascading.write_basket(sink, prepared)
@@ -0,0 +1,361 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""
+This module defines functions that convert data from one format to another,
+such as :doc:`uproot.writing.conversion.convert_to_rntuple`, which converts
+TTrees into an RNTuple, and :doc:`uproot.writing.conversion.to_parquet`, which
+converts TTrees or RNTuples into Parquet files.
+"""
+
+from __future__ import annotations
+
+import os
+
+import awkward
+
+import uproot
+import uproot.behaviors.TBranch
+import uproot.writing.writable
+from uproot._util import no_filter
+
+
+def convert_to_rntuple(
+    files,
+    output,
+    step_size="100 MB",
+    *,
+    name=None,
+    description="",
+    filter_name=no_filter,
+    filter_typename=no_filter,
+    filter_branch=no_filter,
+    prefetch=1,
+    decompression_executor=None,
+    interpretation_executor=None,
+    **options,
+):
+    """
+    Args:
+        files: See :doc:`uproot.behaviors.TBranch.iterate` for a description
+            of the TTrees that can be given, including the
+            ``"filename.root:treename"`` syntax and wildcards.
+        output (str, ``pathlib.Path``, or :doc:`uproot.writing.writable.WritableDirectory`):
+            The file to make (replacing it if it exists) or the directory in
+            which to make the RNTuple.
+        step_size (int or str): If an integer, the maximum number of entries to
+            include in each cluster of the RNTuple; if a string, the maximum
+            memory size to include. The string must be a number followed by a
+            memory unit, such as "100 MB".
+        name (None or str): Name of the new RNTuple. If None, the name of the
+            first TTree is used.
+        description (str): Description for the new RNTuple.
+        filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by name.
+        filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` by type.
+        filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` → bool): A
+            filter to select ``TBranches`` using the full
+            :doc:`uproot.behaviors.TBranch.TBranch` object.
+        prefetch (int): Number of steps to read ahead in a background thread
+            while earlier steps are compressed and written. If 0, reading and
+            writing alternate in the calling thread.
+        decompression_executor (None or Executor with a ``submit`` method): The
+            executor that is used to decompress ``TBaskets``; see
+            :doc:`uproot.behaviors.TBranch.iterate`.
+        interpretation_executor (None or Executor with a ``submit`` method): The
+            executor that is used to interpret uncompressed ``TBasket`` data;
+            see :doc:`uproot.behaviors.TBranch.iterate`.
+        options: See :doc:`uproot.reading.open`.
+
+    Converts TTrees into an RNTuple, one cluster per ``step_size``, and returns
+    it as a :doc:`uproot.writing.writable.WritableNTuple`. For instance,
+
+    .. code-block:: python
+
+        uproot.convert_to_rntuple("data-*.root:Events", "converted.root", "200 MB")
+
+    The ``files`` are read with :doc:`uproot.behaviors.TBranch.iterate`, up to
+    ``prefetch`` steps ahead of the step that is being written, and the pages of
+    all columns in a cluster are compressed concurrently with the output file's
+    :ref:`uproot.writing.writable.WritableFile.compression_executor`. Thus, at
+    most ``prefetch + 2`` steps are in memory at a time.
+
+    If ``output`` is a path, the file is closed when the conversion is done.
+    """
+    if not uproot._util.isint(prefetch) or prefetch < 0:
+        raise ValueError(f"prefetch must be a non-negative integer, not {prefetch!r}")
+
+    steps = uproot.behaviors.TBranch.iterate(
+        files,
+        filter_name=filter_name,
+        filter_typename=filter_typename,
+        filter_branch=filter_branch,
+        step_size=step_size,
+        decompression_executor=decompression_executor,
+        interpretation_executor=interpretation_executor,
+        library="ak",
+        report=True,
+        **options,
+    )
+
+    if isinstance(output, uproot.writing.writable.WritableDirectory):
+        destination = output
+    else:
+        destination = uproot.writing.writable.recreate(output)
+
+    ntuple = None
+    try:
+        with uproot.source.futures._ReadAhead(steps, prefetch) as ahead:
+            for arrays, report in ahead:
+                if ntuple is None:
+                    ntuple = destination.mkrntuple(
+                        report.source.name if name is None else name,
+                        arrays.layout.form,
+                        description,
+                    )
+                if len(arrays) != 0:
+                    ntuple.extend(arrays)
+
+    finally:
+        if destination is not output:
+            destination.close()
+
+    return ntuple
+
+
+def to_parquet(
+    files,
+    output,
+    step_size="100 MB",
+    *,
+    row_group_size=None,
+    max_rows_per_file=None,
+    expressions=None,
+    cut=None,
+    filter_name=no_filter,
+    filter_typename=no_filter,
+    filter_branch=no_filter,
+    filter_field=no_filter,
+    aliases=None,
+    prefetch=1,
+    decompression_executor=None,
+    interpretation_executor=None,
+    parquet_options=None,
+    **options,
+):
+    """
+    Args:
+        files: See :doc:`uproot.behaviors.TBranch.iterate` for a description
+            of the TTrees or RNTuples that can be given, including the
+            ``"filename.root:treename"`` syntax and wildcards.
+        output (str or ``pathlib.Path``): The Parquet file to make (replacing
+            it if it exists) or, if ``max_rows_per_file`` is not None, the
+            directory in which to make ``part-00000.parquet``,
+            ``part-00001.parquet``, etc.
+        step_size (int or str): If an integer, the maximum number of entries to
+            read in each step; if a string, the maximum memory size to read.
+            The string must be a number followed by a memory unit, such as
+            "100 MB".
+        row_group_size (None or int): Number of entries in each Parquet row
+            group (the last row group of each file may be smaller). If None,
+            each step is one row group.
+        max_rows_per_file (None or int): If not None, the maximum number of
+            entries in each output file, and ``output`` is a directory.
+        expressions (None, str, or list of str): Names of ``TBranches`` or
+            aliases to convert; see
+            :ref:`uproot.behaviors.TBranch.HasBranches.arrays`. If None, all
+            ``TBranches`` selected by the filters are converted.
+        cut (None or str): If not None, this expression filters all of the
+            ``expressions``.
+        filter_name (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` or fields by name.
+        filter_typename (None, glob string, regex string in ``"/pattern/i"`` syntax, function of str → bool, or iterable of the above): A
+            filter to select ``TBranches`` or fields by type.
+        filter_branch (None or function of :doc:`uproot.behaviors.TBranch.TBranch` → bool): A
+            filter to select ``TBranches`` using the full
+            :doc:`uproot.behaviors.TBranch.TBranch` object.
+        filter_field (None or function of :doc:`uproot.models.RNTuple.RField` → bool): A
+            filter to select fields using the full
+            :doc:`uproot.models.RNTuple.RField` object. Only used for RNTuples.
+        aliases (None or dict of str → str): Mathematical expressions that
+            can be used in ``expressions`` or ``cut``.
+        prefetch (int): Number of steps to read ahead in a background thread
+            while earlier steps are written. If 0, reading happens in the
+            calling thread.
+        decompression_executor (None or Executor with a ``submit`` method): The
+            executor that is used to decompress ``TBaskets``; see
+            :doc:`uproot.behaviors.TBranch.iterate`.
+        interpretation_executor (None or Executor with a ``submit`` method): The
+            executor that is used to interpret uncompressed ``TBasket`` data;
+            see :doc:`uproot.behaviors.TBranch.iterate`.
+        parquet_options (None or dict): Options passed to
+            ``pyarrow.parquet.ParquetWriter``, such as
+            ``{"compression": "zstd"}``. Dictionary encoding is off unless
+            ``"use_dictionary"`` is given.
+        options: See :doc:`uproot.reading.open`.
+
+    Converts TTrees or RNTuples into Parquet and returns the list of paths
+    that were written. For instance,
+
+    .. code-block:: python
+
+        uproot.to_parquet(
+            "data-*.root:Events", "lake/events", row_group_size=1000000,
+            max_rows_per_file=10000000,
+        )
+
+    The ``files`` are read as ``pyarrow.RecordBatch`` with
+    :doc:`uproot.behaviors.TBranch.iterate` and
+    :doc:`uproot.interpretation.library.Arrow`, which wraps Uproot's arrays
+    without copying them, up to ``prefetch`` steps ahead. Row groups are
+    written through one ``pyarrow.parquet.ParquetWriter`` per file in another
+    background thread, so reading, decompression, and Parquet encoding
+    overlap. If there is a ``cut``, ``aliases``, or ``expressions`` other than
+    names, the steps are computed as Awkward Arrays instead and converted with
+    ``ak.to_arrow_table``. At most ``prefetch + 4`` steps and one partial row group are in
+    memory at a time.
+
+    If the ``files`` have no entries, no Parquet files are written.
+    """
+    if not uproot._util.isint(prefetch) or prefetch < 0:
+        raise ValueError(f"prefetch must be a non-negative integer, not {prefetch!r}")
+    for label, value in [
+        ("row_group_size", row_group_size),
+        ("max_rows_per_file", max_rows_per_file),
+    ]:
+        if value is not None and (not uproot._util.isint(value) or value <= 0):
+            raise ValueError(
+                f"{label} must be None or a positive integer, not {value!r}"
+            )
+
+    # Arrow arrays have no arithmetic operators, so expressions are computed
+    # with Awkward Arrays
+    if isinstance(expressions, str):
+        expressions = [expressions]
+    computed = (
+        cut is not None
+        or aliases is not None
+        or (expressions is not None and not all(x.isidentifier() for x in expressions))
+    )
+
+    parquet_files = _ParquetFiles(
+        os.fspath(output), row_group_size, max_rows_per_file, parquet_options
+    )
+
+    steps = uproot.behaviors.TBranch.iterate(
+        files,
+        expressions,
+        cut,
+        filter_name=filter_name,
+        filter_typename=filter_typename,
+        filter_branch=filter_branch,
+        filter_field=filter_field,
+        aliases=aliases,
+        step_size=step_size,
+        decompression_executor=decompression_executor,
+        interpretation_executor=interpretation_executor,
+        library="ak" if computed else "pa",
+        **options,
+    )
+
+    try:
+        with (
+            uproot.source.futures._WriteBehind(parquet_files.write, 1) as writer,
+            uproot.source.futures._ReadAhead(steps, prefetch) as ahead,
+        ):
+            for arrays in ahead:
+                if computed:
+                    table = awkward.to_arrow_table(arrays, extensionarray=False)
+                    for batch in table.to_batches():
+                        writer.put(batch)
+                else:
+                    writer.put(arrays)
+        parquet_files.flush()
+    finally:
+        parquet_files.close()
+
+    return parquet_files.paths
+
+
+class _ParquetFiles:
+    """
+    Writes ``pyarrow.RecordBatch`` into Parquet files, in row groups of
+    ``row_group_size`` entries and starting a new file after
+    ``max_rows_per_file`` entries. Incomplete row groups are held as slices
+    of the batches, without copying, until ``flush``.
+    """
+
+    def __init__(self, output, row_group_size, max_rows_per_file, parquet_options):
+        self._pyarrow = uproot.extras.pyarrow()
+        import pyarrow.parquet
+
+        self._parquet = pyarrow.parquet
+        self._output = output
+        self._row_group_size = row_group_size
+        self._max_rows_per_file = max_rows_per_file
+        # like ak.to_parquet: dictionaries rarely help continuous values
+        self._parquet_options = {"use_dictionary": False}
+        if parquet_options is not None:
+            self._parquet_options.update(parquet_options)
+        self._schema = None
+        self._writer = None
+        self._rows_in_file = 0
+        self._pending = []
+        self._num_pending = 0
+        self.paths = []
+
+    def write(self, batch):
+        if self._schema is None:
+            self._schema = batch.schema
+        elif not batch.schema.equals(self._schema):
+            # e.g. 32-bit offsets in one file and 64-bit in another
+            batch = self._pyarrow.Table.from_batches([batch]).cast(self._schema)
+            batch = batch.combine_chunks().to_batches()[0]
+        self._pending.append(batch)
+        self._num_pending += batch.num_rows
+        self._write_row_groups(False)
+
+    def flush(self):
+        self._write_row_groups(True)
+
+    def _write_row_groups(self, final):
+        while self._num_pending > 0:
+            if self._row_group_size is None:
+                size = self._num_pending
+            else:
+                size = self._row_group_size
+            if self._max_rows_per_file is not None:
+                size = min(size, self._max_rows_per_file - self._rows_in_file)
+            if self._num_pending < size:
+                if not final:
+                    return
+                size = self._num_pending
+
+            if self._writer is None:
+                if self._max_rows_per_file is None:
+                    path = self._output
+                else:
+                    os.makedirs(self._output, exist_ok=True)
+                    path = os.path.join(
+                        self._output, f"part-{len(self.paths):05d}.parquet"
+                    )
+                self._writer = self._parquet.ParquetWriter(
+                    path, self._schema, **self._parquet_options
+                )
+                self.paths.append(path)
+
+            table = self._pyarrow.Table.from_batches(self._pending, self._schema)
+            self._writer.write_table(table.slice(0, size), row_group_size=size)
+            remainder = table.slice(size)
+            self._pending = remainder.to_batches()
+            self._num_pending = remainder.num_rows
+
+            self._rows_in_file += size
+            if self._rows_in_file == self._max_rows_per_file:
+                self.close()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._rows_in_file = 0
@@ -19,9 +19,11 @@ types. Writing and reading are considered separate projects with different capab
 from __future__ import annotations
 
 import datetime
+import functools
 import itertools
 import queue
 import sys
+import threading
 import uuid
 from collections.abc import Mapping, MutableMapping
 from pathlib import Path
@@ -37,6 +39,7 @@ import uproot.exceptions
 import uproot.model
 import uproot.models.TObjString
 import uproot.sink.file
+import uproot.source.futures
 import uproot.writing._cascade
 import uproot.writing._cascadentuple
 import uproot.writing._cascadetree
@@ -44,6 +47,17 @@ import uproot.writing.identify
 from uproot._util import no_filter, no_rename
 
 
+def _write_buffer_size(options):
+    write_buffer_size = options.pop("write_buffer_size", None)
+    if write_buffer_size is None:
+        return None
+    return uproot._util.memory_size(
+        write_buffer_size,
+        "write_buffer_size must be None, a number of bytes, or a memory size "
+        f"string, not {write_buffer_size!r}",
+    )
+
+
 def create(file_path: str | Path | IO, **options):
     """
     Args:
@@ -64,6 +78,16 @@ def create(file_path: str | Path | IO, **options):
     * compression (:doc:`uproot.compression.Compression` or None): Compression algorithm
     and level for new objects added to the file. Can be updated after creating
     the :doc:`uproot.writing.writable.WritableFile`. Default is ``uproot.ZLIB(1)``.
+    * write_buffer_size (None, int, or str; None): If not None, writes are collected in
+    memory, where repeated metadata updates are merged, and are written by a background
+    thread in large sequential writes when this many bytes are pending (see
+    :doc:`uproot.sink.file`). The file on disk is complete after
+    :ref:`uproot.writing.writable.WritableFile.checkpoint` or when it is closed.
+    * positioned_writes (bool; False): If True, the file is written with ``os.pwrite``
+    at explicit positions, so that the TBaskets of a
+    :ref:`uproot.writing.writable.WritableTree.extend` are written by the same threads
+    that compress them (see :doc:`uproot.sink.file`). Can't be combined with a
+    ``write_buffer_size``.
 
     See :doc:`uproot.writing.writable.WritableFile` for details on these options.
 
@@ -103,6 +127,16 @@ def recreate(file_path: str | Path | IO, **options):
     * compression (:doc:`uproot.compression.Compression` or None): Compression algorithm
     and level for new objects added to the file. Can be updated after creating
     the :doc:`uproot.writing.writable.WritableFile`. Default is ``uproot.ZLIB(1)``.
+    * write_buffer_size (None, int, or str; None): If not None, writes are collected in
+    memory, where repeated metadata updates are merged, and are written by a background
+    thread in large sequential writes when this many bytes are pending (see
+    :doc:`uproot.sink.file`). The file on disk is complete after
+    :ref:`uproot.writing.writable.WritableFile.checkpoint` or when it is closed.
+    * positioned_writes (bool; False): If True, the file is written with ``os.pwrite``
+    at explicit positions, so that the TBaskets of a
+    :ref:`uproot.writing.writable.WritableTree.extend` are written by the same threads
+    that compress them (see :doc:`uproot.sink.file`). Can't be combined with a
+    ``write_buffer_size``.
 
     See :doc:`uproot.writing.writable.WritableFile` for details on these options.
 
@@ -113,7 +147,12 @@ def recreate(file_path: str | Path | IO, **options):
     storage_options = {
         key: value for key, value in options.items() if key not in recreate.defaults
     }
-    sink = uproot.sink.file.FileSink(file_path, **storage_options)
+    sink = uproot.sink.file.FileSink(
+        file_path,
+        write_buffer_size=_write_buffer_size(options),
+        positioned_writes=options.pop("positioned_writes", False),
+        **storage_options,
+    )
     compression = options.pop("compression", create.defaults["compression"])
 
     initial_directory_bytes = options.pop(
@@ -158,6 +197,9 @@ def update(file_path: str | Path | IO, **options):
 
     * initial_directory_bytes (int; 256)
     * uuid_function (callable; ``uuid.uuid1``)
+    * write_buffer_size (None, int, or str; None): See
+      :doc:`uproot.writing.writable.recreate`.
+    * positioned_writes (bool; False): See :doc:`uproot.writing.writable.recreate`.
 
     See :doc:`uproot.writing.writable.WritableFile` for details on these options.
 
@@ -168,7 +210,12 @@ def update(file_path: str | Path | IO, **options):
     storage_options = {
         key: value for key, value in options.items() if key not in update.defaults
     }
-    sink = uproot.sink.file.FileSink(file_path, **storage_options)
+    sink = uproot.sink.file.FileSink(
+        file_path,
+        write_buffer_size=_write_buffer_size(options),
+        positioned_writes=options.pop("positioned_writes", False),
+        **storage_options,
+    )
 
     initial_directory_bytes = options.pop(
         "initial_directory_bytes", create.defaults["initial_directory_bytes"]
@@ -195,11 +242,27 @@ create.defaults = {
     "initial_directory_bytes": 256,
     "initial_streamers_bytes": 1024,  # 256,
     "uuid_function": uuid.uuid1,
+    "write_buffer_size": None,
+    "positioned_writes": False,
 }
 recreate.defaults = create.defaults
 update.defaults = create.defaults
 
 
+_compression_executor_lock = threading.Lock()
+
+
+def _shared_compression_executor():
+    # functools.cache alone could make two if two threads ask at the same time
+    with _compression_executor_lock:
+        return _new_compression_executor()
+
+
+@functools.cache
+def _new_compression_executor():
+    return uproot.source.futures.ThreadPoolExecutor()
+
+
 class WritableFile(uproot.reading.CommonFileMethods):
     """
     Args:
@@ -231,6 +294,7 @@ class WritableFile(uproot.reading.CommonFileMethods):
 
         self._trees = {}
         self._ntuples = {}
+        self._compression_executor = None
 
     def __repr__(self):
         return f"<WritableFile {self.file_path!r} at 0x{id(self):012x}>"
@@ -309,6 +373,32 @@ class WritableFile(uproot.reading.CommonFileMethods):
                 "compression must be None or a uproot.compression.Compression object, like uproot.ZLIB(4) or uproot.ZSTD(0)"
             )
 
+    @property
+    def compression_executor(self):
+        """
+        An object satisfying the Executor interface; ``submit(task, *args, **kwargs)``
+        returns a Future, which blocks and returns ``task(*args, **kwargs)`` when
+        its ``Future.result()`` is called.
+
+        This executor is used to compress the TBaskets of all TBranches concurrently
+        in :ref:`uproot.writing.writable.WritableTree.extend`; the TBaskets are then
+        written in TBranch order, so the file does not depend on the executor.
+
+        If not set (or set to None), a
+        :doc:`uproot.source.futures.ThreadPoolExecutor` shared by all writable files
+        is used. Set it to a :doc:`uproot.source.futures.TrivialExecutor` to compress
+        in the calling thread.
+        """
+        if self._compression_executor is None:
+            return _shared_compression_executor()
+        return self._compression_executor
+
+    @compression_executor.setter
+    def compression_executor(self, value):
+        if value is not None and not hasattr(value, "submit"):
+            raise TypeError("compression_executor must have a 'submit' method")
+        self._compression_executor = value
+
     @property
     def fSeekFree(self):
         """
@@ -402,6 +492,17 @@ class WritableFile(uproot.reading.CommonFileMethods):
         """
         return self._file_path
 
+    def checkpoint(self):
+        """
+        Makes sure that everything written so far is in the file on disk.
+
+        This only matters for files opened with a ``write_buffer_size``, in which
+        writes are buffered and metadata are rewritten in memory (see
+        :doc:`uproot.writing.writable.recreate`); otherwise, it only flushes the
+        file. Closing the file also writes everything.
+        """
+        self._sink.checkpoint()
+
     def close(self):
         """
         Explicitly close the file.
@@ -410,8 +511,18 @@ class WritableFile(uproot.reading.CommonFileMethods):
         managers.)
 
         After closing, objects cannot be read from or written to the file.
+
+        TBaskets that are still being accumulated in TTrees with a ``basket_size``
+        are written first (see :ref:`uproot.writing.writable.WritableTree.flush`),
+        as are clusters in RNTuples with a ``cluster_size`` (see
+        :ref:`uproot.writing.writable.WritableNTuple.flush`).
         """
-        self._sink.close()
+        if self._sink.closed:
+            return
+        try:
+            self._flush_trees()
+        finally:
+            self._sink.close()
 
     @property
     def closed(self) -> bool:
@@ -431,7 +542,19 @@ class WritableFile(uproot.reading.CommonFileMethods):
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._sink.__exit__(exception_type, exception_value, traceback)
+        if self._sink.closed:
+            return
+        try:
+            self._flush_trees()
+        finally:
+            self._sink.__exit__(exception_type, exception_value, traceback)
+
+    def _flush_trees(self):
+        # flushing can move a TTree (and change its key in self._trees)
+        for tree in list(self._trees.values()):
+            tree.flush()
+        for ntuple in list(self._ntuples.values()):
+            ntuple.flush()
 
     def _new_tree(self, tree):
         self._trees[tree._cascading.key.seek_location] = tree
@@ -570,6 +693,13 @@ class WritableDirectory(MutableMapping):
         """
         return self._file
 
+    def checkpoint(self):
+        """
+        Makes sure that everything written so far is in the file on disk (see
+        :ref:`uproot.writing.writable.WritableFile.checkpoint`).
+        """
+        self._file.checkpoint()
+
     def close(self):
         """
         Explicitly close the file.
@@ -599,7 +729,7 @@ class WritableDirectory(MutableMapping):
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._file.sink.__exit__(exception_type, exception_value, traceback)
+        self._file.__exit__(exception_type, exception_value, traceback)
 
     @property
     def compression(self):
@@ -1274,6 +1404,8 @@ in file {self.file_path} in directory {self.path}"""
         field_name=lambda outer, inner: inner if outer == "" else outer + "_" + inner,
         initial_basket_capacity=10,
         resize_factor=10.0,
+        basket_size=None,
+        truncation=None,
     ):
         """
         Args:
@@ -1292,6 +1424,20 @@ in file {self.file_path} in directory {self.path}"""
             resize_factor (float): When the TTree metadata needs to be rewritten,
                 this specifies how many more TBasket slots to allocate as a multiplicative
                 factor.
+            basket_size (None, int, or str): If None, each call to
+                :ref:`uproot.writing.writable.WritableTree.extend` writes one TBasket
+                per TBranch. If an integer, data are accumulated until there are
+                this many entries, which are then written as one TBasket per
+                TBranch. If a string with units (such as ``"1 MB"``), the number of
+                entries is chosen when the biggest TBranch first accumulates that much
+                uncompressed data. See :ref:`uproot.writing.writable.WritableTree.flush`.
+            truncation (None or dict of str \u2192 :doc:`uproot.interpretation.numerical.AsDouble32`,
+                :doc:`uproot.interpretation.numerical.AsFloat16`, or tuple): Floating-point
+                TBranches to write with reduced precision, as ROOT's ``Double32_t``
+                and ``Float16_t``. A ``(low, high, num_bits)`` tuple (or ``(low, high)``
+                for 32 bits) is the same as ``"[low,high,num_bits]"`` in a ROOT
+                leaf-list; it makes ``Float16_t`` for ``float32`` TBranches and
+                ``Double32_t`` otherwise.
 
         Creates an empty TTree in this directory.
 
@@ -1314,6 +1460,8 @@ in file {self.file_path} in directory {self.path}"""
                 field_name=field_name,
                 initial_basket_capacity=initial_basket_capacity,
                 resize_factor=resize_factor,
+                basket_size=basket_size,
+                truncation=truncation,
             )
             tree.extend(data)
             return tree
@@ -1343,6 +1491,8 @@ in file {self.file_path} in directory {self.path}"""
                 field_name,
                 initial_basket_capacity,
                 resize_factor,
+                basket_size,
+                truncation,
             ),
         )
         directory._file._new_tree(tree)
@@ -1380,6 +1530,10 @@ in file {self.file_path} in directory {self.path}"""
         name,
         type_spec_or_data,
         description="",
+        *,
+        encodings=None,
+        page_size=None,
+        cluster_size=None,
     ):
         """
         Args:
@@ -1390,6 +1544,24 @@ in file {self.file_path} in directory {self.path}"""
                 the RNTuple will be empty. If a RecordArray is provided, the RNTuple
                 will be initialized with the input data.
             description (str): Description for the new RNTuple.
+            encodings (None, str, or dict of str \u2192 str): How the columns of
+                each field are encoded in pages: ``"split"`` stores all first bytes
+                of the numbers in a page, then all second bytes, etc., with signed
+                integers in zigzag encoding and offsets as differences, which
+                compresses much better; ``"plain"`` stores the numbers as they are.
+                A str applies to all fields; a dict maps top-level field names to
+                encodings. The default (None, or fields missing from the dict) is
+                ROOT's: ``"split"`` if the file is compressed, ``"plain"`` if not.
+            page_size (None, int, or str): If None, each column has one page per
+                cluster; otherwise, the maximum number of uncompressed bytes in a
+                page, as an integer or a string with units (such as ``"1 MB"``).
+            cluster_size (None, int, or str): If None, each call to
+                :ref:`uproot.writing.writable.WritableNTuple.extend` writes one
+                cluster. If an integer, data are accumulated until there are
+                this many entries, which are then written as a cluster. If a string
+                with units (such as ``"100 MB"``), a cluster is written when the
+                accumulated data have at least that many uncompressed bytes. See
+                :ref:`uproot.writing.writable.WritableNTuple.flush`.
 
         Creates an empty RNTuple in this directory.
 
@@ -1406,9 +1578,15 @@ in file {self.file_path} in directory {self.path}"""
         if self._file.sink.closed:
             raise ValueError("cannot create a RNTuple in a closed file")
 
+        options = {
+            "encodings": encodings,
+            "page_size": page_size,
+            "cluster_size": cluster_size,
+        }
+
         if _is_type_specification(type_spec_or_data):
             ak_form = _type_specification_to_awkward_form(type_spec_or_data)
-            return self.mkrntuple(name, ak_form, description)
+            return self.mkrntuple(name, ak_form, description, **options)
 
         type_spec_or_data = (
             uproot.writing._cascadentuple._regularize_input_type_to_awkward(
@@ -1422,7 +1600,7 @@ in file {self.file_path} in directory {self.path}"""
                 raise TypeError(
                     f"Input Awkward array must be a RecordArray or reducible to such. Got array with form {form!r}."
                 )
-            ntuple = self.mkrntuple(name, packed_form, description)
+            ntuple = self.mkrntuple(name, packed_form, description, **options)
             ntuple.extend(type_spec_or_data)
             return ntuple
         if isinstance(type_spec_or_data, awkward.forms.Form):
@@ -1465,6 +1643,9 @@ in file {self.file_path} in directory {self.path}"""
                 treename,
                 description,
                 type_spec_or_data,
+                encodings,
+                page_size,
+                cluster_size,
             ),
         )
         directory._file._new_ntuple(ntuple)
@@ -1785,7 +1966,7 @@ class WritableTree:
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._file.sink.__exit__(exception_type, exception_value, traceback)
+        self._file.__exit__(exception_type, exception_value, traceback)
 
     @property
     def compression(self):
@@ -1872,9 +2053,11 @@ class WritableTree:
     @property
     def num_entries(self) -> int:
         """
-        The number of entries accumulated so far.
+        The number of entries accumulated so far, including entries that have not
+        been written to TBaskets yet (see ``basket_size`` in
+        :ref:`uproot.writing.writable.WritableDirectory.mktree`).
         """
-        return self._cascading.num_entries
+        return self._cascading.num_entries + self._cascading.num_pending_entries
 
     @property
     def num_baskets(self) -> int:
@@ -1883,6 +2066,38 @@ class WritableTree:
         """
         return self._cascading.num_baskets
 
+    @property
+    def basket_size(self) -> int | None:
+        """
+        The target TBasket size given to
+        :ref:`uproot.writing.writable.WritableDirectory.mktree`, as a number of
+        entries (if it was an integer) or bytes (if it was a memory size string),
+        or None if each :ref:`uproot.writing.writable.WritableTree.extend` writes
+        its own TBaskets.
+        """
+        return self._cascading.basket_size
+
+    def flush(self):
+        """
+        Writes the entries that have been accumulated but not yet written, if
+        this TTree has a ``basket_size`` (see
+        :ref:`uproot.writing.writable.WritableDirectory.mktree`), as one TBasket
+        per TBranch, even if they are fewer than the target. Closing the file
+        does this automatically.
+
+        All TBaskets except the last have the same number of entries, which is
+        recorded as the TTree's ``fAutoFlush`` (cluster size) so that readers can
+        align their reads with cluster boundaries. Flushing before the last
+        :ref:`uproot.writing.writable.WritableTree.extend` makes a short TBasket in
+        the middle of the TTree, and then ``fAutoFlush`` no longer describes
+        the clusters (it is reset to ROOT's default).
+
+        Without a ``basket_size``, this does nothing.
+        """
+        if self._file.sink.closed:
+            raise ValueError("cannot write data to a closed file")
+        self._cascading.flush(self._file, self._file.sink)
+
     def extend(self, data):
         """
         Args:
@@ -1908,7 +2123,7 @@ class WritableTree:
 
         .. warning::
 
-            **As a word of warning,** be sure that each call to :ref:`uproot.writing.writable.WritableTree.extend` includes at least 100 kB per branch/array. (NumPy and Awkward Arrays have an `nbytes <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.nbytes.html>`__ property; you want at least ``100000`` per array.) If you ask Uproot to write very small TBaskets, it will spend more time working on TBasket overhead than actually writing data. The absolute worst case is one-entry-per-:ref:`uproot.writing.writable.WritableTree.extend`. See `#428 (comment) <https://github.com/scikit-hep/uproot5/pull/428#issuecomment-908703486>`__.
+            **As a word of warning,** be sure that each call to :ref:`uproot.writing.writable.WritableTree.extend` includes at least 100 kB per branch/array. (NumPy and Awkward Arrays have an `nbytes <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.nbytes.html>`__ property; you want at least ``100000`` per array.) If you ask Uproot to write very small TBaskets, it will spend more time working on TBasket overhead than actually writing data. The absolute worst case is one-entry-per-:ref:`uproot.writing.writable.WritableTree.extend`. See `#428 (comment) <https://github.com/scikit-hep/uproot5/pull/428#issuecomment-908703486>`__. Alternatively, pass a ``basket_size`` to :ref:`uproot.writing.writable.WritableDirectory.mktree` to accumulate small extensions into TBaskets of that size.
         """
         self._cascading.extend(self._file, self._file.sink, data)
 
@@ -2129,7 +2344,7 @@ class WritableNTuple:
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._file.sink.__exit__(exception_type, exception_value, traceback)
+        self._file.__exit__(exception_type, exception_value, traceback)
 
     @property
     def compression(self):
@@ -2151,9 +2366,45 @@ class WritableNTuple:
     @property
     def num_entries(self) -> int:
         """
-        The number of entries accumulated so far.
+        The number of entries accumulated so far, including entries that have not
+        been written to clusters yet (see ``cluster_size`` in
+        :ref:`uproot.writing.writable.WritableDirectory.mkrntuple`).
         """
-        return self._cascading.num_entries
+        return self._cascading.num_entries + self._cascading.num_pending_entries
+
+    @property
+    def page_size(self) -> int | None:
+        """
+        The maximum number of uncompressed bytes in a page, given to
+        :ref:`uproot.writing.writable.WritableDirectory.mkrntuple`, or None if
+        each column has one page per cluster.
+        """
+        return self._cascading.page_size
+
+    @property
+    def cluster_size(self) -> int | None:
+        """
+        The target cluster size given to
+        :ref:`uproot.writing.writable.WritableDirectory.mkrntuple`, as a number of
+        entries (if it was an integer) or bytes (if it was a memory size string),
+        or None if each :ref:`uproot.writing.writable.WritableNTuple.extend` writes
+        its own cluster.
+        """
+        return self._cascading.cluster_size
+
+    def flush(self):
+        """
+        Writes the entries that have been accumulated but not yet written, if
+        this RNTuple has a ``cluster_size`` (see
+        :ref:`uproot.writing.writable.WritableDirectory.mkrntuple`), as a cluster,
+        even if it is smaller than the target. Closing the file does this
+        automatically.
+
+        Without a ``cluster_size``, this does nothing.
+        """
+        if self._file.sink.closed:
+            raise ValueError("cannot write data to a closed file")
+        self._cascading.flush(self._file, self._file.sink)
 
     def extend(self, data):
         """
@@ -2180,7 +2431,7 @@ class WritableNTuple:
 
         .. warning::
 
-            **As a word of warning,** be sure that each call to :ref:`uproot.writing.writable.WritableNTuple.extend` includes at least 100 kB per branch/array. (NumPy and Awkward Arrays have an `nbytes <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.nbytes.html>`__ property; you want at least ``100000`` per array.) If you ask Uproot to write very small TBaskets, it will spend more time working on TBasket overhead than actually writing data. The absolute worst case is one-entry-per-:ref:`uproot.writing.writable.WritableTree.extend`. See `#428 (comment) <https://github.com/scikit-hep/uproot5/pull/428#issuecomment-908703486>`__.
+            **As a word of warning,** be sure that each call to :ref:`uproot.writing.writable.WritableNTuple.extend` includes at least 100 kB per branch/array. (NumPy and Awkward Arrays have an `nbytes <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.nbytes.html>`__ property; you want at least ``100000`` per array.) If you ask Uproot to write very small TBaskets, it will spend more time working on TBasket overhead than actually writing data. The absolute worst case is one-entry-per-:ref:`uproot.writing.writable.WritableTree.extend`. See `#428 (comment) <https://github.com/scikit-hep/uproot5/pull/428#issuecomment-908703486>`__. Alternatively, pass a ``cluster_size`` to :ref:`uproot.writing.writable.WritableDirectory.mkrntuple` to accumulate small extensions into clusters of that size.
         """
         self._cascading.extend(self._file, self._file.sink, data)
 
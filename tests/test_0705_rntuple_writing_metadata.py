@@ -45,8 +45,8 @@ def test_header(tmp_path):
     assert frs[2].type_name == "bool"
 
     crs = header.column_records
-    assert crs[0].type == uproot.const.rntuple_col_type_to_num_dict["real64"]
-    assert crs[1].type == uproot.const.rntuple_col_type_to_num_dict["int32"]
+    assert crs[0].type == uproot.const.rntuple_col_type_to_num_dict["splitreal64"]
+    assert crs[1].type == uproot.const.rntuple_col_type_to_num_dict["splitint32"]
     assert crs[2].type == uproot.const.rntuple_col_type_to_num_dict["bit"]
     assert crs[0].field_id == 0
     assert crs[1].field_id == 1
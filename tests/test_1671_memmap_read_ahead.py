@@ -0,0 +1,108 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for read-ahead hints and memmap views of uncompressed baskets.
+
+- ``arrays`` passes all of its upcoming byte ranges to
+  ``Source.advise_will_need`` before requesting them.
+- ``MemmapSource.advise_will_need`` merges ranges into page-aligned
+  ``madvise`` calls.
+- Uncompressed baskets of fixed-width branches are not copied out of the
+  memmap, but the final arrays are still safe to use after the file is closed.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import uproot
+import uproot.source.file
+
+
+def _write(path, compression):
+    with uproot.recreate(path, compression=compression) as file:
+        file.mktree("tree", {"x": np.float64, "y": "var * int32"})
+        for i in range(3):
+            file["tree"].extend(
+                {
+                    "x": np.arange(i * 100, (i + 1) * 100, dtype=np.float64),
+                    "y": [list(range(j % 4)) for j in range(100)],
+                }
+            )
+
+
+def test_arrays_advises_upcoming_ranges(tmp_path, monkeypatch):
+    path = os.path.join(tmp_path, "uncompressed.root")
+    _write(path, None)
+
+    advised = []
+    original = uproot.source.file.MemmapSource.advise_will_need
+
+    def spy(self, ranges):
+        advised.append(list(ranges))
+        return original(self, ranges)
+
+    monkeypatch.setattr(uproot.source.file.MemmapSource, "advise_will_need", spy)
+
+    with uproot.open(path, handler=uproot.source.file.MemmapSource) as file:
+        tree = file["tree"]
+        tree.arrays(["x", "y"], library="np")
+        assert len(advised) == 1
+        assert len(advised[0]) == tree["x"].num_baskets + tree["y"].num_baskets
+
+
+@pytest.mark.skipif(
+    uproot.source.file._MADV_WILLNEED is None, reason="madvise is not available"
+)
+def test_madvise_merges_ranges(tmp_path):
+    path = os.path.join(tmp_path, "uncompressed.root")
+    _write(path, None)
+
+    with uproot.open(path, handler=uproot.source.file.MemmapSource) as file:
+        source = file.file.source
+
+        calls = []
+
+        class Recorder:
+            def __init__(self, mapping):
+                self._mapping = mapping
+
+            def madvise(self, flag, start, length):
+                calls.append((start, length))
+
+            def size(self):
+                return self._mapping.size()
+
+            @property
+            def closed(self):
+                return self._mapping.closed
+
+        mapping = source._file._mmap
+        size = mapping.size()
+        source._file._mmap = Recorder(mapping)
+        try:
+            source.advise_will_need([(10, 20), (15, 30), (5000, 5010)])
+            source.advise_will_need([(0, 10**12)])
+        finally:
+            source._file._mmap = mapping
+
+    page = uproot.source.file.mmap.PAGESIZE
+    assert all(start % page == 0 for start, _ in calls)
+    assert calls[0] == (0, 30)
+    assert calls[1] == (page * (5000 // page), 5010 - page * (5000 // page))
+    assert calls[-1] == (0, size)
+
+
+@pytest.mark.parametrize("compression", [None, uproot.ZLIB(1)])
+def test_values_survive_close(tmp_path, compression):
+    path = os.path.join(tmp_path, "file.root")
+    _write(path, compression)
+
+    with uproot.open(path, handler=uproot.source.file.MemmapSource) as file:
+        arrays = file["tree"].arrays(["x", "y"], library="np")
+        first_basket = file["tree"]["x"].basket(0)
+
+    # the file is closed; these must not be views of the unmapped file
+    assert arrays["x"].tolist() == list(range(300))
+    assert [len(y) for y in arrays["y"]] == [j % 4 for j in range(100)] * 3
+    assert first_basket.data.view(">f8").tolist() == list(range(100))
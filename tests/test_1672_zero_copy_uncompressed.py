@@ -0,0 +1,82 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the ``zero_copy`` option of memory-mapped, uncompressed files."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def uncompressed(tmp_path):
+    path = os.path.join(tmp_path, "uncompressed.root")
+    with uproot.recreate(path, compression=None) as file:
+        file.mktree("tree", {"x": np.float64, "b": np.uint8, "y": "var * int32"})
+        for i in range(2):
+            file["tree"].extend(
+                {
+                    "x": np.arange(i * 10, (i + 1) * 10, dtype=np.float64),
+                    "b": np.arange(10, dtype=np.uint8),
+                    "y": ak.Array([[i] * (j % 3) for j in range(10)]),
+                }
+            )
+    return path
+
+
+def test_single_basket_is_view(uncompressed):
+    with uproot.open(
+        uncompressed, handler=uproot.MemmapSource, zero_copy=True
+    ) as file:
+        assert file.file.source.zero_copy
+        arrays = file["tree"].arrays(["x", "y"], entry_stop=10, library="np")
+
+        assert arrays["x"].dtype == np.dtype(">f8")
+        assert not arrays["x"].flags.writeable
+        assert arrays["x"].base is not None
+        assert arrays["y"][2].dtype == np.dtype(">i4")
+
+    # the mapping outlives the file for as long as the views exist
+    assert arrays["x"].tolist() == list(range(10))
+    assert [len(y) for y in arrays["y"]] == [j % 3 for j in range(10)]
+
+
+def test_many_baskets_is_one_copy(uncompressed):
+    with uproot.open(
+        uncompressed, handler=uproot.MemmapSource, zero_copy=True
+    ) as file:
+        arrays = file["tree"].arrays(["x", "y"], entry_start=5, library="np")
+
+    # same byte order as the single-basket case, so steps of iterate agree
+    assert arrays["x"].dtype == np.dtype(">f8")
+    assert arrays["x"].flags.writeable
+    assert arrays["x"].tolist() == list(range(5, 20))
+    assert [y.tolist() for y in arrays["y"][4:8]] == [[], [], [1], [1, 1]]
+
+
+def test_awkward_needs_native_byte_order(uncompressed):
+    with uproot.open(
+        uncompressed, handler=uproot.MemmapSource, zero_copy=True
+    ) as file:
+        tree = file["tree"]
+        arrays = tree.arrays(["x", "b", "y"], entry_stop=10)
+        expected = uproot.open(uncompressed)["tree"].arrays(
+            ["x", "b", "y"], entry_stop=10
+        )
+
+    assert arrays.tolist() == expected.tolist()
+    assert str(arrays.type) == str(expected.type)
+
+
+def test_default_is_native_copy(uncompressed):
+    with uproot.open(uncompressed, handler=uproot.MemmapSource) as file:
+        assert not file.file.source.zero_copy
+        arrays = file["tree"].arrays(["x"], entry_stop=10, library="np")
+        assert file.file.source.closed is False
+
+    assert file.file.source.closed is True
+    assert arrays["x"].dtype == np.dtype(np.float64)
+    assert arrays["x"].tolist() == list(range(10))
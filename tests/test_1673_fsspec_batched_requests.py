@@ -0,0 +1,119 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for FSSpecSource's batching detection, concurrency limit, and
+per-backend request counters."""
+
+import os
+import queue
+import threading
+import time
+
+import awkward as ak
+import fsspec
+import fsspec.implementations.memory
+import numpy as np
+import pytest
+
+import uproot
+import uproot.source.fsspec
+from uproot.source.coalesce import CoalesceConfig
+
+
+class CountingMemoryFileSystem(fsspec.implementations.memory.MemoryFileSystem):
+    protocol = "countingmemory"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        return super()._strip_protocol(path.removeprefix("countingmemory://"))
+
+    def cat_ranges(self, paths, starts, ends, **kwargs):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.01)
+            return [self.cat_file(p, s, e) for p, s, e in zip(paths, starts, ends)]
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+fsspec.register_implementation(
+    CountingMemoryFileSystem.protocol, CountingMemoryFileSystem, clobber=True
+)
+
+
+@pytest.fixture
+def memory_file(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        file.mktree("tree", {"x": np.float64, "y": "var * int64"})
+        file["tree"].extend(
+            {
+                "x": np.arange(1000, dtype=np.float64),
+                "y": ak.Array([[i] * (i % 5) for i in range(1000)]),
+            }
+        )
+    with open(path, "rb") as file:
+        contents = file.read()
+
+    fs = fsspec.filesystem("memory")
+    fs.pipe("/uproot-test-1673/file.root", contents)
+    yield "/uproot-test-1673/file.root"
+    fs.rm("/uproot-test-1673/file.root")
+
+
+def test_memory_backend_counters(memory_file):
+    with uproot.open(f"memory://{memory_file}") as file:
+        source = file.file.source
+        assert isinstance(source, uproot.source.fsspec.FSSpecSource)
+        assert not source.native_batching
+        assert source.max_concurrent_requests is None
+
+        before = source.num_backend_requests
+        array = file["tree"].arrays(["x", "y"], library="np")["x"]
+        after = source.num_backend_requests
+        assert array.tolist() == list(range(1000))
+        assert after.get("cat_ranges", 0) > before.get("cat_ranges", 0)
+
+        counters = source.performance_counters
+        assert counters.backend == "memory"
+        assert counters.num_backend_requests == after
+        assert counters.asdict()["num_backend_requests"] == after
+
+
+def test_native_batching_detected(memory_file):
+    with uproot.open(f"countingmemory://{memory_file}") as file:
+        assert file.file.source.native_batching
+        assert file.file.source.performance_counters.backend == "countingmemory"
+
+
+def test_concurrency_limit(memory_file):
+    CountingMemoryFileSystem.max_in_flight = 0
+    config = CoalesceConfig(max_range_gap=0, max_request_ranges=1)
+    with uproot.source.fsspec.FSSpecSource(
+        f"countingmemory://{memory_file}",
+        coalesce_config=config,
+        max_concurrent_requests=2,
+    ) as source:
+        ranges = [(i * 100, i * 100 + 10) for i in range(20)]
+        notifications = queue.Queue()
+        chunks = source.chunks(ranges, notifications=notifications)
+        for _ in ranges:
+            notifications.get(timeout=10)
+        assert [len(chunk.raw_data) for chunk in chunks] == [10] * 20
+        assert source.num_backend_requests["cat_ranges"] == 20
+
+    assert 1 <= CountingMemoryFileSystem.max_in_flight <= 2
+
+
+@pytest.mark.parametrize("value", [0, -1, 1.5, "2"])
+def test_invalid_concurrency_limit(memory_file, value):
+    with pytest.raises(ValueError, match="max_concurrent_requests"):
+        uproot.source.fsspec.FSSpecSource(
+            f"memory://{memory_file}", max_concurrent_requests=value
+        )
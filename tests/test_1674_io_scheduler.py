@@ -0,0 +1,244 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the process-wide I/O scheduler: per-endpoint caps, priorities,
+fair sharing, and its use by FSSpecSource and MultithreadedFileSource."""
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import uproot
+import uproot.source.scheduler
+from uproot.source.coalesce import CoalesceConfig
+from uproot.source.scheduler import PRIORITY_CURRENT, PRIORITY_PREFETCH, IOScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = IOScheduler(max_requests_per_endpoint=2)
+    old = uproot.source.scheduler.set_scheduler(scheduler)
+    yield scheduler
+    uproot.source.scheduler.set_scheduler(old)
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        file.mktree("tree", {"x": np.float64, "y": np.int32})
+        for i in range(5):
+            file["tree"].extend(
+                {
+                    "x": np.arange(i * 100, (i + 1) * 100, dtype=np.float64),
+                    "y": np.arange(100, dtype=np.int32),
+                }
+            )
+    return path
+
+
+def test_endpoint():
+    endpoint = uproot.source.scheduler.endpoint
+    assert endpoint("/tmp/file.root") == "file://"
+    assert endpoint("C:\\data\\file.root") == "file://"
+    assert endpoint("https://example.com:8443/a/b.root") == "https://example.com:8443"
+    assert endpoint("root://eos.cern.ch//eos/file.root") == "root://eos.cern.ch"
+    assert endpoint("file:///tmp/file.root") == "file://"
+    assert endpoint("s3://bucket/key.root") == "s3://bucket"
+    assert endpoint("simplecache::s3://bucket/key.root") == "s3://bucket"
+    assert endpoint("memory:///file.root") == "memory://"
+
+
+def test_request_cap():
+    scheduler = IOScheduler(max_requests_per_endpoint=2)
+    first = scheduler.acquire("a", 10)
+    second = scheduler.acquire("a", 10)
+    third = scheduler.request("a", 10)
+    other = scheduler.acquire("b", 10)
+    assert not third.granted.is_set()
+    assert scheduler.in_flight("a") == (2, 20)
+    assert scheduler.in_flight("b") == (1, 10)
+
+    scheduler.release(first)
+    assert third.granted.is_set()
+    for permit in (second, third, other):
+        scheduler.release(permit)
+
+    assert scheduler.in_flight("a") == (0, 0)
+    stats = scheduler.stats()["a"]
+    assert stats["granted_requests"] == 3
+    assert stats["waited_requests"] == 1
+
+
+def test_byte_cap():
+    scheduler = IOScheduler(max_bytes_per_endpoint="1 kB")
+    first = scheduler.acquire("a", 600)
+    second = scheduler.request("a", 600)
+    assert not second.granted.is_set()
+    scheduler.release(first)
+    assert second.granted.is_set()
+    scheduler.release(second)
+
+    # a request larger than the cap goes alone instead of deadlocking
+    large = scheduler.acquire("a", 5000, timeout=1)
+    with pytest.raises(TimeoutError):
+        scheduler.acquire("a", 1, timeout=0.01)
+    scheduler.release(large)
+    assert scheduler.stats()["a"]["waiting_requests"] == 0
+
+
+def test_priority_then_fair_share():
+    scheduler = IOScheduler(max_requests_per_endpoint=2)
+    busy1 = scheduler.acquire("a", 1, owner="x")
+    busy2 = scheduler.acquire("a", 1, owner="x")
+    prefetch = scheduler.request("a", 1, priority=PRIORITY_PREFETCH, owner="y")
+    x_again = scheduler.request("a", 1, priority=PRIORITY_CURRENT, owner="x")
+    z_later = scheduler.request("a", 1, priority=PRIORITY_CURRENT, owner="z")
+
+    # "x" still has a request in flight, so "z" goes first though it came later
+    scheduler.release(busy1)
+    assert z_later.granted.is_set()
+    assert not x_again.granted.is_set()
+
+    # current-step requests go before prefetching
+    scheduler.release(z_later)
+    assert x_again.granted.is_set()
+    assert not prefetch.granted.is_set()
+
+    scheduler.release(busy2)
+    assert prefetch.granted.is_set()
+    scheduler.release(x_again)
+    scheduler.release(prefetch)
+    assert scheduler.in_flight("a") == (0, 0)
+
+
+def test_priority_context():
+    assert uproot.source.scheduler.current_priority() == PRIORITY_CURRENT
+    with uproot.source.scheduler.priority(PRIORITY_PREFETCH):
+        assert uproot.source.scheduler.current_priority() == PRIORITY_PREFETCH
+    assert uproot.source.scheduler.current_priority() == PRIORITY_CURRENT
+
+
+def test_promote():
+    scheduler = IOScheduler(max_requests_per_endpoint=1)
+    held = scheduler.acquire("e", 1)
+    prefetch = scheduler.request("e", 1, PRIORITY_PREFETCH, owner="reader")
+    current = scheduler.request("e", 1, PRIORITY_CURRENT, owner="other")
+    scheduler.promote("reader", PRIORITY_CURRENT)
+    scheduler.release(held)
+    assert prefetch.granted.is_set()
+    assert not current.granted.is_set()
+    scheduler.release(prefetch)
+    assert current.granted.is_set()
+    scheduler.release(current)
+
+
+def test_read_ahead_priority():
+    recorded = []
+
+    def items(taken=None):
+        for i in range(3):
+            if taken is not None and i > 0:
+                taken.get(timeout=10)
+            recorded.append(uproot.source.scheduler.current_priority())
+            yield i
+
+    # nothing is consumed until all are read: only the first is needed next
+    with uproot.source.futures._ReadAhead(items(), 2) as ahead:
+        deadline = time.monotonic() + 10
+        while len(recorded) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert list(ahead) == [0, 1, 2]
+    assert recorded == [PRIORITY_CURRENT, PRIORITY_PREFETCH, PRIORITY_PREFETCH]
+
+    # each is read while the consumer waits for it
+    recorded.clear()
+    taken = queue.Queue()
+    with uproot.source.futures._ReadAhead(items(taken), 2) as ahead:
+        for item in ahead:
+            taken.put(item)
+    assert recorded == [PRIORITY_CURRENT] * 3
+
+    recorded.clear()
+    with (
+        uproot.source.scheduler.priority(5),
+        uproot.source.futures._ReadAhead(items(), 0) as ahead,
+    ):
+        assert list(ahead) == [0, 1, 2]
+    assert recorded == [5] * 3
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="max_requests_per_endpoint"):
+        IOScheduler(max_requests_per_endpoint=0)
+    with pytest.raises(TypeError):
+        uproot.source.scheduler.set_scheduler("not a scheduler")
+
+
+def test_multithreaded_source(scheduler, tree_file):
+    ranges = [(i * 100, i * 100 + 50) for i in range(20)]
+    with uproot.open(
+        tree_file, handler=uproot.MultithreadedFileSource, num_workers=8
+    ) as file:
+        source = file.file.source
+        granted = scheduler.stats()["file://"]["granted_requests"]
+        notifications = queue.Queue()
+        chunks = source.chunks(ranges, notifications=notifications)
+        for _ in ranges:
+            notifications.get(timeout=10)
+        assert [len(chunk.raw_data) for chunk in chunks] == [50] * 20
+
+    stats = scheduler.stats()["file://"]
+    assert stats["granted_requests"] - granted == 20
+    assert stats["in_flight_requests"] == 0
+
+
+def test_fsspec_source(scheduler, tree_file):
+    config = CoalesceConfig(max_range_gap=0, max_request_ranges=1)
+    with uproot.open(tree_file, coalesce_config=config) as file:
+        assert isinstance(file.file.source, uproot.source.fsspec.FSSpecSource)
+        arrays = file["tree"].arrays(["x", "y"], library="np")
+        num_backend_requests = sum(file.file.source.num_backend_requests.values())
+    assert arrays["x"].tolist() == list(range(500))
+
+    stats = scheduler.stats()["file://"]
+    assert stats["granted_requests"] == num_backend_requests
+    assert stats["in_flight_requests"] == 0
+    assert stats["waiting_requests"] == 0
+
+
+def test_fsspec_source_remote_endpoint(scheduler, tree_file):
+    fsspec = pytest.importorskip("fsspec")
+    url = "memory://test_1674/file.root"
+    with open(tree_file, "rb") as local, fsspec.open(url, "wb") as remote:
+        remote.write(local.read())
+    try:
+        with uproot.open(url) as file:
+            assert isinstance(file.file.source, uproot.source.fsspec.FSSpecSource)
+            assert file["tree"]["x"].array(library="np").tolist() == list(range(500))
+    finally:
+        fsspec.filesystem("memory").rm(url)
+
+    stats = scheduler.stats()
+    assert "file://" not in stats
+    assert stats["memory://test_1674"]["granted_requests"] > 0
+
+
+def test_concurrent_readers_share(scheduler, tree_file):
+    results = {}
+
+    def read(name):
+        with uproot.open(tree_file, handler=uproot.MultithreadedFileSource) as file:
+            results[name] = file["tree"]["x"].array(library="np").tolist()
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert all(results[i] == list(range(500)) for i in range(4))
+    assert scheduler.in_flight("file://") == (0, 0)
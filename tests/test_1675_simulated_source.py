@@ -0,0 +1,129 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for SimulatedSource, which adds latency, bandwidth limits, and errors
+to local files for reproducible I/O benchmarks."""
+
+import os
+import time
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.source.simulated
+from uproot.source.coalesce import CoalesceConfig
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        file.mktree("tree", {"x": np.float64, "y": "var * int64"})
+        for i in range(4):
+            file["tree"].extend(
+                {
+                    "x": np.arange(i * 100, (i + 1) * 100, dtype=np.float64),
+                    "y": ak.Array([[j] * (j % 3) for j in range(100)]),
+                }
+            )
+        file["ntuple"] = {"z": np.arange(300, dtype=np.int32)}
+    return path
+
+
+@pytest.mark.parametrize(
+    "source", [uproot.source.file.MemmapSource, uproot.source.object.ObjectSource]
+)
+def test_same_arrays(tree_file, source):
+    expected = uproot.open(tree_file)["tree"].arrays(["x", "y"])
+    with uproot.open(
+        tree_file,
+        handler=uproot.SimulatedSource,
+        source=source,
+        latency=0.001,
+        jitter=0.001,
+    ) as file:
+        assert isinstance(file.file.source.source, source)
+        arrays = file["tree"].arrays(["x", "y"])
+        assert file["ntuple"].arrays()["z"].tolist() == list(range(300))
+
+    assert arrays.tolist() == expected.tolist()
+    assert file.file.source.closed
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize(
+    "source", [uproot.source.file.MemmapSource, uproot.source.object.ObjectSource]
+)
+def test_with_restrictive_scheduler(tree_file, source):
+    scheduler = uproot.source.scheduler.IOScheduler(max_requests_per_endpoint=1)
+    old = uproot.source.scheduler.set_scheduler(scheduler)
+    try:
+        with uproot.open(
+            tree_file, handler=uproot.SimulatedSource, source=source, num_workers=4
+        ) as file:
+            arrays = file["tree"].arrays(["x"], library="np")
+    finally:
+        uproot.source.scheduler.set_scheduler(old)
+
+    assert arrays["x"].tolist() == list(range(400))
+    assert scheduler.in_flight("file://") == (0, 0)
+
+
+def test_latency_and_bandwidth(tree_file):
+    with uproot.open(
+        tree_file, handler=uproot.SimulatedSource, latency=0.05, num_connections=4
+    ) as file:
+        source = file.file.source
+        start = time.perf_counter()
+        source.chunk(0, 10)
+        assert time.perf_counter() - start >= 0.05
+
+    with uproot.open(
+        tree_file, handler=uproot.SimulatedSource, bandwidth=100000
+    ) as file:
+        source = file.file.source
+        start = time.perf_counter()
+        source.chunk(0, 2000)
+        source.chunk(0, 2000)
+        assert time.perf_counter() - start >= 0.04
+
+    with pytest.raises(ValueError, match="bandwidth"):
+        uproot.open(tree_file, handler=uproot.SimulatedSource, bandwidth=0)
+
+
+def test_coalescing_reduces_transfers(tree_file):
+    counts = {}
+    for name, config in [
+        ("separate", CoalesceConfig(max_range_gap=0, max_request_ranges=1)),
+        ("coalesced", CoalesceConfig()),
+    ]:
+        with uproot.open(
+            tree_file, handler=uproot.SimulatedSource, coalesce_config=config
+        ) as file:
+            tree = file["tree"]
+            before = file.file.source.num_transfers
+            tree.arrays(["x", "y"])
+            counts[name] = file.file.source.num_transfers - before
+
+    assert counts["coalesced"] < counts["separate"]
+
+
+def test_errors_are_reproducible(tree_file):
+    def failures(seed):
+        with uproot.SimulatedSource(
+            tree_file, error_rate=0.5, seed=seed, **uproot.reading.open.defaults
+        ) as source:
+            result = []
+            for _ in range(20):
+                try:
+                    source.chunk(0, 10)
+                    result.append(False)
+                except OSError:
+                    result.append(True)
+            assert source.num_errors == sum(result)
+            assert source.num_transfers == 20
+            return result
+
+    assert failures(12345) == failures(12345)
+    assert 0 < sum(failures(12345)) < 20
@@ -0,0 +1,103 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for compressing the TBaskets of all TBranches concurrently in
+WritableTree.extend."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+class CountingExecutor:
+    def __init__(self):
+        self.executor = uproot.ThreadPoolExecutor(max_workers=4)
+        self.num_submitted = 0
+
+    def submit(self, task, /, *args, **kwargs):
+        self.num_submitted += 1
+        return self.executor.submit(task, *args, **kwargs)
+
+
+def _write(path, compression, executor):
+    rng = np.random.default_rng(42)
+    with uproot.recreate(path, compression=compression) as file:
+        if executor is not None:
+            file.file.compression_executor = executor
+        file.mktree(
+            "tree",
+            {
+                "a": np.float64,
+                "b": np.int32,
+                "c": "var * float32",
+                "d": (np.int16, (3,)),
+                "s": str,
+            },
+        )
+        for _ in range(3):
+            counts = rng.integers(0, 4, 200)
+            file["tree"].extend(
+                {
+                    "a": rng.normal(size=200),
+                    "b": rng.integers(0, 100, 200).astype(np.int32),
+                    "c": ak.unflatten(
+                        rng.normal(size=counts.sum()).astype(np.float32), counts
+                    ),
+                    "d": rng.integers(0, 10, (200, 3)).astype(np.int16),
+                    "s": [f"entry {i}" * (i % 5) for i in range(200)],
+                }
+            )
+
+
+@pytest.mark.parametrize("compression", [uproot.ZLIB(4), uproot.LZMA(1), None])
+def test_same_file_as_serial(tmp_path, compression):
+    serial = os.path.join(tmp_path, "file1.root")
+    parallel = os.path.join(tmp_path, "file2.root")
+    _write(serial, compression, uproot.TrivialExecutor())
+    executor = CountingExecutor()
+    _write(parallel, compression, executor)
+
+    if compression is None:
+        assert executor.num_submitted == 0
+    else:
+        assert executor.num_submitted == 18
+
+    with uproot.open(serial) as expected, uproot.open(parallel) as observed:
+        expected_tree, observed_tree = expected["tree"], observed["tree"]
+        assert observed_tree.arrays().tolist() == expected_tree.arrays().tolist()
+        for name in expected_tree.keys():
+            assert (
+                observed_tree[name].member("fBasketSeek").tolist()
+                == expected_tree[name].member("fBasketSeek").tolist()
+            )
+            assert (
+                observed_tree[name].member("fBasketBytes").tolist()
+                == expected_tree[name].member("fBasketBytes").tolist()
+            )
+        assert observed_tree["s"].member("fLeaves")[0].member("fLen") == (
+            expected_tree["s"].member("fLeaves")[0].member("fLen")
+        )
+
+
+def test_default_executor_is_shared(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "one.root")) as one, uproot.recreate(
+        os.path.join(tmp_path, "two.root")
+    ) as two:
+        assert one.file.compression_executor is two.file.compression_executor
+        with pytest.raises(TypeError):
+            one.file.compression_executor = "not an executor"
+
+
+def test_errors_are_raised(tmp_path):
+    class Failing:
+        def submit(self, task, /, *args, **kwargs):
+            raise RuntimeError("compression failed")
+
+    with uproot.recreate(os.path.join(tmp_path, "file.root")) as file:
+        file.file.compression_executor = Failing()
+        file.mktree("tree", {"x": np.float64, "y": np.float64})
+        with pytest.raises(RuntimeError, match="compression failed"):
+            file["tree"].extend({"x": np.arange(10.0), "y": np.arange(10.0)})
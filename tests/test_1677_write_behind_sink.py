@@ -0,0 +1,136 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the write-behind mode of FileSink (``write_buffer_size``)."""
+
+import io
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.sink.file
+
+
+class CountingBytesIO(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.num_writes = 0
+        self.num_flushes = 0
+
+    def write(self, data):
+        self.num_writes += 1
+        return super().write(data)
+
+    def flush(self):
+        self.num_flushes += 1
+        return super().flush()
+
+    def close(self):
+        self.value = self.getvalue()
+        super().close()
+
+
+def _write(file_or_path, **options):
+    with uproot.recreate(file_or_path, **options) as file:
+        file.mktree("tree", {"x": np.float64, "y": "var * int32"})
+        for i in range(20):
+            file["tree"].extend(
+                {
+                    "x": np.arange(i * 100, (i + 1) * 100, dtype=np.float64),
+                    "y": ak.Array([[j] * (j % 3) for j in range(100)]),
+                }
+            )
+        file["hist"] = np.histogram(np.arange(10), bins=5)
+
+
+def test_merging_matches_direct_writes():
+    rng = np.random.default_rng(0)
+    direct = uproot.sink.file.FileSink(io.BytesIO())
+    buffered = uproot.sink.file.FileSink(io.BytesIO(), write_buffer_size=50)
+    for _ in range(500):
+        location = int(rng.integers(0, 1000))
+        data = rng.integers(0, 256, int(rng.integers(1, 40)), dtype=np.uint8)
+        direct.write(location, data.tobytes())
+        buffered.write(location, data.tobytes())
+        if rng.random() < 0.1:
+            direct.set_file_length(location + 100)
+            buffered.set_file_length(location + 100)
+            buffered.flush()
+
+    expected = direct.read(0, 1100, insist=False)
+    assert buffered.read(0, 1100, insist=False) == expected
+    assert buffered.num_pending_bytes == 0
+
+
+def test_fewer_writes_and_flushes(tmp_path):
+    unbuffered, buffered = CountingBytesIO(), CountingBytesIO()
+    _write(unbuffered)
+    _write(buffered, write_buffer_size="1 MB")
+
+    assert buffered.num_writes * 5 < unbuffered.num_writes
+    assert buffered.num_flushes * 5 < unbuffered.num_flushes
+
+    path1 = os.path.join(tmp_path, "file1.root")
+    path2 = os.path.join(tmp_path, "file2.root")
+    with open(path1, "wb") as file:
+        file.write(unbuffered.value)
+    with open(path2, "wb") as file:
+        file.write(buffered.value)
+
+    with uproot.open(path1) as expected, uproot.open(path2) as observed:
+        assert observed["tree"].arrays().tolist() == expected["tree"].arrays().tolist()
+        assert observed["hist"].values().tolist() == expected["hist"].values().tolist()
+        assert (
+            observed["tree"]["x"].member("fBasketSeek").tolist()
+            == expected["tree"]["x"].member("fBasketSeek").tolist()
+        )
+
+
+def test_checkpoint(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path, write_buffer_size="100 MB") as file:
+        file.mktree("tree", {"x": np.int64})
+        file["tree"].extend({"x": np.arange(10)})
+        file["tree"].extend({"x": np.arange(10, 20)})
+        assert file.file.sink.num_pending_bytes > 0
+
+        file.checkpoint()
+        assert file.file.sink.num_pending_bytes == 0
+        with uproot.open(path) as reader:
+            assert reader["tree"]["x"].array(library="np").tolist() == list(range(20))
+
+        file["tree"].extend({"x": np.arange(20, 30)})
+
+    with uproot.open(path) as reader:
+        assert reader["tree"]["x"].array(library="np").tolist() == list(range(30))
+
+
+def test_update(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    _write(path)
+    with uproot.update(path, write_buffer_size=0) as file:
+        file["more"] = "some string"
+        assert "tree" in file
+    with uproot.open(path) as file:
+        assert str(file["more"]) == "some string"
+        assert len(file["tree"]["x"].array()) == 2000
+
+
+def test_background_errors_are_raised():
+    class Failing(io.BytesIO):
+        def write(self, data):
+            raise OSError("disk full")
+
+    sink = uproot.sink.file.FileSink(Failing(), write_buffer_size=0)
+    sink.write(0, b"hello")
+    sink.flush()
+    with pytest.raises(OSError, match="disk full"):
+        sink.close()
+    assert sink.closed
+
+
+def test_invalid_buffer_size():
+    with pytest.raises(ValueError, match="write_buffer_size"):
+        uproot.sink.file.FileSink(io.BytesIO(), write_buffer_size=-1)
@@ -0,0 +1,168 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for accumulating small WritableTree.extend calls into TBaskets of a
+target size (``basket_size`` in mktree)."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+def _chunks(num_chunks, chunk_size):
+    for i in range(num_chunks):
+        start = i * chunk_size
+        yield {
+            "x": np.arange(start, start + chunk_size, dtype=np.float64),
+            "y": ak.Array(
+                [[j] * (j % 4) for j in range(start, start + chunk_size)]
+            ),
+            "s": [f"entry {j}" * (j % 3) for j in range(start, start + chunk_size)],
+        }
+
+
+def _expected(num_entries):
+    return {
+        "x": list(range(num_entries)),
+        "y": [[j] * (j % 4) for j in range(num_entries)],
+        "s": [f"entry {j}" * (j % 3) for j in range(num_entries)],
+    }
+
+
+def _check(tree, num_entries):
+    arrays = tree.arrays(["x", "y", "s"])
+    expected = _expected(num_entries)
+    for name in ["x", "y", "s"]:
+        assert arrays[name].tolist() == expected[name]
+
+
+def test_basket_size_in_entries(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        tree = file.mktree(
+            "tree", {"x": np.float64, "y": "var * int64", "s": str}, basket_size=100
+        )
+        assert tree.basket_size == 100
+        for chunk in _chunks(35, 7):
+            tree.extend(chunk)
+        assert tree.num_entries == 245
+        assert tree.num_baskets == 2
+
+    with uproot.open(path) as file:
+        tree = file["tree"]
+        assert tree.member("fAutoFlush") == 100
+        for name in ["x", "y", "ny", "s"]:
+            assert tree[name].entry_offsets == [0, 100, 200, 245]
+        _check(tree, 245)
+
+
+def test_basket_size_in_bytes(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        tree = file.mktree("tree", {"x": np.float64, "z": np.int8}, basket_size="8 kB")
+        for i in range(100):
+            tree.extend(
+                {
+                    "x": np.arange(i * 50, (i + 1) * 50, dtype=np.float64),
+                    "z": np.zeros(50, np.int8),
+                }
+            )
+
+    with uproot.open(path) as file:
+        tree = file["tree"]
+        # the biggest TBranch (float64) sets the number of entries per TBasket
+        assert tree.member("fAutoFlush") == 1000
+        assert tree["x"].entry_offsets == list(range(0, 5001, 1000))
+        assert tree["z"].entry_offsets == tree["x"].entry_offsets
+        assert tree["x"].array(library="np").tolist() == list(range(5000))
+
+
+def test_flush_and_short_baskets(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        tree = file.mktree(
+            "tree", {"x": np.float64, "y": "var * int64", "s": str}, basket_size=100
+        )
+        chunks = list(_chunks(10, 30))
+        for chunk in chunks[:5]:
+            tree.extend(chunk)
+        assert tree.num_baskets == 1
+        tree.flush()
+        assert tree.num_baskets == 2
+        tree.flush()
+        assert tree.num_baskets == 2
+        for chunk in chunks[5:]:
+            tree.extend(chunk)
+
+    with uproot.open(path) as file:
+        tree = file["tree"]
+        assert tree["x"].entry_offsets == [0, 100, 150, 250, 300]
+        # a short TBasket in the middle means that clusters are irregular
+        assert tree.member("fAutoFlush") == -30000000
+        _check(tree, 300)
+
+
+def test_many_small_extends_large_tree(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        tree = file.mktree(
+            "tree",
+            {"x": np.float64, "y": "var * int64", "s": str},
+            basket_size=50,
+            initial_basket_capacity=2,
+        )
+        for chunk in _chunks(200, 3):
+            tree.extend(chunk)
+
+    with uproot.open(path) as file:
+        tree = file["tree"]
+        assert tree["x"].num_baskets == 12
+        _check(tree, 600)
+
+
+def test_without_basket_size(tmp_path):
+    path = os.path.join(tmp_path, "file.root")
+    with uproot.recreate(path) as file:
+        tree = file.mktree("tree", {"x": np.float64})
+        assert tree.basket_size is None
+        for i in range(3):
+            tree.extend({"x": np.arange(i * 10, (i + 1) * 10, dtype=np.float64)})
+        assert tree.num_baskets == 3
+
+    with uproot.open(path) as file:
+        assert file["tree"].member("fAutoFlush") == -30000000
+        assert file["tree"]["x"].entry_offsets == [0, 10, 20, 30]
+
+
+def test_invalid_basket_size(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "file.root")) as file:
+        with pytest.raises(ValueError, match="basket_size"):
+            file.mktree("a", {"x": np.float64}, basket_size=0)
+        with pytest.raises(TypeError, match="basket_size"):
+            file.mktree("b", {"x": np.float64}, basket_size="lots")
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, ">f8"])
+def test_reused_input_buffer(tmp_path, dtype):
+    path = os.path.join(tmp_path, "file.root")
+    buffer = np.zeros(10, dtype)
+    content = np.zeros(10, np.uint8)
+    with uproot.recreate(path) as file:
+        tree = file.mktree("tree", {"x": dtype, "y": "var * uint8"}, basket_size=100)
+        for i in range(10):
+            buffer[:] = np.arange(i * 10, (i + 1) * 10)
+            content[:] = np.arange(i * 10, (i + 1) * 10)
+            jagged = ak.Array(
+                ak.contents.ListOffsetArray(
+                    ak.index.Index64(np.arange(11)), ak.contents.NumpyArray(content)
+                )
+            )
+            tree.extend({"x": buffer, "y": jagged})
+
+    with uproot.open(path) as file:
+        arrays = file["tree"].arrays(["x", "y"], library="np")
+        assert arrays["x"].tolist() == list(range(100))
+        assert [x.tolist() for x in arrays["y"]] == [[j] for j in range(100)]
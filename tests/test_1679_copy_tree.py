@@ -0,0 +1,132 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for uproot.copy_tree, which copies and skims TTrees by their compressed
+TBaskets."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.writing.basketcopy
+
+ALL = ["a", "b", "m", "nJet", "jet_pt", "jet_eta", "s"]
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = os.path.join(tmp_path, "source.root")
+    rng = np.random.default_rng(42)
+    with uproot.recreate(path, compression=uproot.ZLIB(4)) as file:
+        file.mktree(
+            "events",
+            {
+                "a": np.float64,
+                "b": np.int32,
+                "m": (np.int16, (3,)),
+                "jet_pt": "var * float32",
+                "jet_eta": "var * float32",
+                "s": str,
+            },
+            title="some events",
+            counter_name=lambda counted: "nJet",
+        )
+        for i in range(5):
+            counts = rng.integers(0, 4, 100)
+            file["events"].extend(
+                {
+                    "a": rng.normal(size=100),
+                    "b": np.arange(i * 100, (i + 1) * 100, dtype=np.int32),
+                    "m": rng.integers(0, 10, (100, 3)).astype(np.int16),
+                    "jet_pt": ak.unflatten(
+                        rng.normal(size=counts.sum()).astype(np.float32), counts
+                    ),
+                    "jet_eta": ak.unflatten(
+                        rng.normal(size=counts.sum()).astype(np.float32), counts
+                    ),
+                    "s": [f"event {j}" * (j % 3) for j in range(100)],
+                }
+            )
+    return path
+
+
+def _compare(expected, observed, names, entry_start=None, entry_stop=None):
+    expected_arrays = expected.arrays(
+        names, entry_start=entry_start, entry_stop=entry_stop
+    )
+    observed_arrays = observed.arrays(names)
+    for name in names:
+        assert observed_arrays[name].tolist() == expected_arrays[name].tolist()
+
+
+def test_copy_all_raw(source_file, tmp_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("no TBasket should be decompressed")
+
+    monkeypatch.setattr(uproot.writing.basketcopy, "_rewrite_basket", fail)
+
+    path = os.path.join(tmp_path, "copy.root")
+    with uproot.open(source_file) as source, uproot.recreate(path) as output:
+        tree = uproot.copy_tree(source["events"], output)
+        assert tree.num_entries == 500
+
+    with uproot.open(source_file) as source, uproot.open(path) as copy:
+        expected, observed = source["events"], copy["events"]
+        assert observed.title == "some events"
+        assert set(observed.keys()) == set(ALL)
+        _compare(expected, observed, ALL)
+        for name in ALL:
+            # same compressed TBaskets, byte for byte
+            assert (
+                observed[name].member("fBasketBytes").tolist()[:5]
+                == expected[name].member("fBasketBytes").tolist()[:5]
+            )
+            assert observed[name].entry_offsets == expected[name].entry_offsets
+            assert observed[name].basket(0).data.tobytes() == (
+                expected[name].basket(0).data.tobytes()
+            )
+
+
+def test_skim_branches_and_entries(source_file, tmp_path):
+    path = os.path.join(tmp_path, "skim.root")
+    with uproot.open(source_file) as source, uproot.recreate(path) as output:
+        uproot.copy_tree(
+            source["events"],
+            output,
+            "skimmed",
+            filter_name=["b", "jet_pt", "s"],
+            entry_start=150,
+            entry_stop=420,
+        )
+
+    with uproot.open(source_file) as source, uproot.open(path) as copy:
+        observed = copy["skimmed"]
+        assert observed.keys() == ["b", "nJet", "jet_pt", "s"]
+        assert observed.num_entries == 270
+        # the first and last TBaskets were cut, the others copied
+        assert observed["b"].entry_offsets == [0, 50, 150, 250, 270]
+        _compare(source["events"], observed, ["b", "nJet", "jet_pt", "s"], 150, 420)
+
+
+def test_copied_tree_can_be_extended(source_file, tmp_path):
+    path = os.path.join(tmp_path, "copy.root")
+    with uproot.open(source_file) as source, uproot.recreate(path) as output:
+        tree = uproot.copy_tree(
+            source["events"], output, filter_name=["a", "b"], entry_stop=250
+        )
+        tree.extend({"a": np.zeros(10), "b": np.full(10, -1, np.int32)})
+
+    with uproot.open(path) as copy:
+        b = copy["events"]["b"].array(library="np").tolist()
+        assert b == list(range(250)) + [-1] * 10
+
+
+def test_unsupported_branches(tmp_path, source_file):
+    path = os.path.join(tmp_path, "copy.root")
+    with uproot.open(source_file) as source, uproot.recreate(path) as output:
+        with pytest.raises(ValueError, match="no TBranches"):
+            uproot.copy_tree(source["events"], output, filter_name="nothing")
+        with pytest.raises(TypeError):
+            uproot.copy_tree(source, output)
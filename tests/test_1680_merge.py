@@ -0,0 +1,92 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for uproot.merge, which concatenates TTrees from many files by their
+compressed TBaskets."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+def _write_inputs(tmp_path, num_files):
+    rng = np.random.default_rng(1)
+    paths = []
+    for i in range(num_files):
+        path = os.path.join(tmp_path, f"job-{i:02d}.root")
+        with uproot.recreate(path) as file:
+            file.mktree(
+                "events",
+                {"x": np.float64, "hits": "var * int32", "label": str},
+                title="job output",
+            )
+            for j in range(1 + i % 3):
+                n = 20 + 10 * j
+                counts = rng.integers(0, 3, n)
+                file["events"].extend(
+                    {
+                        "x": np.full(n, i, np.float64),
+                        "hits": ak.unflatten(
+                            rng.integers(0, 100, counts.sum()).astype(np.int32),
+                            counts,
+                        ),
+                        "label": [f"file {i} entry {k}" for k in range(n)],
+                    }
+                )
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("step_size", ["100 MB", 1])
+def test_merge(tmp_path, step_size):
+    paths = _write_inputs(tmp_path, 7)
+    output = os.path.join(tmp_path, "merged.root")
+    merged = uproot.merge(
+        paths, output, tree="events", step_size=step_size, num_workers=3
+    )
+    assert merged.closed
+
+    expected = uproot.concatenate([p + ":events" for p in paths])
+    with uproot.open(output) as file:
+        tree = file["events"]
+        assert tree.title == "job output"
+        assert tree.num_entries == len(expected)
+        assert tree.keys() == ["x", "nhits", "hits", "label"]
+        arrays = tree.arrays()
+        for name in ["x", "nhits", "hits", "label"]:
+            assert arrays[name].tolist() == expected[name].tolist()
+        num_baskets = sum(1 + i % 3 for i in range(7))
+        assert tree["x"].num_baskets == num_baskets
+
+
+def test_merge_into_directory_with_filter(tmp_path):
+    paths = _write_inputs(tmp_path, 3)
+    with uproot.recreate(os.path.join(tmp_path, "merged.root")) as file:
+        merged = uproot.merge(
+            [p + ":events" for p in paths], file.mkdir("sub"), filter_name="hits"
+        )
+        assert merged.num_entries == 20 + 50 + 90
+        merged.extend({"hits": ak.Array([[1, 2, 3]])})
+
+    with uproot.open(os.path.join(tmp_path, "merged.root")) as file:
+        tree = file["sub/events"]
+        assert tree.keys() == ["nhits", "hits"]
+        assert tree["hits"].array()[-1].tolist() == [1, 2, 3]
+
+
+def test_incompatible_inputs(tmp_path):
+    paths = _write_inputs(tmp_path, 2)
+    other = os.path.join(tmp_path, "other.root")
+    with uproot.recreate(other) as file:
+        file.mktree("events", {"x": np.int64}).extend({"x": np.arange(5)})
+
+    with pytest.raises(ValueError, match="different TBranches"):
+        uproot.merge(
+            [*paths, other],
+            os.path.join(tmp_path, "merged.root"),
+            tree="events",
+            filter_name="x",
+        )
@@ -0,0 +1,100 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for uproot.convert_to_rntuple and concurrent compression of RNTuple
+pages."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+class CountingExecutor:
+    def __init__(self):
+        self.executor = uproot.ThreadPoolExecutor(max_workers=4)
+        self.num_submitted = 0
+
+    def submit(self, task, /, *args, **kwargs):
+        self.num_submitted += 1
+        return self.executor.submit(task, *args, **kwargs)
+
+
+@pytest.fixture
+def tree_files(tmp_path):
+    rng = np.random.default_rng(7)
+    paths = []
+    for i in range(3):
+        path = os.path.join(tmp_path, f"input{i}.root")
+        with uproot.recreate(path) as file:
+            file.mktree(
+                "Events", {"x": np.float64, "n": np.int32, "v": "var * float32"}
+            )
+            for _ in range(2):
+                counts = rng.integers(0, 4, 250)
+                file["Events"].extend(
+                    {
+                        "x": rng.normal(size=250),
+                        "n": rng.integers(0, 10, 250).astype(np.int32),
+                        "v": ak.unflatten(
+                            rng.normal(size=counts.sum()).astype(np.float32), counts
+                        ),
+                    }
+                )
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_convert(tree_files, tmp_path, prefetch):
+    output = os.path.join(tmp_path, "output.root")
+    ntuple = uproot.convert_to_rntuple(
+        [p + ":Events" for p in tree_files], output, step_size=200, prefetch=prefetch
+    )
+    assert ntuple.closed
+
+    expected = uproot.concatenate([p + ":Events" for p in tree_files])
+    with uproot.open(output) as file:
+        observed = file["Events"]
+        assert observed.num_entries == 1500
+        # 500 entries per file, in steps of 200: 3 clusters per file
+        assert len(observed.cluster_summaries) == 9
+        arrays = observed.arrays()
+        for name in ["x", "n", "v"]:
+            assert arrays[name].tolist() == expected[name].tolist()
+
+
+def test_filters_and_directory(tree_files, tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "output.root")) as file:
+        ntuple = uproot.convert_to_rntuple(
+            tree_files[0], file, name="ntuple", filter_name=["x", "v"]
+        )
+        assert ntuple.num_entries == 500
+
+    with uproot.open(os.path.join(tmp_path, "output.root")) as file:
+        assert file["ntuple"].keys() == ["x", "v"]
+
+
+def test_pages_compressed_concurrently(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "output.root")) as file:
+        executor = CountingExecutor()
+        file.file.compression_executor = executor
+        file["ntuple"] = {"a": np.arange(100), "b": np.arange(100.0)}
+        assert executor.num_submitted == 2
+
+    with uproot.open(os.path.join(tmp_path, "output.root")) as file:
+        assert file["ntuple"]["b"].array().tolist() == list(range(100))
+
+
+def test_errors_are_raised(tree_files, tmp_path):
+    with pytest.raises(ValueError, match="prefetch"):
+        uproot.convert_to_rntuple(
+            tree_files, os.path.join(tmp_path, "a.root"), prefetch=-1
+        )
+    with pytest.raises(FileNotFoundError):
+        uproot.convert_to_rntuple(
+            [*tree_files, os.path.join(tmp_path, "missing.root")],
+            os.path.join(tmp_path, "b.root"),
+        )
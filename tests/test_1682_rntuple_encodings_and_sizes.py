@@ -0,0 +1,171 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the column encodings, page sizes, and cluster sizes of the RNTuple
+writer."""
+
+import os
+
+import numpy as np
+import pytest
+
+import uproot
+
+ak = pytest.importorskip("awkward")
+
+
+def _data(num_entries=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 4, num_entries)
+    return ak.Array(
+        {
+            "i16": rng.integers(-500, 500, num_entries).astype(np.int16),
+            "u32": rng.integers(0, 1000, num_entries).astype(np.uint32),
+            "i64": rng.integers(-(2**40), 2**40, num_entries),
+            "f32": rng.normal(size=num_entries).astype(np.float32),
+            "f64": rng.normal(size=num_entries),
+            "b": rng.integers(0, 2, num_entries).astype(bool),
+            "jagged": ak.unflatten(rng.normal(size=counts.sum()), counts),
+            "s": [str(i) * (i % 3) for i in range(num_entries)],
+            "opt": ak.Array([None if i % 5 == 0 else i for i in range(num_entries)]),
+            "rec": ak.zip({"x": np.arange(num_entries), "y": -np.arange(num_entries)}),
+        }
+    )
+
+
+def _page_bytes(ntuple):
+    return sum(
+        page.locator.num_bytes
+        for cluster in ntuple.page_link_list
+        for column in cluster
+        for page in column.pages
+    )
+
+
+@pytest.mark.parametrize("encodings", ["split", "plain", None])
+@pytest.mark.parametrize("compression", [uproot.ZLIB(1), uproot.LZ4(1), None])
+def test_round_trip(tmp_path, encodings, compression):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = _data()
+
+    with uproot.recreate(filepath, compression=compression) as file:
+        ntuple = file.mkrntuple(
+            "ntuple",
+            data.layout.form,
+            encodings=encodings,
+            page_size=100,
+            cluster_size=300,
+        )
+        for start in range(0, len(data), 70):
+            ntuple.extend(data[start : start + 70])
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        types = {column.type for column in ntuple.header.column_records}
+        if encodings == "split" or (encodings is None and compression is not None):
+            assert types.isdisjoint({0x05, 0x08, 0x09, 0x0C, 0x0D, 0x0F})
+            assert {0x11, 0x14, 0x15, 0x18, 0x19, 0x1B}.issubset(types)
+        else:
+            assert types.isdisjoint(range(0x11, 0x1C))
+
+        assert ntuple.arrays().tolist() == data.tolist()
+
+
+def test_split_is_smaller(tmp_path):
+    data = _data(num_entries=20000)
+    sizes = {}
+    for encodings in ["plain", "split"]:
+        filepath = os.path.join(tmp_path, f"{encodings}.root")
+        with uproot.recreate(filepath) as file:
+            file.mkrntuple("ntuple", data, encodings=encodings)
+        with uproot.open(filepath) as file:
+            sizes[encodings] = _page_bytes(file["ntuple"])
+            assert file["ntuple"].arrays().tolist() == data.tolist()
+
+    assert sizes["split"] < sizes["plain"]
+
+
+def test_per_field_encodings(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = _data()
+    with uproot.recreate(filepath) as file:
+        file.mkrntuple("ntuple", data, encodings={"i16": "plain", "jagged": "plain"})
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        field_names = [field.field_name for field in ntuple.field_records]
+        types = {}
+        for column in ntuple.header.column_records:
+            types.setdefault(field_names[column.field_id], []).append(column.type)
+        assert types["i16"] == [0x05]
+        assert types["jagged"] == [0x0F]
+        assert 0x0D in types["_0"]  # contents of "jagged"
+        assert types["i64"] == [0x15]
+        assert ntuple.arrays().tolist() == data.tolist()
+
+
+def test_cluster_size_in_entries(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = _data()
+    with uproot.recreate(filepath) as file:
+        ntuple = file.mkrntuple("ntuple", data.layout.form, cluster_size=300)
+        assert ntuple.cluster_size == 300
+        for start in range(0, len(data), 70):
+            ntuple.extend(data[start : start + 70])
+        assert ntuple.num_entries == 1000
+        assert ntuple._cascading.num_entries == 900
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        assert [c.num_entries for c in ntuple.cluster_summaries] == [300, 300, 300, 100]
+        assert ntuple.arrays().tolist() == data.tolist()
+
+
+def test_cluster_size_in_bytes_and_flush(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = ak.Array({"x": np.arange(1000, dtype=np.float64)})
+    with uproot.recreate(filepath) as file:
+        ntuple = file.mkrntuple("ntuple", data.layout.form, cluster_size="2 kB")
+        assert ntuple.cluster_size == 2000
+        for start in range(0, 600, 100):
+            ntuple.extend(data[start : start + 100])
+        ntuple.flush()
+        assert ntuple._cascading.num_pending_entries == 0
+        ntuple.extend(data[600:])
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        assert [c.num_entries for c in ntuple.cluster_summaries] == [300, 300, 400]
+        assert ntuple["x"].array(library="np").tolist() == list(range(1000))
+
+
+def test_page_size(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = ak.Array(
+        {"x": np.arange(1000, dtype=np.float64), "b": np.arange(1000) % 3 == 0}
+    )
+    with uproot.recreate(filepath) as file:
+        ntuple = file.mkrntuple("ntuple", data, page_size="1 kB")
+        assert ntuple.page_size == 1000
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        (cluster,) = ntuple.page_link_list
+        assert [page.num_elements for page in cluster[0].pages] == [125] * 8
+        assert [page.num_elements for page in cluster[1].pages] == [1000]
+        assert ntuple.arrays().tolist() == data.tolist()
+
+
+def test_errors(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "test.root")) as file:
+        with pytest.raises(ValueError, match="one of"):
+            file.mkrntuple("a", {"x": np.float64}, encodings="shuffle")
+        with pytest.raises(ValueError, match="not in the RNTuple"):
+            file.mkrntuple("b", {"x": np.float64}, encodings={"y": "split"})
+        with pytest.raises(TypeError):
+            file.mkrntuple("c", {"x": np.float64}, encodings=["split"])
+        with pytest.raises(ValueError, match="cluster_size"):
+            file.mkrntuple("d", {"x": np.float64}, cluster_size=0)
+        with pytest.raises(TypeError):
+            file.mkrntuple("e", {"x": np.float64}, cluster_size="lots")
+        with pytest.raises(ValueError, match="page_size"):
+            file.mkrntuple("f", {"x": np.float64}, page_size=0)
@@ -0,0 +1,120 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for writing TBranches with ROOT's Double32_t and Float16_t
+truncation."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+def _data(num_entries=1000, seed=1):
+    rng = np.random.default_rng(seed)
+    return {
+        "ranged": rng.uniform(0, 10, num_entries),
+        "mantissa": rng.normal(size=num_entries) * 100,
+        "half": rng.normal(size=num_entries).astype(np.float32),
+        "vector": rng.uniform(-1, 1, (num_entries, 3)),
+        "jagged": ak.unflatten(
+            rng.uniform(-5, 5, 3 * num_entries), np.full(num_entries, 3)
+        ),
+    }
+
+
+TRUNCATION = {
+    "ranged": (0, 10, 16),
+    "mantissa": uproot.AsDouble32(0, 0, 12),
+    "half": (0, 0, 10),
+    "vector": (-1, 1, 20),
+    "jagged": (-5, 5),
+}
+
+
+@pytest.mark.parametrize("basket_size", [None, 300])
+def test_round_trip(tmp_path, basket_size):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = _data()
+    with uproot.recreate(filepath) as file:
+        file.mktree(
+            "tree",
+            {name: array.dtype for name, array in data.items() if name != "jagged"}
+            | {"vector": (np.float64, (3,)), "jagged": "var * float64"},
+            truncation=TRUNCATION,
+            basket_size=basket_size,
+        )
+        for start in range(0, 1000, 70):
+            file["tree"].extend(
+                {name: array[start : start + 70] for name, array in data.items()}
+            )
+
+    with uproot.open(filepath) as file:
+        tree = file["tree"]
+        assert tree.num_entries == 1000
+        if basket_size is not None:
+            assert tree["ranged"].num_baskets == 4
+
+        assert tree["ranged"].interpretation == uproot.AsDouble32(0, 10, 16)
+        assert tree["ranged"].member("fLeaves")[0].classname == "TLeafD32"
+        assert tree["half"].interpretation == uproot.AsFloat16(0, 0, 10)
+        assert tree["half"].member("fLeaves")[0].classname == "TLeafF16"
+        assert tree["vector"].interpretation == uproot.AsDouble32(
+            -1, 1, 20, to_dims=(3,)
+        )
+        assert tree["jagged"].interpretation.content == uproot.AsDouble32(-5, 5, 32)
+        assert tree["mantissa"].title == "mantissa/d[0,0,12]"
+
+        arrays = tree.arrays(library="np")
+        assert np.abs(arrays["ranged"] - data["ranged"]).max() <= 10 / 2**17
+        assert np.abs(arrays["vector"] - data["vector"]).max() <= 2 / 2**21
+        assert np.allclose(arrays["mantissa"], data["mantissa"], rtol=2**-12)
+        assert np.allclose(arrays["half"], data["half"], rtol=2**-10)
+        assert arrays["half"].dtype == np.float32
+        jagged = tree["jagged"].array()
+        assert ak.all(abs(ak.flatten(jagged) - ak.flatten(data["jagged"])) < 1e-8)
+
+        # writing the values that were read back is lossless
+        assert np.array_equal(
+            uproot.AsDouble32(0, 10, 16).to_raw(arrays["ranged"]).view(">u4"),
+            np.floor(0.5 + 2**16 / 10 * arrays["ranged"]).astype(">u4"),
+        )
+
+
+def test_values_outside_range_are_clipped(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        file.mktree("tree", {"x": np.float64}, truncation={"x": (0, 1, 8)})
+        file["tree"].extend({"x": np.array([-3.0, 0.5, 1.0, 7.0])})
+
+    with uproot.open(filepath) as file:
+        assert file["tree"]["x"].array(library="np").tolist() == [0, 0.5, 1, 1]
+
+
+def test_smaller_when_compressed(tmp_path):
+    data = {"x": np.random.default_rng(2).uniform(0, 1, 100000)}
+    sizes = {}
+    for label, truncation in [("full", None), ("truncated", {"x": (0, 1, 12)})]:
+        filepath = os.path.join(tmp_path, f"{label}.root")
+        with uproot.recreate(filepath) as file:
+            file.mktree("tree", data, truncation=truncation)
+        with uproot.open(filepath) as file:
+            sizes[label] = file["tree"]["x"].compressed_bytes
+
+    assert sizes["truncated"] < sizes["full"] / 2
+
+
+def test_errors(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "test.root")) as file:
+        with pytest.raises(ValueError, match="no such branch"):
+            file.mktree("a", {"x": np.float64}, truncation={"y": (0, 1)})
+        with pytest.raises(TypeError):
+            file.mktree("b", {"x": np.int32}, truncation={"x": (0, 1)})
+        with pytest.raises(TypeError):
+            file.mktree("c", {"x": np.float64}, truncation={"x": "[0,1,8]"})
+        with pytest.raises(TypeError):
+            file.mktree("d", {"x": (np.float64, (2, 3))}, truncation={"x": (0, 1)})
+        with pytest.raises(ValueError, match="at most 14 bits"):
+            file.mktree("e", {"x": np.float64}, truncation={"x": (0, 0, 20)})
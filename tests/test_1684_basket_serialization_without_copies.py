@@ -0,0 +1,118 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for serializing TBaskets from NumPy and Awkward buffers without
+intermediate copies."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.writing._cascadetree
+
+
+def _datum(tree, name):
+    cascading = tree._cascading
+    return cascading._branch_data[cascading._branch_lookup[name]]
+
+
+@pytest.mark.parametrize("compression", [uproot.ZLIB(1), None])
+def test_scratch_buffer_is_reused(tmp_path, compression):
+    filepath = os.path.join(tmp_path, "test.root")
+    rng = np.random.default_rng(3)
+    expected = {"x": [], "y": [], "j": []}
+    with uproot.recreate(filepath, compression=compression) as file:
+        tree = file.mktree(
+            "tree", {"x": np.float64, "y": np.int32, "j": "var * float64"}
+        )
+        scratch = None
+        for size in [100, 50, 100, 20]:
+            counts = rng.integers(0, 4, size)
+            data = {
+                "x": rng.normal(size=size).astype("<f8"),
+                "y": rng.integers(0, 1000, size).astype("<i4"),
+                "j": ak.unflatten(rng.normal(size=counts.sum()), counts),
+            }
+            tree.extend(data)
+            for name, array in data.items():
+                expected[name].extend(ak.to_list(array))
+
+            if scratch is None:
+                scratch = _datum(tree, "x")["scratch"]
+            assert _datum(tree, "x")["scratch"] is scratch
+            assert "scratch" in _datum(tree, "j")
+
+    with uproot.open(filepath) as file:
+        arrays = file["tree"].arrays()
+        for name, values in expected.items():
+            assert arrays[name].tolist() == values
+
+
+def test_big_endian_input_is_not_copied(tmp_path):
+    with uproot.recreate(os.path.join(tmp_path, "test.root")) as file:
+        tree = file.mktree("tree", {"x": np.float64})
+        datum = _datum(tree, "x")
+        big_endian = np.arange(10, dtype=">f8")
+        assert tree._cascading._to_big_endian(datum, big_endian) is big_endian
+        assert "scratch" not in datum
+
+        strided = big_endian[::2]
+        contiguous = tree._cascading._to_big_endian(datum, strided)
+        assert contiguous.flags.c_contiguous
+        assert contiguous.tolist() == strided.tolist()
+
+
+def test_scratch_buffer_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(uproot.writing._cascadetree, "_max_scratch_bytes", 800)
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree("tree", {"x": np.float64})
+        tree.extend({"x": np.arange(50, dtype="<f8")})
+        scratch = _datum(tree, "x")["scratch"]
+        assert len(scratch) == 400
+        tree.extend({"x": np.arange(50, 1050, dtype="<f8")})
+        assert _datum(tree, "x")["scratch"] is scratch
+        tree.extend({"x": np.arange(1050, 1100, dtype="<f8")})
+        assert _datum(tree, "x")["scratch"] is scratch
+
+    with uproot.open(filepath) as file:
+        assert file["tree"]["x"].array(library="np").tolist() == list(range(1100))
+
+
+def test_accumulated_baskets_do_not_share_scratch(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = np.arange(1000, dtype="<i8")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree("tree", {"x": np.int64}, basket_size=300)
+        for start in range(0, 1000, 70):
+            tree.extend({"x": data[start : start + 70]})
+        assert "scratch" not in _datum(tree, "x")
+
+    with uproot.open(filepath) as file:
+        assert file["tree"]["x"].array(library="np").tolist() == data.tolist()
+
+
+def test_strided_and_string_data(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    matrix = np.arange(60, dtype="<f4").reshape(20, 3)
+    strings = [f"entry {i}" * i for i in range(20)]
+    with uproot.recreate(filepath) as file:
+        file.mktree("tree", {"col": np.float32, "s": str})
+        file["tree"].extend({"col": matrix[:, 1], "s": strings})
+
+    with uproot.open(filepath) as file:
+        arrays = file["tree"].arrays()
+        assert arrays["col"].tolist() == matrix[:, 1].tolist()
+        assert arrays["s"].tolist() == strings
+
+
+def test_as_bytes_is_a_view():
+    array = np.arange(10, dtype=">i4")
+    view = uproot.writing._cascadetree._as_bytes(array)
+    assert len(view) == 40
+    assert np.shares_memory(np.asarray(view), array)
+
+    joined = uproot.writing._cascadetree._join_bytes(b"ab", view[:4], b"")
+    assert bytes(joined) == b"ab\x00\x00\x00\x00"
@@ -0,0 +1,144 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for FileSink with positioned_writes, which writes with os.pwrite from
+several threads at once."""
+
+import io
+import os
+import pickle
+import threading
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.sink.file
+
+
+class CountingExecutor:
+    def __init__(self):
+        self.executor = uproot.ThreadPoolExecutor(max_workers=4)
+        self.threads = set()
+        self.num_submitted = 0
+
+    def submit(self, task, /, *args, **kwargs):
+        self.num_submitted += 1
+
+        def run():
+            self.threads.add(threading.get_ident())
+            return task(*args, **kwargs)
+
+        return self.executor.submit(run)
+
+
+def _write(path, **options):
+    rng = np.random.default_rng(7)
+    with uproot.recreate(path, **options) as file:
+        executor = CountingExecutor()
+        file.file.compression_executor = executor
+        tree = file.mktree(
+            "tree", {"x": np.float64, "y": "var * int32", "s": str, "z": np.int16}
+        )
+        for _ in range(5):
+            counts = rng.integers(0, 5, 300)
+            tree.extend(
+                {
+                    "x": rng.normal(size=300),
+                    "y": ak.unflatten(
+                        rng.integers(0, 100, counts.sum()).astype(np.int32), counts
+                    ),
+                    "s": [f"item {i}" * (i % 4) for i in range(300)],
+                    "z": rng.integers(0, 100, 300).astype(np.int16),
+                }
+            )
+    return executor
+
+
+@pytest.mark.parametrize("compression", [uproot.ZLIB(1), None])
+def test_same_tree_as_direct_writes(tmp_path, compression):
+    os.mkdir(os.path.join(tmp_path, "direct"))
+    os.mkdir(os.path.join(tmp_path, "positioned"))
+    direct = os.path.join(tmp_path, "direct", "file.root")
+    positioned = os.path.join(tmp_path, "positioned", "file.root")
+    direct_executor = _write(direct, compression=compression)
+    positioned_executor = _write(
+        positioned, compression=compression, positioned_writes=True
+    )
+
+    # the five TBaskets of each extend (including y's counter) are written by
+    # the executor
+    assert positioned_executor.num_submitted == direct_executor.num_submitted + 5 * 5
+
+    with uproot.open(direct) as expected, uproot.open(positioned) as observed:
+        expected_tree, observed_tree = expected["tree"], observed["tree"]
+        assert observed_tree.arrays().tolist() == expected_tree.arrays().tolist()
+        for name in expected_tree.keys():
+            assert (
+                observed_tree[name].member("fBasketSeek").tolist()
+                == expected_tree[name].member("fBasketSeek").tolist()
+            )
+    assert os.path.getsize(direct) == os.path.getsize(positioned)
+
+
+def test_concurrent_writes_and_reads(tmp_path):
+    filepath = os.path.join(tmp_path, "file.bin")
+    sink = uproot.sink.file.FileSink(filepath, positioned_writes=True)
+    assert sink.positioned_writes
+    chunks = [bytes([i]) * 1000 for i in range(64)]
+
+    def write(i):
+        sink.write(i * 1000, chunks[i])
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(64)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sink.set_file_length(70000)
+    assert sink.read(63000, 1000) == chunks[63]
+    assert sink.read(64000, 6000) == b"\x00" * 6000
+    with pytest.raises(OSError):
+        sink.read(69000, 2000)
+    sink.close()
+
+    with open(filepath, "rb") as file:
+        assert file.read() == b"".join(chunks) + b"\x00" * 6000
+
+
+def test_file_like_without_descriptor():
+    direct = uproot.sink.file.FileSink(io.BytesIO())
+    positioned = uproot.sink.file.FileSink(io.BytesIO(), positioned_writes=True)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        location = int(rng.integers(0, 1000))
+        data = rng.integers(0, 256, int(rng.integers(1, 40)), dtype=np.uint8)
+        direct.write(location, data.tobytes())
+        positioned.write(location, data)
+        if rng.random() < 0.1:
+            direct.set_file_length(location + 100)
+            positioned.set_file_length(location + 100)
+    positioned.flush()
+    assert positioned.read(0, 2000, insist=False) == direct.read(0, 2000, insist=False)
+
+
+def test_pickle(tmp_path):
+    filepath = os.path.join(tmp_path, "file.bin")
+    sink = uproot.sink.file.FileSink(filepath, positioned_writes=True)
+    sink.write(0, b"abc")
+    copy = pickle.loads(pickle.dumps(sink))
+    assert copy.positioned_writes
+    copy.write(3, b"def")
+    assert copy.read(0, 6) == b"abcdef"
+    copy.close()
+    sink.close()
+
+
+def test_cannot_combine_with_write_buffer(tmp_path):
+    with pytest.raises(ValueError, match="positioned_writes"):
+        uproot.recreate(
+            os.path.join(tmp_path, "file.root"),
+            positioned_writes=True,
+            write_buffer_size="1 MB",
+        )
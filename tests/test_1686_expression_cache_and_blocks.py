@@ -0,0 +1,135 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the compiled-expression cache and blocked evaluation of
+PythonLanguage."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+import uproot.language.python
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    rng = np.random.default_rng(5)
+    counts = rng.integers(0, 4, 10000)
+    with uproot.recreate(filepath) as file:
+        file.mktree(
+            "tree",
+            {
+                "px": np.float64,
+                "py": np.float32,
+                "n": np.int32,
+                "sqrt": np.float64,
+                "jets": "var * float64",
+            },
+        )
+        file["tree"].extend(
+            {
+                "px": rng.normal(size=10000),
+                "py": rng.normal(size=10000).astype(np.float32),
+                "n": rng.integers(0, 10, 10000).astype(np.int32),
+                "sqrt": rng.uniform(0, 1, 10000),
+                "jets": ak.unflatten(rng.normal(size=counts.sum()), counts),
+            }
+        )
+    return filepath
+
+
+def test_compiled_once_per_signature(tree_file):
+    uproot.language.python._compile_expression.cache_clear()
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        for _ in tree.iterate(
+            ["px * 2", "pt"], step_size=1000, aliases={"pt": "hypot(px, py)"}
+        ):
+            pass
+        info = uproot.language.python._compile_expression.cache_info()
+        # "px * 2", "pt", and the definition of "pt" are each compiled once
+        # for 10 steps
+        assert info.misses == 3
+        assert info.hits == 27
+
+        # a different alias definition is a different signature
+        arrays = tree.arrays(["pt"], aliases={"pt": "px"}, library="np")
+        assert np.array_equal(arrays["pt"], tree["px"].array(library="np"))
+
+
+def test_errors_and_warnings_are_not_cached(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        for _ in range(2):
+            with pytest.raises(uproot.KeyInFileError):
+                tree.arrays(["px + missing"])
+            with pytest.raises(SyntaxError):
+                tree.arrays(["px +"])
+            with pytest.warns(uproot.exceptions.NameConflictWarning):
+                arrays = tree.arrays(["sqrt(sqrt)"], library="np")
+            assert np.allclose(arrays["sqrt(sqrt)"], np.sqrt(tree["sqrt"].array()))
+
+
+def _to_list(array):
+    if isinstance(array, np.ndarray):
+        return [x.tolist() if isinstance(x, np.ndarray) else x for x in array]
+    return array.tolist()
+
+
+@pytest.mark.parametrize("library", ["np", "ak"])
+@pytest.mark.parametrize("block_size", [1, 999, 4096, 100000])
+def test_blocked_evaluation(tree_file, library, block_size):
+    language = uproot.language.python.PythonLanguage(block_size=block_size)
+    assert language.block_size == block_size
+    expressions = [
+        "exp(-(px**2 + py**2)) * 2 + 1",
+        "px * py - n",
+        "where(n > 5, px, -px)",
+        "px - px[0]",
+        "jets * 2",
+        "pt",
+    ]
+    aliases = {"pt": "hypot(px, py)"}
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays(
+            expressions, cut="abs(px) < 1", aliases=aliases, library=library
+        )
+        observed = tree.arrays(
+            expressions,
+            cut="abs(px) < 1",
+            aliases=aliases,
+            library=library,
+            language=language,
+        )
+        for expression in expressions:
+            assert _to_list(observed[expression]) == _to_list(expected[expression])
+            assert type(observed[expression]) is type(expected[expression])
+
+
+def test_elementwise_detection():
+    symbols = frozenset(["x", "y"])
+    functions = frozenset(["sqrt", "where"])
+
+    def is_elementwise(expression):
+        node = uproot.language.python._parse_expression(expression)[0]
+        return uproot.language.python._is_elementwise(node, symbols, functions, "get")
+
+    assert is_elementwise("sqrt(x**2 + y**2) > 1.5")
+    assert is_elementwise("where(x > 0, x, -y)")
+    assert is_elementwise("-get('x') * 3")
+    assert not is_elementwise("x[0] + y")
+    assert not is_elementwise("x > y > 0")
+    assert not is_elementwise("sqrt(x, out=y)")
+    assert not is_elementwise("len(x)")
+    assert not is_elementwise("x and y")
+
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        uproot.language.python.PythonLanguage(block_size=0)
+    with pytest.raises(ValueError):
+        uproot.language.python.PythonLanguage(block_size="big")
@@ -0,0 +1,173 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for library="pa" (Arrow) and library="pl" (Polars)."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    rng = np.random.default_rng(11)
+    counts = rng.integers(0, 4, 1000)
+    with uproot.recreate(filepath) as file:
+        file.mktree(
+            "tree",
+            {
+                "x": np.float64,
+                "b": np.bool_,
+                "v": (np.float32, (3,)),
+                "j": "var * int32",
+                "s": str,
+            },
+        )
+        file["tree"].extend(
+            {
+                "x": rng.normal(size=1000),
+                "b": rng.random(1000) < 0.5,
+                "v": rng.normal(size=(1000, 3)).astype(np.float32),
+                "j": ak.unflatten(
+                    rng.integers(0, 10, counts.sum()).astype(np.int32), counts
+                ),
+                "s": [f"entry {i}" * (i % 3) for i in range(1000)],
+            }
+        )
+    return filepath
+
+
+def test_buffers_are_not_copied():
+    library = uproot.interpretation.library._regularize_library("arrow")
+    assert library is uproot.interpretation.library._regularize_library("pa")
+
+    flat = np.arange(10, dtype=np.float64)
+    out = library.finalize(flat, None, None, 0, 10, {})
+    assert out.buffers()[1].address == flat.ctypes.data
+
+    for dtype in [np.int32, np.int64]:
+        offsets = np.array([2, 4, 4, 7], dtype=dtype)
+        content = np.arange(10, dtype=np.int16)
+        jagged = uproot.interpretation.jagged.JaggedArray(offsets, content)
+        out = library.finalize(jagged, None, None, 0, 3, {})
+        assert out.to_pylist() == [[2, 3], [], [4, 5, 6]]
+        assert out.offsets.buffers()[1].address == offsets.ctypes.data
+        assert out.values.buffers()[1].address == content.ctypes.data
+
+        strings = uproot.interpretation.strings.StringArray(offsets, b"..abcdefg...")
+        out = library.finalize(strings, None, None, 0, 3, {})
+        assert out.to_pylist() == ["ab", "", "cde"]
+        assert out.buffers()[1].address == offsets.ctypes.data
+
+
+def test_arrow(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays()
+        batch = tree.arrays(library="arrow")
+        assert isinstance(batch, pa.RecordBatch)
+        assert batch.schema.names == ["x", "b", "v", "nj", "j", "s"]
+        assert pa.types.is_fixed_size_list(batch.schema.field("v").type)
+        for name in batch.schema.names:
+            assert batch.column(name).to_pylist() == expected[name].tolist()
+
+        assert isinstance(tree.arrays(library="pa", how="table"), pa.Table)
+        assert isinstance(tree["j"].array(library="pa"), pa.Array)
+        assert tree.arrays(["x", "s"], library="pa", how=tuple)[1].to_pylist() == (
+            expected["s"].tolist()
+        )
+
+        batches = list(tree.iterate(["x", "j"], step_size=300, library="pa"))
+        assert [x.num_rows for x in batches] == [300, 300, 300, 100]
+        assert all(isinstance(x, pa.RecordBatch) for x in batches)
+
+        table = uproot.concatenate(
+            {tree_file: "tree"}, ["x", "j"], step_size=300, library="pa"
+        )
+        assert isinstance(table, pa.Table)
+        assert table.column("j").to_pylist() == expected["j"].tolist()
+
+
+def test_arrow_cut(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays(["x", "j", "s"], cut="(x > 1) & (nj > 0)")
+        batch = tree.arrays(["x", "j", "s"], cut="(x > 1) & (nj > 0)", library="pa")
+        assert isinstance(batch, pa.RecordBatch)
+        assert batch.num_rows == len(expected)
+        for name in ["x", "j", "s"]:
+            assert batch.column(name).to_pylist() == expected[name].tolist()
+
+
+def test_arrow_cut_with_compute_functions(tree_file):
+    pc = pytest.importorskip("pyarrow.compute")
+    language = uproot.language.python.PythonLanguage(
+        functions={"greater": pc.greater, "multiply": pc.multiply}
+    )
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        x = tree["x"].array(library="np")
+        batch = tree.arrays(
+            ["s", "multiply(x, 2)"],
+            cut="greater(x, 1)",
+            library="pa",
+            language=language,
+        )
+        assert batch.column("multiply(x, 2)").to_pylist() == (x[x > 1] * 2).tolist()
+        assert batch.num_rows == np.count_nonzero(x > 1)
+
+
+def test_polars(tree_file):
+    pl = pytest.importorskip("polars")
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays()
+        df = tree.arrays(library="polars")
+        assert isinstance(df, pl.DataFrame)
+        assert df.columns == ["x", "b", "v", "nj", "j", "s"]
+        for name in df.columns:
+            assert df[name].to_list() == expected[name].tolist()
+
+        series = tree["s"].array(library="pl")
+        assert isinstance(series, pl.Series)
+        assert series.name == "s"
+
+        x = expected["x"].to_numpy()
+        df = tree.arrays(["x * 2", "j"], cut="x > 1", library="pl")
+        assert df["x * 2"].to_list() == (x[x > 1] * 2).tolist()
+        assert df["j"].to_list() == expected["j"][x > 1].tolist()
+
+        frames = list(tree.iterate(["x"], step_size=400, library="pl"))
+        assert [len(x) for x in frames] == [400, 400, 200]
+        df = uproot.concatenate({tree_file: "tree"}, ["x"], library="pl")
+        assert df["x"].to_list() == expected["x"].tolist()
+
+
+def test_rntuple(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    data = {
+        "x": np.arange(5.0),
+        "j": ak.Array([[1, 2], [], [3], [4, 5, 6], []]),
+        "r": ak.Array([[{"a": 1, "b": 2.0}], [], [], [], [{"a": 3, "b": 4.0}]]),
+    }
+    with uproot.recreate(filepath) as file:
+        file["ntuple"] = data
+
+    with uproot.open(filepath) as file:
+        ntuple = file["ntuple"]
+        batch = ntuple.arrays(library="pa")
+        assert isinstance(batch, pa.RecordBatch)
+        for name, array in data.items():
+            assert batch.column(name).to_pylist() == ak.to_list(array)
+        assert ntuple["j"].array(library="pa").to_pylist() == data["j"].tolist()
+
+
+def test_unknown_library():
+    with pytest.raises(ValueError, match="Polars"):
+        uproot.interpretation.library._regularize_library("arrow2")
@@ -0,0 +1,157 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for uproot.to_parquet, which streams TTrees and RNTuples into Parquet
+files."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _data(seed, num_entries):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 4, num_entries)
+    return {
+        "x": rng.normal(size=num_entries),
+        "n": rng.integers(0, 100, num_entries).astype(np.int32),
+        "j": ak.unflatten(rng.normal(size=counts.sum()), counts),
+        "s": [f"entry {i}" * (i % 3) for i in range(num_entries)],
+    }
+
+
+@pytest.fixture
+def tree_files(tmp_path):
+    paths = []
+    for i, num_entries in enumerate([1000, 700, 0, 1300]):
+        filepath = os.path.join(tmp_path, f"input{i}.root")
+        with uproot.recreate(filepath) as file:
+            tree = file.mktree(
+                "tree",
+                {"x": np.float64, "n": np.int32, "j": "var * float64", "s": str},
+            )
+            if num_entries != 0:
+                tree.extend(_data(i, num_entries))
+        paths.append(filepath)
+    return paths
+
+
+def _expected(tree_files, **kwargs):
+    return uproot.concatenate({path: "tree" for path in tree_files}, **kwargs)
+
+
+def test_single_file(tree_files, tmp_path):
+    output = os.path.join(tmp_path, "out.parquet")
+    paths = uproot.to_parquet(
+        {path: "tree" for path in tree_files},
+        output,
+        step_size=400,
+        row_group_size=512,
+        parquet_options={"compression": "zstd"},
+    )
+    assert paths == [output]
+
+    metadata = pq.ParquetFile(output).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+        512,
+        512,
+        512,
+        512,
+        512,
+        440,
+    ]
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    table = pq.read_table(output)
+    expected = _expected(tree_files)
+    assert table.column_names == ["x", "n", "nj", "j", "s"]
+    for name in table.column_names:
+        assert table.column(name).to_pylist() == expected[name].tolist()
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_partitioned(tree_files, tmp_path, prefetch):
+    output = os.path.join(tmp_path, "lake")
+    paths = uproot.to_parquet(
+        [f"{path}:tree" for path in tree_files],
+        output,
+        step_size=300,
+        row_group_size=250,
+        max_rows_per_file=1200,
+        expressions=["x", "j"],
+        prefetch=prefetch,
+    )
+    assert paths == [os.path.join(output, f"part-0000{i}.parquet") for i in range(3)]
+    assert [pq.ParquetFile(path).metadata.num_rows for path in paths] == [
+        1200,
+        1200,
+        600,
+    ]
+    metadata = pq.ParquetFile(paths[0]).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+        250,
+        250,
+        250,
+        250,
+        200,
+    ]
+
+    table = pa.concat_tables([pq.read_table(path) for path in paths])
+    expected = _expected(tree_files, expressions=["x", "j"])
+    assert table.column("x").to_pylist() == expected["x"].tolist()
+    assert table.column("j").to_pylist() == expected["j"].tolist()
+
+
+def test_row_group_per_step_and_cut(tree_files, tmp_path):
+    output = os.path.join(tmp_path, "out.parquet")
+    uproot.to_parquet(
+        {tree_files[0]: "tree"},
+        output,
+        step_size=300,
+        cut="n < 50",
+        filter_name=["x", "n"],
+    )
+    metadata = pq.ParquetFile(output).metadata
+    assert metadata.num_row_groups == 4
+
+    table = pq.read_table(output)
+    expected = _expected(tree_files[:1], filter_name=["x", "n"], cut="n < 50")
+    assert table.column("x").to_pylist() == expected["x"].tolist()
+
+
+def test_rntuple(tmp_path):
+    filepath = os.path.join(tmp_path, "input.root")
+    data = _data(5, 500)
+    with uproot.recreate(filepath) as file:
+        file["ntuple"] = {"x": data["x"], "j": data["j"]}
+
+    output = os.path.join(tmp_path, "out.parquet")
+    uproot.to_parquet({filepath: "ntuple"}, output, row_group_size=128)
+    table = pq.read_table(output)
+    assert pq.ParquetFile(output).metadata.num_row_groups == 4
+    assert table.column("x").to_pylist() == data["x"].tolist()
+    assert table.column("j").to_pylist() == data["j"].tolist()
+
+
+def test_no_entries(tree_files, tmp_path):
+    output = os.path.join(tmp_path, "out.parquet")
+    assert uproot.to_parquet({tree_files[2]: "tree"}, output) == []
+    assert not os.path.exists(output)
+
+
+def test_errors(tree_files, tmp_path):
+    output = os.path.join(tmp_path, "out.parquet")
+    with pytest.raises(ValueError, match="row_group_size"):
+        uproot.to_parquet({tree_files[0]: "tree"}, output, row_group_size=0)
+    with pytest.raises(ValueError, match="prefetch"):
+        uproot.to_parquet({tree_files[0]: "tree"}, output, prefetch=-1)
+    with pytest.raises(TypeError):
+        uproot.to_parquet(
+            {tree_files[0]: "tree"}, output, parquet_options={"no_such_option": 1}
+        )
@@ -0,0 +1,137 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for the array-backed plan of TBaskets to read and the vectorized
+merging of byte ranges."""
+
+import os
+import types
+
+import numpy as np
+import pytest
+
+import uproot
+import uproot.behaviors.TBranch
+import uproot.source.coalesce
+
+
+def _brute_force(entry_offsets, entry_start, entry_stop):
+    out = []
+    for basket_num in range(len(entry_offsets) - 1):
+        start, stop = entry_offsets[basket_num], entry_offsets[basket_num + 1]
+        if entry_start < stop and (
+            start < entry_stop or entry_start == entry_stop == start
+        ):
+            out.append(basket_num)
+    return out
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_entries_to_basket_range(seed):
+    rng = np.random.default_rng(seed)
+    # some TBaskets may be empty
+    entry_offsets = np.concatenate([[0], np.cumsum(rng.integers(0, 5, 30))])
+    branch = types.SimpleNamespace(_basket_layout=lambda: (entry_offsets, None, None))
+    num_entries = int(entry_offsets[-1])
+    for entry_start in range(num_entries + 2):
+        for entry_stop in range(entry_start, num_entries + 2):
+            start, stop = uproot.behaviors.TBranch.TBranch._entries_to_basket_range(
+                branch, entry_start, entry_stop
+            )
+            assert list(range(start, stop)) == _brute_force(
+                entry_offsets, entry_start, entry_stop
+            )
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree("tree", {"x": np.int64, "y": np.float32, "z": np.int16})
+        rng = np.random.default_rng(0)
+        start = 0
+        for size in rng.integers(1, 50, 40):
+            tree.extend(
+                {
+                    "x": np.arange(start, start + size),
+                    "y": np.arange(start, start + size, dtype=np.float32),
+                    "z": (np.arange(start, start + size) % 100).astype(np.int16),
+                }
+            )
+            start += size
+    return filepath
+
+
+def test_plan_matches_entries_to_ranges_or_baskets(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        for entry_start, entry_stop in [(0, 10), (13, 500), (100, 100), (0, 10000)]:
+            plan = uproot.behaviors.TBranch._BasketPlan()
+            expected = []
+            for branch in tree.values():
+                plan.add(branch, entry_start, entry_stop)
+                for basket_num, byte_range in branch.entries_to_ranges_or_baskets(
+                    entry_start, entry_stop
+                ):
+                    expected.append((branch, basket_num, byte_range))
+
+                    seek = branch.member("fBasketSeek")[basket_num]
+                    assert byte_range == (
+                        seek,
+                        seek + branch.basket_compressed_bytes(basket_num),
+                    )
+
+            assert len(plan) == len(expected)
+            assert list(plan) == expected
+
+            ranges, starts, index = plan.ranges_to_read()
+            assert ranges == sorted(x[2] for x in expected)
+            assert starts.tolist() == [start for start, _ in ranges]
+            for (start, _), i in zip(ranges, index):
+                assert plan[i][2][0] == start
+
+
+@pytest.mark.parametrize("step_size", [1, 7, 64, 1000])
+def test_iterate_steps_across_baskets(tree_file, step_size):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays(library="np")
+        steps = list(tree.iterate(step_size=step_size, library="np"))
+        for name in ["x", "y", "z"]:
+            assert np.array_equal(
+                np.concatenate([step[name] for step in steps]), expected[name]
+            )
+        assert tree["x"].array(entry_start=13, entry_stop=300).tolist() == list(
+            range(13, 300)
+        )
+
+
+def _merge_adjacent_loop(ranges, config):
+    sorted_ranges = sorted(ranges, key=lambda r: r.start)
+    cluster = uproot.source.coalesce.Cluster([])
+    for current_range in sorted_ranges:
+        if cluster.ranges and current_range.start - cluster.stop > config.max_range_gap:
+            yield cluster
+            cluster = uproot.source.coalesce.Cluster([])
+        cluster.append(current_range)
+    if cluster.ranges:
+        yield cluster
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_adjacent(seed):
+    rng = np.random.default_rng(seed)
+    config = uproot.source.coalesce.CoalesceConfig(max_range_gap=100)
+    starts = rng.integers(0, 10000, 200)
+    ranges = [
+        uproot.source.coalesce.RangeRequest(int(start), int(start + size), None)
+        for start, size in zip(starts, rng.integers(1, 300, 200))
+    ]
+    observed = list(uproot.source.coalesce._merge_adjacent(ranges, config))
+    expected = list(_merge_adjacent_loop(ranges, config))
+    assert [(c.start, c.stop) for c in observed] == [
+        (c.start, c.stop) for c in expected
+    ]
+    assert [[id(r) for r in c.ranges] for c in observed] == [
+        [id(r) for r in c.ranges] for c in expected
+    ]
+    assert list(uproot.source.coalesce._merge_adjacent([], config)) == []
@@ -0,0 +1,138 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for HasBranches.reader, random access to entries with a cache of
+interpreted TBaskets."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree("tree", {"x": np.int64, "j": "var * float64", "s": str})
+        for start in range(0, 1000, 100):
+            entries = np.arange(start, start + 100)
+            tree.extend(
+                {
+                    "x": entries,
+                    "j": ak.unflatten(
+                        np.arange((entries % 3).sum(), dtype=np.float64), entries % 3
+                    ),
+                    "s": [f"entry {i}" for i in entries],
+                }
+            )
+    return filepath
+
+
+class CountingChunks:
+    def __init__(self, source):
+        self.chunks = source.chunks
+        self.requests = []
+
+    def __call__(self, ranges, notifications):
+        self.requests.append(list(ranges))
+        return self.chunks(ranges, notifications=notifications)
+
+
+def test_entries_and_slices(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays()
+        reader = tree.reader()
+        assert len(reader) == 1000
+
+        for entry in [0, 99, 100, 555, 999, -1, -1000]:
+            assert reader[entry].tolist() == expected[entry].tolist()
+        for entry_start, entry_stop in [(0, 1), (95, 105), (250, 250), (990, 2000)]:
+            assert (
+                reader[entry_start:entry_stop].tolist()
+                == expected[entry_start:entry_stop].tolist()
+            )
+        assert reader[-3:].tolist() == expected[-3:].tolist()
+
+        with pytest.raises(IndexError):
+            reader[1000]
+        with pytest.raises(ValueError, match="step"):
+            reader[0:10:2]
+        with pytest.raises(TypeError):
+            reader["x"]
+
+
+def test_cache_hits_do_no_io(tree_file, monkeypatch):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        counting = CountingChunks(file.file.source)
+        monkeypatch.setattr(file.file.source, "chunks", counting)
+
+        reader = tree.reader(["x", "j", "s"])
+        assert reader[150].tolist() == {"x": 150, "j": [], "s": "entry 150"}
+        # one request for the TBaskets of all three TBranches
+        assert len(counting.requests) == 1
+        assert len(counting.requests[0]) == 3
+
+        for entry in range(100, 200):
+            assert reader[entry]["x"] == entry
+        assert reader[120:180]["s"].tolist() == [f"entry {i}" for i in range(120, 180)]
+        assert len(counting.requests) == 1
+
+        # a window that starts in the cached TBaskets only requests the others
+        assert reader[190:210]["x"].tolist() == list(range(190, 210))
+        assert len(counting.requests) == 2
+        assert len(counting.requests[1]) == 3
+
+
+def test_bounded_cache(tree_file, monkeypatch):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        counting = CountingChunks(file.file.source)
+        monkeypatch.setattr(file.file.source, "chunks", counting)
+
+        reader = tree.reader(["x"], basket_cache=1000)
+        assert isinstance(reader.basket_cache, uproot.LRUArrayCache)
+        for entry in [0, 100, 200]:
+            assert reader[entry]["x"] == entry
+        assert len(reader.basket_cache) == 1
+        assert reader.basket_cache.current <= 1000
+        # the first TBasket was evicted
+        assert reader[1]["x"] == 1
+        assert len(counting.requests) == 4
+
+        shared = {}
+        assert tree.reader("x", basket_cache=shared, library="np")[5] == {"x": 5}
+        assert len(shared) == 1
+        assert tree.reader("x * 2", basket_cache=shared, library="np")[6] == {
+            "x * 2": 12
+        }
+        assert len(counting.requests) == 5
+
+
+@pytest.mark.parametrize("library", ["np", "pa", "pl"])
+def test_libraries(tree_file, library):
+    if library == "pa":
+        pytest.importorskip("pyarrow")
+    elif library == "pl":
+        pytest.importorskip("polars")
+
+    with uproot.open(tree_file) as file:
+        reader = file["tree"].reader(["x", "s"], library=library)
+        entry = reader[321]
+        assert {name: entry[name] for name in ["x", "s"]} == {
+            "x": 321,
+            "s": "entry 321",
+        }
+        window = reader[10:20]
+        assert len(window["x"]) == 10
+
+
+def test_branch_reader(tree_file):
+    with uproot.open(tree_file) as file:
+        branch = file["tree"]["j"]
+        assert branch.reader()[100].tolist() == {"j": [0.0]}
+        assert branch.reader(library="np", how=tuple)[101][0].tolist() == [1.0, 2.0]
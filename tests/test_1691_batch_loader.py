@@ -0,0 +1,185 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for uproot.batch_loader, which yields shuffled mini-batches of features
+from TTrees and RNTuples."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def tree_files(tmp_path):
+    paths = []
+    for i, num_entries in enumerate([1000, 0, 1500]):
+        filepath = os.path.join(tmp_path, f"input{i}.root")
+        with uproot.recreate(filepath) as file:
+            tree = file.mktree(
+                "tree",
+                {"index": np.int64, "x": np.float64, "v": (np.float32, (2,))},
+            )
+            for start in range(0, num_entries, 100):
+                index = np.arange(start, start + 100) + 10000 * i
+                tree.extend(
+                    {
+                        "index": index,
+                        "x": index * 0.5,
+                        "v": np.stack([index, -index], axis=1).astype(np.float32),
+                    }
+                )
+        paths.append(filepath)
+    return paths
+
+
+def _all_indexes(tree_files):
+    return sorted(list(range(1000)) + list(range(20000, 21500)))
+
+
+def test_sequential(tree_files):
+    batches = list(
+        uproot.batch_loader(
+            [f"{path}:tree" for path in tree_files],
+            ["index", "x", "v"],
+            batch_size=300,
+            shuffle=False,
+        )
+    )
+    assert [len(x) for x in batches] == [300] * 8 + [100]
+    for batch in batches:
+        assert batch.dtype == np.float32
+        assert batch.flags.c_contiguous
+        assert batch.shape[1] == 4
+        assert np.array_equal(batch[:, 1], batch[:, 0] * 0.5)
+        assert np.array_equal(batch[:, 2], batch[:, 0])
+        assert np.array_equal(batch[:, 3], -batch[:, 0])
+
+    indexes = np.concatenate([x[:, 0] for x in batches])
+    assert indexes.tolist() == _all_indexes(tree_files)
+
+
+def test_shuffled_and_deterministic(tree_files):
+    def indexes(seed, **kwargs):
+        batches = list(
+            uproot.batch_loader(
+                dict.fromkeys(tree_files, "tree"),
+                "index",
+                batch_size=64,
+                seed=seed,
+                shuffle_buffer=800,
+                dtype=np.float64,
+                **kwargs,
+            )
+        )
+        assert all(len(x) == 64 for x in batches[:-1])
+        return np.concatenate(batches)[:, 0].astype(np.int64)
+
+    first = indexes(123)
+    assert np.array_equal(first, indexes(123, prefetch=0))
+    assert sorted(first.tolist()) == _all_indexes(tree_files)
+    assert not np.array_equal(first, np.sort(first))
+    assert not np.array_equal(first, indexes(124))
+
+    # entries of one mini-batch come from several clusters
+    assert len(np.unique(first[:64] // 100)) > 1
+
+    dropped = indexes(123, drop_last=True)
+    assert len(dropped) == len(first) // 64 * 64
+
+
+@pytest.mark.parametrize("num_shards", [2, 3])
+def test_shards(tree_files, num_shards):
+    shards = [
+        np.concatenate(
+            list(
+                uproot.batch_loader(
+                    dict.fromkeys(tree_files, "tree"),
+                    ["index"],
+                    batch_size=100,
+                    seed=7,
+                    shuffle_buffer=400,
+                    num_shards=num_shards,
+                    shard=shard,
+                )
+            )
+        )[:, 0]
+        for shard in range(num_shards)
+    ]
+    combined = np.concatenate(shards).astype(np.int64).tolist()
+    assert sorted(combined) == _all_indexes(tree_files)
+
+
+def test_expressions_and_cut(tree_files):
+    batches = list(
+        uproot.batch_loader(
+            {tree_files[0]: "tree"},
+            ["index", "x * 2"],
+            batch_size=128,
+            cut="index % 2 == 0",
+            seed=1,
+        )
+    )
+    data = np.concatenate(batches)
+    assert sorted(data[:, 0].tolist()) == list(range(0, 1000, 2))
+    assert np.array_equal(data[:, 1], data[:, 0])
+
+
+def test_cut_removes_whole_clusters(tree_files):
+    batches = list(
+        uproot.batch_loader(
+            {tree_files[0]: "tree"},
+            ["index", "x * 2", "v"],
+            batch_size=64,
+            shuffle=False,
+            cut="index >= 900",
+        )
+    )
+    data = np.concatenate(batches)
+    assert data.shape == (100, 4)
+    assert data[:, 0].tolist() == list(range(900, 1000))
+    assert np.array_equal(data[:, 1], data[:, 0])
+
+
+def test_rntuple(tmp_path):
+    filepath = os.path.join(tmp_path, "input.root")
+    with uproot.recreate(filepath) as file:
+        ntuple = file.mkrntuple("ntuple", {"a": np.int32, "b": np.float64})
+        for start in range(0, 500, 50):
+            ntuple.extend(
+                {
+                    "a": np.arange(start, start + 50, dtype=np.int32),
+                    "b": np.arange(start, start + 50) * 2.0,
+                }
+            )
+
+    with uproot.open(filepath) as file:
+        assert len(file["ntuple"].ntuple.cluster_summaries) == 10
+
+    data = np.concatenate(
+        list(
+            uproot.batch_loader(
+                {filepath: "ntuple"}, batch_size=32, seed=3, shuffle_buffer=200
+            )
+        )
+    )
+    assert sorted(data[:, 0].tolist()) == list(range(500))
+    assert np.array_equal(data[:, 1], data[:, 0] * 2)
+
+
+def test_errors(tree_files, tmp_path):
+    files = {tree_files[0]: "tree"}
+    with pytest.raises(ValueError, match="batch_size"):
+        next(uproot.batch_loader(files, batch_size=0))
+    with pytest.raises(ValueError, match="shard"):
+        next(uproot.batch_loader(files, num_shards=2, shard=2, seed=1))
+    with pytest.raises(ValueError, match="seed"):
+        next(uproot.batch_loader(files, num_shards=2))
+
+    filepath = os.path.join(tmp_path, "jagged.root")
+    with uproot.recreate(filepath) as file:
+        file["tree"] = {"j": ak.Array([[1.0, 2.0], [], [3.0]])}
+    with pytest.raises(TypeError, match="fixed number"):
+        next(uproot.batch_loader({filepath: "tree"}, ["j"]))
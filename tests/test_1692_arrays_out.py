@@ -0,0 +1,104 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for HasBranches.arrays with out=, which fills the columns of a 2D array
+directly from the TBaskets."""
+
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree(
+            "tree",
+            {"a": np.float64, "b": np.int32, "c": np.bool_, "j": "var * float32"},
+        )
+        for start in range(0, 1000, 130):
+            entries = np.arange(start, start + 130)
+            tree.extend(
+                {
+                    "a": entries * 0.5,
+                    "b": entries.astype(np.int32),
+                    "c": entries % 3 == 0,
+                    "j": ak.unflatten(
+                        np.ones(entries.size, dtype=np.float32), np.ones_like(entries)
+                    ),
+                }
+            )
+    return filepath
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int64])
+def test_fill_columns(tree_file, order, dtype):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays(["a", "b", "c"], library="np")
+        for entry_start, entry_stop in [(0, 1040), (100, 400), (5, 6), (7, 7)]:
+            out = np.full((entry_stop - entry_start, 3), -1, dtype=dtype, order=order)
+            result = tree.arrays(
+                ["a", "b", "c"], entry_start=entry_start, entry_stop=entry_stop, out=out
+            )
+            assert result is out
+            for column, name in enumerate(["a", "b", "c"]):
+                assert np.array_equal(
+                    out[:, column],
+                    expected[name][entry_start:entry_stop].astype(dtype),
+                )
+
+
+def test_filters_select_columns(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        out = np.zeros((1040, 2), dtype=np.float32)
+        tree.arrays(filter_name=["a", "b"], out=out)
+        assert out[:, 0].tolist() == (np.arange(1040) * 0.5).tolist()
+        assert out[:, 1].tolist() == list(range(1040))
+
+
+def test_dtype_in_place_releases_baskets(tree_file):
+    # each TBasket is copied into place as soon as it is interpreted
+    with uproot.open(tree_file) as file:
+        branch = file["tree"]["b"]
+        out = np.zeros(1040, dtype=np.int64)
+        interpretation = uproot.AsDtypeInPlace(out, branch.interpretation.from_dtype)
+        array = branch.array(
+            interpretation=interpretation, library="np", array_cache=None
+        )
+        assert np.shares_memory(array, out)
+        assert out.tolist() == list(range(1040))
+
+        with pytest.raises(ValueError, match="size"):
+            branch.array(
+                interpretation=uproot.AsDtypeInPlace(
+                    np.zeros(10, dtype=np.int64), branch.interpretation.from_dtype
+                ),
+                library="np",
+                array_cache=None,
+            )
+
+
+def test_errors(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        with pytest.raises(ValueError, match="not a TBranch of one number"):
+            tree.arrays(["a", "j"], out=np.zeros((1040, 2)))
+        with pytest.raises(ValueError, match="not a TBranch of one number"):
+            tree.arrays(["a", "b * 2"], out=np.zeros((1040, 2)))
+        with pytest.raises(ValueError, match="more than one column"):
+            tree.arrays(["a", "a"], out=np.zeros((1040, 2)))
+        with pytest.raises(ValueError, match="shape"):
+            tree.arrays(["a", "b"], out=np.zeros((1040, 3)))
+        with pytest.raises(TypeError):
+            tree.arrays(["a"], out=np.zeros(1040))
+        with pytest.raises(ValueError, match="cut"):
+            tree.arrays(["a"], cut="b > 5", out=np.zeros((1040, 1)))
+        with pytest.raises(ValueError, match="virtual"):
+            tree.arrays(virtual=True, out=np.zeros((1040, 1)))
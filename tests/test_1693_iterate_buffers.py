@@ -0,0 +1,107 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for HasBranches.iterate with a BufferPool, which reuses the output
+buffers of one step in the next."""
+
+import gc
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+def _tolist(array):
+    if isinstance(array, np.ndarray) and array.dtype == np.dtype(object):
+        return [x.tolist() if isinstance(x, np.ndarray) else x for x in array]
+    return ak.to_list(array)
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree(
+            "tree",
+            {"x": np.float64, "v": (np.int32, (2,)), "j": "var * int64", "s": str},
+        )
+        for start in range(0, 1000, 70):
+            entries = np.arange(start, start + 70)
+            tree.extend(
+                {
+                    "x": entries * 0.5,
+                    "v": np.stack([entries, -entries], axis=1).astype(np.int32),
+                    "j": ak.unflatten(np.arange((entries % 4).sum()), entries % 4),
+                    "s": [f"entry {i}" for i in entries],
+                }
+            )
+    return filepath
+
+
+@pytest.mark.parametrize("library", ["ak", "np"])
+def test_same_values(tree_file, library):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = list(tree.iterate(step_size=100, library=library, how=dict))
+        pool = uproot.BufferPool()
+        for arrays, expect in zip(
+            tree.iterate(step_size=100, library=library, how=dict, buffers=pool),
+            expected,
+            strict=True,
+        ):
+            with pool:
+                for name in ["x", "v", "j", "s"]:
+                    assert _tolist(arrays[name]) == _tolist(expect[name])
+
+
+def test_buffers_are_reused(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        pool = uproot.BufferPool()
+        addresses = []
+        for arrays in tree.iterate(["x", "j"], step_size=100, buffers=pool):
+            addresses.append(ak.to_numpy(arrays["x"]).ctypes.data)
+            pool.release()
+        # every step fills the same buffer
+        assert len(set(addresses)) == 1
+        # one buffer for x and the offsets and content of j
+        assert len(pool._free) == 3
+        assert pool.nbytes < 3 * 100 * 8 * 2
+
+        # without releasing, the buffers are not reused
+        kept = list(tree.iterate("x", step_size=100, library="np", buffers=pool))
+        for i, arrays in enumerate(kept):
+            start = 100 * i
+            assert (
+                arrays["x"].tolist()
+                == (np.arange(start, min(start + 100, 1050)) * 0.5).tolist()
+            )
+
+
+def test_unreleased_buffers_are_not_kept(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        pool = uproot.BufferPool()
+        for arrays in tree.iterate("x", step_size=100, library="np", buffers=pool):
+            assert len(arrays["x"]) != 0
+        del arrays
+        gc.collect()
+        pool.release()
+        assert len(pool._free) == 0
+
+        pool = uproot.BufferPool(growth=2)
+        assert pool.growth == 2
+        first = pool.empty("a", (10,), np.float32)
+        pool.release()
+        assert pool.nbytes == 80
+        second = pool.empty("a", (20,), np.float32)
+        assert np.shares_memory(first, second)
+        pool.release()
+        third = pool.empty("a", (30, 2), np.int8)
+        assert third.shape == (30, 2)
+        assert np.shares_memory(first, third)
+
+        with pytest.raises(ValueError, match="growth"):
+            uproot.BufferPool(growth=0.5)
@@ -0,0 +1,117 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for iterating with step_size=uproot.MemoryBudget, which chooses the
+entries of each step from the sizes of the TBaskets."""
+
+import itertools
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    rng = np.random.default_rng(0)
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree("tree", {"x": np.float64, "j": "var * float64"})
+        for i in range(20):
+            # the second half of the entries have 40 times more items
+            counts = rng.poisson(1 if i < 10 else 40, 2000)
+            tree.extend(
+                {
+                    "x": np.arange(2000 * i, 2000 * (i + 1), dtype=np.float64),
+                    "j": ak.unflatten(rng.random(counts.sum()), counts),
+                }
+            )
+    return filepath
+
+
+def test_steps_fit_the_budget(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        expected = tree.arrays()
+
+        budget = uproot.MemoryBudget("1 MB")
+        steps = list(tree.iterate(step_size=budget, report=True))
+        assert ak.concatenate([x for x, _ in steps]).tolist() == expected.tolist()
+        assert [r.tree_entry_start for _, r in steps[1:]] == [
+            r.tree_entry_stop for _, r in steps[:-1]
+        ]
+        for arrays, _ in steps:
+            assert arrays.layout.nbytes <= 1000000
+
+        # the steps are larger where the entries are smaller
+        sizes = [r.tree_entry_stop - r.tree_entry_start for _, r in steps]
+        assert sizes[0] > 5 * sizes[-2]
+
+        # a fixed number of entries for the same memory size overshoots
+        fixed = [x.layout.nbytes for x in tree.iterate(step_size="1 MB")]
+        assert max(fixed) > 1000000
+
+
+def test_ratio_is_corrected(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        budget = uproot.MemoryBudget(500000, ratio=5)
+        assert budget.budget == 500000
+        sizes = [
+            r.tree_entry_stop - r.tree_entry_start
+            for _, r in tree.iterate(["x"], step_size=budget, report=True)
+        ]
+        assert 0.5 < budget.ratio < 2
+        assert sizes[-2] > sizes[0]
+
+        # arrays of Python objects do not report their sizes
+        budget = uproot.MemoryBudget(500000, ratio=3)
+        for _ in tree.iterate(["j"], step_size=budget, library="np"):
+            pass
+        assert budget.ratio == 3
+
+
+def test_baskets_larger_than_the_budget(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        offsets = tree["j"].entry_offsets
+        steps = [
+            (r.tree_entry_start, r.tree_entry_stop)
+            for _, r in tree.iterate(
+                ["j"], step_size=uproot.MemoryBudget(100), report=True
+            )
+        ]
+        # one step per TBasket
+        assert steps == list(itertools.pairwise(offsets))
+
+        steps = [
+            (r.tree_entry_start, r.tree_entry_stop)
+            for _, r in tree.iterate(
+                step_size=uproot.MemoryBudget(100),
+                entry_start=1000,
+                entry_stop=4500,
+                report=True,
+            )
+        ]
+        assert steps == [(1000, 2000), (2000, 4000), (4000, 4500)]
+
+
+def test_many_files_and_errors(tree_file):
+    budget = uproot.MemoryBudget("2 MB")
+    arrays = list(uproot.iterate([tree_file, tree_file], "x", step_size=budget))
+    assert ak.concatenate(arrays).x.tolist() == list(range(40000)) * 2
+
+    filepath = os.path.join(os.path.dirname(tree_file), "ntuple.root")
+    with uproot.recreate(filepath) as file:
+        file["ntuple"] = {"x": np.arange(1000.0)}
+    with uproot.open(filepath) as file:
+        steps = list(file["ntuple"].iterate(step_size=uproot.MemoryBudget(800)))
+        assert ak.concatenate(steps).x.tolist() == list(range(1000))
+        assert len(steps) > 1
+
+    with pytest.raises(TypeError, match="memory size"):
+        uproot.MemoryBudget("two megabytes")
+    with pytest.raises(ValueError, match="ratio"):
+        uproot.MemoryBudget("2 MB", ratio=0)
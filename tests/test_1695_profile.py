@@ -0,0 +1,133 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot5/blob/main/LICENSE
+
+"""Tests for arrays and iterate with profile=True, which record the time and
+memory spent on each TBranch."""
+
+import json
+import os
+
+import awkward as ak
+import numpy as np
+import pytest
+
+import uproot
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filepath = os.path.join(tmp_path, "test.root")
+    with uproot.recreate(filepath, compression=uproot.ZLIB(1)) as file:
+        tree = file.mktree("tree", {"x": np.float64, "j": "var * int64"})
+        for start in range(0, 1000, 100):
+            entries = np.arange(start, start + 100)
+            tree.extend(
+                {"x": entries * 0.5, "j": ak.unflatten(np.arange(3000), [30] * 100)}
+            )
+    return filepath
+
+
+def test_arrays(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        arrays, profile = tree.arrays(["x", "j", "x * 2"], profile=True)
+        assert isinstance(profile, uproot.Profile)
+        assert arrays.tolist() == tree.arrays(["x", "j", "x * 2"]).tolist()
+
+        branches = profile.branches
+        assert set(branches) == {"x", "j"}
+        for name in ["x", "j"]:
+            stats = branches[name]
+            branch = tree[name]
+            assert stats["num_baskets"] == branch.num_baskets == 10
+            assert stats["compressed_bytes"] == sum(
+                branch.basket_compressed_bytes(i) for i in range(10)
+            )
+            assert stats["uncompressed_bytes"] == sum(
+                branch.basket_uncompressed_bytes(i) for i in range(10)
+            )
+            assert stats["fetch_wait"] >= 0
+            assert stats["decompression_time"] > 0
+            assert stats["interpretation_time"] > 0
+        # the output array and the interpreted TBaskets
+        assert branches["x"]["peak_memory"] == 2 * 1000 * 8
+
+        names = [event["name"] for event in profile.events]
+        assert names.count("fetch") == names.count("decompress") == 20
+        assert names.count("interpret") == 20
+        assert names.count("finalize") == 2
+        assert names[-1] == "compute"
+        assert profile.wall_time > 0
+
+        # the same Profile collects several calls
+        same = tree.arrays(["x"], entry_stop=150, profile=profile)[1]
+        assert same is profile
+        assert profile.branches["x"]["num_baskets"] == 12
+
+
+def test_out_and_branch(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        out = np.zeros((1000, 1))
+        result, profile = tree.arrays(["x"], out=out, profile=True)
+        assert result is out
+        assert profile.branches["x"]["num_baskets"] == 10
+
+        array, profile = tree["j"].arrays(profile=True)
+        assert len(array) == 1000
+        assert list(profile.branches) == ["j"]
+
+        with pytest.raises(ValueError, match="profile"):
+            tree.arrays(virtual=True, profile=True)
+        with pytest.raises(TypeError, match="profile"):
+            tree.arrays(profile="yes")
+
+
+def test_iterate(tree_file):
+    with uproot.open(tree_file) as file:
+        tree = file["tree"]
+        profiles = []
+        for arrays, report, profile in tree.iterate(
+            step_size=250, report=True, profile=True
+        ):
+            assert len(arrays) == report.tree_entry_stop - report.tree_entry_start
+            profiles.append(profile)
+        assert len({id(x) for x in profiles}) == 4
+        assert sum(x.branches["x"]["num_baskets"] for x in profiles) == 10
+
+        total = uproot.Profile()
+        for _, profile in tree.iterate("x", step_size=250, profile=total):
+            assert profile is total
+        assert total.branches["x"]["num_baskets"] == 10
+        assert list(total.branches) == ["x"]
+
+
+def test_exports(tree_file, tmp_path):
+    with uproot.open(tree_file) as file:
+        _, profile = file["tree"].arrays(["x", "j"], profile=True)
+
+    lines = profile.table().split("\n")
+    assert lines[0].split()[:2] == ["branch", "baskets"]
+    assert {line.split()[0] for line in lines[2:]} == {"x", "j"}
+    # the costliest TBranch is first
+    assert lines[2].split()[0] == "j"
+    assert lines[2:] == profile.table(sort_by="decompression_time").split("\n")[2:]
+    with pytest.raises(ValueError, match="sort_by"):
+        profile.table(sort_by="nothing")
+
+    filepath = os.path.join(tmp_path, "trace.json")
+    profile.write_chrome_trace(filepath)
+    with open(filepath, encoding="utf-8") as trace_file:
+        trace = json.load(trace_file)
+    phases = [event["ph"] for event in trace["traceEvents"]]
+    assert phases.count("b") == phases.count("e") == 20
+    assert phases.count("X") == 20 + 20 + 2 + 1
+    assert "M" in phases
+    for event in trace["traceEvents"]:
+        if event["ph"] == "X":
+            assert event["dur"] >= 0
+
+    pandas = pytest.importorskip("pandas")
+    df = profile.to_pandas()
+    assert isinstance(df, pandas.DataFrame)
+    assert set(df.index) == {"x", "j"}
+    assert df.loc["j", "num_baskets"] == 10